@@ -0,0 +1 @@
+# Paquete del servidor HTTP/JSON del sistema bancario
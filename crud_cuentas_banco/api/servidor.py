@@ -0,0 +1,588 @@
+"""
+Servidor HTTP/JSON sin interfaz gráfica sobre los controladores del sistema.
+Expone las operaciones de clientes, cuentas y usuarios con un pool acotado
+de hilos, tiempo máximo de espera por conexión, keep-alive (HTTP/1.1),
+compresión gzip de respuestas grandes y listados paginados o en streaming.
+
+Rutas:
+    GET    /salud
+    GET    /estadisticas
+    GET    /reportes/saldos?fecha=AAAA-MM-DD   (resumen diario por agencia, producto y estado)
+    GET    /reportes/saldos?dimension=&valor=&desde=&hasta=   (serie diaria)
+    GET    /{recurso}?limite=&offset=&despues_de=&columnas=&<filtro>=
+    GET    /{recurso}?stream=1              (listado completo en streaming)
+    GET    /{recurso}/conteo?<filtro>=
+    GET    /{recurso}/{id}
+    POST   /{recurso}
+    PUT    /{recurso}/{id}                  ("version" leída: 409 si otro la cambió)
+    DELETE /{recurso}/{id}
+    POST   /cuentas/{id}/saldo              {"saldo": 100.0}
+    GET    /cuentas/{id}/saldo?fecha=AAAA-MM-DD
+    POST   /usuarios/autenticar             {"username": "...", "password": "..."}
+
+Los listados y conteos tienen un tiempo máximo de ejecución por consulta
+(--timeout-consulta; en streaming, por lote): al vencer se responde 503.
+
+Acceso: con la variable de entorno BANCO_API_TOKEN definida, todas las rutas
+salvo /salud exigen la cabecera "Authorization: Bearer <token>" (401 si falta
+o no coincide). Sin token el servidor solo acepta escuchar en una interfaz
+local (127.0.0.1, ::1 o localhost) y se niega a iniciar en cualquier otra.
+
+Uso (desde crud_cuentas_banco/):
+    python -m api.servidor --puerto 8080 --hilos 8 --timeout-consulta 10
+    BANCO_API_TOKEN=secreto python -m api.servidor --host 0.0.0.0
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from http import HTTPStatus
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+import argparse
+import gzip
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import threading
+import zlib
+
+from controllers.cliente_controller import ClienteController
+from controllers.cuenta_controller import CuentaController
+from controllers.usuario_controller import UsuarioController
+from database.sesiones import cerrar_todas
+
+logger = logging.getLogger(__name__)
+
+# Respuestas a partir de este tamaño (bytes) se comprimen si el cliente acepta gzip
+MINIMO_GZIP = 1024
+
+# Tamaño máximo del cuerpo de una petición (bytes)
+MAXIMO_CUERPO = 1024 * 1024
+
+# Paginación por defecto y máxima de los listados
+LIMITE_POR_DEFECTO = 100
+LIMITE_MAXIMO = 1000
+
+# Filas por lote al transmitir un listado en streaming
+TAMANO_LOTE_STREAM = 500
+
+# Segundos máximos de ejecución de las consultas de listados y conteos
+TIEMPO_MAXIMO_CONSULTA = 10
+
+# Variable de entorno con el token de acceso a la API
+VARIABLE_TOKEN = 'BANCO_API_TOKEN'
+
+# Recursos expuestos: controlador, métodos específicos y columnas que nunca se devuelven
+RECURSOS = {
+    'clientes': {
+        'controlador': ClienteController,
+        'crear': 'crear_cliente',
+        'actualizar': 'actualizar_cliente',
+        'ocultas': ()
+    },
+    'cuentas': {
+        'controlador': CuentaController,
+        'crear': 'crear_cuenta',
+        'actualizar': 'actualizar_cuenta',
+        'ocultas': ()
+    },
+    'usuarios': {
+        'controlador': UsuarioController,
+        'crear': 'crear_usuario',
+        'actualizar': 'actualizar_usuario',
+        'ocultas': ('password_hash',)
+    }
+}
+
+# Un controlador por recurso compartido por todos los hilos: los modelos usan
+# la sesión de BD del hilo que atiende la petición (database.sesiones)
+_controladores = {}
+_lock_controladores = threading.Lock()
+
+
+def obtener_controlador(recurso):
+    """
+    Obtiene el controlador compartido del recurso.
+
+    Args:
+        recurso (str): Nombre del recurso (clave de RECURSOS)
+
+    Returns:
+        BaseController: Controlador del recurso
+    """
+    controlador = _controladores.get(recurso)
+    if controlador is None:
+        with _lock_controladores:
+            controlador = _controladores.get(recurso)
+            if controlador is None:
+                controlador = _controladores[recurso] = RECURSOS[recurso]['controlador']()
+    return controlador
+
+
+def es_interfaz_local(host):
+    """
+    Indica si el host de escucha solo es accesible desde la propia máquina.
+
+    Args:
+        host (str): Host o dirección IP de escucha ('' significa todas las interfaces)
+
+    Returns:
+        bool: True si es localhost o una dirección de loopback
+    """
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _serializar(valor):
+    """Convierte a JSON los tipos que json no soporta directamente."""
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (datetime, date, time)):
+        return valor.isoformat()
+    if isinstance(valor, timedelta):
+        return valor.total_seconds()
+    if isinstance(valor, bytes):
+        return valor.decode('utf-8', errors='replace')
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+def _a_dict(fila, ocultas=()):
+    """Convierte una fila (Fila o dict) en un diccionario sin las columnas ocultas."""
+    return {columna: valor for columna, valor in fila.items() if columna not in ocultas}
+
+
+def _a_json(datos):
+    """Serializa a JSON compacto en UTF-8."""
+    return json.dumps(datos, default=_serializar, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class ManejadorAPI(BaseHTTPRequestHandler):
+    """Atiende las peticiones de una conexión (keep-alive con HTTP/1.1)."""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'BancoAPI/1.0'
+
+    def setup(self):
+        # Tiempo máximo sin actividad en la conexión (lectura de peticiones y keep-alive)
+        self.timeout = self.server.timeout_conexion
+        super().setup()
+
+    def do_GET(self):
+        self._despachar('GET')
+
+    def do_POST(self):
+        self._despachar('POST')
+
+    def do_PUT(self):
+        self._despachar('PUT')
+
+    def do_DELETE(self):
+        self._despachar('DELETE')
+
+    def log_message(self, formato, *args):
+        logger.info("%s - %s", self.address_string(), formato % args)
+
+    def _despachar(self, metodo):
+        """Resuelve la ruta y ejecuta la operación correspondiente."""
+        url = urlsplit(self.path)
+        partes = [parte for parte in url.path.split('/') if parte]
+        parametros = {clave: valores[-1] for clave, valores in parse_qs(url.query).items()}
+
+        try:
+            if metodo == 'GET' and partes in ([], ['salud']):
+                return self._responder(HTTPStatus.OK, {'exito': True, 'mensaje': 'Servicio disponible'})
+            if not self._autorizado():
+                # El cuerpo de la petición queda sin leer: no se puede reutilizar la conexión
+                self.close_connection = True
+                return self._responder(HTTPStatus.UNAUTHORIZED,
+                                       {'exito': False, 'mensaje': "Token de acceso inválido o ausente"},
+                                       {'WWW-Authenticate': 'Bearer'})
+            if metodo == 'GET' and partes == ['estadisticas']:
+                return self._estadisticas()
+            if metodo == 'GET' and partes == ['reportes', 'saldos']:
+                return self._reporte_saldos(parametros)
+
+            if not partes or partes[0] not in RECURSOS:
+                return self._error(HTTPStatus.NOT_FOUND, "Recurso no encontrado")
+            recurso = partes[0]
+
+            if len(partes) == 1:
+                if metodo == 'GET':
+                    return self._listar(recurso, parametros)
+                if metodo == 'POST':
+                    return self._crear(recurso)
+            elif len(partes) == 2 and partes[1] == 'conteo' and metodo == 'GET':
+                return self._conteo(recurso, parametros)
+            elif recurso == 'usuarios' and partes[1:] == ['autenticar'] and metodo == 'POST':
+                return self._autenticar()
+            elif partes[1].isdigit():
+                id_registro = int(partes[1])
+                if len(partes) == 2:
+                    if metodo == 'GET':
+                        return self._leer(recurso, id_registro)
+                    if metodo == 'PUT':
+                        return self._actualizar(recurso, id_registro)
+                    if metodo == 'DELETE':
+                        return self._eliminar(recurso, id_registro)
+                elif recurso == 'cuentas' and partes[2:] == ['saldo'] and metodo == 'POST':
+                    return self._actualizar_saldo(id_registro)
+                elif recurso == 'cuentas' and partes[2:] == ['saldo'] and metodo == 'GET':
+                    return self._saldo_al(id_registro, parametros)
+
+            return self._error(HTTPStatus.NOT_FOUND, "Ruta no encontrada")
+
+        except ValueError as e:
+            return self._error(HTTPStatus.BAD_REQUEST, str(e))
+        except Exception as e:
+            logger.error(f"Error al atender {metodo} {self.path}: {str(e)}")
+            return self._error(HTTPStatus.INTERNAL_SERVER_ERROR, "Error interno del servidor")
+
+    # Operaciones
+
+    def _listar(self, recurso, parametros):
+        """Listado paginado (limite/offset o despues_de) o completo en streaming."""
+        controlador = obtener_controlador(recurso)
+        filtros = {nombre: parametros[nombre]
+                   for nombre in controlador.modelo.tabla.filtros if parametros.get(nombre)}
+        columnas = [c for c in parametros['columnas'].split(',') if c] if parametros.get('columnas') else None
+
+        if parametros.get('stream') in ('1', 'true'):
+            return self._listar_stream(recurso, controlador, filtros, columnas)
+
+        limite = self._entero(parametros, 'limite', LIMITE_POR_DEFECTO)
+        if limite < 1:
+            # limite=0 compilaría la consulta sin LIMIT y devolvería la tabla completa
+            raise ValueError("El parámetro limite debe ser mayor que cero")
+        limite = min(limite, LIMITE_MAXIMO)
+        offset = self._entero(parametros, 'offset', 0)
+        despues_de = self._entero(parametros, 'despues_de', None)
+
+        exito, mensaje, filas = controlador.listar(filtros, limite, offset or None, columnas, despues_de,
+                                                   self.server.timeout_consulta)
+        if not exito:
+            return self._error_lectura(controlador, mensaje)
+
+        ocultas = RECURSOS[recurso]['ocultas']
+        cuerpo = {
+            'exito': True,
+            'mensaje': mensaje,
+            'datos': [_a_dict(fila, ocultas) for fila in filas],
+            'paginacion': {'limite': limite, 'offset': offset, 'despues_de': despues_de}
+        }
+        clave = controlador.modelo.tabla.clave
+        if len(filas) == limite and filas and clave in filas[0]:
+            cuerpo['paginacion']['siguiente'] = filas[-1][clave]
+        self._responder(HTTPStatus.OK, cuerpo)
+
+    def _listar_stream(self, recurso, controlador, filtros, columnas):
+        """Transmite el listado completo por lotes con Transfer-Encoding: chunked."""
+        ocultas = RECURSOS[recurso]['ocultas']
+        compresor = zlib.compressobj(wbits=31) if self._acepta_gzip() else None
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        if compresor:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+
+        def enviar(datos, final=False):
+            if compresor:
+                datos = compresor.compress(datos) + (compresor.flush() if final else compresor.flush(zlib.Z_SYNC_FLUSH))
+            if datos:
+                self.wfile.write(f"{len(datos):X}\r\n".encode() + datos + b"\r\n")
+
+        try:
+            enviar(b'{"exito":true,"datos":[')
+            primero = True
+            for lote in controlador.modelo.iterar_lotes(filtros, TAMANO_LOTE_STREAM, columnas,
+                                                        self.server.timeout_consulta):
+                contenido = b",".join(_a_json(_a_dict(fila, ocultas)) for fila in lote)
+                enviar(contenido if primero else b"," + contenido)
+                primero = False
+            enviar(b"]}", final=True)
+            self.wfile.write(b"0\r\n\r\n")
+        except Exception as e:
+            # Los encabezados ya se enviaron: se corta la conexión para que el cliente note el error
+            logger.error(f"Error al transmitir listado de {recurso}: {str(e)}")
+            self.close_connection = True
+
+    def _conteo(self, recurso, parametros):
+        controlador = obtener_controlador(recurso)
+        filtros = {nombre: parametros[nombre]
+                   for nombre in controlador.modelo.tabla.filtros if parametros.get(nombre)}
+        exito, mensaje, conteo = controlador.obtener_conteo(filtros, self.server.timeout_consulta)
+        if not exito:
+            return self._error_lectura(controlador, mensaje)
+        self._responder(HTTPStatus.OK, {'exito': True, 'mensaje': mensaje, 'datos': conteo})
+
+    def _leer(self, recurso, id_registro):
+        exito, mensaje, datos = obtener_controlador(recurso).leer(id_registro)
+        if not exito:
+            return self._error(HTTPStatus.NOT_FOUND, mensaje)
+        self._responder(HTTPStatus.OK, {'exito': True, 'mensaje': mensaje,
+                                        'datos': _a_dict(datos, RECURSOS[recurso]['ocultas'])})
+
+    def _crear(self, recurso):
+        datos = self._leer_cuerpo()
+        controlador = obtener_controlador(recurso)
+        exito, mensaje, id_nuevo = getattr(controlador, RECURSOS[recurso]['crear'])(datos)
+        if not exito:
+            return self._error(HTTPStatus.BAD_REQUEST, mensaje)
+        self._responder(HTTPStatus.CREATED, {'exito': True, 'mensaje': mensaje, 'datos': {'id': id_nuevo}})
+
+    def _actualizar(self, recurso, id_registro):
+        datos = self._leer_cuerpo()
+        controlador = obtener_controlador(recurso)
+        exito, mensaje = getattr(controlador, RECURSOS[recurso]['actualizar'])(id_registro, datos)[:2]
+        if not exito:
+            estado = HTTPStatus.CONFLICT if controlador.es_conflicto(mensaje) else HTTPStatus.BAD_REQUEST
+            return self._error(estado, mensaje)
+        self._responder(HTTPStatus.OK, {'exito': True, 'mensaje': mensaje})
+
+    def _eliminar(self, recurso, id_registro):
+        exito, mensaje = obtener_controlador(recurso).eliminar(id_registro)
+        if not exito:
+            return self._error(HTTPStatus.NOT_FOUND, mensaje)
+        self._responder(HTTPStatus.OK, {'exito': True, 'mensaje': mensaje})
+
+    def _actualizar_saldo(self, id_cuenta):
+        datos = self._leer_cuerpo()
+        try:
+            saldo = float(datos['saldo'])
+        except (KeyError, TypeError, ValueError):
+            return self._error(HTTPStatus.BAD_REQUEST, "El saldo debe ser un número válido")
+        exito, mensaje = obtener_controlador('cuentas').actualizar_saldo(id_cuenta, saldo)
+        if not exito:
+            return self._error(HTTPStatus.BAD_REQUEST, mensaje)
+        self._responder(HTTPStatus.OK, {'exito': True, 'mensaje': mensaje})
+
+    def _saldo_al(self, id_cuenta, parametros):
+        fecha = parametros.get('fecha')
+        if not fecha:
+            return self._error(HTTPStatus.BAD_REQUEST, "Indique la fecha (AAAA-MM-DD)")
+        exito, mensaje, saldo = obtener_controlador('cuentas').obtener_saldo_al(id_cuenta, fecha)
+        if not exito:
+            return self._error(HTTPStatus.BAD_REQUEST, mensaje)
+        self._responder(HTTPStatus.OK, {'exito': True, 'mensaje': mensaje,
+                                        'datos': {'id_cuenta': id_cuenta, 'fecha': fecha, 'saldo': saldo}})
+
+    def _autenticar(self):
+        datos = self._leer_cuerpo()
+        exito, mensaje, usuario = obtener_controlador('usuarios').autenticar_usuario(
+            str(datos.get('username', '')), str(datos.get('password', '')))
+        if not exito:
+            return self._error(HTTPStatus.UNAUTHORIZED, mensaje)
+        self._responder(HTTPStatus.OK, {'exito': True, 'mensaje': mensaje,
+                                        'datos': _a_dict(usuario, RECURSOS['usuarios']['ocultas'])})
+
+    def _estadisticas(self):
+        estadisticas = {}
+        for recurso, metodo in (('clientes', 'obtener_estadisticas_clientes'),
+                                ('cuentas', 'obtener_estadisticas_cuentas'),
+                                ('usuarios', 'obtener_estadisticas_usuarios')):
+            exito, _, datos = getattr(obtener_controlador(recurso), metodo)()
+            estadisticas[recurso] = datos if exito else None
+        self._responder(HTTPStatus.OK, {'exito': True, 'mensaje': "Estadísticas obtenidas", 'datos': estadisticas})
+
+    def _reporte_saldos(self, parametros):
+        controlador = obtener_controlador('cuentas')
+        if parametros.get('dimension'):
+            exito, mensaje, datos = controlador.obtener_tendencia_saldos(
+                parametros['dimension'], parametros.get('valor'), parametros.get('desde'), parametros.get('hasta'))
+            datos = [_a_dict(fila) for fila in datos]
+        else:
+            exito, mensaje, datos = controlador.obtener_resumen_saldos(parametros.get('fecha'))
+        if not exito:
+            return self._error(HTTPStatus.BAD_REQUEST, mensaje)
+        self._responder(HTTPStatus.OK, {'exito': True, 'mensaje': mensaje, 'datos': datos})
+
+    # Utilidades de petición y respuesta
+
+    @staticmethod
+    def _entero(parametros, nombre, defecto):
+        """Lee un parámetro entero no negativo de la URL."""
+        valor = parametros.get(nombre)
+        if valor in (None, ''):
+            return defecto
+        if not valor.isdigit():
+            raise ValueError(f"El parámetro {nombre} debe ser un entero no negativo")
+        return int(valor)
+
+    def _leer_cuerpo(self):
+        """
+        Lee y decodifica el cuerpo JSON de la petición.
+
+        Raises:
+            ValueError: Si el cuerpo es demasiado grande o no es un objeto JSON
+        """
+        try:
+            longitud = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            longitud = -1
+        if longitud < 0:
+            # Una longitud inválida deja el resto de la conexión sin sentido
+            self.close_connection = True
+            raise ValueError("Content-Length inválido")
+        if longitud > MAXIMO_CUERPO:
+            self.close_connection = True
+            raise ValueError("El cuerpo de la petición es demasiado grande")
+        try:
+            datos = json.loads(self.rfile.read(longitud) or b'{}')
+        except ValueError:
+            raise ValueError("El cuerpo de la petición no es JSON válido") from None
+        if not isinstance(datos, dict):
+            raise ValueError("El cuerpo de la petición debe ser un objeto JSON")
+        return datos
+
+    def _autorizado(self):
+        """Comprueba la cabecera Authorization contra el token del servidor (si lo tiene)."""
+        token = self.server.token
+        if not token:
+            return True
+        esquema, _, credencial = self.headers.get('Authorization', '').partition(' ')
+        if esquema.lower() != 'bearer':
+            return False
+        return hmac.compare_digest(credencial.strip().encode('utf-8'), token.encode('utf-8'))
+
+    def _acepta_gzip(self):
+        return 'gzip' in self.headers.get('Accept-Encoding', '')
+
+    def _error(self, estado, mensaje):
+        self._responder(estado, {'exito': False, 'mensaje': mensaje})
+
+    def _error_lectura(self, controlador, mensaje):
+        """Error de un listado o conteo: 503 si superó el tiempo máximo, 400 en otro caso."""
+        if controlador.es_tiempo_agotado(mensaje):
+            return self._error(HTTPStatus.SERVICE_UNAVAILABLE, mensaje)
+        return self._error(HTTPStatus.BAD_REQUEST, mensaje)
+
+    def _responder(self, estado, cuerpo, cabeceras=None):
+        """Envía una respuesta JSON con Content-Length (comprimida si conviene)."""
+        datos = _a_json(cuerpo)
+        comprimir = len(datos) >= MINIMO_GZIP and self._acepta_gzip()
+        if comprimir:
+            datos = gzip.compress(datos, compresslevel=5)
+
+        self.send_response(estado)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(datos)))
+        if comprimir:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        for nombre, valor in (cabeceras or {}).items():
+            self.send_header(nombre, valor)
+        self.end_headers()
+        self.wfile.write(datos)
+
+
+class ServidorAPI(HTTPServer):
+    """
+    Servidor HTTP con un pool acotado de hilos.
+
+    Cada conexión ocupa un hilo mientras está activa (incluido keep-alive,
+    limitado por timeout_conexion). Si los hilos y la cola de espera están
+    llenos, la conexión se rechaza de inmediato con 503.
+
+    Con token, toda ruta salvo /salud exige "Authorization: Bearer <token>";
+    sin token solo se permite escuchar en una interfaz local.
+    """
+
+    def __init__(self, direccion, hilos=8, cola=32, timeout_conexion=30,
+                 timeout_consulta=TIEMPO_MAXIMO_CONSULTA, token=None):
+        """
+        Args:
+            direccion (tuple): (host, puerto)
+            hilos (int): Conexiones atendidas en paralelo
+            cola (int): Conexiones aceptadas en espera de un hilo libre
+            timeout_conexion (float): Segundos sin actividad antes de cerrar la conexión
+            timeout_consulta (float): Segundos máximos de las consultas de listados y conteos
+            token (str): Token de acceso exigido a los clientes (None: sin autenticación)
+
+        Raises:
+            ValueError: Si no hay token y el host de escucha no es local
+        """
+        if not token and not es_interfaz_local(direccion[0]):
+            raise ValueError(f"Sin token de acceso ({VARIABLE_TOKEN}) el servidor solo puede "
+                             f"escuchar en una interfaz local, no en '{direccion[0]}'")
+        super().__init__(direccion, ManejadorAPI)
+        self.token = token or None
+        self.timeout_conexion = timeout_conexion
+        self.timeout_consulta = timeout_consulta
+        self.ejecutor = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='api')
+        self.cupos = threading.BoundedSemaphore(hilos + cola)
+
+    def process_request(self, request, client_address):
+        if not self.cupos.acquire(blocking=False):
+            self._rechazar(request)
+            return
+        self.ejecutor.submit(self._atender, request, client_address)
+
+    def _atender(self, request, client_address):
+        """Atiende una conexión en un hilo del pool."""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.cupos.release()
+
+    def _rechazar(self, request):
+        """Responde 503 sin ocupar un hilo del pool."""
+        try:
+            request.sendall(b"HTTP/1.1 503 Service Unavailable\r\n"
+                            b"Content-Length: 0\r\nRetry-After: 1\r\nConnection: close\r\n\r\n")
+        except OSError:
+            pass
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.ejecutor.shutdown(wait=True)
+        cerrar_todas()
+
+
+def main():
+    """Inicia el servidor con los parámetros de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON del sistema bancario")
+    parser.add_argument('--host', default='127.0.0.1',
+                        help=f"Interfaz de escucha (otra que no sea local exige {VARIABLE_TOKEN})")
+    parser.add_argument('--puerto', type=int, default=8080, help="Puerto de escucha")
+    parser.add_argument('--hilos', type=int, default=8, help="Conexiones atendidas en paralelo")
+    parser.add_argument('--cola', type=int, default=32, help="Conexiones en espera de un hilo libre")
+    parser.add_argument('--timeout', type=float, default=30, help="Segundos sin actividad por conexión")
+    parser.add_argument('--timeout-consulta', type=float, default=TIEMPO_MAXIMO_CONSULTA,
+                        help="Segundos máximos de las consultas de listados y conteos")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    try:
+        servidor = ServidorAPI((args.host, args.puerto), args.hilos, args.cola, args.timeout,
+                               args.timeout_consulta, os.environ.get(VARIABLE_TOKEN))
+    except ValueError as e:
+        parser.error(str(e))
+    logger.info(f"Servidor API escuchando en http://{args.host}:{args.puerto}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Servidor API detenido")
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
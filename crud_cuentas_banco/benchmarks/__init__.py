@@ -0,0 +1,7 @@
+"""
+Pruebas de rendimiento de los modelos y controladores.
+
+Uso (desde crud_cuentas_banco/, sobre una BD local con script.sql cargado):
+    python -m benchmarks.ejecutar --escala pequena --salida resultados/base.json
+    python -m benchmarks.comparar resultados/base.json resultados/nuevo.json
+"""
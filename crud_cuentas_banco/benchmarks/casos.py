@@ -0,0 +1,197 @@
+"""
+Casos de las pruebas de rendimiento.
+
+Cada caso recibe el ContextoBenchmark y retorna la operación a medir, una
+función que recibe el número de iteración. Los casos transaccionales se
+ejecutan dentro de una unidad de trabajo que se deshace al terminar, así
+la BD sembrada no cambia entre ejecuciones.
+"""
+
+from controllers.cliente_controller import ClienteController
+from controllers.cuenta_controller import CuentaController
+from controllers.usuario_controller import UsuarioController
+from benchmarks.sembrado import ID_INICIAL, SEMILLA
+import random
+
+# Casos registrados: nombre -> Caso (en orden de registro)
+CASOS = {}
+
+
+class Caso:
+    """Metadatos de un caso de rendimiento."""
+
+    def __init__(self, nombre, funcion, repeticiones=None, transaccional=False, filas_por_operacion=1):
+        """
+        Args:
+            nombre (str): Nombre del caso en los resultados
+            funcion (callable): Recibe el contexto y retorna la operación a medir
+            repeticiones (int): Iteraciones fijas (por defecto las de la ejecución)
+            transaccional (bool): Ejecutar dentro de una unidad de trabajo deshecha al final
+            filas_por_operacion (int): Filas procesadas por cada iteración
+        """
+        self.nombre = nombre
+        self.funcion = funcion
+        self.repeticiones = repeticiones
+        self.transaccional = transaccional
+        self.filas_por_operacion = filas_por_operacion
+
+
+def caso(nombre, **opciones):
+    """Decorador que registra un caso en CASOS."""
+    def registrar(funcion):
+        CASOS[nombre] = Caso(nombre, funcion, **opciones)
+        return funcion
+    return registrar
+
+
+class ContextoBenchmark:
+    """Controladores y muestras de datos sembrados compartidos por los casos."""
+
+    def __init__(self, db):
+        """
+        Args:
+            db: Database conectada a la BD sembrada
+        """
+        self.db = db
+        self.rng = random.Random(SEMILLA)
+        self.clientes = ClienteController()
+        self.cuentas = CuentaController()
+        self.usuarios = UsuarioController()
+        self._secuencia = 0
+
+        self.muestra_clientes = db.fetch_all(
+            "SELECT id_cliente, numero_documento, email FROM clientes WHERE id_cliente >= %s", (ID_INICIAL,))
+        self.muestra_cuentas = db.fetch_all(
+            "SELECT id_cuenta, numero_cuenta FROM cuentas WHERE id_cliente >= %s", (ID_INICIAL,))
+        self.muestra_usuarios = db.fetch_all(
+            "SELECT username FROM usuarios WHERE id_cliente >= %s", (ID_INICIAL,))
+        if not self.muestra_clientes or not self.muestra_cuentas:
+            raise RuntimeError("La BD no tiene datos sembrados para las pruebas de rendimiento")
+
+    def elegir(self, muestra):
+        """Elige una fila de la muestra con el generador de la ejecución (reproducible)."""
+        return muestra[self.rng.randrange(len(muestra))]
+
+    def datos_cliente_nuevo(self):
+        """Datos válidos de un cliente que no existe en la BD sembrada."""
+        self._secuencia += 1
+        return {
+            'nombre': 'Prueba',
+            'apellido_paterno': 'Rendimiento',
+            'apellido_materno': 'Benchmark',
+            'id_tipo_documento': 1,
+            'numero_documento': f"{60_000_000 + self._secuencia:08d}",
+            'email': f"benchmark{self._secuencia}@email.com",
+            'telefono': '987654321',
+            'fecha_nacimiento': '1990-01-01',
+            'id_categoria': 1,
+            'id_agencia_apertura': 1
+        }
+
+
+# Modelos
+
+@caso('modelo.crear', transaccional=True)
+def crear_cliente_modelo(contexto):
+    modelo = contexto.clientes.modelo
+
+    def operacion(_):
+        # Un INSERT fallido (validación, duplicado) no debe medirse como una creación rápida
+        exito, mensaje, id_cliente = modelo.crear(contexto.datos_cliente_nuevo())
+        if not exito:
+            raise RuntimeError(mensaje)
+        return id_cliente
+    return operacion
+
+
+@caso('modelo.leer')
+def leer_cliente(contexto):
+    modelo = contexto.clientes.modelo
+    return lambda _: modelo.leer(contexto.elegir(contexto.muestra_clientes)['id_cliente'])
+
+
+@caso('modelo.listar_pagina')
+def listar_pagina_cuentas(contexto):
+    modelo = contexto.cuentas.modelo
+    return lambda _: modelo.listar({'estado': 'Activa'}, limite=50,
+                                   despues_de=contexto.elegir(contexto.muestra_cuentas)['id_cuenta'])
+
+
+@caso('modelo.listar_filtro_like')
+def listar_clientes_por_nombre(contexto):
+    modelo = contexto.clientes.modelo
+    return lambda _: modelo.listar({'nombre': 'Quisp'}, limite=50)
+
+
+# Controladores
+
+@caso('controlador.obtener_conteo')
+def contar_cuentas_activas(contexto):
+    return lambda _: contexto.cuentas.obtener_conteo({'estado': 'Activa'})
+
+
+@caso('controlador.estadisticas_clientes', repeticiones=20)
+def estadisticas_clientes(contexto):
+    return lambda _: contexto.clientes.obtener_estadisticas_clientes()
+
+
+@caso('controlador.estadisticas_cuentas', repeticiones=20)
+def estadisticas_cuentas(contexto):
+    return lambda _: contexto.cuentas.obtener_estadisticas_cuentas()
+
+
+@caso('controlador.estadisticas_usuarios', repeticiones=20)
+def estadisticas_usuarios(contexto):
+    return lambda _: contexto.usuarios.obtener_estadisticas_usuarios()
+
+
+@caso('cuenta.generar_numero_cuenta')
+def generar_numero_cuenta(contexto):
+    return lambda _: contexto.cuentas.generar_numero_cuenta()
+
+
+# Verificaciones de unicidad (mitad valores existentes, mitad nuevos)
+
+@caso('unicidad.documento')
+def unicidad_documento(contexto):
+    def operacion(i):
+        documento = contexto.elegir(contexto.muestra_clientes)['numero_documento'] if i % 2 else f"{70_000_000 + i:08d}"
+        return contexto.clientes._documento_existe(documento)
+    return operacion
+
+
+@caso('unicidad.email')
+def unicidad_email(contexto):
+    def operacion(i):
+        email = contexto.elegir(contexto.muestra_clientes)['email'] if i % 2 else f"nuevo{i}@email.com"
+        return contexto.clientes._email_existe(email)
+    return operacion
+
+
+@caso('unicidad.numero_cuenta')
+def unicidad_numero_cuenta(contexto):
+    def operacion(i):
+        numero = contexto.elegir(contexto.muestra_cuentas)['numero_cuenta'] if i % 2 else f"003-999-{i % 1_000_000:06d}-00"
+        return contexto.cuentas._numero_cuenta_existe(numero)
+    return operacion
+
+
+@caso('unicidad.username')
+def unicidad_username(contexto):
+    def operacion(i):
+        if i % 2 and contexto.muestra_usuarios:
+            return contexto.usuarios._username_existe(contexto.elegir(contexto.muestra_usuarios)['username'])
+        return contexto.usuarios._username_existe(f"nuevo_usuario_{i}")
+    return operacion
+
+
+# Importación masiva (mismo camino que cli.py importar: validaciones del controlador por fila)
+
+@caso('importacion.clientes', repeticiones=5, transaccional=True, filas_por_operacion=200)
+def importar_clientes(contexto):
+    def operacion(_):
+        for _ in range(200):
+            exito, mensaje, _ = contexto.clientes.crear_cliente(contexto.datos_cliente_nuevo())
+            if not exito:
+                raise RuntimeError(mensaje)
+    return operacion
@@ -0,0 +1,88 @@
+"""
+Compara dos archivos de resultados de benchmarks.ejecutar y señala regresiones.
+
+Uso (desde crud_cuentas_banco/):
+    python -m benchmarks.comparar resultados/base.json resultados/nuevo.json --umbral 10
+
+Termina con código 1 si algún caso empeoró más que el umbral, para usarlo
+en scripts de integración.
+"""
+
+import argparse
+import json
+import sys
+
+# Métricas comparadas: (clave, mayor_es_mejor)
+METRICAS = (('p50_ms', False), ('p95_ms', False), ('ops_por_segundo', True), ('sentencias_por_operacion', False))
+
+# Diferencias absolutas menores que esta (en ms) se consideran ruido de medición
+RUIDO_MS = 0.05
+
+
+def cargar(ruta):
+    """Lee un archivo de resultados."""
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+
+def comparar(base, nuevo, umbral):
+    """
+    Compara los casos presentes en ambos resultados.
+
+    Args:
+        base (dict): Resultados de referencia
+        nuevo (dict): Resultados a evaluar
+        umbral (float): Porcentaje de empeoramiento tolerado
+
+    Returns:
+        list: Filas (caso, métrica, base, nuevo, variación %, es_regresion)
+    """
+    filas = []
+    for nombre, actual in nuevo['casos'].items():
+        referencia = base['casos'].get(nombre)
+        if referencia is None:
+            continue
+        for metrica, mayor_es_mejor in METRICAS:
+            anterior, posterior = referencia.get(metrica), actual.get(metrica)
+            if not anterior or posterior is None:
+                continue
+            variacion = (posterior - anterior) / anterior * 100
+            empeoro = -variacion if mayor_es_mejor else variacion
+            es_regresion = empeoro > umbral
+            if metrica.endswith('_ms') and abs(posterior - anterior) < RUIDO_MS:
+                es_regresion = False
+            elif metrica == 'ops_por_segundo' and posterior and abs(1000 / posterior - 1000 / anterior) < RUIDO_MS:
+                es_regresion = False
+            filas.append((nombre, metrica, anterior, posterior, variacion, es_regresion))
+    return filas
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Compara resultados de rendimiento")
+    parser.add_argument('base', help="Resultados de referencia (JSON)")
+    parser.add_argument('nuevo', help="Resultados a evaluar (JSON)")
+    parser.add_argument('--umbral', type=float, default=10.0, help="Empeoramiento tolerado en %% (por defecto 10)")
+    args = parser.parse_args(argv)
+
+    base, nuevo = cargar(args.base), cargar(args.nuevo)
+    if base.get('escala') != nuevo.get('escala'):
+        print(f"Advertencia: escalas distintas ({base.get('escala')} vs {nuevo.get('escala')})")
+    print(f"Base: {base.get('commit')} ({base.get('fecha')})  Nuevo: {nuevo.get('commit')} ({nuevo.get('fecha')})")
+
+    filas = comparar(base, nuevo, args.umbral)
+    for nombre, metrica, anterior, posterior, variacion, es_regresion in filas:
+        marca = "REGRESIÓN" if es_regresion else ""
+        print(f"{nombre:<40} {metrica:<24} {anterior:>12.3f} {posterior:>12.3f} {variacion:>+8.1f}%  {marca}")
+
+    faltantes = sorted(set(base['casos']) - set(nuevo['casos']))
+    if faltantes:
+        print(f"Casos sin resultado nuevo: {', '.join(faltantes)}")
+
+    regresiones = sum(1 for fila in filas if fila[5])
+    print(f"{regresiones} regresiones (umbral {args.umbral:.0f}%)")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Ejecuta las pruebas de rendimiento y guarda los resultados en JSON.
+
+Uso (desde crud_cuentas_banco/):
+    python -m benchmarks.ejecutar --escala mediana --salida resultados/mediana.json
+    python -m benchmarks.ejecutar --casos modelo unicidad --repeticiones 500
+    python -m benchmarks.ejecutar --memoria     (SQLite en memoria, sin servidor MySQL)
+"""
+
+from datetime import datetime
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from database.connection import Database
+from database.instrumentacion import contar_sentencias
+from database.unidad_trabajo import unidad_de_trabajo
+from benchmarks.casos import CASOS, ContextoBenchmark
+from benchmarks.sembrado import ESCALAS, sembrar
+
+logger = logging.getLogger(__name__)
+
+# Versión del formato del archivo de resultados
+FORMATO = 1
+
+
+def percentil(ordenados, porcentaje):
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    indice = max(0, min(len(ordenados) - 1, round(porcentaje / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+def medir(operacion, repeticiones, calentamiento):
+    """
+    Mide la latencia de cada llamada a la operación.
+
+    Returns:
+        list: Duraciones en segundos, ordenadas
+    """
+    for i in range(calentamiento):
+        operacion(i)
+    duraciones = []
+    for i in range(calentamiento, calentamiento + repeticiones):
+        inicio = time.perf_counter()
+        operacion(i)
+        duraciones.append(time.perf_counter() - inicio)
+    return sorted(duraciones)
+
+
+def resumir(duraciones, filas_por_operacion, sentencias_por_operacion):
+    """Estadísticas de un caso (latencias en milisegundos)."""
+    total = sum(duraciones)
+    return {
+        'iteraciones': len(duraciones),
+        'sentencias_por_operacion': round(sentencias_por_operacion, 2),
+        'ops_por_segundo': round(len(duraciones) / total, 2) if total else None,
+        'filas_por_segundo': round(len(duraciones) * filas_por_operacion / total, 2) if total else None,
+        'media_ms': round(total / len(duraciones) * 1000, 4),
+        'min_ms': round(duraciones[0] * 1000, 4),
+        'p50_ms': round(percentil(duraciones, 50) * 1000, 4),
+        'p95_ms': round(percentil(duraciones, 95) * 1000, 4),
+        'p99_ms': round(percentil(duraciones, 99) * 1000, 4),
+        'max_ms': round(duraciones[-1] * 1000, 4)
+    }
+
+
+def ejecutar_caso(contexto, caso, repeticiones, calentamiento):
+    """
+    Ejecuta un caso y resume sus mediciones.
+
+    Returns:
+        dict: Estadísticas del caso
+    """
+    operacion = caso.funcion(contexto)
+    repeticiones = caso.repeticiones or repeticiones
+    calentamiento = min(calentamiento, repeticiones)
+    with contar_sentencias() as registro:
+        if not caso.transaccional:
+            duraciones = medir(operacion, repeticiones, calentamiento)
+        else:
+            # Las escrituras se deshacen al terminar para no alterar los datos sembrados
+            with unidad_de_trabajo() as bloque:
+                duraciones = medir(operacion, repeticiones, calentamiento)
+                bloque.descartar()
+    # Las sentencias se cuentan también durante el calentamiento
+    return resumir(duraciones, caso.filas_por_operacion, registro.total / (repeticiones + calentamiento))
+
+
+def metadatos(db, escala):
+    """Entorno de la ejecución para poder comparar resultados."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    version = db.fetch_all("SELECT VERSION() AS version")
+    return {
+        'formato': FORMATO,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'escala': escala,
+        'motor': 'memoria' if Database.fabrica_conexion else 'mysql',
+        'clientes': ESCALAS[escala],
+        'commit': commit,
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'servidor': version[0]['version'] if version else None
+    }
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento del sistema bancario")
+    parser.add_argument('--escala', choices=ESCALAS, default='pequena', help="Tamaño de la BD sembrada")
+    parser.add_argument('--repeticiones', type=int, default=200, help="Iteraciones medidas por caso")
+    parser.add_argument('--calentamiento', type=int, default=20, help="Iteraciones previas sin medir")
+    parser.add_argument('--casos', nargs='*', help="Ejecutar solo los casos que empiezan con estos prefijos")
+    parser.add_argument('--salida', help="Archivo JSON de resultados (por defecto resultados/<escala>_<fecha>.json)")
+    parser.add_argument('--resembrar', action='store_true', help="Volver a cargar los datos aunque ya estén")
+    parser.add_argument('--memoria', action='store_true', help="Usar la BD en memoria (database.memoria)")
+    args = parser.parse_args(argv)
+
+    # Los modelos registran cada operación en INFO; durante la medición solo se muestran advertencias
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.memoria:
+        from database import memoria
+        memoria.activar()
+
+    db = Database()
+    db.connect()
+    if not db.connection or not db.connection.open:
+        print("No se pudo conectar a la base de datos", file=sys.stderr)
+        return 1
+
+    try:
+        exito, mensaje = sembrar(db, args.escala, args.resembrar)
+        print(mensaje)
+        if not exito:
+            return 1
+
+        contexto = ContextoBenchmark(db)
+        resultados = metadatos(db, args.escala)
+        resultados['casos'] = {}
+        for nombre, caso in CASOS.items():
+            if args.casos and not any(nombre.startswith(prefijo) for prefijo in args.casos):
+                continue
+            estadisticas = ejecutar_caso(contexto, caso, args.repeticiones, args.calentamiento)
+            resultados['casos'][nombre] = estadisticas
+            print(f"{nombre:<40} p50 {estadisticas['p50_ms']:>10.3f} ms  "
+                  f"p95 {estadisticas['p95_ms']:>10.3f} ms  {estadisticas['ops_por_segundo']:>10.1f} ops/s")
+    finally:
+        db.disconnect()
+
+    salida = args.salida or os.path.join(
+        'resultados', f"{args.escala}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(salida) or '.', exist_ok=True)
+    with open(salida, 'w', encoding='utf-8') as archivo:
+        json.dump(resultados, archivo, ensure_ascii=False, indent=2)
+    print(f"Resultados guardados en {salida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
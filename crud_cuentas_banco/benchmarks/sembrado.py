@@ -0,0 +1,97 @@
+"""
+Carga de la BD de pruebas de rendimiento con datos sintéticos a escala fija.
+Los datos se generan con utils/generador_datos.py a partir de ID_INICIAL,
+de modo que no se mezclan con los datos de script.sql y se pueden borrar
+y volver a sembrar sin tocar el resto de la BD.
+"""
+
+from utils.generador_datos import generar, MAXIMO_CUENTAS
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Clientes por escala
+ESCALAS = {
+    'pequena': 1_000,
+    'mediana': 10_000,
+    'grande': 100_000
+}
+
+# Primer id_cliente de los datos de prueba y semilla fija (resultados reproducibles)
+ID_INICIAL = 100_000
+SEMILLA = 2024
+
+# Tablas sembradas (en orden de borrado) con la columna y el primer ID de los datos de prueba
+RANGOS_BORRADO = (
+    ('historial_saldos', 'id_cuenta', ID_INICIAL * MAXIMO_CUENTAS),
+    ('historial_cuentas', 'id_cuenta', ID_INICIAL * MAXIMO_CUENTAS),
+    ('actividad_cuentas', 'id_cuenta', ID_INICIAL * MAXIMO_CUENTAS),
+    ('saldos_cierre', 'id_cuenta', ID_INICIAL * MAXIMO_CUENTAS),
+    ('transacciones_cuenta', 'id_cuenta_origen', ID_INICIAL * MAXIMO_CUENTAS),
+    ('transacciones_tarjeta', 'id_tarjeta', ID_INICIAL * MAXIMO_CUENTAS * 2),
+    ('tarjetas', 'id_tarjeta', ID_INICIAL * MAXIMO_CUENTAS * 2),
+    ('cuentas', 'id_cuenta', ID_INICIAL * MAXIMO_CUENTAS),
+    ('lineas_credito', 'id_linea', ID_INICIAL),
+    ('usuario_rol', 'id_usuario', ID_INICIAL),
+    ('usuarios', 'id_usuario', ID_INICIAL),
+    ('direcciones', 'id_cliente', ID_INICIAL),
+    ('clientes', 'id_cliente', ID_INICIAL)
+)
+
+
+def clientes_sembrados(db):
+    """
+    Cuenta los clientes de prueba presentes en la BD.
+
+    Returns:
+        int: Cantidad de clientes con ID desde ID_INICIAL
+    """
+    resultado = db.fetch_all("SELECT COUNT(*) AS total FROM clientes WHERE id_cliente >= %s", (ID_INICIAL,))
+    return resultado[0]['total'] if resultado else 0
+
+
+def sembrar(db, escala, forzar=False):
+    """
+    Deja la BD con exactamente los datos de prueba de la escala indicada.
+    Si ya están cargados (misma cantidad de clientes) no hace nada.
+
+    Args:
+        db: Database conectada
+        escala (str): Clave de ESCALAS
+        forzar (bool): Borrar y volver a cargar aunque la escala coincida
+
+    Returns:
+        tuple: (exito, mensaje)
+    """
+    clientes = ESCALAS[escala]
+    if not forzar and clientes_sembrados(db) == clientes:
+        return True, f"Datos de la escala '{escala}' ya cargados"
+
+    try:
+        cursor = db.connection.cursor()
+        for tabla, columna, desde in RANGOS_BORRADO:
+            cursor.execute(f"DELETE FROM {tabla} WHERE {columna} >= %s", (desde,))
+        db.connection.commit()
+
+        with tempfile.TemporaryDirectory(prefix='benchmark_') as directorio:
+            totales = generar(clientes, directorio, 'sql', id_inicial=ID_INICIAL, semilla=SEMILLA)
+            # Los archivos se ejecutan en el orden de dependencias de cargar.sql
+            with open(os.path.join(directorio, 'cargar.sql'), encoding='utf-8') as script:
+                archivos = [linea[len('SOURCE '):].rstrip(';\n') for linea in script
+                            if linea.startswith('SOURCE ')]
+            for ruta in archivos:
+                with open(ruta, encoding='utf-8') as archivo:
+                    for sentencia in archivo.read().split(";\n"):
+                        if sentencia.strip():
+                            cursor.execute(sentencia)
+        cursor.close()
+
+        logger.info(f"Escala '{escala}' sembrada: {totales}")
+        return True, f"Escala '{escala}' sembrada ({clientes} clientes, {totales['cuentas']} cuentas)"
+
+    except Exception as e:
+        db.connection.rollback()
+        logger.error(f"Error al sembrar la BD de pruebas: {str(e)}")
+        return False, f"Error al sembrar la BD de pruebas: {str(e)}"
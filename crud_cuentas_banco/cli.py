@@ -0,0 +1,492 @@
+"""
+Línea de comandos del sistema bancario para trabajos por lotes sin interfaz.
+Reutiliza los controladores y ejecuta los comandos sobre una sola conexión,
+dentro de una unidad de trabajo (cada comando en su propio SAVEPOINT), y
+termina con un único informe de resultados.
+
+Uso (desde crud_cuentas_banco/):
+    python cli.py exportar cuentas cuentas.csv --filtro estado=Activa
+    python cli.py importar clientes clientes.csv
+    python cli.py estado Inactiva 10 11 12
+    python cli.py masivo --filtro id_cliente=3 --estado Suspendida [--simular]
+    python cli.py inactivas --dias 365 [--simular]
+    python cli.py saldos-diarios [--fecha 2024-06-30 | --desde 2024-06-01 --hasta 2024-06-30]
+    python cli.py saldo-al 10 2024-06-30
+    python cli.py cierre-mes 2024-06 [--archivo saldos.csv]
+    python cli.py ajustar-saldo 10 -25.50
+    python cli.py estadisticas
+    python cli.py reindexar cuentas clientes
+    python cli.py lote comandos.txt [--atomico]    (un comando por línea; '-' lee stdin)
+"""
+
+from contextlib import nullcontext
+import argparse
+import csv
+import json
+import logging
+import os
+import shlex
+import sys
+import time
+
+# Agregar el directorio raíz al path para importaciones
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from controllers.cliente_controller import ClienteController
+from controllers.cuenta_controller import CuentaController
+from controllers.usuario_controller import UsuarioController
+from database.connection import Database
+from database.unidad_trabajo import unidad_de_trabajo
+from trabajos import cuentas_inactivas, saldos_diarios
+from utils.helpers import Constantes
+
+logger = logging.getLogger(__name__)
+
+# Recursos exportables/importables: controlador, método de creación y columnas ocultas
+RECURSOS = {
+    'clientes': (ClienteController, 'crear_cliente', ()),
+    'cuentas': (CuentaController, 'crear_cuenta', ()),
+    'usuarios': (UsuarioController, 'crear_usuario', ('password_hash',))
+}
+
+# Tablas sobre las que se permite el mantenimiento de índices
+TABLAS_MANTENIMIENTO = ('clientes', 'cuentas', 'usuarios', 'historial_saldos', 'historial_cuentas',
+                        'actividad_cuentas', 'saldos_cierre', 'resumen_saldos_diarios', 'transacciones_cuenta',
+                        'tarjetas', 'transacciones_tarjeta', 'direcciones', 'lineas_credito')
+
+TAMANO_LOTE_EXPORTACION = 1000
+
+
+class ContextoCLI:
+    """Controladores compartidos por los comandos de una ejecución (creados a demanda)."""
+
+    def __init__(self):
+        self._controladores = {}
+
+    def controlador(self, recurso):
+        """Obtiene (o crea) el controlador de un recurso."""
+        if recurso not in self._controladores:
+            self._controladores[recurso] = RECURSOS[recurso][0]()
+        return self._controladores[recurso]
+
+
+# Comandos: reciben el contexto y los argumentos, retornan (exito, mensaje)
+
+def comando_exportar(contexto, args):
+    """Exporta un recurso a CSV recorriendo la tabla por lotes."""
+    controlador = contexto.controlador(args.recurso)
+    ocultas = RECURSOS[args.recurso][2]
+    filtros = _parsear_filtros(args.filtro)
+    columnas = args.columnas.split(',') if args.columnas else None
+
+    total = 0
+    with open(args.archivo, 'w', newline='', encoding='utf-8') as archivo:
+        escritor = None
+        for lote in controlador.modelo.iterar_lotes(filtros, TAMANO_LOTE_EXPORTACION, columnas):
+            if escritor is None:
+                campos = [campo for campo in lote[0].keys() if campo not in ocultas]
+                escritor = csv.writer(archivo)
+                escritor.writerow(campos)
+            escritor.writerows([fila[campo] for campo in campos] for fila in lote)
+            total += len(lote)
+        if escritor is None:
+            campos = columnas or list(controlador.modelo.tabla.proyeccion)
+            csv.writer(archivo).writerow([campo for campo in campos if campo not in ocultas])
+    return True, f"{total} filas exportadas a {args.archivo}"
+
+
+def comando_importar(contexto, args):
+    """Importa un CSV creando cada fila con las validaciones del controlador."""
+    controlador = contexto.controlador(args.recurso)
+    crear = getattr(controlador, RECURSOS[args.recurso][1])
+
+    creadas = 0
+    errores = []
+    with open(args.archivo, newline='', encoding='utf-8-sig') as archivo:
+        for numero, fila in enumerate(csv.DictReader(archivo), start=2):
+            exito, mensaje, _ = crear(fila)
+            if exito:
+                creadas += 1
+            else:
+                errores.append(f"línea {numero}: {mensaje}")
+
+    if errores:
+        return False, f"{len(errores)} filas con error, importación deshecha ({errores[0]})"
+    return True, f"{creadas} filas importadas desde {args.archivo}"
+
+
+def comando_estado(contexto, args):
+    """Cambia el estado de varias cuentas."""
+    exito, mensaje, _ = contexto.controlador('cuentas').cambiar_estado(args.ids, args.estado)
+    return exito, mensaje
+
+
+def comando_masivo(contexto, args):
+    """Cambia estado, producto o cliente de las cuentas filtradas (o solo las cuenta)."""
+    cambios = {columna: valor for columna, valor in (('estado', args.estado),
+                                                     ('id_producto', args.producto),
+                                                     ('id_cliente', args.cliente))
+               if valor is not None}
+    exito, mensaje, _ = contexto.controlador('cuentas').actualizar_masivo(
+        _parsear_filtros(args.filtro), cambios, args.simular)
+    return exito, mensaje
+
+
+def comando_inactivas(contexto, args):
+    """Actualiza la actividad de las cuentas y marca como inactivas las que no tienen movimientos."""
+    return cuentas_inactivas.ejecutar(args.dias, args.simular)
+
+
+def comando_saldos_diarios(contexto, args):
+    """Materializa los saldos diarios por cuenta y el resumen por agencia, producto y estado."""
+    return saldos_diarios.ejecutar(args.fecha or args.desde, args.fecha or args.hasta)
+
+
+def comando_ajustar_saldo(contexto, args):
+    """Suma (o resta) un monto al saldo de una cuenta y lo registra en el historial."""
+    controlador = contexto.controlador('cuentas')
+    exito, mensaje, cuenta = controlador.leer(args.id_cuenta)
+    if not exito:
+        return False, mensaje
+    nuevo_saldo = round(cuenta['saldo'] + args.monto, 2)
+    if nuevo_saldo < Constantes.SALDO_MINIMO:
+        return False, f"El ajuste dejaría la cuenta {args.id_cuenta} con saldo negativo"
+    exito, mensaje = controlador.actualizar_saldo(args.id_cuenta, nuevo_saldo)
+    if exito:
+        mensaje = f"Saldo de la cuenta {args.id_cuenta}: {cuenta['saldo']:.2f} -> {nuevo_saldo:.2f}"
+    return exito, mensaje
+
+
+def comando_saldo_al(contexto, args):
+    """Muestra el saldo de una cuenta al final de una fecha."""
+    exito, mensaje, saldo = contexto.controlador('cuentas').obtener_saldo_al(args.id_cuenta, args.fecha)
+    if exito:
+        mensaje = f"Saldo de la cuenta {args.id_cuenta} al {args.fecha}: {saldo:.2f}"
+    return exito, mensaje
+
+
+def comando_cierre_mes(contexto, args):
+    """Calcula (y guarda como cierre) el saldo de todas las cuentas al fin de un mes."""
+    anio, separador, mes = args.mes.partition('-')
+    if not separador or not anio.isdigit() or not mes.isdigit():
+        return False, "El mes debe tener el formato AAAA-MM"
+    exito, mensaje, saldos = contexto.controlador('cuentas').obtener_saldos_fin_de_mes(int(anio), int(mes))
+    if not exito:
+        return False, mensaje
+    if args.archivo:
+        with open(args.archivo, 'w', newline='', encoding='utf-8') as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(['id_cuenta', 'saldo'])
+            escritor.writerows((id_cuenta, f"{saldo:.2f}") for id_cuenta, saldo in sorted(saldos.items()))
+    return True, f"{mensaje} (total {sum(saldos.values()):.2f})"
+
+
+def comando_estadisticas(contexto, args):
+    """Muestra las estadísticas de clientes, cuentas y usuarios."""
+    estadisticas = {}
+    for recurso, metodo in (('clientes', 'obtener_estadisticas_clientes'),
+                            ('cuentas', 'obtener_estadisticas_cuentas'),
+                            ('usuarios', 'obtener_estadisticas_usuarios')):
+        exito, mensaje, datos = getattr(contexto.controlador(recurso), metodo)()
+        if not exito:
+            return False, mensaje
+        estadisticas[recurso] = datos
+    print(json.dumps(estadisticas, indent=2, ensure_ascii=False, default=str))
+    return True, "Estadísticas obtenidas"
+
+
+def comando_reindexar(contexto, args):
+    """
+    Actualiza las estadísticas de índices (ANALYZE TABLE) o reconstruye las
+    tablas (OPTIMIZE TABLE). Estas sentencias hacen commit implícito, por eso
+    usan una conexión propia y se ejecutan fuera de la unidad de trabajo.
+    """
+    tablas = args.tablas or list(TABLAS_MANTENIMIENTO)
+    desconocidas = [tabla for tabla in tablas if tabla not in TABLAS_MANTENIMIENTO]
+    if desconocidas:
+        return False, f"Tablas no permitidas: {', '.join(desconocidas)}"
+
+    db = Database()
+    db.connect()
+    if not db.connection or not db.connection.open:
+        return False, "No hay conexión a la base de datos"
+    try:
+        operacion = "OPTIMIZE" if args.reconstruir else "ANALYZE"
+        cursor = db.connection.cursor()
+        try:
+            cursor.execute(f"{operacion} TABLE {', '.join(tablas)}")
+            errores = [fila for fila in cursor.fetchall() if fila['Msg_type'] == 'error']
+        finally:
+            cursor.close()
+    finally:
+        db.disconnect()
+
+    if errores:
+        return False, "; ".join(f"{fila['Table']}: {fila['Msg_text']}" for fila in errores)
+    return True, f"{operacion} TABLE en {len(tablas)} tablas"
+
+
+def _parsear_filtros(filtros):
+    """Convierte una lista 'clave=valor' en diccionario."""
+    resultado = {}
+    for filtro in filtros or []:
+        clave, separador, valor = filtro.partition('=')
+        if not separador:
+            raise ValueError(f"Filtro inválido (se espera clave=valor): {filtro}")
+        resultado[clave] = valor
+    return resultado
+
+
+class ErrorArgumentos(Exception):
+    """Error de sintaxis en un comando (en lugar de terminar el proceso)."""
+
+
+class ParserComandos(argparse.ArgumentParser):
+    """ArgumentParser que lanza una excepción en vez de salir del programa."""
+
+    def error(self, message):
+        raise ErrorArgumentos(message)
+
+
+def crear_parser():
+    """Construye el parser de comandos (compartido por la línea de comandos y los lotes)."""
+    parser = ParserComandos(prog='cli.py', description="Operaciones por lotes del sistema bancario")
+    parser.add_argument('--json', action='store_true', help="Imprimir el informe final en JSON")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    exportar = comandos.add_parser('exportar', help="Exportar un recurso a CSV")
+    exportar.add_argument('recurso', choices=RECURSOS)
+    exportar.add_argument('archivo')
+    exportar.add_argument('--filtro', action='append', help="Filtro clave=valor (repetible)")
+    exportar.add_argument('--columnas', help="Columnas separadas por coma")
+    exportar.set_defaults(funcion=comando_exportar, transaccional=True)
+
+    importar = comandos.add_parser('importar', help="Importar un recurso desde CSV")
+    importar.add_argument('recurso', choices=RECURSOS)
+    importar.add_argument('archivo')
+    importar.set_defaults(funcion=comando_importar, transaccional=True)
+
+    estado = comandos.add_parser('estado', help="Cambiar el estado de varias cuentas")
+    estado.add_argument('estado', choices=Constantes.ESTADOS_CUENTA)
+    estado.add_argument('ids', type=int, nargs='+')
+    estado.set_defaults(funcion=comando_estado, transaccional=True)
+
+    # Fuera de la transacción del lote: cada grupo de cuentas se confirma por separado
+    masivo = comandos.add_parser('masivo', help="Cambiar estado, producto o cliente de las cuentas filtradas")
+    masivo.add_argument('--filtro', action='append', required=True, help="Filtro clave=valor (repetible)")
+    masivo.add_argument('--estado', choices=Constantes.ESTADOS_CUENTA)
+    masivo.add_argument('--producto', type=int, help="Nuevo id_producto")
+    masivo.add_argument('--cliente', type=int, help="Nuevo id_cliente")
+    masivo.add_argument('--simular', action='store_true', help="Solo contar las cuentas que cambiarían")
+    masivo.set_defaults(funcion=comando_masivo, transaccional=False)
+
+    inactivas = comandos.add_parser('inactivas', help="Marcar como inactivas las cuentas sin movimientos")
+    inactivas.add_argument('--dias', type=int, default=Constantes.DIAS_INACTIVIDAD_CUENTA)
+    inactivas.add_argument('--simular', action='store_true', help="Solo contar las cuentas que se marcarían")
+    inactivas.set_defaults(funcion=comando_inactivas, transaccional=False)
+
+    diarios = comandos.add_parser('saldos-diarios', help="Resumir los saldos de los días terminados")
+    diarios.add_argument('--fecha', help="Resumir solo esta fecha (AAAA-MM-DD)")
+    diarios.add_argument('--desde', help="Primera fecha (por defecto, la siguiente al último resumen)")
+    diarios.add_argument('--hasta', help="Última fecha (por defecto, ayer)")
+    diarios.set_defaults(funcion=comando_saldos_diarios, transaccional=False)
+
+    ajuste = comandos.add_parser('ajustar-saldo', help="Sumar o restar un monto al saldo de una cuenta")
+    ajuste.add_argument('id_cuenta', type=int)
+    ajuste.add_argument('monto', type=float)
+    ajuste.set_defaults(funcion=comando_ajustar_saldo, transaccional=True)
+
+    saldo_al = comandos.add_parser('saldo-al', help="Saldo de una cuenta al final de una fecha")
+    saldo_al.add_argument('id_cuenta', type=int)
+    saldo_al.add_argument('fecha', help="AAAA-MM-DD")
+    saldo_al.set_defaults(funcion=comando_saldo_al, transaccional=True)
+
+    cierre = comandos.add_parser('cierre-mes', help="Saldos de todas las cuentas al fin de un mes")
+    cierre.add_argument('mes', help="AAAA-MM")
+    cierre.add_argument('--archivo', help="Exportar los saldos a CSV")
+    cierre.set_defaults(funcion=comando_cierre_mes, transaccional=True)
+
+    estadisticas = comandos.add_parser('estadisticas', help="Mostrar estadísticas")
+    estadisticas.set_defaults(funcion=comando_estadisticas, transaccional=True)
+
+    reindexar = comandos.add_parser('reindexar', help="ANALYZE (u OPTIMIZE) de tablas")
+    reindexar.add_argument('tablas', nargs='*')
+    reindexar.add_argument('--reconstruir', action='store_true', help="Usar OPTIMIZE TABLE")
+    reindexar.set_defaults(funcion=comando_reindexar, transaccional=False)
+
+    lote = comandos.add_parser('lote', help="Ejecutar comandos desde un archivo ('-' para stdin)")
+    lote.add_argument('archivo')
+    lote.add_argument('--atomico', action='store_true',
+                      help="Deshacer todo el lote si algún comando falla (solo comandos transaccionales)")
+    lote.set_defaults(funcion=None, transaccional=False)
+
+    return parser
+
+
+def leer_comandos(parser, lineas):
+    """
+    Convierte líneas de texto en comandos; las líneas vacías y los
+    comentarios (#) se ignoran.
+
+    Returns:
+        list: Pares (texto, argumentos o mensaje de error)
+    """
+    comandos = []
+    for linea in lineas:
+        texto = linea.strip()
+        if not texto or texto.startswith('#'):
+            continue
+        try:
+            args = parser.parse_args(shlex.split(texto))
+            if args.comando == 'lote':
+                raise ErrorArgumentos("no se permiten lotes anidados")
+            comandos.append((texto, args))
+        except (ErrorArgumentos, ValueError) as e:
+            comandos.append((texto, str(e)))
+        except SystemExit:
+            # --help dentro de un lote: argparse ya imprimió la ayuda
+            comandos.append((texto, "la ayuda no es un comando ejecutable"))
+    return comandos
+
+
+def ejecutar_comandos(comandos, atomico=False):
+    """
+    Ejecuta los comandos en el orden recibido y arma el informe.
+
+    Los comandos transaccionales consecutivos comparten una unidad de trabajo
+    (una sola conexión y un único commit); cada uno corre en su SAVEPOINT y,
+    si falla, se deshace solo su parte. Antes de un comando no transaccional
+    (mantenimiento, trabajos por lotes) se confirma la unidad en curso; el
+    comando corre fuera de ella y los siguientes abren una nueva, así cada
+    comando ve los cambios de los anteriores.
+
+    Con atomico todo el lote corre en una sola unidad y cualquier fallo lo
+    deshace completo; por eso no admite comandos no transaccionales.
+
+    Returns:
+        list: Resultados por comando (comando, exito, mensaje, segundos)
+    """
+    contexto = ContextoCLI()
+    if atomico:
+        no_transaccionales = [texto for texto, args in comandos
+                              if not isinstance(args, str) and not args.transaccional]
+        if no_transaccionales:
+            mensaje = (f"No ejecutado: un lote atómico no admite comandos no transaccionales "
+                       f"({', '.join(no_transaccionales)})")
+            return [_resultado(texto, False, mensaje, 0.0) for texto, _ in comandos]
+        return _ejecutar_tramo(contexto, comandos, atomico=True)
+
+    informe = []
+    tramo = []
+    for texto, args in comandos:
+        if isinstance(args, str) or args.transaccional:
+            tramo.append((texto, args))
+            continue
+        informe.extend(_ejecutar_tramo(contexto, tramo))
+        tramo = []
+        informe.append(_ejecutar(contexto, texto, args))
+    informe.extend(_ejecutar_tramo(contexto, tramo))
+    return informe
+
+
+def _ejecutar_tramo(contexto, comandos, atomico=False):
+    """
+    Ejecuta comandos transaccionales consecutivos en una unidad de trabajo
+    (cada uno en su SAVEPOINT) y la confirma al terminar.
+
+    Returns:
+        list: Resultados por comando
+    """
+    informe = []
+    unidad = unidad_de_trabajo() if any(not isinstance(args, str) for _, args in comandos) else nullcontext()
+    with unidad as bloque:
+        for posicion, (texto, args) in enumerate(comandos):
+            if isinstance(args, str):
+                informe.append(_resultado(texto, False, f"Comando inválido: {args}", 0.0))
+            else:
+                with unidad_de_trabajo() as subbloque:
+                    informe.append(_ejecutar(contexto, texto, args, subbloque))
+            if atomico and not informe[-1]['exito']:
+                if bloque is not None:
+                    bloque.cancelar()
+                informe.extend(_resultado(texto_pendiente, False, "No ejecutado: el lote atómico se interrumpió", 0.0)
+                               for texto_pendiente, _ in comandos[posicion + 1:])
+                break
+
+    if atomico and any(not resultado['exito'] for resultado in informe):
+        for resultado in informe:
+            if resultado['exito']:
+                resultado['exito'] = False
+                resultado['mensaje'] += " (deshecho: el lote es atómico)"
+    return informe
+
+
+def _ejecutar(contexto, texto, args, subbloque=None):
+    """Ejecuta un comando midiendo su duración; si falla, deshace su SAVEPOINT."""
+    inicio = time.perf_counter()
+    try:
+        exito, mensaje = args.funcion(contexto, args)
+    except Exception as e:
+        logger.error(f"Error en el comando '{texto}': {str(e)}")
+        exito, mensaje = False, f"Error: {str(e)}"
+    if subbloque is not None:
+        if not exito:
+            subbloque.cancelar()
+        elif subbloque.fallida:
+            exito, mensaje = False, f"{mensaje} (deshecho: una sentencia falló)"
+    return _resultado(texto, exito, mensaje, time.perf_counter() - inicio)
+
+
+def _resultado(texto, exito, mensaje, segundos):
+    return {'comando': texto, 'exito': exito, 'mensaje': mensaje, 'segundos': round(segundos, 3)}
+
+
+def imprimir_informe(informe, segundos, como_json=False):
+    """Imprime el informe final de la ejecución."""
+    exitosos = sum(1 for resultado in informe if resultado['exito'])
+    if como_json:
+        print(json.dumps({'comandos': informe, 'exitosos': exitosos,
+                          'fallidos': len(informe) - exitosos, 'segundos': round(segundos, 3)},
+                         indent=2, ensure_ascii=False))
+        return
+    print(f"Resumen: {len(informe)} comandos, {exitosos} exitosos, "
+          f"{len(informe) - exitosos} fallidos, {segundos:.2f} s")
+    for resultado in informe:
+        marca = "OK" if resultado['exito'] else "ERROR"
+        print(f"  [{marca:5}] {resultado['comando']} - {resultado['mensaje']} ({resultado['segundos']:.2f} s)")
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    logging.basicConfig(level=logging.WARNING,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = crear_parser()
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        args = parser.parse_args(argv)
+    except ErrorArgumentos as e:
+        parser.print_usage(sys.stderr)
+        print(f"cli.py: error: {e}", file=sys.stderr)
+        return 2
+
+    inicio = time.perf_counter()
+    try:
+        if args.comando == 'lote':
+            if args.archivo == '-':
+                comandos = leer_comandos(parser, sys.stdin)
+            else:
+                with open(args.archivo, encoding='utf-8') as archivo:
+                    comandos = leer_comandos(parser, archivo)
+            informe = ejecutar_comandos(comandos, args.atomico)
+        else:
+            informe = ejecutar_comandos([(shlex.join(argv), args)])
+    except (ConnectionError, OSError) as e:
+        print(f"cli.py: error: {e}", file=sys.stderr)
+        return 1
+
+    imprimir_informe(informe, time.perf_counter() - inicio, args.json)
+    return 0 if all(resultado['exito'] for resultado in informe) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,8 @@ Proporciona funcionalidad común y manejo de errores.
 
 import logging
 from typing import Dict, List, Tuple, Any, Optional
+from models.base_model import MENSAJE_CONFLICTO, MENSAJE_TIEMPO_AGOTADO
+from utils.trazas import trazar_clase
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -14,6 +16,11 @@ logger = logging.getLogger(__name__)
 class BaseController:
     """Clase base abstracta para todos los controladores del sistema."""
     
+    def __init_subclass__(cls, **kwargs):
+        """Instrumenta con trazas los métodos de cada controlador."""
+        super().__init_subclass__(**kwargs)
+        trazar_clase(cls)
+    
     def __init__(self, modelo):
         """
         Inicializa el controlador con un modelo específico.
@@ -94,7 +101,9 @@ class BaseController:
             return False, f"Error interno: {str(e)}"
     
     def listar(self, filtros: Optional[Dict] = None, limite: Optional[int] = None, 
-               offset: Optional[int] = None) -> Tuple[bool, str, List[Dict]]:
+               offset: Optional[int] = None, columnas: Optional[List[str]] = None,
+               despues_de: Optional[int] = None,
+               timeout: Optional[float] = None) -> Tuple[bool, str, List[Dict]]:
         """
         Lista registros con filtros opcionales.
         
@@ -102,17 +111,47 @@ class BaseController:
             filtros: Diccionario con filtros a aplicar
             limite: Número máximo de registros a retornar
             offset: Número de registros a omitir
+            columnas: Columnas a retornar (por defecto todas)
+            despues_de: Paginación por clave: solo registros con ID mayor
+            timeout: Segundos máximos de ejecución de la consulta
             
         Returns:
             tuple: (exito, mensaje, lista_datos)
         """
         try:
             self.logger.info(f"Intentando listar registros con filtros: {filtros}")
-            return self.modelo.listar(filtros, limite, offset)
+            return self.modelo.listar(filtros, limite, offset, columnas, despues_de, timeout)
         except Exception as e:
             self.logger.error(f"Error en controlador al listar: {str(e)}")
             return False, f"Error interno: {str(e)}", []
     
+    @staticmethod
+    def es_conflicto(mensaje: str) -> bool:
+        """
+        Indica si una actualización falló porque otro usuario modificó el
+        registro después de leerlo (hay que recargarlo antes de reintentar).
+        
+        Args:
+            mensaje: Mensaje retornado por actualizar
+            
+        Returns:
+            bool: True si fue un conflicto de versión
+        """
+        return mensaje == MENSAJE_CONFLICTO
+    
+    @staticmethod
+    def es_tiempo_agotado(mensaje: str) -> bool:
+        """
+        Indica si una lectura falló porque superó su tiempo máximo de ejecución.
+        
+        Args:
+            mensaje: Mensaje retornado por listar u obtener_conteo
+            
+        Returns:
+            bool: True si la consulta se interrumpió por tiempo
+        """
+        return mensaje.startswith(MENSAJE_TIEMPO_AGOTADO.split('{}')[0])
+    
     def validar_datos_entrada(self, datos: Dict[str, Any]) -> Tuple[bool, str]:
         """
         Valida los datos de entrada antes de procesarlos.
@@ -199,23 +238,24 @@ class BaseController:
         except:
             return False
     
-    def obtener_conteo(self, filtros: Optional[Dict] = None) -> Tuple[bool, str, int]:
+    def obtener_conteo(self, filtros: Optional[Dict] = None,
+                       timeout: Optional[float] = None) -> Tuple[bool, str, int]:
         """
         Obtiene el número total de registros que coinciden con los filtros.
         
         Args:
             filtros: Filtros a aplicar
+            timeout: Segundos máximos de ejecución de la consulta
             
         Returns:
             tuple: (exito, mensaje, conteo)
         """
         try:
-            # Obtener todos los registros con los filtros
-            exito, mensaje, datos = self.listar(filtros)
-            if exito:
-                return True, "Conteo obtenido exitosamente", len(datos)
-            else:
-                return False, mensaje, 0
+            # El conteo se resuelve en la BD con COUNT(*)
+            return self.modelo.contar(filtros, timeout)
         except Exception as e:
             self.logger.error(f"Error al obtener conteo: {str(e)}")
             return False, f"Error al obtener conteo: {str(e)}", 0
+
+
+trazar_clase(BaseController)
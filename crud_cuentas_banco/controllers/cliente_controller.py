@@ -6,6 +6,8 @@ Maneja la lógica de negocio relacionada con clientes.
 from controllers.base_controller import BaseController
 from models.cliente import Cliente
 from models.catalogo import TipoDocumento, CategoriaCliente
+from models.instantanea_catalogos import obtener_instantanea
+from database.unidad_trabajo import unidad_de_trabajo
 from typing import Dict, List, Tuple, Optional
 import logging
 
@@ -63,71 +65,82 @@ class ClienteController(BaseController):
             tuple: (exito, mensaje)
         """
         try:
-            # Verificar que el cliente existe
-            if not self.verificar_existencia(id_cliente):
-                return False, "El cliente no existe"
-            
-            # Validaciones específicas del controlador
-            exito, mensaje = self._validar_cliente_especifico(datos)
-            if not exito:
-                return False, mensaje
-            
-            # Verificar que el documento no exista en otro cliente
-            if self._documento_existe_en_otro_cliente(datos['numero_documento'], id_cliente):
-                return False, "Ya existe otro cliente con ese número de documento"
-            
-            # Verificar que el email no exista en otro cliente
-            if self._email_existe_en_otro_cliente(datos['email'], id_cliente):
-                return False, "Ya existe otro cliente con ese email"
-            
-            # Actualizar el cliente
-            return self.actualizar(id_cliente, datos)
+            # Una sola unidad de trabajo: las lecturas repetidas del mismo registro
+            # (verificación, validaciones y actualización) salen del mapa de identidad
+            with unidad_de_trabajo(self.modelo.db):
+                # Verificar que el cliente existe
+                if not self.verificar_existencia(id_cliente):
+                    return False, "El cliente no existe"
+                
+                # Validaciones específicas del controlador
+                exito, mensaje = self._validar_cliente_especifico(datos)
+                if not exito:
+                    return False, mensaje
+                
+                # Verificar que el documento no exista en otro cliente
+                if self._documento_existe_en_otro_cliente(datos['numero_documento'], id_cliente):
+                    return False, "Ya existe otro cliente con ese número de documento"
+                
+                # Verificar que el email no exista en otro cliente
+                if self._email_existe_en_otro_cliente(datos['email'], id_cliente):
+                    return False, "Ya existe otro cliente con ese email"
+                
+                # Actualizar el cliente
+                return self.actualizar(id_cliente, datos)
             
         except Exception as e:
             logger.error(f"Error al actualizar cliente: {str(e)}")
             return False, f"Error al actualizar cliente: {str(e)}"
     
-    def buscar_cliente_por_documento(self, numero_documento: str) -> Tuple[bool, str, Optional[Dict]]:
+    def buscar_cliente_por_documento(self, numero_documento: str,
+                                     columnas: Optional[List[str]] = None) -> Tuple[bool, str, Optional[Dict]]:
         """
         Busca un cliente por número de documento.
         
         Args:
             numero_documento: Número de documento a buscar
+            columnas: Columnas a retornar (por defecto todas)
             
         Returns:
             tuple: (exito, mensaje, datos_cliente)
         """
         try:
-            return self.modelo.buscar_por_documento(numero_documento)
+            return self.modelo.buscar_por_documento(numero_documento, columnas)
         except Exception as e:
             logger.error(f"Error al buscar cliente por documento: {str(e)}")
             return False, f"Error al buscar cliente: {str(e)}", None
     
-    def buscar_clientes_por_nombre(self, nombre: str) -> Tuple[bool, str, List[Dict]]:
+    def buscar_clientes_por_nombre(self, nombre: str,
+                                   timeout: Optional[float] = None) -> Tuple[bool, str, List[Dict]]:
         """
         Busca clientes por nombre (nombre, apellido paterno o materno).
         
         Args:
             nombre: Nombre a buscar
+            timeout: Segundos máximos de ejecución de la búsqueda
             
         Returns:
             tuple: (exito, mensaje, lista_clientes)
         """
         try:
             filtros = {'nombre': nombre}
-            return self.listar(filtros)
+            return self.listar(filtros, timeout=timeout)
         except Exception as e:
             logger.error(f"Error al buscar clientes por nombre: {str(e)}")
             return False, f"Error al buscar clientes: {str(e)}", []
     
     def obtener_tipos_documento(self) -> Tuple[bool, str, List[Dict]]:
         """
-        Obtiene la lista de tipos de documento disponibles.
+        Obtiene la lista de tipos de documento disponibles
+        (de la copia local de catálogos si está cargada).
         
         Returns:
             tuple: (exito, mensaje, lista_tipos)
         """
         try:
+            tipos = obtener_instantanea().obtener('tipos_documento')
+            if tipos is not None:
+                return True, "Lista obtenida de la copia local", tipos
             return self.tipo_documento_model.listar()
         except Exception as e:
             logger.error(f"Error al obtener tipos de documento: {str(e)}")
@@ -135,12 +148,16 @@ class ClienteController(BaseController):
     
     def obtener_categorias_cliente(self) -> Tuple[bool, str, List[Dict]]:
         """
-        Obtiene la lista de categorías de cliente disponibles.
+        Obtiene la lista de categorías de cliente disponibles
+        (de la copia local de catálogos si está cargada).
         
         Returns:
             tuple: (exito, mensaje, lista_categorias)
         """
         try:
+            categorias = obtener_instantanea().obtener('categorias')
+            if categorias is not None:
+                return True, "Lista obtenida de la copia local", categorias
             return self.categoria_model.listar()
         except Exception as e:
             logger.error(f"Error al obtener categorías de cliente: {str(e)}")
@@ -215,7 +232,7 @@ class ClienteController(BaseController):
             bool: True si existe, False en caso contrario
         """
         try:
-            exito, _, _ = self.buscar_cliente_por_documento(numero_documento)
+            exito, _, _ = self.buscar_cliente_por_documento(numero_documento, ['id_cliente'])
             return exito
         except:
             return False
@@ -232,8 +249,8 @@ class ClienteController(BaseController):
         """
         try:
             filtros = {'email': email}
-            exito, _, clientes = self.listar(filtros)
-            return exito and len(clientes) > 0
+            exito, _, existe = self.modelo.existe(filtros)
+            return exito and existe
         except:
             return False
     
@@ -249,7 +266,7 @@ class ClienteController(BaseController):
             bool: True si existe en otro cliente, False en caso contrario
         """
         try:
-            exito, _, cliente = self.buscar_cliente_por_documento(numero_documento)
+            exito, _, cliente = self.buscar_cliente_por_documento(numero_documento, ['id_cliente'])
             if exito and cliente['id_cliente'] != id_cliente_actual:
                 return True
             return False
@@ -269,7 +286,7 @@ class ClienteController(BaseController):
         """
         try:
             filtros = {'email': email}
-            exito, _, clientes = self.listar(filtros)
+            exito, _, clientes = self.listar(filtros, columnas=['id_cliente'])
             if exito:
                 for cliente in clientes:
                     if cliente['id_cliente'] != id_cliente_actual:
@@ -6,8 +6,13 @@ Maneja la lógica de negocio relacionada con cuentas.
 from controllers.base_controller import BaseController
 from models.cuenta import Cuenta
 from models.cliente import Cliente
-from models.catalogo import Banco
+from models.historial_saldo import HistorialSaldo
+from models.resumen_saldo import ResumenSaldo
+from models.catalogo import Banco, ProductoCuenta
+from models.instantanea_catalogos import obtener_instantanea
+from database.unidad_trabajo import unidad_de_trabajo
 from typing import Dict, List, Tuple, Optional
+from datetime import date, timedelta
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,6 +25,9 @@ class CuentaController(BaseController):
         super().__init__(Cuenta())
         self.cliente_model = Cliente()
         self.banco_model = Banco()
+        self.producto_model = ProductoCuenta()
+        self.historial_model = HistorialSaldo()
+        self.resumen_model = ResumenSaldo()
     
     def crear_cuenta(self, datos: Dict) -> Tuple[bool, str, Optional[int]]:
         """
@@ -68,46 +76,51 @@ class CuentaController(BaseController):
             tuple: (exito, mensaje)
         """
         try:
-            # Verificar que la cuenta existe
-            if not self.verificar_existencia(id_cuenta):
-                return False, "La cuenta no existe"
-            
-            # Validaciones específicas del controlador
-            exito, mensaje = self._validar_cuenta_especifica(datos)
-            if not exito:
-                return False, mensaje
-            
-            # Verificar que el número de cuenta no exista en otra cuenta
-            if self._numero_cuenta_existe_en_otra_cuenta(datos['numero_cuenta'], id_cuenta):
-                return False, "Ya existe otra cuenta con ese número"
-            
-            # Verificar que el CCI no exista en otra cuenta
-            if self._cci_existe_en_otra_cuenta(datos['cci'], id_cuenta):
-                return False, "Ya existe otra cuenta con ese CCI"
-            
-            # Verificar que el cliente existe
-            if not self._cliente_existe(datos['id_cliente']):
-                return False, "El cliente seleccionado no existe"
-            
-            # Actualizar la cuenta
-            return self.actualizar(id_cuenta, datos)
+            # Una sola unidad de trabajo: las lecturas repetidas del mismo registro
+            # (verificación, validaciones y actualización) salen del mapa de identidad
+            with unidad_de_trabajo(self.modelo.db):
+                # Verificar que la cuenta existe
+                if not self.verificar_existencia(id_cuenta):
+                    return False, "La cuenta no existe"
+                
+                # Validaciones específicas del controlador
+                exito, mensaje = self._validar_cuenta_especifica(datos)
+                if not exito:
+                    return False, mensaje
+                
+                # Verificar que el número de cuenta no exista en otra cuenta
+                if self._numero_cuenta_existe_en_otra_cuenta(datos['numero_cuenta'], id_cuenta):
+                    return False, "Ya existe otra cuenta con ese número"
+                
+                # Verificar que el CCI no exista en otra cuenta
+                if self._cci_existe_en_otra_cuenta(datos['cci'], id_cuenta):
+                    return False, "Ya existe otra cuenta con ese CCI"
+                
+                # Verificar que el cliente existe
+                if not self._cliente_existe(datos['id_cliente']):
+                    return False, "El cliente seleccionado no existe"
+                
+                # Actualizar la cuenta
+                return self.actualizar(id_cuenta, datos)
             
         except Exception as e:
             logger.error(f"Error al actualizar cuenta: {str(e)}")
             return False, f"Error al actualizar cuenta: {str(e)}", None
     
-    def buscar_cuenta_por_numero(self, numero_cuenta: str) -> Tuple[bool, str, Optional[Dict]]:
+    def buscar_cuenta_por_numero(self, numero_cuenta: str,
+                                 columnas: Optional[List[str]] = None) -> Tuple[bool, str, Optional[Dict]]:
         """
         Busca una cuenta por número de cuenta.
         
         Args:
             numero_cuenta: Número de cuenta a buscar
+            columnas: Columnas a retornar (por defecto todas)
             
         Returns:
             tuple: (exito, mensaje, datos_cuenta)
         """
         try:
-            return self.modelo.buscar_por_numero(numero_cuenta)
+            return self.modelo.buscar_por_numero(numero_cuenta, columnas)
         except Exception as e:
             logger.error(f"Error al buscar cuenta por número: {str(e)}")
             return False, f"Error al buscar cuenta: {str(e)}", None
@@ -145,6 +158,150 @@ class CuentaController(BaseController):
             logger.error(f"Error al actualizar saldo: {str(e)}")
             return False, f"Error al actualizar saldo: {str(e)}"
     
+    def cambiar_estado(self, ids_cuenta: List[int], estado: str) -> Tuple[bool, str, int]:
+        """
+        Cambia el estado de varias cuentas a la vez.
+        
+        Args:
+            ids_cuenta: IDs de las cuentas
+            estado: Nuevo estado
+            
+        Returns:
+            tuple: (exito, mensaje, filas_afectadas)
+        """
+        try:
+            return self.modelo.cambiar_estado(ids_cuenta, estado)
+        except Exception as e:
+            logger.error(f"Error al cambiar estado de cuentas: {str(e)}")
+            return False, f"Error al cambiar estado: {str(e)}", 0
+    
+    def actualizar_masivo(self, filtros: Dict, cambios: Dict,
+                          simulacion: bool = False) -> Tuple[bool, str, int]:
+        """
+        Cambia el estado, el producto o el cliente de todas las cuentas que
+        cumplen los filtros (por ejemplo todas las de un cliente), sin validar
+        ni leer cada cuenta por separado.
+        
+        Args:
+            filtros: Filtros de cuentas (id_cliente, estado, id_producto...)
+            cambios: Nuevos valores de estado, id_producto y/o id_cliente
+            simulacion: Solo contar las cuentas que cambiarían
+            
+        Returns:
+            tuple: (exito, mensaje, cuentas cambiadas o que cambiarían)
+        """
+        try:
+            logger.info(f"Cambio masivo de cuentas {filtros} -> {cambios} (simulación: {simulacion})")
+            return self.modelo.actualizar_masivo(filtros, cambios, simulacion)
+        except Exception as e:
+            logger.error(f"Error en el cambio masivo de cuentas: {str(e)}")
+            return False, f"Error en el cambio masivo: {str(e)}", 0
+    
+    def obtener_saldo_al(self, id_cuenta: int, fecha: str) -> Tuple[bool, str, Optional[float]]:
+        """
+        Obtiene el saldo que tenía una cuenta al final de una fecha.
+        
+        Args:
+            id_cuenta: ID de la cuenta
+            fecha: Fecha (AAAA-MM-DD)
+            
+        Returns:
+            tuple: (exito, mensaje, saldo)
+        """
+        try:
+            return self.historial_model.saldo_al(id_cuenta, fecha)
+        except Exception as e:
+            logger.error(f"Error al obtener saldo a la fecha: {str(e)}")
+            return False, f"Error al obtener saldo: {str(e)}", None
+    
+    def obtener_saldos_fin_de_mes(self, anio: int, mes: int) -> Tuple[bool, str, Dict]:
+        """
+        Obtiene el saldo de todas las cuentas al cierre de un mes (y lo guarda
+        como punto de partida de los siguientes cálculos si el mes terminó).
+        
+        Args:
+            anio: Año
+            mes: Mes (1-12)
+            
+        Returns:
+            tuple: (exito, mensaje, diccionario id_cuenta -> saldo)
+        """
+        try:
+            return self.historial_model.saldos_fin_de_mes(anio, mes)
+        except Exception as e:
+            logger.error(f"Error al obtener saldos de fin de mes: {str(e)}")
+            return False, f"Error al obtener saldos de fin de mes: {str(e)}", {}
+    
+    def obtener_movimientos_del_dia(self, fecha: str) -> Tuple[bool, str, Dict]:
+        """
+        Obtiene el total de depósitos y retiros de un día.
+        
+        Args:
+            fecha: Fecha (AAAA-MM-DD)
+            
+        Returns:
+            tuple: (exito, mensaje, totales)
+        """
+        try:
+            return self.historial_model.movimientos_del_dia(fecha)
+        except Exception as e:
+            logger.error(f"Error al obtener movimientos del día: {str(e)}")
+            return False, f"Error al obtener movimientos: {str(e)}", {}
+    
+    def obtener_resumen_saldos(self, fecha: Optional[str] = None) -> Tuple[bool, str, Dict]:
+        """
+        Obtiene el resumen de saldos de un día por agencia, producto y estado.
+        
+        Args:
+            fecha: Fecha (AAAA-MM-DD); por defecto la última resumida
+            
+        Returns:
+            tuple: (exito, mensaje, resumen)
+        """
+        try:
+            return self.resumen_model.resumen_del_dia(fecha)
+        except Exception as e:
+            logger.error(f"Error al obtener resumen de saldos: {str(e)}")
+            return False, f"Error al obtener resumen de saldos: {str(e)}", {}
+    
+    def obtener_tendencia_saldos(self, dimension: str, valor: Optional[str] = None,
+                                 desde: Optional[str] = None, hasta: Optional[str] = None) -> Tuple[bool, str, List[Dict]]:
+        """
+        Obtiene la serie diaria de cuentas y saldo total de una agencia,
+        producto o estado a partir de los resúmenes guardados.
+        
+        Args:
+            dimension: 'agencia', 'producto' o 'estado'
+            valor: ID de agencia o producto, o estado (todos si es None)
+            desde: Primera fecha (AAAA-MM-DD)
+            hasta: Última fecha (AAAA-MM-DD)
+            
+        Returns:
+            tuple: (exito, mensaje, lista de filas por fecha)
+        """
+        try:
+            return self.resumen_model.tendencia(dimension, valor, desde, hasta)
+        except Exception as e:
+            logger.error(f"Error al obtener tendencia de saldos: {str(e)}")
+            return False, f"Error al obtener tendencia de saldos: {str(e)}", []
+    
+    def obtener_productos(self) -> Tuple[bool, str, List[Dict]]:
+        """
+        Obtiene la lista de productos de cuenta disponibles
+        (de la copia local de catálogos si está cargada).
+        
+        Returns:
+            tuple: (exito, mensaje, lista_productos)
+        """
+        try:
+            productos = obtener_instantanea().obtener('productos')
+            if productos is not None:
+                return True, "Lista obtenida de la copia local", productos
+            return self.producto_model.listar()
+        except Exception as e:
+            logger.error(f"Error al obtener productos de cuenta: {str(e)}")
+            return False, f"Error al obtener productos: {str(e)}", []
+    
     def obtener_cuentas_activas(self) -> Tuple[bool, str, List[Dict]]:
         """
         Obtiene todas las cuentas activas.
@@ -182,14 +339,39 @@ class CuentaController(BaseController):
             logger.error(f"Error al obtener cuentas por saldo: {str(e)}")
             return False, f"Error al obtener cuentas: {str(e)}", []
     
-    def obtener_estadisticas_cuentas(self) -> Tuple[bool, str, Dict]:
+    def obtener_estadisticas_cuentas(self, usar_resumen: bool = False) -> Tuple[bool, str, Dict]:
         """
-        Obtiene estadísticas de las cuentas.
+        Obtiene estadísticas de las cuentas (por defecto, sobre la tabla cuentas).
+        
+        Con usar_resumen lee el resumen diario de saldos de ayer
+        (trabajos/saldos_diarios.py) en lugar de recorrer la tabla cuentas;
+        las estadísticas incluyen entonces 'fecha_resumen'. Si no hay
+        resumen de ayer (el trabajo no se ejecutó) se calculan sobre la tabla.
         
+        Args:
+            usar_resumen: Leer el resumen de ayer si existe
+            
         Returns:
             tuple: (exito, mensaje, estadisticas)
         """
         try:
+            if usar_resumen:
+                exito, _, resumen = self.resumen_model.resumen_del_dia()
+                ayer = (date.today() - timedelta(days=1)).isoformat()
+                if exito and resumen and resumen['fecha'] >= ayer:
+                    por_estado = resumen['estado']
+                    activas = por_estado.get('Activa', {})
+                    estados = dict.fromkeys(['Activa', 'Inactiva', 'Suspendida', 'Cerrada'], 0)
+                    estados.update((estado, fila['cuentas']) for estado, fila in por_estado.items())
+                    estadisticas = {
+                        'total_cuentas': sum(fila['cuentas'] for fila in por_estado.values()),
+                        'cuentas_activas': activas.get('cuentas', 0),
+                        'saldo_total': round(activas.get('saldo_total', 0.0), 2),
+                        'cuentas_por_estado': estados,
+                        'fecha_resumen': resumen['fecha']
+                    }
+                    return True, f"Estadísticas al cierre del {resumen['fecha']}", estadisticas
+            
             # Obtener total de cuentas
             exito, mensaje, total_cuentas = self.obtener_conteo()
             if not exito:
@@ -298,7 +480,7 @@ class CuentaController(BaseController):
             bool: True si existe, False en caso contrario
         """
         try:
-            exito, _, _ = self.buscar_cuenta_por_numero(numero_cuenta)
+            exito, _, _ = self.buscar_cuenta_por_numero(numero_cuenta, ['id_cuenta'])
             return exito
         except:
             return False
@@ -315,8 +497,8 @@ class CuentaController(BaseController):
         """
         try:
             filtros = {'cci': cci}
-            exito, _, cuentas = self.listar(filtros)
-            return exito and len(cuentas) > 0
+            exito, _, existe = self.modelo.existe(filtros)
+            return exito and existe
         except:
             return False
     
@@ -348,7 +530,7 @@ class CuentaController(BaseController):
             bool: True si existe en otra cuenta, False en caso contrario
         """
         try:
-            exito, _, cuenta = self.buscar_cuenta_por_numero(numero_cuenta)
+            exito, _, cuenta = self.buscar_cuenta_por_numero(numero_cuenta, ['id_cuenta'])
             if exito and cuenta['id_cuenta'] != id_cuenta_actual:
                 return True
             return False
@@ -368,7 +550,7 @@ class CuentaController(BaseController):
         """
         try:
             filtros = {'cci': cci}
-            exito, _, cuentas = self.listar(filtros)
+            exito, _, cuentas = self.listar(filtros, columnas=['id_cuenta'])
             if exito:
                 for cuenta in cuentas:
                     if cuenta['id_cuenta'] != id_cuenta_actual:
@@ -6,6 +6,7 @@ Maneja la lógica de negocio relacionada con usuarios y autenticación.
 from controllers.base_controller import BaseController
 from models.usuario import Usuario
 from models.cliente import Cliente
+from database.unidad_trabajo import unidad_de_trabajo
 from typing import Dict, List, Tuple, Optional
 import logging
 
@@ -66,25 +67,28 @@ class UsuarioController(BaseController):
             tuple: (exito, mensaje)
         """
         try:
-            # Verificar que el usuario existe
-            if not self.verificar_existencia(id_usuario):
-                return False, "El usuario no existe"
-            
-            # Validaciones específicas del controlador
-            exito, mensaje = self._validar_usuario_especifico(datos)
-            if not exito:
-                return False, mensaje
-            
-            # Verificar que el username no exista en otro usuario
-            if self._username_existe_en_otro_usuario(datos['username'], id_usuario):
-                return False, "Ya existe otro usuario con ese nombre de usuario"
-            
-            # Verificar que el cliente existe
-            if not self._cliente_existe(datos['id_cliente']):
-                return False, "El cliente seleccionado no existe"
-            
-            # Actualizar el usuario
-            return self.actualizar(id_usuario, datos)
+            # Una sola unidad de trabajo: las lecturas repetidas del mismo registro
+            # (verificación, validaciones y actualización) salen del mapa de identidad
+            with unidad_de_trabajo(self.modelo.db):
+                # Verificar que el usuario existe
+                if not self.verificar_existencia(id_usuario):
+                    return False, "El usuario no existe"
+                
+                # Validaciones específicas del controlador
+                exito, mensaje = self._validar_usuario_especifico(datos)
+                if not exito:
+                    return False, mensaje
+                
+                # Verificar que el username no exista en otro usuario
+                if self._username_existe_en_otro_usuario(datos['username'], id_usuario):
+                    return False, "Ya existe otro usuario con ese nombre de usuario"
+                
+                # Verificar que el cliente existe
+                if not self._cliente_existe(datos['id_cliente']):
+                    return False, "El cliente seleccionado no existe"
+                
+                # Actualizar el usuario
+                return self.actualizar(id_usuario, datos)
             
         except Exception as e:
             logger.error(f"Error al actualizar usuario: {str(e)}")
@@ -107,18 +111,20 @@ class UsuarioController(BaseController):
             logger.error(f"Error al autenticar usuario: {str(e)}")
             return False, f"Error en autenticación: {str(e)}", None
     
-    def buscar_usuario_por_username(self, username: str) -> Tuple[bool, str, Optional[Dict]]:
+    def buscar_usuario_por_username(self, username: str,
+                                    columnas: Optional[List[str]] = None) -> Tuple[bool, str, Optional[Dict]]:
         """
         Busca un usuario por nombre de usuario.
         
         Args:
             username: Nombre de usuario a buscar
+            columnas: Columnas a retornar (por defecto todas)
             
         Returns:
             tuple: (exito, mensaje, datos_usuario)
         """
         try:
-            return self.modelo.buscar_por_username(username)
+            return self.modelo.buscar_por_username(username, columnas)
         except Exception as e:
             logger.error(f"Error al buscar usuario por username: {str(e)}")
             return False, f"Error al buscar usuario: {str(e)}", None
@@ -269,7 +275,7 @@ class UsuarioController(BaseController):
             bool: True si existe, False en caso contrario
         """
         try:
-            exito, _, _ = self.buscar_usuario_por_username(username)
+            exito, _, _ = self.buscar_usuario_por_username(username, ['id_usuario'])
             return exito
         except:
             return False
@@ -301,8 +307,9 @@ class UsuarioController(BaseController):
             bool: True si tiene usuario, False en caso contrario
         """
         try:
-            exito, _, usuarios = self.buscar_usuarios_por_cliente(id_cliente)
-            return exito and len(usuarios) > 0
+            filtros = {'id_cliente': id_cliente}
+            exito, _, existe = self.modelo.existe(filtros)
+            return exito and existe
         except:
             return False
     
@@ -318,7 +325,7 @@ class UsuarioController(BaseController):
             bool: True si existe en otro usuario, False en caso contrario
         """
         try:
-            exito, _, usuario = self.buscar_usuario_por_username(username)
+            exito, _, usuario = self.buscar_usuario_por_username(username, ['id_usuario'])
             if exito and usuario['id_usuario'] != id_usuario_actual:
                 return True
             return False
@@ -0,0 +1,398 @@
+"""
+Acceso asíncrono a la base de datos (asyncio) en paralelo a Database.
+Usa un pool de aiomysql (dependencia opcional) y entrega las mismas filas
+inmutables que la capa síncrona. ModeloAsync reutiliza los metadatos,
+validaciones y el compilador SQL de los modelos síncronos.
+
+Uso:
+    db = DatabaseAsync()
+    await db.connect()
+    clientes = ModeloAsync(Cliente, db)
+    exito, mensaje, datos = await clientes.leer(1)
+    async for cliente in clientes.iterar():
+        ...
+    await db.disconnect()
+"""
+
+from contextlib import asynccontextmanager
+import asyncio
+import contextvars
+import logging
+
+from pymysql.constants import CLIENT
+from database.compilador import MENSAJE_CONFLICTO
+from database.connection import Database
+from database.filas import construir_filas
+
+try:
+    import aiomysql
+except ImportError:  # pragma: no cover - dependencia opcional
+    aiomysql = None
+
+logger = logging.getLogger(__name__)
+
+# Conexión fijada por la transacción asíncrona activa en la tarea actual
+_conexion_transaccion = contextvars.ContextVar('conexion_transaccion_async', default=None)
+
+
+class DatabaseAsync:
+    """Pool de conexiones asíncronas con la misma configuración que Database."""
+
+    def __init__(self, minimo=1, maximo=20):
+        """
+        Args:
+            minimo (int): Conexiones abiertas al iniciar el pool
+            maximo (int): Conexiones simultáneas como máximo
+        """
+        if aiomysql is None:
+            raise ImportError("El acceso asíncrono requiere el paquete aiomysql (pip install aiomysql)")
+        self.config = Database().config
+        self.minimo = minimo
+        self.maximo = maximo
+        self.pool = None
+
+    async def connect(self):
+        """Crea el pool de conexiones."""
+        if not self.config:
+            logger.error("No se pudo cargar la configuración de la base de datos.")
+            return
+        self.pool = await aiomysql.create_pool(
+            minsize=self.minimo,
+            maxsize=self.maximo,
+            host=self.config['host'],
+            port=self.config['port'],
+            user=self.config['user'],
+            password=self.config['password'],
+            db=self.config['database'],
+            client_flag=CLIENT.FOUND_ROWS,
+            autocommit=False
+        )
+        logger.info("Pool de conexiones asíncronas creado")
+
+    async def disconnect(self):
+        """Cierra el pool esperando a que se liberen las conexiones."""
+        if self.pool is not None:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+
+    @asynccontextmanager
+    async def _conexion(self):
+        """
+        Entrega la conexión de la transacción activa o una del pool.
+        Si la tarea se cancela a mitad de una sentencia, la conexión se cierra
+        en lugar de devolverse al pool con un resultado a medio leer.
+        """
+        conexion = _conexion_transaccion.get()
+        if conexion is not None:
+            yield conexion, True
+            return
+
+        if self.pool is None:
+            raise ConnectionError("El pool de conexiones asíncronas no está iniciado")
+        conexion = await self.pool.acquire()
+        try:
+            yield conexion, False
+        except asyncio.CancelledError:
+            conexion.close()
+            raise
+        finally:
+            self.pool.release(conexion)
+
+    @asynccontextmanager
+    async def transaccion(self):
+        """
+        Agrupa varias operaciones de la tarea actual en una transacción.
+        Hace commit al salir o rollback si hubo una excepción o cancelación.
+        """
+        if _conexion_transaccion.get() is not None:
+            yield
+            return
+
+        async with self._conexion() as (conexion, _):
+            await conexion.begin()
+            token = _conexion_transaccion.set(conexion)
+            try:
+                yield
+                await conexion.commit()
+            except asyncio.CancelledError:
+                # La conexión se cierra y el servidor deshace la transacción
+                raise
+            except BaseException:
+                await conexion.rollback()
+                raise
+            finally:
+                _conexion_transaccion.reset(token)
+
+    async def _ejecutar(self, query, params=None):
+        """
+        Ejecuta una sentencia de modificación.
+        Dentro de una transacción el commit se difiere al final.
+
+        Returns:
+            tuple: (lastrowid, filas_afectadas) o None si hubo error
+        """
+        async with self._conexion() as (conexion, en_transaccion):
+            try:
+                async with conexion.cursor() as cursor:
+                    await cursor.execute(query, params)
+                    if not en_transaccion:
+                        await conexion.commit()
+                    return cursor.lastrowid, cursor.rowcount
+            except aiomysql.MySQLError as err:
+                if en_transaccion:
+                    raise
+                await conexion.rollback()
+                logger.error(f"Error al ejecutar la consulta: {err}")
+                return None
+
+    async def execute_query(self, query, params=None):
+        """Ejecuta una sentencia y devuelve el ID insertado."""
+        resultado = await self._ejecutar(query, params)
+        return resultado[0] if resultado else None
+
+    async def execute_update(self, query, params=None):
+        """Ejecuta un UPDATE/DELETE y devuelve las filas coincidentes, o None si hubo error."""
+        resultado = await self._ejecutar(query, params)
+        return resultado[1] if resultado else None
+
+    async def fetch_all(self, query, params=None, conversiones=None):
+        """
+        Ejecuta una consulta y devuelve todos los resultados como filas.
+
+        Args:
+            query (str): Consulta SQL
+            params: Parámetros de la consulta
+            conversiones (dict): Funciones de conversión por nombre de columna
+        """
+        async with self._conexion() as (conexion, en_transaccion):
+            try:
+                async with conexion.cursor() as cursor:
+                    await cursor.execute(query, params)
+                    filas = await cursor.fetchall()
+                    if not en_transaccion:
+                        # Cierra la transacción implícita de la lectura (autocommit desactivado)
+                        await conexion.commit()
+                    if not cursor.description:
+                        return []
+                    campos = [columna[0] for columna in cursor.description]
+                    return construir_filas(campos, filas, conversiones)
+            except aiomysql.MySQLError as err:
+                if en_transaccion:
+                    raise
+                logger.error(f"Error al obtener los datos: {err}")
+                return []
+
+    async def iterar(self, query, params=None, conversiones=None, tamano_lote=500):
+        """
+        Recorre un resultado sin cargarlo entero en memoria (cursor del servidor).
+
+        Si el consumidor abandona el recorrido o la tarea se cancela, la
+        conexión se cierra en vez de leer el resto de filas pendientes
+        (para cortar el recorrido con break, usar contextlib.aclosing).
+
+        Args:
+            query (str): Consulta SQL
+            params: Parámetros de la consulta
+            conversiones (dict): Funciones de conversión por nombre de columna
+            tamano_lote (int): Filas leídas del servidor por vez
+
+        Yields:
+            Fila: Cada fila del resultado
+        """
+        if _conexion_transaccion.get() is not None:
+            raise RuntimeError("iterar no puede usarse dentro de una transacción asíncrona")
+
+        async with self._conexion() as (conexion, _):
+            cursor = await conexion.cursor(aiomysql.SSCursor)
+            completo = False
+            try:
+                await cursor.execute(query, params)
+                campos = [columna[0] for columna in cursor.description]
+                while True:
+                    filas = await cursor.fetchmany(tamano_lote)
+                    if not filas:
+                        break
+                    for fila in construir_filas(campos, filas, conversiones):
+                        yield fila
+                completo = True
+            finally:
+                if completo:
+                    await cursor.close()
+                    await conexion.commit()
+                else:
+                    conexion.close()
+
+
+class ModeloAsync:
+    """Operaciones CRUD asíncronas para un modelo síncrono existente."""
+
+    def __init__(self, clase_modelo, db):
+        """
+        Args:
+            clase_modelo (type): Subclase de BaseModel (aporta tabla, validaciones y preparación)
+            db (DatabaseAsync): Pool asíncrono a utilizar
+        """
+        # Instancia sin conexión propia: solo se usan sus metadatos y validaciones
+        self.modelo = clase_modelo.__new__(clase_modelo)
+        self.tabla = clase_modelo.tabla
+        self.conversiones_lectura = clase_modelo.conversiones_lectura
+        self.db = db
+
+    async def crear(self, datos):
+        """
+        Crea un nuevo registro.
+
+        Returns:
+            tuple: (exito, mensaje, id_registro)
+        """
+        try:
+            es_valido, mensaje_error = self.modelo.validar_datos(datos)
+            if not es_valido:
+                return False, mensaje_error, None
+
+            datos_insert = self.modelo._preparar_datos_creacion(datos)
+            id_registro = await self.db.execute_query(self.modelo._generar_query_creacion(), datos_insert)
+            if id_registro:
+                return True, "Registro creado exitosamente", id_registro
+            return False, "No se pudo crear el registro", None
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error al crear registro: {str(e)}")
+            return False, f"Error al crear el registro: {str(e)}", None
+
+    async def leer(self, id_registro):
+        """
+        Lee un registro por ID.
+
+        Returns:
+            tuple: (exito, mensaje, datos)
+        """
+        try:
+            resultado = await self.db.fetch_all(self.modelo._generar_query_lectura(), (id_registro,),
+                                                self.conversiones_lectura)
+            if resultado:
+                return True, "Registro encontrado", resultado[0]
+            return False, "Registro no encontrado", None
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error al leer registro: {str(e)}")
+            return False, f"Error al leer el registro: {str(e)}", None
+
+    async def actualizar(self, id_registro, datos):
+        """
+        Actualiza un registro escribiendo solo las columnas modificadas.
+
+        Returns:
+            tuple: (exito, mensaje)
+        """
+        try:
+            es_valido, mensaje_error = self.modelo.validar_datos(datos)
+            if not es_valido:
+                return False, mensaje_error
+
+            existe, _, actual = await self.leer(id_registro)
+            if not existe:
+                return False, "El registro no existe"
+
+            version = self.modelo._version_leida(datos)
+            if version is not None and actual[self.tabla.version] != version:
+                return False, MENSAJE_CONFLICTO
+
+            datos_update = self.modelo._columnas_modificadas(
+                actual, self.modelo._preparar_datos_actualizacion(datos))
+            if not datos_update:
+                return True, "Registro actualizado exitosamente"
+
+            query = self.modelo._generar_query_actualizacion(list(datos_update), version is not None)
+            datos_update['id'] = id_registro
+            if version is not None:
+                datos_update['version_leida'] = version
+            filas_afectadas = await self.db.execute_update(query, datos_update)
+            if filas_afectadas:
+                return True, "Registro actualizado exitosamente"
+            if filas_afectadas == 0 and version is not None:
+                return False, MENSAJE_CONFLICTO
+            return False, "No se pudo actualizar el registro"
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error al actualizar registro: {str(e)}")
+            return False, f"Error al actualizar el registro: {str(e)}"
+
+    async def eliminar(self, id_registro):
+        """
+        Elimina un registro por ID.
+
+        Returns:
+            tuple: (exito, mensaje)
+        """
+        try:
+            existe, _, _ = await self.leer(id_registro)
+            if not existe:
+                return False, "El registro no existe"
+
+            filas_afectadas = await self.db.execute_update(self.modelo._generar_query_eliminacion(), (id_registro,))
+            if filas_afectadas:
+                return True, "Registro eliminado exitosamente"
+            return False, "No se pudo eliminar el registro"
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error al eliminar registro: {str(e)}")
+            return False, f"Error al eliminar el registro: {str(e)}"
+
+    async def listar(self, filtros=None, limite=None, offset=None, columnas=None, despues_de=None):
+        """
+        Lista registros con los mismos filtros y paginación que BaseModel.listar.
+
+        Returns:
+            tuple: (exito, mensaje, lista_datos)
+        """
+        try:
+            query, params = self.modelo._generar_query_listado(filtros, limite, offset, columnas, despues_de)
+            resultado = await self.db.fetch_all(query, params, self.conversiones_lectura)
+            return True, "Lista obtenida exitosamente", resultado
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error al listar registros: {str(e)}")
+            return False, f"Error al listar registros: {str(e)}", []
+
+    async def iterar(self, filtros=None, columnas=None, tamano_lote=500):
+        """
+        Recorre todos los registros que cumplen los filtros, fila por fila.
+
+        Yields:
+            Fila: Cada registro
+        """
+        query, params = self.modelo._generar_query_listado(filtros, columnas=columnas)
+        async for fila in self.db.iterar(query, params, self.conversiones_lectura, tamano_lote):
+            yield fila
+
+    async def contar(self, filtros=None):
+        """
+        Cuenta los registros que coinciden con los filtros.
+
+        Returns:
+            tuple: (exito, mensaje, conteo)
+        """
+        try:
+            compilador = self.tabla.compilador
+            forma = compilador.forma_filtros(filtros)
+            resultado = await self.db.fetch_all(compilador.contar(forma),
+                                                compilador.parametros_filtros(forma, filtros))
+            return True, "Conteo obtenido exitosamente", resultado[0]['total'] if resultado else 0
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error al contar registros: {str(e)}")
+            return False, f"Error al contar registros: {str(e)}", 0
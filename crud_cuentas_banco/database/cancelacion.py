@@ -0,0 +1,154 @@
+"""
+Tiempo máximo y cancelación de consultas.
+
+    - limitar_tiempo() agrega a un SELECT la pista MAX_EXECUTION_TIME: MySQL
+      lo interrumpe al vencer el plazo (error 3024).
+    - Cancelacion permite detener desde otro hilo (la interfaz) la consulta
+      en curso de una tarea: envía KILL QUERY por una conexión aparte y la
+      consulta falla con el error 1317. La conexión de la tarea sigue
+      abierta y lista para la siguiente sentencia.
+
+Uso:
+    cancelacion = Cancelacion()
+    # hilo de la tarea
+    with cancelacion.vincular(modelo.db):
+        modelo.listar(filtros, timeout=10)
+    # hilo de la interfaz
+    cancelacion.cancelar()
+"""
+
+from contextlib import contextmanager
+import logging
+import re
+import threading
+
+import pymysql
+
+logger = logging.getLogger(__name__)
+
+# Consulta interrumpida por KILL QUERY o por MAX_EXECUTION_TIME
+ERROR_INTERRUMPIDA = 1317
+ERROR_TIEMPO_AGOTADO = 3024
+ERRORES_CANCELACION = {ERROR_INTERRUMPIDA, ERROR_TIEMPO_AGOTADO}
+
+_SELECT = re.compile(r"^\s*SELECT\b", re.I)
+
+
+def limitar_tiempo(sql, segundos):
+    """
+    Agrega el tiempo máximo de ejecución a un SELECT (MySQL solo lo aplica a lecturas).
+
+    Args:
+        sql (str): Sentencia
+        segundos (float): Tiempo máximo
+
+    Returns:
+        str: Sentencia con la pista (las demás sentencias quedan igual)
+    """
+    milisegundos = max(int(segundos * 1000), 1)
+    return _SELECT.sub(f"SELECT /*+ MAX_EXECUTION_TIME({milisegundos}) */", sql, count=1)
+
+
+def _conexion_lateral(replica):
+    """Abre una conexión aparte con el servidor indicado (la primaria si replica es None)."""
+    if replica is not None:
+        try:
+            return replica.conectar()
+        except pymysql.MySQLError:
+            return None
+
+    # Importación diferida: Database usa este módulo
+    from database.connection import Database
+
+    db = Database()
+    db.connect()
+    return db.connection if db.connection and db.connection.open else None
+
+
+def cancelar_consulta(id_conexion, replica=None):
+    """
+    Interrumpe la consulta en curso de otra conexión con KILL QUERY.
+
+    Args:
+        id_conexion (int): ID de la conexión en el servidor (Database.id_conexion)
+        replica (Replica): Servidor de la conexión (None para la primaria)
+
+    Returns:
+        bool: True si se envió la cancelación
+    """
+    conexion = _conexion_lateral(replica)
+    if conexion is None:
+        logger.warning(f"No se pudo abrir una conexión para cancelar la consulta de {id_conexion}")
+        return False
+    try:
+        cursor = conexion.cursor()
+        try:
+            cursor.execute(f"KILL QUERY {int(id_conexion)}")
+        finally:
+            cursor.close()
+        logger.info(f"Consulta de la conexión {id_conexion} cancelada")
+        return True
+    except pymysql.MySQLError as err:
+        logger.warning(f"No se pudo cancelar la consulta de la conexión {id_conexion}: {err}")
+        return False
+    finally:
+        conexion.close()
+
+
+class Cancelacion:
+    """
+    Permite cancelar desde otro hilo las consultas de una tarea.
+
+    Una vez cancelada, la sesión vinculada no envía más sentencias (fallan
+    como interrumpidas), y el KILL QUERY solo se envía si la sentencia que
+    estaba en curso al cancelar sigue en curso: nunca alcanza a la siguiente
+    sentencia de la tarea ni a otra tarea que reutilice la conexión.
+    """
+
+    def __init__(self):
+        self.cancelada = False
+        self._db = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def vincular(self, db):
+        """
+        Asocia la sesión de la tarea mientras dura el bloque.
+
+        Args:
+            db: Database que usa la tarea (la sesión de su hilo)
+        """
+        with self._lock:
+            self._db = db
+            db.cancelacion = self
+        try:
+            yield self
+        finally:
+            # Espera a que termine un KILL QUERY en curso antes de liberar la sesión
+            with self._lock:
+                db.cancelacion = None
+                self._db = None
+
+    def cancelar(self):
+        """
+        Marca la tarea como cancelada e interrumpe su consulta en curso (en
+        la primaria o en la réplica donde se esté ejecutando). El KILL QUERY
+        se envía desde un hilo aparte para no bloquear a quien cancela.
+        """
+        with self._lock:
+            if self.cancelada:
+                return
+            self.cancelada = True
+            en_curso = self._db.consulta_en_curso if self._db is not None else None
+        if en_curso is not None:
+            threading.Thread(target=self._interrumpir, args=(en_curso,),
+                             name='cancelar-consulta', daemon=True).start()
+
+    def _interrumpir(self, en_curso):
+        """Envía KILL QUERY si la sentencia en_curso sigue en ejecución."""
+        with self._lock:
+            # Cada sentencia asigna una tupla nueva: la identidad la distingue de las siguientes
+            if self._db is None or self._db.consulta_en_curso is not en_curso:
+                return
+            replica, id_conexion = en_curso
+            cancelar_consulta(id_conexion, replica)
@@ -0,0 +1,331 @@
+"""
+Metadatos declarativos de tablas y compilador de consultas SQL.
+Cada modelo describe su tabla (columnas, uniones y filtros) y el compilador
+genera las sentencias INSERT/SELECT/UPDATE/DELETE/COUNT/EXISTS, guardando
+el SQL compilado por forma de consulta para no reconstruirlo en cada llamada.
+"""
+
+# Resultado de actualizar con la versión leída cuando otro usuario modificó
+# el registro después de leerlo (lo usan los modelos síncronos y asíncronos)
+MENSAJE_CONFLICTO = "El registro fue modificado por otro usuario. Recárguelo e intente de nuevo."
+
+
+class Filtro:
+    """Filtro declarativo aplicable en listados, conteos y verificaciones."""
+
+    OPERADORES = ('=', 'LIKE', '>=', '<=')
+
+    def __init__(self, columnas, operador='='):
+        """
+        Args:
+            columnas (str | tuple): Expresión o expresiones SQL a comparar
+                (varias expresiones se combinan con OR)
+            operador (str): Operador de comparación; LIKE busca por contenido
+        """
+        if operador not in self.OPERADORES:
+            raise ValueError(f"Operador de filtro no soportado: {operador}")
+        self.columnas = (columnas,) if isinstance(columnas, str) else tuple(columnas)
+        self.operador = operador
+
+    def condicion(self):
+        """Genera la condición SQL del filtro."""
+        partes = [f"{columna} {self.operador} %s" for columna in self.columnas]
+        if len(partes) == 1:
+            return partes[0]
+        return "(" + " OR ".join(partes) + ")"
+
+    def parametros(self, valor):
+        """Genera los parámetros del filtro para un valor."""
+        if self.operador == 'LIKE':
+            valor = f"%{valor}%"
+        return [valor] * len(self.columnas)
+
+
+class Tabla:
+    """Descripción declarativa de la tabla principal de un modelo."""
+
+    def __init__(self, nombre, clave, columnas, alias=None, extras=None,
+                 uniones=None, filtros=None, orden=None, version=None):
+        """
+        Args:
+            nombre (str): Nombre de la tabla
+            clave (str): Columna de clave primaria
+            columnas (tuple): Columnas escribibles (sin la clave)
+            alias (str): Alias de la tabla en las consultas de lectura
+            extras (dict): Columnas de solo lectura: nombre -> (expresión, alias de uniones requeridas)
+            uniones (dict): Uniones opcionales: alias -> cláusula JOIN (en orden de dependencia)
+            filtros (dict): Filtros disponibles: nombre -> Filtro
+            orden (str): Cláusula ORDER BY por defecto
+            version (str): Columna de versión para la concurrencia optimista
+                (se lee con el registro y cada UPDATE la incrementa)
+        """
+        self.nombre = nombre
+        self.clave = clave
+        self.columnas = tuple(columnas)
+        self.alias = alias
+        self.uniones = uniones or {}
+        self.filtros = filtros or {}
+        self.orden = orden or self.calificar(clave)
+        self.version = version
+
+        # Proyección de lectura: nombre -> (expresión SQL, uniones requeridas)
+        self.proyeccion = {clave: (self.calificar(clave), ())}
+        for columna in self.columnas:
+            self.proyeccion[columna] = (self.calificar(columna), ())
+        if version:
+            self.proyeccion[version] = (self.calificar(version), ())
+        self.proyeccion.update(extras or {})
+
+        self.compilador = CompiladorConsultas(self)
+
+    def calificar(self, columna):
+        """Antepone el alias de la tabla a una columna."""
+        return f"{self.alias}.{columna}" if self.alias else columna
+
+    @property
+    def origen(self):
+        """Tabla con su alias para la cláusula FROM."""
+        return f"{self.nombre} {self.alias}" if self.alias else self.nombre
+
+
+class CompiladorConsultas:
+    """Genera y guarda en caché las sentencias SQL de una tabla."""
+
+    def __init__(self, tabla):
+        self.tabla = tabla
+        self._cache = {}
+
+    def _en_cache(self, clave, generar):
+        """Retorna el SQL en caché o lo genera y guarda."""
+        sql = self._cache.get(clave)
+        if sql is None:
+            sql = generar()
+            self._cache[clave] = sql
+        return sql
+
+    def forma_filtros(self, filtros):
+        """
+        Obtiene la forma de un diccionario de filtros: los nombres de los
+        filtros conocidos con valor, en el orden en que fueron declarados.
+        """
+        if not filtros:
+            return ()
+        return tuple(nombre for nombre in self.tabla.filtros if filtros.get(nombre))
+
+    def parametros_filtros(self, forma, filtros):
+        """Genera la lista de parámetros para una forma de filtros."""
+        params = []
+        for nombre in forma:
+            params.extend(self.tabla.filtros[nombre].parametros(filtros[nombre]))
+        return params
+
+    def insertar(self):
+        """INSERT con parámetros nombrados para todas las columnas escribibles."""
+        def generar():
+            columnas = self.tabla.columnas
+            valores = ", ".join(f"%({columna})s" for columna in columnas)
+            return f"INSERT INTO {self.tabla.nombre} ({', '.join(columnas)}) VALUES ({valores})"
+        return self._en_cache(('insertar',), generar)
+
+    def seleccionar(self, columnas=None, forma=(), limite=False, offset=False, keyset=False):
+        """
+        SELECT con proyección, filtros y paginación.
+
+        Args:
+            columnas (tuple): Columnas a proyectar (por defecto todas)
+            forma (tuple): Forma de los filtros activos
+            limite (bool): Incluir LIMIT
+            offset (bool): Incluir OFFSET
+            keyset (bool): Paginar por clave primaria (clave > %s, ordenado por clave)
+
+        Raises:
+            ValueError: Si se solicita una columna desconocida
+        """
+        columnas = tuple(columnas) if columnas else None
+        clave_cache = ('seleccionar', columnas, forma, limite, offset, keyset)
+
+        def generar():
+            condiciones = [self.tabla.filtros[nombre].condicion() for nombre in forma]
+            if keyset:
+                condiciones.append(f"{self.tabla.calificar(self.tabla.clave)} > %s")
+            query = self._select(columnas) + self._where(condiciones)
+            if keyset:
+                query += f" ORDER BY {self.tabla.calificar(self.tabla.clave)}"
+            else:
+                query += f" ORDER BY {self.tabla.orden}"
+            if limite:
+                query += " LIMIT %s"
+            if offset:
+                query += " OFFSET %s"
+            return query
+        return self._en_cache(clave_cache, generar)
+
+    def leer_por(self, columna, columnas=None):
+        """SELECT de un registro por igualdad en una columna (clave o única)."""
+        columnas = tuple(columnas) if columnas else None
+
+        def generar():
+            return self._select(columnas) + f" WHERE {self.tabla.calificar(columna)} = %s"
+        return self._en_cache(('leer_por', columna, columnas), generar)
+
+    def actualizar(self, columnas=None, con_version=False):
+        """
+        UPDATE de las columnas indicadas (por defecto todas) por clave primaria.
+        Si la tabla tiene columna de versión la incrementa y, con con_version,
+        solo actualiza si sigue siendo la leída (parámetro version_leida).
+        """
+        columnas = tuple(columnas) if columnas else self.tabla.columnas
+
+        def generar():
+            asignaciones = ", ".join(f"{columna} = %({columna})s" for columna in columnas)
+            condicion = f"{self.tabla.clave} = %(id)s"
+            version = self.tabla.version
+            if version:
+                asignaciones += f", {version} = {version} + 1"
+                if con_version:
+                    condicion += f" AND {version} = %(version_leida)s"
+            return f"UPDATE {self.tabla.nombre} SET {asignaciones} WHERE {condicion}"
+        return self._en_cache(('actualizar', columnas, con_version), generar)
+
+    def insertar_o_actualizar(self, columnas, actualizables, filas):
+        """
+        INSERT de varias filas con ON DUPLICATE KEY UPDATE.
+
+        Args:
+            columnas (tuple): Columnas insertadas (parámetros posicionales por fila)
+            actualizables (tuple): Columnas que se sobrescriben si la clave ya existe
+            filas (int): Número de filas del lote
+        """
+        def generar():
+            marcadores = "(" + ", ".join(["%s"] * len(columnas)) + ")"
+            asignaciones = ", ".join(f"{columna} = VALUES({columna})" for columna in actualizables)
+            if self.tabla.version:
+                asignaciones += f", {self.tabla.version} = {self.tabla.version} + 1"
+            return (f"INSERT INTO {self.tabla.nombre} ({', '.join(columnas)}) "
+                    f"VALUES {', '.join([marcadores] * filas)} "
+                    f"ON DUPLICATE KEY UPDATE {asignaciones}")
+        return self._en_cache(('insertar_o_actualizar', columnas, actualizables, filas), generar)
+
+    def contar_cambios(self, columnas, forma=()):
+        """
+        SELECT COUNT(*) de los registros filtrados con alguna de las columnas
+        distinta del nuevo valor (parámetros: filtros, nuevos valores).
+        """
+        def generar():
+            condiciones = self._condiciones_cambio(columnas, forma)
+            return f"SELECT COUNT(*) AS total FROM {self.tabla.origen}" + self._where(condiciones)
+        return self._en_cache(('contar_cambios', columnas, forma), generar)
+
+    def pendientes_de_cambio(self, columnas, forma=()):
+        """
+        SELECT de las claves del siguiente lote a cambiar, en orden de clave
+        (parámetros: filtros, última clave, nuevos valores, tamaño del lote).
+        """
+        def generar():
+            clave = self.tabla.calificar(self.tabla.clave)
+            condiciones = self._condiciones_cambio(columnas, forma, f"{clave} > %s")
+            return (f"SELECT {clave} FROM {self.tabla.origen}" + self._where(condiciones)
+                    + f" ORDER BY {clave} LIMIT %s")
+        return self._en_cache(('pendientes_de_cambio', columnas, forma), generar)
+
+    def actualizar_rango(self, columnas, forma=()):
+        """
+        UPDATE filtrado de un rango de claves que solo toca los registros con
+        algún valor distinto (parámetros: nuevos valores, filtros, primera y
+        última clave, nuevos valores).
+        """
+        def generar():
+            asignaciones = ", ".join(f"{columna} = %s" for columna in columnas)
+            if self.tabla.version:
+                asignaciones += f", {self.tabla.version} = {self.tabla.version} + 1"
+            condiciones = self._condiciones_cambio(
+                columnas, forma, f"{self.tabla.calificar(self.tabla.clave)} BETWEEN %s AND %s")
+            return f"UPDATE {self.tabla.origen} SET {asignaciones}" + self._where(condiciones)
+        return self._en_cache(('actualizar_rango', columnas, forma), generar)
+
+    def registrar_cambios(self, historial, columna, forma=()):
+        """
+        INSERT ... SELECT en la tabla de historial (clave, campo, valor_anterior,
+        valor_nuevo) de los registros del rango cuyo valor de la columna
+        cambiará (parámetros: nuevo valor, filtros, primera y última clave, nuevo valor).
+        """
+        def generar():
+            condiciones = self._condiciones_cambio(
+                (columna,), forma, f"{self.tabla.calificar(self.tabla.clave)} BETWEEN %s AND %s")
+            return (f"INSERT INTO {historial} ({self.tabla.clave}, campo, valor_anterior, valor_nuevo) "
+                    f"SELECT {self.tabla.calificar(self.tabla.clave)}, '{columna}', "
+                    f"{self.tabla.calificar(columna)}, %s FROM {self.tabla.origen}" + self._where(condiciones))
+        return self._en_cache(('registrar_cambios', historial, columna, forma), generar)
+
+    def _condiciones_cambio(self, columnas, forma, condicion_clave=None):
+        """Filtros, condición sobre la clave y 'alguna columna distinta del nuevo valor'."""
+        condiciones = [self.tabla.filtros[nombre].condicion() for nombre in forma]
+        if condicion_clave:
+            condiciones.append(condicion_clave)
+        distintas = [f"{self.tabla.calificar(columna)} IS NULL OR {self.tabla.calificar(columna)} <> %s"
+                     for columna in columnas]
+        condiciones.append("(" + " OR ".join(distintas) + ")")
+        return condiciones
+
+    def eliminar_por(self, columna, cantidad):
+        """DELETE de los registros cuyo valor de columna está en una lista."""
+        def generar():
+            marcadores = ", ".join(["%s"] * cantidad)
+            return f"DELETE FROM {self.tabla.nombre} WHERE {columna} IN ({marcadores})"
+        return self._en_cache(('eliminar_por', columna, cantidad), generar)
+
+    def valores_de(self, columna):
+        """SELECT de todos los valores de una columna de la tabla."""
+        return self._en_cache(
+            ('valores_de', columna),
+            lambda: f"SELECT {columna} FROM {self.tabla.nombre}")
+
+    def eliminar(self):
+        """DELETE por clave primaria."""
+        return self._en_cache(
+            ('eliminar',),
+            lambda: f"DELETE FROM {self.tabla.nombre} WHERE {self.tabla.clave} = %s")
+
+    def contar(self, forma=()):
+        """SELECT COUNT(*) con los filtros indicados, sin uniones."""
+        def generar():
+            condiciones = [self.tabla.filtros[nombre].condicion() for nombre in forma]
+            return f"SELECT COUNT(*) AS total FROM {self.tabla.origen}" + self._where(condiciones)
+        return self._en_cache(('contar', forma), generar)
+
+    def existe(self, forma=()):
+        """SELECT 1 ... LIMIT 1 con los filtros indicados, sin uniones."""
+        def generar():
+            condiciones = [self.tabla.filtros[nombre].condicion() for nombre in forma]
+            return f"SELECT 1 AS existe FROM {self.tabla.origen}" + self._where(condiciones) + " LIMIT 1"
+        return self._en_cache(('existe', forma), generar)
+
+    def _select(self, columnas=None):
+        """Cláusula SELECT ... FROM con solo las uniones que requieren las columnas."""
+        nombres = columnas or tuple(self.tabla.proyeccion)
+        desconocidas = [nombre for nombre in nombres if nombre not in self.tabla.proyeccion]
+        if desconocidas:
+            raise ValueError(f"Columnas no permitidas: {', '.join(desconocidas)}")
+
+        expresiones = []
+        uniones_requeridas = set()
+        for nombre in nombres:
+            expresion, uniones = self.tabla.proyeccion[nombre]
+            if expresion.split('.')[-1] == nombre:
+                expresiones.append(expresion)
+            else:
+                expresiones.append(f"{expresion} AS {nombre}")
+            uniones_requeridas.update(uniones)
+
+        query = f"SELECT {', '.join(expresiones)} FROM {self.tabla.origen}"
+        for alias, union in self.tabla.uniones.items():
+            if alias in uniones_requeridas:
+                query += f" {union}"
+        return query
+
+    @staticmethod
+    def _where(condiciones):
+        """Cláusula WHERE a partir de una lista de condiciones."""
+        if not condiciones:
+            return ""
+        return " WHERE " + " AND ".join(condiciones)
@@ -1,12 +1,35 @@
 import pymysql
+from pymysql.constants import CLIENT
 import configparser
+import time
+from database.cancelacion import ERROR_INTERRUMPIDA, ERRORES_CANCELACION, limitar_tiempo
+from database.filas import CursorFilas
+from database.instrumentacion import registrar_sentencia
+from database.replicas import REPLICAS, es_lectura_replicable
+from database.resiliencia import (CORTOCIRCUITO, INTERVALO_PING, MAXIMO_REINTENTOS, codigo_error,
+                                  es_conexion_perdida, es_reintentable, espera_reintento)
+from database.unidad_trabajo import unidad_activa
 
 class Database:
     """Clase para gestionar la conexión a la base de datos con PyMySQL y un archivo de configuración."""
 
+    # Fábrica de conexiones alternativa (por ejemplo database.memoria en pruebas); None usa MySQL
+    fabrica_conexion = None
+
     def __init__(self):
         self.connection = None
         self.config = {}
+        self._ultimo_uso = 0.0
+        # Error de la última sentencia fallida (None si la última tuvo éxito)
+        self.ultimo_error = None
+        # Sentencia en ejecución: (réplica o None para la primaria, ID de la conexión)
+        self.consulta_en_curso = None
+        # Cancelación de la tarea que usa la sesión (Cancelacion.vincular)
+        self.cancelacion = None
+        # Conexión con la réplica de lectura de esta sesión
+        self.conexion_lectura = None
+        self._replica = None
+        self._ultima_escritura = None
         self.load_config()
 
     def load_config(self):
@@ -26,54 +49,334 @@ class Database:
             self.config = None
 
     def connect(self):
-        """Establece la conexión con la base de datos."""
-        if not self.config:
+        """
+        Establece la conexión con la base de datos.
+        Con el cortocircuito abierto falla de inmediato sin intentar conectar.
+        """
+        if not CORTOCIRCUITO.permitir():
+            print("Base de datos no disponible (cortocircuito abierto).")
+            self.connection = None
+            return
+
+        if Database.fabrica_conexion is not None:
+            fabrica, argumentos = Database.fabrica_conexion, {}
+        elif not self.config:
             print("No se pudo cargar la configuración de la base de datos.")
             return
+        else:
+            fabrica = pymysql.connect
+            argumentos = dict(self.config, cursorclass=CursorFilas, client_flag=CLIENT.FOUND_ROWS)
 
         try:
-            self.connection = pymysql.connect(**self.config)
-            print("Conexión a la base de datos exitosa.")
+            self.connection = fabrica(**argumentos)
+            self._ultimo_uso = time.monotonic()
+            CORTOCIRCUITO.registrar_exito()
+            if fabrica is pymysql.connect:
+                print("Conexión a la base de datos exitosa.")
         except pymysql.MySQLError as err:
+            CORTOCIRCUITO.registrar_fallo()
             print(f"Error de conexión: {err}")
             self.connection = None
 
+    def id_conexion(self):
+        """
+        ID de la conexión en el servidor (el que recibe KILL QUERY).
+        
+        Returns:
+            int: ID de la conexión o None si no está conectada
+        """
+        if self.connection and self.connection.open:
+            return self.connection.thread_id()
+        return None
+
+    def marcar_escritura(self):
+        """Registra que la sesión escribió: sus lecturas van a la primaria por retraso_maximo segundos."""
+        self._ultima_escritura = time.monotonic()
+
     def disconnect(self):
-        """Cierra la conexión con la base de datos."""
+        """Cierra la conexión con la base de datos (y la de la réplica, si hay)."""
+        self._cerrar_lectura()
         if self.connection and self.connection.open:
             self.connection.close()
             print("Conexión a la base de datos cerrada.")
     
-    def execute_query(self, query, params=None):
-        """Ejecuta una consulta SQL con seguridad."""
-        if not self.connection or not self.connection.open:
-            print("No hay conexión a la base de datos.")
+    def _conexion_replica(self, query):
+        """
+        Obtiene la conexión de réplica para una lectura, o None si debe ir a la primaria:
+        no hay réplicas sanas, hay una unidad de trabajo activa, la sesión escribió
+        hace menos de retraso_maximo segundos o la consulta bloquea filas.
+        """
+        if not REPLICAS.replicas or unidad_activa() is not None or not es_lectura_replicable(query):
+            return None
+        if self._ultima_escritura is not None and \
+                time.monotonic() - self._ultima_escritura < REPLICAS.retraso_maximo:
+            return None
+        
+        replica = REPLICAS.elegir(self._replica)
+        if replica is None:
+            self._cerrar_lectura()
             return None
+        if replica is not self._replica or not self.conexion_lectura or not self.conexion_lectura.open:
+            self._cerrar_lectura()
+            try:
+                self.conexion_lectura = replica.conectar()
+                self._replica = replica
+            except pymysql.MySQLError as err:
+                REPLICAS.marcar_caida(replica, err)
+                return None
+        return self.conexion_lectura
+    
+    def _cerrar_lectura(self):
+        """Cierra la conexión con la réplica ignorando errores."""
+        if self.conexion_lectura is not None:
+            try:
+                self.conexion_lectura.close()
+            except Exception:
+                pass
+        self.conexion_lectura = None
+        self._replica = None
+    
+    def _leer_replica(self, conexion, query, params, conversiones):
+        """
+        Ejecuta una lectura en la réplica de la sesión.
         
-        cursor = self.connection.cursor()
+        Returns:
+            list: Filas, o None si la réplica falló y hay que leer de la primaria
+        """
+        replica = self._replica
+        cursor = conexion.cursor(CursorFilas)
+        cursor.conversiones = conversiones
+        inicio = time.perf_counter()
+        self.consulta_en_curso = (replica, conexion.thread_id())
         try:
             cursor.execute(query, params)
-            self.connection.commit()
-            return cursor.lastrowid
+            registrar_sentencia(query, params, inicio)
+            self.ultimo_error = None
+            return cursor.fetchall()
         except pymysql.MySQLError as err:
-            self.connection.rollback()
-            print(f"Error al ejecutar la consulta: {err}")
+            registrar_sentencia(query, params, inicio, error=True)
+            if codigo_error(err) in ERRORES_CANCELACION:
+                # Cancelada o fuera de tiempo: no se repite en la primaria
+                self.ultimo_error = err
+                print(f"Error al obtener los datos: {err}")
+                return []
+            REPLICAS.marcar_caida(replica, err)
+            self._cerrar_lectura()
             return None
         finally:
+            self.consulta_en_curso = None
             cursor.close()
+    
+    def _conexion_activa(self):
+        """
+        Obtiene la conexión a usar: la de la unidad de trabajo activa
+        (si la hay) o la conexión propia, verificada al tomarla.
+        """
+        unidad = unidad_activa()
+        conexion = unidad.connection if unidad else self._verificar_conexion()
+        if not conexion or not conexion.open:
+            return unidad, None
+        return unidad, conexion
+    
+    def _verificar_conexion(self):
+        """
+        Verifica la conexión propia antes de usarla y reconecta si se perdió.
+        Si lleva más de INTERVALO_PING segundos sin usarse se comprueba con ping.
+        
+        Returns:
+            Conexión lista para usar o None
+        """
+        conexion = self.connection
+        if conexion and conexion.open:
+            if time.monotonic() - self._ultimo_uso < INTERVALO_PING:
+                return conexion
+            try:
+                conexion.ping(reconnect=False)
+                self._ultimo_uso = time.monotonic()
+                return conexion
+            except pymysql.MySQLError as err:
+                print(f"Conexión perdida ({err}); reconectando.")
+        return self._reconectar()
+    
+    def _reconectar(self):
+        """Descarta la conexión actual y abre una nueva."""
+        self._descartar_conexion()
+        self.connect()
+        return self.connection
+    
+    def _descartar_conexion(self):
+        """Cierra la conexión actual ignorando errores (puede estar rota)."""
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+        self.connection = None
+    
+    def _manejar_error(self, err, unidad, conexion, intento):
+        """
+        Decide qué hacer tras el error de una sentencia.
+        
+        Fuera de una unidad de trabajo se deshace la sentencia y, si fue un
+        deadlock o una espera de bloqueo, se reintenta tras una espera con
+        jitter. Dentro de una unidad no se reintenta (la transacción completa
+        quedó deshecha o inconsistente) y se marca el bloque como fallido.
+        
+        Returns:
+            bool: True si hay que reintentar la sentencia
+        """
+        if es_conexion_perdida(err):
+            CORTOCIRCUITO.registrar_fallo()
+            if unidad is None:
+                self._descartar_conexion()
+            else:
+                unidad.marcar_fallida()
+            return False
+        
+        if unidad is not None:
+            unidad.marcar_fallida()
+            return False
+        
+        try:
+            conexion.rollback()
+        except pymysql.MySQLError:
+            pass
+        if es_reintentable(err) and intento < MAXIMO_REINTENTOS:
+            espera = espera_reintento(intento + 1)
+            print(f"Reintentando la sentencia en {espera * 1000:.0f} ms ({err})")
+            time.sleep(espera)
+            return True
+        return False
+    
+    def _cancelada(self):
+        """
+        Indica si la tarea de la sesión fue cancelada; sus sentencias ya no se
+        envían y fallan como interrumpidas (el motivo queda en ultimo_error).
+        """
+        if self.cancelacion is None or not self.cancelacion.cancelada:
+            return False
+        self.ultimo_error = pymysql.err.OperationalError(ERROR_INTERRUMPIDA, "Query execution was interrupted")
+        return True
+    
+    def _ejecutar(self, query, params=None):
+        """
+        Ejecuta una sentencia de modificación.
+        Dentro de una unidad de trabajo el commit se difiere al final de la unidad.
+        
+        Una conexión perdida no se reintenta aquí: no se sabe si el commit
+        llegó a aplicarse. La siguiente sentencia reconecta.
+        
+        Returns:
+            tuple: (lastrowid, filas_afectadas) o None si hubo error
+        """
+        if self._cancelada():
+            return None
+        
+        unidad, conexion = self._conexion_activa()
+        if not conexion:
+            print("No hay conexión a la base de datos.")
+            self.ultimo_error = pymysql.err.OperationalError(2006, "No hay conexión a la base de datos")
+            return None
+        
+        intento = 0
+        while True:
+            cursor = conexion.cursor()
+            inicio = time.perf_counter()
+            self.consulta_en_curso = (None, conexion.thread_id())
+            try:
+                cursor.execute(query, params)
+                registrar_sentencia(query, params, inicio)
+                if unidad is None:
+                    conexion.commit()
+                self._ultimo_uso = self._ultima_escritura = time.monotonic()
+                self.ultimo_error = None
+                return cursor.lastrowid, cursor.rowcount
+            except pymysql.MySQLError as err:
+                registrar_sentencia(query, params, inicio, error=True)
+                self.ultimo_error = err
+                if self._manejar_error(err, unidad, conexion, intento):
+                    intento += 1
+                    continue
+                print(f"Error al ejecutar la consulta: {err}")
+                return None
+            finally:
+                self.consulta_en_curso = None
+                cursor.close()
+    
+    def execute_query(self, query, params=None):
+        """Ejecuta una consulta SQL con seguridad y devuelve el ID insertado."""
+        resultado = self._ejecutar(query, params)
+        return resultado[0] if resultado else None
+    
+    def execute_update(self, query, params=None):
+        """
+        Ejecuta un UPDATE/DELETE y devuelve el número de filas coincidentes
+        (la conexión usa FOUND_ROWS), o None si hubo error.
+        """
+        resultado = self._ejecutar(query, params)
+        return resultado[1] if resultado else None
+
+    def fetch_all(self, query, params=None, conversiones=None, timeout=None):
+        """
+        Ejecuta una consulta y devuelve todos los resultados como filas
+        inmutables accesibles por nombre de columna.
 
-    def fetch_all(self, query, params=None):
-        """Ejecuta una consulta y devuelve todos los resultados."""
-        if not self.connection or not self.connection.open:
+        Si hay réplicas configuradas la lectura puede ir a una de ellas
+        (database.replicas); si la réplica falla se lee de la primaria.
+        Si la consulta se interrumpe (timeout o KILL QUERY) devuelve una lista
+        vacía y el motivo queda en ultimo_error.
+
+        Args:
+            query (str): Consulta SQL
+            params: Parámetros de la consulta
+            conversiones (dict): Funciones de conversión por nombre de columna
+            timeout (float): Segundos máximos de ejecución (MAX_EXECUTION_TIME)
+        """
+        if self._cancelada():
+            return []
+        if timeout:
+            query = limitar_tiempo(query, timeout)
+        
+        conexion_replica = self._conexion_replica(query)
+        if conexion_replica is not None:
+            filas = self._leer_replica(conexion_replica, query, params, conversiones)
+            if filas is not None:
+                return filas
+        
+        unidad, conexion = self._conexion_activa()
+        if not conexion:
             print("No hay conexión a la base de datos.")
+            self.ultimo_error = pymysql.err.OperationalError(2006, "No hay conexión a la base de datos")
             return []
 
-        cursor = self.connection.cursor()
-        try:
-            cursor.execute(query, params)
-            return cursor.fetchall()
-        except pymysql.MySQLError as err:
-            print(f"Error al obtener los datos: {err}")
-            return []
-        finally:
-            cursor.close()
+        intento = 0
+        reconectada = False
+        while True:
+            cursor = conexion.cursor(CursorFilas)
+            cursor.conversiones = conversiones
+            inicio = time.perf_counter()
+            self.consulta_en_curso = (None, conexion.thread_id())
+            try:
+                cursor.execute(query, params)
+                registrar_sentencia(query, params, inicio)
+                filas = cursor.fetchall()
+                self._ultimo_uso = time.monotonic()
+                self.ultimo_error = None
+                return filas
+            except pymysql.MySQLError as err:
+                registrar_sentencia(query, params, inicio, error=True)
+                self.ultimo_error = err
+                if self._manejar_error(err, unidad, conexion, intento):
+                    intento += 1
+                    continue
+                # Una lectura fuera de una unidad de trabajo se repite una vez con otra conexión
+                if unidad is None and es_conexion_perdida(err) and not reconectada:
+                    reconectada = True
+                    conexion = self._reconectar()
+                    if conexion:
+                        continue
+                print(f"Error al obtener los datos: {err}")
+                return []
+            finally:
+                self.consulta_en_curso = None
+                cursor.close()
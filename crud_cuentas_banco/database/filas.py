@@ -0,0 +1,137 @@
+"""
+Filas de resultado compactas e inmutables para las consultas del sistema.
+Los nombres de columna se resuelven una sola vez por consulta a partir de
+la descripción del cursor, y cada fila es una tupla accesible por nombre.
+"""
+
+from functools import lru_cache
+from operator import itemgetter
+import pymysql.cursors
+
+
+class Fila(tuple):
+    """
+    Fila inmutable de un resultado de consulta.
+
+    Se comporta como una tupla (acceso por posición) y como un diccionario
+    de solo lectura (acceso por nombre de columna, get, keys, items).
+    """
+
+    __slots__ = ()
+
+    # Se definen en cada subclase generada por clase_fila
+    _campos = ()
+    _indices = {}
+
+    def __getitem__(self, clave):
+        if isinstance(clave, str):
+            try:
+                return tuple.__getitem__(self, self._indices[clave])
+            except KeyError:
+                raise KeyError(clave) from None
+        return tuple.__getitem__(self, clave)
+
+    def __contains__(self, clave):
+        return clave in self._indices
+
+    def get(self, clave, defecto=None):
+        """Obtiene el valor de una columna o el valor por defecto."""
+        indice = self._indices.get(clave)
+        if indice is None:
+            return defecto
+        return tuple.__getitem__(self, indice)
+
+    def keys(self):
+        """Retorna los nombres de las columnas."""
+        return self._campos
+
+    def values(self):
+        """Retorna los valores de la fila."""
+        return tuple(self)
+
+    def items(self):
+        """Retorna pares (columna, valor)."""
+        return zip(self._campos, self)
+
+    def _asdict(self):
+        """Convierte la fila en un diccionario mutable."""
+        return dict(zip(self._campos, self))
+
+    def __repr__(self):
+        contenido = ", ".join(f"{campo}={valor!r}" for campo, valor in zip(self._campos, self))
+        return f"Fila({contenido})"
+
+
+@lru_cache(maxsize=256)
+def clase_fila(campos):
+    """
+    Obtiene (o genera) la clase de fila para una secuencia de columnas.
+
+    Args:
+        campos (tuple): Nombres de columna en el orden del resultado
+
+    Returns:
+        type: Subclase de Fila con acceso por atributo a cada columna
+    """
+    atributos = {
+        '__slots__': (),
+        '_campos': campos,
+        '_indices': {campo: indice for indice, campo in enumerate(campos)},
+    }
+    for indice, campo in enumerate(campos):
+        if campo.isidentifier() and not hasattr(Fila, campo):
+            atributos[campo] = property(itemgetter(indice))
+    return type('Fila', (Fila,), atributos)
+
+
+def construir_filas(campos, filas, conversiones=None):
+    """
+    Convierte tuplas de un resultado en instancias de Fila.
+
+    Args:
+        campos (tuple): Nombres de columna en el orden del resultado
+        filas (iterable): Tuplas de valores
+        conversiones (dict): Funciones de conversión por nombre de columna
+
+    Returns:
+        list: Filas del resultado
+    """
+    clase = clase_fila(tuple(campos))
+    conversiones = [(indice, conversiones[nombre])
+                    for indice, nombre in enumerate(campos)
+                    if conversiones and nombre in conversiones]
+    if conversiones:
+        return [clase(CursorFilas._convertir(fila, conversiones)) for fila in filas]
+    return [clase(fila) for fila in filas]
+
+
+class CursorFilas(pymysql.cursors.Cursor):
+    """
+    Cursor que entrega instancias de Fila en lugar de tuplas simples.
+
+    El atributo conversiones (dict columna -> función) permite normalizar
+    valores puntuales, por ejemplo DECIMAL a float, sin recorrer la fila entera.
+    """
+
+    conversiones = None
+
+    def _do_get_result(self):
+        super()._do_get_result()
+        if not self.description or not self._rows:
+            return
+
+        campos = []
+        for campo in self._result.fields:
+            nombre = campo.name
+            if nombre in campos:
+                nombre = f"{campo.table_name}.{nombre}"
+            campos.append(nombre)
+        self._rows = construir_filas(campos, self._rows, self.conversiones)
+
+    @staticmethod
+    def _convertir(fila, conversiones):
+        """Aplica las conversiones por columna a una fila."""
+        valores = list(fila)
+        for indice, funcion in conversiones:
+            valores[indice] = funcion(valores[indice])
+        return valores
@@ -0,0 +1,221 @@
+"""
+Conteo de las sentencias SQL emitidas por Database.
+
+Mientras hay un registro activo en el contexto actual, cada sentencia
+ejecutada con execute_query, execute_update o fetch_all se anota con su
+duración. Sirve para ver cuántas consultas hace una operación de un
+controlador y para fijar en pruebas un máximo que detecte regresiones.
+
+Uso:
+    with contar_sentencias() as registro:
+        controlador.actualizar_cliente(1, datos)
+    print(registro.total, registro.por_tipo())
+
+    with limite_sentencias(4, "actualizar_cliente"):
+        controlador.actualizar_cliente(1, datos)
+
+    instrumentar_controlador(controlador)   # acumula en ESTADISTICAS por método
+"""
+
+from contextlib import contextmanager
+import contextvars
+import functools
+import threading
+import time
+
+from utils import trazas
+
+# Registros activos en el contexto actual (los anidados también reciben las sentencias)
+_registros_activos = contextvars.ContextVar('registros_sentencias', default=())
+
+
+class Sentencia:
+    """Sentencia ejecutada: SQL, parámetros, duración y si falló."""
+
+    __slots__ = ('sql', 'params', 'duracion_ms', 'error')
+
+    def __init__(self, sql, params, duracion_ms, error):
+        self.sql = sql
+        self.params = params
+        self.duracion_ms = duracion_ms
+        self.error = error
+
+    @property
+    def tipo(self):
+        """Primera palabra de la sentencia (SELECT, INSERT, UPDATE...)."""
+        partes = self.sql.split(None, 1)
+        return partes[0].upper() if partes else ''
+
+    def __repr__(self):
+        sql = " ".join(self.sql.split())
+        estado = ", con error" if self.error else ""
+        return f"{sql[:120]}{'...' if len(sql) > 120 else ''} ({self.duracion_ms:.2f} ms{estado})"
+
+
+class RegistroSentencias:
+    """Sentencias anotadas mientras el registro estuvo activo."""
+
+    def __init__(self):
+        self.sentencias = []
+
+    @property
+    def total(self):
+        """Cantidad de sentencias."""
+        return len(self.sentencias)
+
+    @property
+    def duracion_ms(self):
+        """Tiempo total en la BD (ms)."""
+        return sum(sentencia.duracion_ms for sentencia in self.sentencias)
+
+    def por_tipo(self):
+        """
+        Cuenta las sentencias por tipo.
+
+        Returns:
+            dict: Tipo -> cantidad
+        """
+        conteo = {}
+        for sentencia in self.sentencias:
+            conteo[sentencia.tipo] = conteo.get(sentencia.tipo, 0) + 1
+        return conteo
+
+    def detalle(self):
+        """Texto con una línea por sentencia (para mensajes de error)."""
+        return "\n".join(f"  {indice}. {sentencia!r}" for indice, sentencia in enumerate(self.sentencias, 1))
+
+
+def registrar_sentencia(sql, params, inicio, error=False):
+    """
+    Anota una sentencia en los registros activos y, si están activas, en las trazas.
+    Lo llama Database después de cada ejecución; sin registros ni trazas no hace nada.
+
+    Args:
+        sql (str): Sentencia ejecutada
+        params: Parámetros de la sentencia
+        inicio (float): time.perf_counter() tomado antes de ejecutarla
+        error (bool): Si la sentencia falló
+    """
+    if trazas.activas():
+        trazas.registrar_sql(sql, inicio)
+    registros = _registros_activos.get()
+    if not registros:
+        return
+    sentencia = Sentencia(sql, params, (time.perf_counter() - inicio) * 1000, error)
+    for registro in registros:
+        registro.sentencias.append(sentencia)
+
+
+@contextmanager
+def contar_sentencias():
+    """
+    Registra las sentencias emitidas dentro del bloque en el contexto actual.
+
+    Yields:
+        RegistroSentencias: Registro que se completa durante el bloque
+    """
+    registro = RegistroSentencias()
+    token = _registros_activos.set(_registros_activos.get() + (registro,))
+    try:
+        yield registro
+    finally:
+        _registros_activos.reset(token)
+
+
+@contextmanager
+def limite_sentencias(maximo, descripcion=None):
+    """
+    Verifica que el bloque no emita más de `maximo` sentencias.
+    Pensado para pruebas: falla con la lista de sentencias emitidas.
+
+    Args:
+        maximo (int): Cantidad máxima permitida
+        descripcion (str): Nombre de la operación para el mensaje
+
+    Yields:
+        RegistroSentencias: Registro del bloque
+
+    Raises:
+        AssertionError: Si se superó el máximo
+    """
+    with contar_sentencias() as registro:
+        yield registro
+    if registro.total > maximo:
+        raise AssertionError(
+            f"{descripcion or 'La operación'} emitió {registro.total} sentencias (máximo {maximo}):\n"
+            f"{registro.detalle()}")
+
+
+class EstadisticasOperaciones:
+    """Sentencias por llamada acumuladas por operación (compartidas entre hilos)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operaciones = {}
+
+    def agregar(self, operacion, registro):
+        """Acumula el registro de una llamada a la operación."""
+        with self._lock:
+            datos = self._operaciones.setdefault(
+                operacion, {'llamadas': 0, 'sentencias': 0, 'maximo': 0, 'duracion_ms': 0.0})
+            datos['llamadas'] += 1
+            datos['sentencias'] += registro.total
+            datos['maximo'] = max(datos['maximo'], registro.total)
+            datos['duracion_ms'] += registro.duracion_ms
+
+    def resumen(self):
+        """
+        Retorna las estadísticas por operación.
+
+        Returns:
+            dict: Operación -> llamadas, sentencias, promedio, máximo y duración en BD
+        """
+        with self._lock:
+            return {
+                operacion: dict(datos, promedio=round(datos['sentencias'] / datos['llamadas'], 2),
+                                duracion_ms=round(datos['duracion_ms'], 3))
+                for operacion, datos in self._operaciones.items()
+            }
+
+    def limpiar(self):
+        """Olvida las estadísticas acumuladas."""
+        with self._lock:
+            self._operaciones.clear()
+
+
+ESTADISTICAS = EstadisticasOperaciones()
+
+
+def instrumentar_controlador(controlador, estadisticas=None):
+    """
+    Envuelve los métodos públicos de un controlador para registrar las
+    sentencias de cada llamada en las estadísticas.
+
+    Args:
+        controlador: Instancia de un controlador
+        estadisticas (EstadisticasOperaciones): Destino (por defecto ESTADISTICAS)
+
+    Returns:
+        El mismo controlador
+    """
+    estadisticas = estadisticas or ESTADISTICAS
+    clase = type(controlador).__name__
+    for nombre in dir(controlador):
+        metodo = getattr(controlador, nombre)
+        if nombre.startswith('_') or not callable(metodo) or getattr(metodo, '_sentencias', False):
+            continue
+        setattr(controlador, nombre, _envolver(metodo, f"{clase}.{nombre}", estadisticas))
+    return controlador
+
+
+def _envolver(metodo, operacion, estadisticas):
+    """Método que registra sus sentencias en las estadísticas."""
+    @functools.wraps(metodo)
+    def envoltura(*args, **kwargs):
+        with contar_sentencias() as registro:
+            try:
+                return metodo(*args, **kwargs)
+            finally:
+                estadisticas.agregar(operacion, registro)
+    envoltura._sentencias = True
+    return envoltura
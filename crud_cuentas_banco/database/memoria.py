@@ -0,0 +1,534 @@
+"""
+Base de datos en memoria (SQLite) compatible con la parte de PyMySQL que usa
+la aplicación, para pruebas y mediciones sin un servidor MySQL.
+
+Las conexiones traducen al vuelo lo propio de MySQL que generan los modelos
+y script.sql: marcadores %s / %(nombre)s, AUTO_INCREMENT, ON DUPLICATE KEY
+UPDATE con VALUES(), NOW(), START TRANSACTION, SET FOREIGN_KEY_CHECKS,
+CHECKSUM TABLE, ANALYZE/OPTIMIZE TABLE, KILL QUERY, SHOW REPLICA STATUS (sin
+retraso), la pista MAX_EXECUTION_TIME y las cadenas con escapes de barra
+invertida. Los errores se entregan como excepciones de PyMySQL con los
+códigos de MySQL equivalentes.
+
+Uso:
+    from database import memoria
+    motor = memoria.activar()          # esquema y datos de script.sql
+    ...                                # Database() se conecta a la BD en memoria
+    memoria.desactivar()
+
+Limitaciones: todas las conexiones comparten una caché de SQLite, así que
+solo una puede tener una transacción de escritura abierta a la vez y las
+lecturas de las demás ven los cambios aún no confirmados; y los
+convertidores de DATE, TIMESTAMP y DECIMAL se registran globalmente en sqlite3.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+import itertools
+import os
+import re
+import sqlite3
+import time
+import weakref
+import zlib
+
+from pymysql import err
+from database.connection import Database
+from database.filas import construir_filas
+
+RUTA_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'script.sql')
+
+# Todas las columnas DECIMAL del esquema tienen dos decimales
+_CENTESIMOS = Decimal('0.01')
+
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda valor: valor.isoformat(sep=' '))
+sqlite3.register_converter('DECIMAL', lambda valor: Decimal(valor.decode()).quantize(_CENTESIMOS))
+sqlite3.register_converter('DATE', lambda valor: date.fromisoformat(valor.decode()[:10]))
+sqlite3.register_converter('TIMESTAMP', lambda valor: datetime.fromisoformat(valor.decode()))
+sqlite3.register_converter('DATETIME', lambda valor: datetime.fromisoformat(valor.decode()))
+
+_contador_motores = itertools.count(1)
+
+# Conexiones abiertas por ID (el que recibe KILL QUERY)
+_contador_conexiones = itertools.count(1)
+_conexiones = weakref.WeakValueDictionary()
+
+
+# Traducción de sentencias
+
+# Sentencias de sesión o administración que no se envían tal cual a SQLite
+_ESPECIALES = (
+    ('claves_foraneas', re.compile(r"^SET\s+FOREIGN_KEY_CHECKS\s*=\s*(\d)$", re.I)),
+    ('cancelar', re.compile(r"^KILL\s+QUERY\s+(\d+)$", re.I)),
+    ('estado_replica', re.compile(r"^SHOW\s+(REPLICA|SLAVE)\s+STATUS$", re.I)),
+    ('ignorar', re.compile(r"^(SET|USE|CREATE\s+DATABASE|KILL)\b", re.I)),
+    ('iniciar', re.compile(r"^(START\s+TRANSACTION|BEGIN)\b", re.I)),
+    ('confirmar', re.compile(r"^COMMIT$", re.I)),
+    ('deshacer', re.compile(r"^ROLLBACK$", re.I)),
+    ('checksum', re.compile(r"^CHECKSUM\s+TABLE\s+(.+)$", re.I | re.S)),
+    ('mantenimiento', re.compile(r"^(ANALYZE|OPTIMIZE)\s+TABLE\s+(.+)$", re.I | re.S)),
+)
+
+# Reescrituras de MySQL a SQLite aplicadas fuera de las cadenas
+_REESCRITURAS = (
+    (re.compile(r"\bINT(EGER)?\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.I), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r"\s+AUTO_INCREMENT\b(\s*=\s*\d+)?", re.I), ""),
+    (re.compile(r"\b(ENGINE|(DEFAULT\s+)?CHARSET|COLLATE)\s*=\s*\w+", re.I), ""),
+    (re.compile(r"\s+UNSIGNED\b", re.I), ""),
+    (re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.I), "ON CONFLICT DO UPDATE SET"),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.I), "INSERT OR IGNORE"),
+    (re.compile(r"\bNOW\(\)", re.I), "CURRENT_TIMESTAMP"),
+    (re.compile(r"\bCURDATE\(\)", re.I), "CURRENT_DATE"),
+    (re.compile(r"\bGREATEST\(", re.I), "MAX("),
+    (re.compile(r"\bLEAST\(", re.I), "MIN("),
+    (re.compile(r"^UPDATE\s+(\w+)\s+(?!SET\b)(\w+)\s+SET\b", re.I), r"UPDATE \1 AS \2 SET"),
+)
+_VALUES_UPSERT = re.compile(r"\bVALUES\((\w+)\)", re.I)
+_MARCADOR = re.compile(r"%\((\w+)\)s|%s|%%")
+_TIEMPO_MAXIMO = re.compile(r"/\*\+\s*MAX_EXECUTION_TIME\((\d+)\)\s*\*/", re.I)
+
+# Operaciones de la máquina virtual de SQLite entre verificaciones del tiempo máximo
+_PASOS_VERIFICACION = 1000
+
+
+def _segmentos(sql):
+    """
+    Divide el SQL en segmentos de código y de cadena, quitando los
+    comentarios de línea y convirtiendo las cadenas a la sintaxis de SQLite
+    (comillas simples duplicadas en lugar de escapes con barra invertida).
+
+    Returns:
+        list: Tuplas (es_cadena, texto)
+    """
+    segmentos = []
+    codigo = []
+    i, n = 0, len(sql)
+    while i < n:
+        caracter = sql[i]
+        if caracter in "'\"":
+            valor = []
+            i += 1
+            while i < n:
+                if sql[i] == '\\' and i + 1 < n:
+                    siguiente = sql[i + 1]
+                    valor.append({'n': '\n', 't': '\t', 'r': '\r', '0': '\0'}.get(siguiente, siguiente))
+                    i += 2
+                elif sql[i] == caracter and sql[i + 1:i + 2] == caracter:
+                    valor.append(caracter)
+                    i += 2
+                elif sql[i] == caracter:
+                    i += 1
+                    break
+                else:
+                    valor.append(sql[i])
+                    i += 1
+            segmentos.append((False, "".join(codigo)))
+            codigo = []
+            segmentos.append((True, "'" + "".join(valor).replace("'", "''") + "'"))
+        elif caracter == '`':
+            fin = sql.find('`', i + 1)
+            fin = n if fin < 0 else fin
+            codigo.append('"' + sql[i + 1:fin] + '"')
+            i = fin + 1
+        elif sql.startswith('--', i) or caracter == '#':
+            fin = sql.find('\n', i)
+            i = n if fin < 0 else fin
+        else:
+            codigo.append(caracter)
+            i += 1
+    segmentos.append((False, "".join(codigo)))
+    return segmentos
+
+
+def dividir_script(script):
+    """
+    Divide un script SQL en sentencias (punto y coma fuera de las cadenas).
+
+    Returns:
+        list: Sentencias sin comentarios, en sintaxis de cadenas de SQLite
+    """
+    sentencias = []
+    actual = []
+    for es_cadena, texto in _segmentos(script):
+        if es_cadena:
+            actual.append(texto)
+            continue
+        partes = texto.split(';')
+        actual.append(partes[0])
+        for parte in partes[1:]:
+            sentencias.append("".join(actual).strip())
+            actual = [parte]
+    sentencias.append("".join(actual).strip())
+    return [sentencia for sentencia in sentencias if sentencia]
+
+
+@lru_cache(maxsize=1024)
+def traducir(sql, con_parametros=True):
+    """
+    Traduce una sentencia de MySQL a SQLite (con caché: los modelos repiten
+    el mismo SQL compilado).
+
+    Args:
+        sql (str): Sentencia en sintaxis de MySQL
+        con_parametros (bool): Si se ejecuta con parámetros (PyMySQL solo
+            interpreta los marcadores % en ese caso)
+
+    Returns:
+        tuple: (tipo, sql_traducido, coincidencia) donde tipo es 'sql',
+            'consulta', 'upsert' o el de una sentencia especial de _ESPECIALES
+    """
+    partes = []
+    for es_cadena, texto in _segmentos(sql.strip().rstrip(';')):
+        if con_parametros:
+            texto = _MARCADOR.sub(lambda m: f":{m.group(1)}" if m.group(1) else ('?' if m.group(0) == '%s' else '%'),
+                                  texto)
+        if not es_cadena:
+            for patron, reemplazo in _REESCRITURAS:
+                texto = patron.sub(reemplazo, texto)
+        partes.append(texto)
+    traducido = "".join(partes).strip()
+
+    for tipo, patron in _ESPECIALES:
+        coincidencia = patron.match(traducido)
+        if coincidencia:
+            return tipo, traducido, coincidencia.groups()
+
+    if "ON CONFLICT DO UPDATE SET" in traducido:
+        inicio, asignaciones = traducido.split("ON CONFLICT DO UPDATE SET", 1)
+        asignaciones = _VALUES_UPSERT.sub(r"excluded.\1", asignaciones).strip()
+        # Solo se actualizan las filas con algún valor distinto (FILA_CAMBIA las cuenta)
+        comparaciones = ", ".join(f"{columna.strip()} IS NOT ({valor.strip()})"
+                                  for columna, valor in (asignacion.split('=', 1)
+                                                         for asignacion in _dividir_asignaciones(asignaciones)))
+        traducido = (f"{inicio}ON CONFLICT DO UPDATE SET {asignaciones} "
+                     f"WHERE FILA_CAMBIA({comparaciones})")
+        return 'upsert', traducido, None
+    if re.match(r"(SELECT|WITH)\b", traducido, re.I):
+        return 'consulta', traducido, None
+    return 'sql', traducido, None
+
+
+def _dividir_asignaciones(texto):
+    """Separa las asignaciones de un UPDATE por las comas fuera de paréntesis y cadenas."""
+    asignaciones = []
+    nivel, en_cadena, inicio = 0, False, 0
+    for i, caracter in enumerate(texto):
+        if caracter == "'":
+            en_cadena = not en_cadena
+        elif en_cadena:
+            continue
+        elif caracter == '(':
+            nivel += 1
+        elif caracter == ')':
+            nivel -= 1
+        elif caracter == ',' and nivel == 0:
+            asignaciones.append(texto[inicio:i])
+            inicio = i + 1
+    asignaciones.append(texto[inicio:])
+    return asignaciones
+
+
+def _error_mysql(error):
+    """Convierte un error de sqlite3 en el error de PyMySQL con el código de MySQL equivalente."""
+    mensaje = str(error)
+    if isinstance(error, sqlite3.IntegrityError):
+        if mensaje.startswith('UNIQUE') or mensaje.startswith('PRIMARY KEY'):
+            return err.IntegrityError(1062, f"Duplicate entry for key '{mensaje.split(': ', 1)[-1]}'")
+        if 'FOREIGN KEY' in mensaje:
+            return err.IntegrityError(1452, "Cannot add or update a child row: a foreign key constraint fails")
+        if mensaje.startswith('NOT NULL'):
+            return err.IntegrityError(1048, f"Column '{mensaje.rsplit('.', 1)[-1]}' cannot be null")
+        return err.IntegrityError(1105, mensaje)
+    if 'no such table' in mensaje:
+        return err.ProgrammingError(1146, f"Table '{mensaje.split(': ', 1)[-1]}' doesn't exist")
+    if 'no such column' in mensaje:
+        return err.OperationalError(1054, f"Unknown column '{mensaje.split(': ', 1)[-1]}'")
+    if 'locked' in mensaje or 'busy' in mensaje:
+        return err.OperationalError(1205, "Lock wait timeout exceeded; try restarting transaction")
+    if 'syntax error' in mensaje:
+        return err.ProgrammingError(1064, mensaje)
+    if 'interrupted' in mensaje:
+        return err.OperationalError(1317, "Query execution was interrupted")
+    return err.OperationalError(1105, mensaje)
+
+
+# Conexión y cursor
+
+class CursorMemoria:
+    """Cursor con la interfaz de pymysql.cursors.Cursor que entrega filas inmutables."""
+
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.conversiones = None
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+        self._filas = []
+        self._posicion = 0
+
+    def execute(self, query, args=None):
+        """Ejecuta una sentencia y retorna las filas afectadas."""
+        sqlite = self.conexion._activa()
+        if args is not None and not isinstance(args, (dict, list, tuple)):
+            args = (args,)
+        tipo, sql, grupos = traducir(query, args is not None)
+        parametros = args if isinstance(args, dict) else tuple(args or ())
+        self.description, self._filas, self._posicion = None, [], 0
+
+        limite = _TIEMPO_MAXIMO.search(sql) if tipo == 'consulta' else None
+        vencimiento = time.monotonic() + int(limite.group(1)) / 1000 if limite else None
+        if vencimiento is not None:
+            sqlite.set_progress_handler(lambda: time.monotonic() > vencimiento, _PASOS_VERIFICACION)
+
+        try:
+            if tipo in ('sql', 'upsert', 'consulta'):
+                # Las lecturas fuera de una transacción no la abren: en la caché
+                # compartida bloquearían las escrituras de las demás conexiones
+                if tipo != 'consulta' and not sqlite.in_transaction:
+                    sqlite.execute("BEGIN")
+                self.conexion.filas_comparadas = [0, 0]
+                cursor = sqlite.execute(sql, parametros)
+                if cursor.description:
+                    self._resultado([columna[0] for columna in cursor.description], cursor.fetchall())
+                else:
+                    self.rowcount = cursor.rowcount
+                    self.lastrowid = cursor.lastrowid
+                    if tipo == 'upsert':
+                        # Como MySQL con FOUND_ROWS: 1 por fila insertada, 2 por fila
+                        # existente con cambios y 1 por fila existente sin cambios
+                        cambiadas, sin_cambios = self.conexion.filas_comparadas
+                        self.rowcount = (cursor.rowcount - cambiadas) + 2 * cambiadas + sin_cambios
+            else:
+                self._especial(sqlite, tipo, grupos)
+        except sqlite3.Error as error:
+            if vencimiento is not None and time.monotonic() > vencimiento and 'interrupted' in str(error):
+                raise err.OperationalError(
+                    3024, "Query execution was interrupted, maximum statement execution time exceeded") from error
+            raise _error_mysql(error) from error
+        finally:
+            if vencimiento is not None:
+                sqlite.set_progress_handler(None, 0)
+        return self.rowcount
+
+    def _especial(self, sqlite, tipo, grupos):
+        """Ejecuta una sentencia de sesión o administración emulada."""
+        self.rowcount = 0
+        if tipo == 'claves_foraneas':
+            # PRAGMA foreign_keys no tiene efecto dentro de una transacción
+            if not sqlite.in_transaction:
+                sqlite.execute(f"PRAGMA foreign_keys = {'ON' if grupos[0] == '1' else 'OFF'}")
+        elif tipo == 'cancelar':
+            conexion = _conexiones.get(int(grupos[0]))
+            if conexion is None:
+                raise err.InternalError(1094, f"Unknown thread id: {grupos[0]}")
+            conexion.interrumpir()
+        elif tipo == 'estado_replica':
+            # Todas las conexiones ven la misma BD: una réplica al día
+            self._resultado(['Seconds_Behind_Source', 'Seconds_Behind_Master'], [(0, 0)])
+        elif tipo == 'iniciar':
+            self.conexion.begin()
+        elif tipo == 'confirmar':
+            self.conexion.commit()
+        elif tipo == 'deshacer':
+            self.conexion.rollback()
+        elif tipo == 'checksum':
+            filas = []
+            for tabla in (nombre.strip() for nombre in grupos[0].split(',')):
+                contenido = sqlite.execute(f"SELECT * FROM {tabla} ORDER BY rowid").fetchall()
+                filas.append((f"main.{tabla}", zlib.crc32(repr(contenido).encode())))
+            self._resultado(['Table', 'Checksum'], filas)
+        elif tipo == 'mantenimiento':
+            filas = []
+            for tabla in (nombre.strip() for nombre in grupos[1].split(',')):
+                sqlite.execute(f"ANALYZE {tabla}")
+                filas.append((f"main.{tabla}", grupos[0].lower(), 'status', 'OK'))
+            self._resultado(['Table', 'Op', 'Msg_type', 'Msg_text'], filas)
+
+    def _resultado(self, campos, filas):
+        """Guarda un resultado como filas inmutables (como CursorFilas)."""
+        self.description = tuple((campo, None, None, None, None, None, None) for campo in campos)
+        self._filas = construir_filas(campos, filas, self.conversiones)
+        self.rowcount = len(self._filas)
+
+    def executemany(self, query, args):
+        """Ejecuta la sentencia para cada conjunto de parámetros."""
+        total = 0
+        for parametros in args:
+            total += self.execute(query, parametros)
+        self.rowcount = total
+        return total
+
+    def fetchone(self):
+        """Siguiente fila o None."""
+        if self._posicion >= len(self._filas):
+            return None
+        self._posicion += 1
+        return self._filas[self._posicion - 1]
+
+    def fetchmany(self, size=1):
+        """Siguientes filas (hasta size)."""
+        filas = self._filas[self._posicion:self._posicion + size]
+        self._posicion += len(filas)
+        return filas
+
+    def fetchall(self):
+        """Filas restantes."""
+        filas = self._filas[self._posicion:]
+        self._posicion = len(self._filas)
+        return filas
+
+    def close(self):
+        """Libera el resultado."""
+        self._filas = []
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ConexionMemoria:
+    """Conexión con la interfaz de pymysql.connections.Connection sobre SQLite."""
+
+    def __init__(self, uri):
+        self._sqlite = sqlite3.connect(uri, uri=True, isolation_level=None, check_same_thread=False,
+                                       detect_types=sqlite3.PARSE_DECLTYPES)
+        self._sqlite.execute("PRAGMA foreign_keys = ON")
+        # Las lecturas no esperan a las transacciones de escritura de otras conexiones
+        self._sqlite.execute("PRAGMA read_uncommitted = ON")
+        self._sqlite.create_function('VERSION', 0, lambda: f"{sqlite3.sqlite_version}-sqlite")
+        self._sqlite.create_function('FILA_CAMBIA', -1, self._fila_cambia)
+        # Filas existentes de la última sentencia upsert: [con cambios, sin cambios]
+        self.filas_comparadas = [0, 0]
+        self._id = next(_contador_conexiones)
+        _conexiones[self._id] = self
+
+    def _fila_cambia(self, *diferencias):
+        """Si alguna columna de la fila cambia; cuenta la fila en filas_comparadas."""
+        cambia = any(diferencias)
+        self.filas_comparadas[0 if cambia else 1] += 1
+        return cambia
+
+    @property
+    def open(self):
+        """Si la conexión sigue abierta."""
+        return self._sqlite is not None
+
+    def _activa(self):
+        """Conexión de SQLite; falla como PyMySQL si está cerrada."""
+        if self._sqlite is None:
+            raise err.InterfaceError(0, "")
+        return self._sqlite
+
+    def cursor(self, cursor=None):
+        """Crea un cursor (la clase indicada se ignora: siempre entrega filas inmutables)."""
+        self._activa()
+        return CursorMemoria(self)
+
+    def begin(self):
+        """Inicia una transacción (confirma la anterior, como MySQL)."""
+        sqlite = self._activa()
+        if sqlite.in_transaction:
+            sqlite.execute("COMMIT")
+        sqlite.execute("BEGIN")
+
+    def commit(self):
+        """Confirma la transacción en curso."""
+        sqlite = self._activa()
+        if sqlite.in_transaction:
+            sqlite.execute("COMMIT")
+
+    def rollback(self):
+        """Deshace la transacción en curso."""
+        sqlite = self._activa()
+        if sqlite.in_transaction:
+            sqlite.execute("ROLLBACK")
+
+    def ping(self, reconnect=True):
+        """Verifica la conexión."""
+        self._activa()
+
+    def thread_id(self):
+        """ID de la conexión (para KILL QUERY)."""
+        return self._id
+
+    def interrumpir(self):
+        """Interrumpe la sentencia en curso (puede llamarse desde otro hilo)."""
+        if self._sqlite is not None:
+            self._sqlite.interrupt()
+
+    def get_server_info(self):
+        """Versión del motor."""
+        return f"{sqlite3.sqlite_version}-sqlite"
+
+    def close(self):
+        """Cierra la conexión (deshace lo no confirmado)."""
+        if self._sqlite is None:
+            raise err.Error("Already closed")
+        self._sqlite.close()
+        self._sqlite = None
+
+
+class MotorMemoria:
+    """Base de datos SQLite en memoria compartida por las conexiones que entrega."""
+
+    def __init__(self, script=RUTA_SCRIPT):
+        """
+        Args:
+            script (str): Script SQL de MySQL a cargar (None para una BD vacía)
+        """
+        self.uri = f"file:banco_memoria_{next(_contador_motores)}?mode=memory&cache=shared"
+        # Mantiene viva la BD en memoria mientras el motor exista
+        self._ancla = ConexionMemoria(self.uri)
+        if script:
+            self.ejecutar_script(script)
+
+    def conectar(self):
+        """
+        Abre una conexión nueva a la BD en memoria.
+
+        Returns:
+            ConexionMemoria: Conexión con la interfaz de PyMySQL
+        """
+        return ConexionMemoria(self.uri)
+
+    def ejecutar_script(self, ruta):
+        """Ejecuta un script SQL de MySQL (por ejemplo script.sql) sentencia por sentencia."""
+        with open(ruta, encoding='utf-8') as archivo:
+            sentencias = dividir_script(archivo.read())
+        cursor = self._ancla.cursor()
+        for sentencia in sentencias:
+            cursor.execute(sentencia)
+        self._ancla.commit()
+
+    def cerrar(self):
+        """Cierra la conexión que mantiene la BD (se libera al cerrar las demás)."""
+        if self._ancla.open:
+            self._ancla.close()
+
+
+def activar(script=RUTA_SCRIPT):
+    """
+    Hace que Database se conecte a una BD nueva en memoria.
+
+    Args:
+        script (str): Script SQL a cargar (por defecto script.sql)
+
+    Returns:
+        MotorMemoria: Motor creado
+    """
+    motor = MotorMemoria(script)
+    Database.fabrica_conexion = motor.conectar
+    return motor
+
+
+def desactivar():
+    """Vuelve a conectar Database a MySQL."""
+    Database.fabrica_conexion = None
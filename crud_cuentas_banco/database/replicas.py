@@ -0,0 +1,226 @@
+"""
+Réplicas de lectura.
+
+Database envía a una réplica los SELECT que no necesitan la primaria:
+    - Dentro de una unidad de trabajo todo va a la primaria (la transacción
+      debe leer sus propios cambios).
+    - Después de escribir, la sesión lee de la primaria durante
+      retraso_maximo segundos (lee lo que acaba de escribir).
+    - SELECT ... FOR UPDATE / LOCK IN SHARE MODE van siempre a la primaria.
+
+Cada intervalo_verificacion segundos se mide el retraso de replicación de
+cada réplica (SHOW REPLICA STATUS). Una réplica caída, con la replicación
+detenida o más atrasada que retraso_maximo deja de recibir lecturas hasta
+la siguiente verificación; si no queda ninguna se lee de la primaria.
+
+Configuración (config/config.ini; usuario, contraseña y BD por defecto los de mysql_config):
+    [mysql_replica_1]
+    host = 127.0.0.1
+    port = 3307
+
+    [replicas]
+    retraso_maximo = 5
+    intervalo_verificacion = 10
+"""
+
+import configparser
+import itertools
+import logging
+import re
+import threading
+import time
+
+import pymysql
+from pymysql.constants import CLIENT
+
+from database.filas import CursorFilas
+
+logger = logging.getLogger(__name__)
+
+RUTA_CONFIG = 'config/config.ini'
+PREFIJO_SECCION = 'mysql_replica'
+
+# Segundos máximos para conectar con una réplica (una réplica caída no debe bloquear la lectura)
+TIEMPO_CONEXION = 3
+
+_LECTURA = re.compile(r"^\s*(SELECT|WITH)\b", re.I)
+_BLOQUEO = re.compile(r"\bFOR\s+UPDATE\b|\bLOCK\s+IN\s+SHARE\s+MODE\b|\bFOR\s+SHARE\b", re.I)
+
+
+def es_lectura_replicable(sql):
+    """Indica si la sentencia es una lectura que puede ir a una réplica."""
+    return bool(_LECTURA.match(sql)) and not _BLOQUEO.search(sql)
+
+
+class Replica:
+    """Réplica de lectura: datos de conexión y último estado medido."""
+
+    def __init__(self, nombre, config):
+        """
+        Args:
+            nombre (str): Nombre de la sección de configuración
+            config (dict): Argumentos de conexión de PyMySQL
+        """
+        self.nombre = nombre
+        self.config = config
+        self.sana = True
+        self.retraso = None
+
+    def conectar(self):
+        """
+        Abre una conexión con la réplica.
+
+        Returns:
+            Conexión de PyMySQL
+
+        Raises:
+            pymysql.MySQLError: Si no se pudo conectar
+        """
+        # Importación diferida: Database usa este módulo
+        from database.connection import Database
+
+        if Database.fabrica_conexion is not None:
+            return Database.fabrica_conexion()
+        return pymysql.connect(**self.config, cursorclass=CursorFilas, client_flag=CLIENT.FOUND_ROWS,
+                               connect_timeout=TIEMPO_CONEXION)
+
+    def medir_retraso(self):
+        """
+        Consulta el retraso de replicación.
+
+        Returns:
+            int: Segundos de retraso o None si la replicación está detenida
+
+        Raises:
+            pymysql.MySQLError: Si la réplica no responde
+        """
+        conexion = self.conectar()
+        try:
+            cursor = conexion.cursor()
+            try:
+                try:
+                    cursor.execute("SHOW REPLICA STATUS")
+                except pymysql.err.ProgrammingError:
+                    # MySQL anterior a 8.0.22
+                    cursor.execute("SHOW SLAVE STATUS")
+                fila = cursor.fetchone()
+            finally:
+                cursor.close()
+        finally:
+            conexion.close()
+        if fila is None:
+            return None
+        retraso = fila.get('Seconds_Behind_Source', fila.get('Seconds_Behind_Master'))
+        return None if retraso is None else int(retraso)
+
+    def __repr__(self):
+        return f"Replica({self.nombre}, {self.config.get('host')}:{self.config.get('port')})"
+
+
+class ConjuntoReplicas:
+    """Réplicas configuradas y su estado, compartidas por todas las sesiones."""
+
+    def __init__(self, replicas=(), retraso_maximo=5, intervalo_verificacion=10):
+        """
+        Args:
+            replicas (list): Réplicas disponibles
+            retraso_maximo (float): Retraso de replicación tolerado (segundos)
+            intervalo_verificacion (float): Segundos entre verificaciones del estado
+        """
+        self.replicas = list(replicas)
+        self.retraso_maximo = retraso_maximo
+        self.intervalo_verificacion = intervalo_verificacion
+        self._proxima_verificacion = 0.0
+        self._turno = itertools.count()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def desde_config(cls, ruta=RUTA_CONFIG):
+        """
+        Lee las réplicas del archivo de configuración (ninguna si no hay secciones).
+
+        Returns:
+            ConjuntoReplicas: Réplicas configuradas
+        """
+        parser = configparser.ConfigParser()
+        parser.read(ruta)
+        base = dict(parser['mysql_config']) if parser.has_section('mysql_config') else {}
+        replicas = []
+        for seccion in parser.sections():
+            if not seccion.startswith(PREFIJO_SECCION):
+                continue
+            datos = dict(base, **parser[seccion])
+            replicas.append(Replica(seccion, {
+                'user': datos.get('user'),
+                'password': datos.get('password'),
+                'host': datos.get('host', 'localhost'),
+                'database': datos.get('db'),
+                'port': int(datos.get('port', 3306))
+            }))
+        opciones = parser['replicas'] if parser.has_section('replicas') else {}
+        return cls(replicas, float(opciones.get('retraso_maximo', 5)),
+                   float(opciones.get('intervalo_verificacion', 10)))
+
+    def verificar(self):
+        """Mide el retraso de cada réplica y actualiza cuáles pueden recibir lecturas."""
+        for replica in self.replicas:
+            try:
+                replica.retraso = replica.medir_retraso()
+                sana = replica.retraso is not None and replica.retraso <= self.retraso_maximo
+            except pymysql.MySQLError as err:
+                logger.warning(f"{replica} no responde: {err}")
+                replica.retraso = None
+                sana = False
+            if sana != replica.sana:
+                logger.warning(f"{replica} {'vuelve a recibir' if sana else 'deja de recibir'} lecturas "
+                               f"(retraso: {replica.retraso})")
+            replica.sana = sana
+
+    def _verificar_si_corresponde(self):
+        """Verifica el estado si venció el intervalo (un solo hilo verifica; los demás siguen)."""
+        if time.monotonic() < self._proxima_verificacion or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self.verificar()
+            self._proxima_verificacion = time.monotonic() + self.intervalo_verificacion
+        finally:
+            self._lock.release()
+
+    def elegir(self, preferida=None):
+        """
+        Elige la réplica para una lectura.
+
+        Args:
+            preferida (Replica): Réplica que ya usa la sesión (se mantiene si sigue sana)
+
+        Returns:
+            Replica: Réplica sana o None si no hay ninguna
+        """
+        if not self.replicas:
+            return None
+        self._verificar_si_corresponde()
+        if preferida is not None and preferida.sana:
+            return preferida
+        sanas = [replica for replica in self.replicas if replica.sana]
+        if not sanas:
+            return None
+        return sanas[next(self._turno) % len(sanas)]
+
+    def marcar_caida(self, replica, error):
+        """Deja de enviar lecturas a una réplica hasta la siguiente verificación."""
+        if replica.sana:
+            logger.warning(f"{replica} deja de recibir lecturas: {error}")
+        replica.sana = False
+
+    def estado(self):
+        """
+        Estado de las réplicas (para diagnóstico).
+
+        Returns:
+            list: Diccionarios con nombre, sana y retraso
+        """
+        return [{'nombre': replica.nombre, 'sana': replica.sana, 'retraso': replica.retraso}
+                for replica in self.replicas]
+
+
+REPLICAS = ConjuntoReplicas.desde_config()
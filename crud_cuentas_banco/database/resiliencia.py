@@ -0,0 +1,133 @@
+"""
+Tolerancia a fallos de la conexión con MySQL.
+
+Database usa estas piezas en cada sentencia:
+    - Clasificación de errores: reintentables (deadlock 1213, espera de
+      bloqueo 1205) y de conexión perdida (2006, 2013...).
+    - Reintentos acotados con espera exponencial y jitter completo, para
+      que varios clientes que chocaron no reintenten a la vez.
+    - Un cortocircuito compartido por todo el proceso: tras varios fallos de
+      conexión seguidos deja de intentar conectar durante un tiempo y las
+      operaciones fallan de inmediato en lugar de quedarse esperando. Pasado
+      ese tiempo deja pasar un único intento de prueba.
+"""
+
+import logging
+import random
+import threading
+import time
+
+import pymysql
+
+logger = logging.getLogger(__name__)
+
+# Deadlock y tiempo de espera de bloqueo agotado: la operación puede repetirse
+ERRORES_REINTENTABLES = {1213, 1205}
+
+# Servidor caído, conexión perdida o rechazada
+ERRORES_CONEXION = {2003, 2006, 2013, 2055}
+
+# Reintentos por sentencia y espera base/máxima entre ellos (segundos)
+MAXIMO_REINTENTOS = 3
+ESPERA_BASE = 0.05
+ESPERA_MAXIMA = 1.0
+
+# Segundos sin usar la conexión a partir de los cuales se verifica con ping antes de usarla
+INTERVALO_PING = 30
+
+
+def codigo_error(error):
+    """Código de error de MySQL de una excepción de PyMySQL (o None)."""
+    return error.args[0] if error.args and isinstance(error.args[0], int) else None
+
+
+def es_reintentable(error):
+    """Indica si la sentencia falló por un deadlock o una espera de bloqueo."""
+    return codigo_error(error) in ERRORES_REINTENTABLES
+
+
+def es_conexion_perdida(error):
+    """Indica si el error se debe a que la conexión ya no sirve."""
+    return isinstance(error, pymysql.err.InterfaceError) or codigo_error(error) in ERRORES_CONEXION
+
+
+def espera_reintento(intento):
+    """
+    Espera antes de un reintento: aleatoria entre 0 y la espera exponencial.
+
+    Args:
+        intento (int): Número de reintento (desde 1)
+
+    Returns:
+        float: Segundos a esperar
+    """
+    return random.uniform(0, min(ESPERA_MAXIMA, ESPERA_BASE * 2 ** (intento - 1)))
+
+
+class Cortocircuito:
+    """
+    Cortocircuito de la conexión con la base de datos.
+
+    Estados:
+        cerrado:    se opera normalmente, se cuentan los fallos seguidos
+        abierto:    se falla de inmediato hasta que pase tiempo_abierto
+        semiabierto: un único intento de prueba decide si vuelve a cerrarse
+    """
+
+    CERRADO = 'cerrado'
+    ABIERTO = 'abierto'
+    SEMIABIERTO = 'semiabierto'
+
+    def __init__(self, umbral_fallos=5, tiempo_abierto=10.0):
+        """
+        Args:
+            umbral_fallos (int): Fallos de conexión seguidos que abren el circuito
+            tiempo_abierto (float): Segundos que permanece abierto antes de probar
+        """
+        self.umbral_fallos = umbral_fallos
+        self.tiempo_abierto = tiempo_abierto
+        self.estado = self.CERRADO
+        self.fallos = 0
+        self._abierto_desde = 0.0
+        self._lock = threading.Lock()
+
+    def permitir(self):
+        """
+        Indica si se puede intentar conectar. Con el circuito abierto solo
+        deja pasar un intento de prueba cuando venció tiempo_abierto.
+
+        Returns:
+            bool: True si se puede intentar
+        """
+        if self.estado == self.CERRADO:
+            return True
+        with self._lock:
+            if self.estado == self.ABIERTO and time.monotonic() - self._abierto_desde >= self.tiempo_abierto:
+                self.estado = self.SEMIABIERTO
+                logger.info("Cortocircuito semiabierto: probando la conexión")
+                return True
+            return self.estado == self.CERRADO
+
+    def registrar_exito(self):
+        """Registra una conexión o sentencia exitosa (cierra el circuito)."""
+        if self.estado == self.CERRADO and not self.fallos:
+            return
+        with self._lock:
+            if self.estado != self.CERRADO:
+                logger.info("Cortocircuito cerrado: la base de datos responde")
+            self.estado = self.CERRADO
+            self.fallos = 0
+
+    def registrar_fallo(self):
+        """Registra un fallo de conexión (puede abrir el circuito)."""
+        with self._lock:
+            self.fallos += 1
+            if self.estado == self.SEMIABIERTO or self.fallos >= self.umbral_fallos:
+                if self.estado != self.ABIERTO:
+                    logger.error(f"Cortocircuito abierto tras {self.fallos} fallos de conexión; "
+                                 f"se reintentará en {self.tiempo_abierto:g} s")
+                self.estado = self.ABIERTO
+                self._abierto_desde = time.monotonic()
+
+
+CORTOCIRCUITO = Cortocircuito()
@@ -0,0 +1,151 @@
+"""
+Sesiones de base de datos por hilo (o por tarea).
+
+Una conexión PyMySQL no admite dos hilos a la vez, por eso los modelos no
+guardan una conexión propia: BaseModel.db retorna la sesión del hilo que
+llama. Así un mismo controlador puede atender a varios hilos a la vez.
+
+Propiedad de las sesiones:
+    - Cada sesión pertenece al hilo que la abrió y solo ese hilo la usa.
+      Si el contexto se copia a otro hilo (asyncio.to_thread o
+      contextvars.copy_context().run, por ejemplo), ese hilo usa su propia
+      sesión implícita en lugar de compartir la conexión.
+    - La sesión implícita de un hilo se abre en el primer uso y dura lo que
+      dure el hilo; cerrar_sesion() la cierra antes (al terminar un trabajo).
+      Las de hilos ya terminados se cierran al abrir otra sesión.
+    - with sesion(): abre una sesión propia del bloque y la cierra al salir
+      (una petición, un trabajo en segundo plano).
+    - cerrar_todas() cierra las que queden (se registra al salir del proceso).
+
+Uso:
+    with sesion():
+        controlador.listar_clientes()      # los modelos usan esta conexión
+"""
+
+from contextlib import contextmanager
+import atexit
+import contextvars
+import logging
+import threading
+
+from database.connection import Database
+
+logger = logging.getLogger(__name__)
+
+# Sesión del contexto actual: (hilo dueño, Database)
+_sesion_actual = contextvars.ContextVar('sesion_bd', default=None)
+
+# Sesiones abiertas por identificador, con su hilo dueño (para cerrarlas)
+_abiertas = {}
+_lock = threading.Lock()
+
+# Sesión implícita de cada hilo (la reutilizan los contextos copiados al hilo)
+_implicitas = threading.local()
+
+
+def _conectada(db):
+    """Indica si la Database tiene una conexión abierta."""
+    return db.connection is not None and db.connection.open
+
+
+def _abrir():
+    """Abre una sesión para el hilo actual y la registra."""
+    _cerrar_huerfanas()
+    db = Database()
+    db.connect()
+    with _lock:
+        _abiertas[id(db)] = (threading.current_thread(), db)
+    return db
+
+
+def _cerrar(db):
+    """Cierra una sesión y la quita del registro."""
+    with _lock:
+        _abiertas.pop(id(db), None)
+    db.disconnect()
+
+
+def _cerrar_huerfanas():
+    """Cierra las sesiones de hilos que ya terminaron."""
+    with _lock:
+        huerfanas = [db for hilo, db in _abiertas.values() if not hilo.is_alive()]
+    for db in huerfanas:
+        logger.info("Cerrando sesión de un hilo terminado")
+        _cerrar(db)
+
+
+def obtener_sesion():
+    """
+    Obtiene la sesión del hilo actual, abriéndola si no existe o se cerró.
+
+    Returns:
+        Database: Sesión del hilo (puede estar desconectada si falló la conexión)
+    """
+    actual = _sesion_actual.get()
+    hilo = threading.current_thread()
+    if actual is not None and actual[0] is hilo:
+        db = actual[1]
+        if _conectada(db):
+            return db
+        _cerrar(db)
+
+    db = getattr(_implicitas, 'db', None)
+    if db is None or not _conectada(db):
+        if db is not None:
+            _cerrar(db)
+        db = _abrir()
+        _implicitas.db = db
+    _sesion_actual.set((hilo, db))
+    return db
+
+
+def cerrar_sesion():
+    """Cierra la sesión implícita del hilo actual (se reabre en el próximo uso)."""
+    actual = _sesion_actual.get()
+    if actual is not None and actual[0] is threading.current_thread():
+        _cerrar(actual[1])
+        _sesion_actual.set(None)
+    db = getattr(_implicitas, 'db', None)
+    if db is not None:
+        _implicitas.db = None
+        _cerrar(db)
+
+
+@contextmanager
+def sesion():
+    """
+    Abre una sesión propia del bloque; los modelos la usan mientras dura.
+
+    Yields:
+        Database: Sesión del bloque
+    """
+    db = _abrir()
+    token = _sesion_actual.set((threading.current_thread(), db))
+    try:
+        yield db
+    finally:
+        _sesion_actual.reset(token)
+        _cerrar(db)
+
+
+def sesiones_abiertas():
+    """
+    Cantidad de sesiones abiertas en el proceso.
+
+    Returns:
+        int: Sesiones registradas
+    """
+    with _lock:
+        return len(_abiertas)
+
+
+def cerrar_todas():
+    """Cierra todas las sesiones abiertas (al detener un servidor o salir)."""
+    with _lock:
+        sesiones = [db for _, db in _abiertas.values()]
+        _abiertas.clear()
+    for db in sesiones:
+        db.disconnect()
+
+
+atexit.register(cerrar_todas)
@@ -0,0 +1,222 @@
+"""
+Unidad de trabajo para agrupar operaciones de varios modelos en una transacción.
+Mientras hay una unidad activa, todas las instancias de Database usan su
+conexión y el commit se difiere hasta el final del bloque. Los bloques
+anidados se resuelven con SAVEPOINT.
+
+Uso:
+    with unidad_de_trabajo() as bloque:
+        cliente_model.crear(datos_cliente)
+        cuenta_model.crear(datos_cuenta)
+    if bloque.fallida:
+        ...
+"""
+
+from contextlib import contextmanager
+import contextvars
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_unidad_actual = contextvars.ContextVar('unidad_de_trabajo', default=None)
+
+
+class BloqueTransaccional:
+    """Bloque de una unidad de trabajo: la transacción principal o un SAVEPOINT."""
+
+    def __init__(self, unidad, savepoint=None):
+        self.unidad = unidad
+        self.savepoint = savepoint
+        self.fallida = False
+        self.descartado = False
+
+    def cancelar(self):
+        """Solicita deshacer el bloque al terminar sin lanzar una excepción."""
+        self.fallida = True
+
+    def descartar(self):
+        """
+        Deshace el bloque al terminar como parte normal de la operación
+        (pruebas de rendimiento, simulaciones): no se registra como fallo.
+        """
+        self.fallida = True
+        self.descartado = True
+
+
+class MapaIdentidad:
+    """
+    Registros ya leídos dentro de una unidad de trabajo, por (tabla, id).
+    Evita volver a consultar la BD al leer el mismo registro varias veces.
+    """
+
+    def __init__(self):
+        self._registros = {}
+
+    def obtener(self, tabla, id_registro):
+        """Retorna el registro cargado o None."""
+        return self._registros.get((tabla, id_registro))
+
+    def registrar(self, tabla, id_registro, registro):
+        """Guarda un registro recién leído."""
+        self._registros[(tabla, id_registro)] = registro
+
+    def descartar(self, tabla, id_registro):
+        """Olvida un registro (tras modificarlo o eliminarlo)."""
+        self._registros.pop((tabla, id_registro), None)
+
+    def limpiar(self):
+        """Olvida todos los registros (tras deshacer cambios)."""
+        self._registros.clear()
+
+
+class UnidadDeTrabajo:
+    """Transacción compartida por los modelos dentro de un bloque with."""
+
+    def __init__(self, db):
+        """
+        Args:
+            db: Instancia de Database con la conexión fijada para la unidad
+        """
+        self.db = db
+        self.hilo = threading.current_thread()
+        self.mapa_identidad = MapaIdentidad()
+        self._bloques = []
+
+    @property
+    def connection(self):
+        """Conexión fijada para la unidad."""
+        return self.db.connection
+
+    def marcar_fallida(self):
+        """Marca el bloque actual para deshacerse al terminar (una sentencia falló)."""
+        self._bloques[-1].fallida = True
+
+    @contextmanager
+    def _bloque(self, savepoint=None):
+        """Apila un bloque mientras dura el with."""
+        bloque = BloqueTransaccional(self, savepoint)
+        self._bloques.append(bloque)
+        try:
+            yield bloque
+        finally:
+            self._bloques.pop()
+
+    @contextmanager
+    def _savepoint(self):
+        """Bloque anidado: si falla se deshace solo su parte."""
+        nombre = f"sp_{len(self._bloques)}"
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"SAVEPOINT {nombre}")
+            with self._bloque(nombre) as bloque:
+                try:
+                    yield bloque
+                except BaseException:
+                    _deshacer(lambda: cursor.execute(f"ROLLBACK TO SAVEPOINT {nombre}"))
+                    self.mapa_identidad.limpiar()
+                    raise
+                if bloque.fallida:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {nombre}")
+                    self.mapa_identidad.limpiar()
+                    if not bloque.descartado:
+                        logger.warning(f"Bloque anidado deshecho hasta {nombre}")
+                else:
+                    cursor.execute(f"RELEASE SAVEPOINT {nombre}")
+        finally:
+            cursor.close()
+
+
+def _deshacer(rollback):
+    """
+    Deshace tras un error sin ocultarlo: si el rollback también falla, solo
+    se registra y quien llama vuelve a lanzar el error original.
+    """
+    try:
+        rollback()
+    except Exception as err:
+        logger.error(f"No se pudo deshacer la unidad de trabajo: {err}")
+
+
+def unidad_activa():
+    """
+    Obtiene la unidad de trabajo activa en el contexto actual.
+
+    Returns:
+        UnidadDeTrabajo: Unidad activa o None
+
+    Raises:
+        RuntimeError: Si la unidad se abrió en otro hilo (el contexto se copió
+            a este hilo) y su conexión no puede compartirse
+    """
+    unidad = _unidad_actual.get()
+    if unidad is not None and unidad.hilo is not threading.current_thread():
+        raise RuntimeError("La unidad de trabajo pertenece a otro hilo y no puede usarse desde este")
+    return unidad
+
+
+@contextmanager
+def unidad_de_trabajo(db=None):
+    """
+    Abre una unidad de trabajo (o un SAVEPOINT si ya hay una activa).
+
+    Al salir hace un único commit; si se lanzó una excepción, alguna
+    sentencia falló o se llamó a cancelar(), hace rollback.
+
+    Args:
+        db: Database conectada a reutilizar; si no se indica se usa la
+            sesión del hilo actual (database.sesiones)
+
+    Yields:
+        BloqueTransaccional: Bloque abierto (consultar fallida al salir)
+
+    Raises:
+        ConnectionError: Si no se pudo abrir la conexión de la unidad
+    """
+    unidad = _unidad_actual.get()
+    if unidad is not None:
+        with unidad._savepoint() as bloque:
+            yield bloque
+        return
+
+    if db is None:
+        # Importación diferida: Database consulta este módulo en cada sentencia
+        from database.sesiones import obtener_sesion
+
+        db = obtener_sesion()
+
+    conexion_propia = not db.connection or not db.connection.open
+    if conexion_propia:
+        from database.connection import Database
+
+        db = Database()
+        db.connect()
+        if not db.connection or not db.connection.open:
+            raise ConnectionError("No se pudo abrir la conexión para la unidad de trabajo")
+
+    unidad = UnidadDeTrabajo(db)
+    token = _unidad_actual.set(unidad)
+    try:
+        db.connection.begin()
+        with unidad._bloque() as bloque:
+            try:
+                yield bloque
+            except BaseException:
+                _deshacer(db.connection.rollback)
+                raise
+
+        if bloque.fallida:
+            db.connection.rollback()
+            if not bloque.descartado:
+                logger.warning("Unidad de trabajo deshecha: una o más operaciones fallaron")
+        else:
+            try:
+                db.connection.commit()
+            except BaseException:
+                _deshacer(db.connection.rollback)
+                raise
+            db.marcar_escritura()
+    finally:
+        _unidad_actual.reset(token)
+        if conexion_propia:
+            db.disconnect()
@@ -14,6 +14,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from views.main_window import MainWindow
 from database.connection import Database
+from models.instantanea_catalogos import obtener_instantanea
+from utils.perfilador import perfilar_sesion
 
 # Configurar logging
 logging.basicConfig(
@@ -59,8 +61,13 @@ def verificar_conexion_bd():
         return False
 
 
-def mostrar_error_conexion():
-    """Muestra un mensaje de error de conexión."""
+def mostrar_error_conexion(root=None):
+    """
+    Muestra un mensaje de error de conexión.
+    
+    Args:
+        root: Ventana sobre la que se muestra (si es None se crea una oculta)
+    """
     mensaje = """
 Error de Conexión a la Base de Datos
 
@@ -79,21 +86,52 @@ Configuración actual:
 - Usuario: admin
     """
     
+    if root is not None:
+        messagebox.showerror("Error de Conexión", mensaje, parent=root)
+        return
+    
     root = tk.Tk()
     root.withdraw()  # Ocultar ventana principal
     messagebox.showerror("Error de Conexión", mensaje)
     root.destroy()
 
 
+def opcion_perfil(argumentos=None):
+    """
+    Lee el modo de perfilado: --perfil [prefijo] o la variable BANCO_PERFIL.
+    
+    Args:
+        argumentos (list): Argumentos de la línea de comandos (por defecto sys.argv)
+        
+    Returns:
+        tuple: (activo, prefijo de los archivos o None para el de por defecto)
+    """
+    argumentos = sys.argv[1:] if argumentos is None else argumentos
+    if '--perfil' in argumentos:
+        indice = argumentos.index('--perfil')
+        siguiente = argumentos[indice + 1] if indice + 1 < len(argumentos) else None
+        return True, siguiente if siguiente and not siguiente.startswith('-') else None
+    
+    valor = os.environ.get('BANCO_PERFIL', '')
+    if valor.lower() in ('', '0', 'no', 'false'):
+        return False, None
+    return True, None if valor.lower() in ('1', 'si', 'true') else valor
+
+
 def main():
     """Función principal de la aplicación."""
     try:
         logger.info("Iniciando Sistema CRUD de Cuentas Bancarias")
         
-        # Verificar conexión a la base de datos
-        if not verificar_conexion_bd():
-            mostrar_error_conexion()
-            return
+        # Perfilador de toda la sesión (guarda los resultados al salir)
+        perfilar, prefijo = opcion_perfil()
+        if perfilar:
+            perfilar_sesion(prefijo)
+        
+        # Cargar la copia local de catálogos y refrescarla en segundo plano
+        instantanea = obtener_instantanea()
+        instantanea.cargar()
+        instantanea.refrescar_en_segundo_plano()
         
         # Crear ventana principal
         root = tk.Tk()
@@ -107,9 +145,13 @@ def main():
         except:
             pass
         
-        # Crear y mostrar la ventana principal
+        # Crear y mostrar la ventana principal (con los catálogos de la copia local)
         app = MainWindow(root)
         
+        # Verificar la conexión sin bloquear el inicio (resultado en la barra de estado)
+        app.verificar_conexion_en_segundo_plano(verificar_conexion_bd,
+                                                al_fallar=lambda: mostrar_error_conexion(root))
+        
         # Centrar la ventana
         root.update_idletasks()
         ancho = root.winfo_width()
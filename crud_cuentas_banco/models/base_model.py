@@ -3,7 +3,12 @@ Modelo base para todas las entidades del sistema.
 Proporciona funcionalidad CRUD básica y manejo de conexión a BD.
 """
 
-from database.connection import Database
+from database.cancelacion import ERROR_TIEMPO_AGOTADO, ERRORES_CANCELACION
+from database.compilador import MENSAJE_CONFLICTO
+from database.resiliencia import codigo_error
+from database.sesiones import obtener_sesion
+from database.unidad_trabajo import unidad_activa
+from utils.trazas import trazar_clase
 from datetime import datetime
 import logging
 
@@ -11,21 +16,37 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Resultado de una lectura interrumpida por su tiempo máximo (se completa con los segundos)
+MENSAJE_TIEMPO_AGOTADO = "La consulta superó el tiempo máximo de {} s"
+
 
 class BaseModel:
     """Clase base abstracta para todos los modelos del sistema."""
     
+    def __init_subclass__(cls, **kwargs):
+        """Instrumenta con trazas los métodos de cada modelo."""
+        super().__init_subclass__(**kwargs)
+        trazar_clase(cls)
+    
+    # Conversiones por columna aplicadas por el cursor al leer (columna -> función)
+    conversiones_lectura = None
+    
+    # Metadatos de la tabla principal (database.compilador.Tabla); cada modelo define la suya
+    tabla = None
+    
     def __init__(self):
-        self.db = Database()
-        self.db.connect()
         self.id = None
         self.fecha_creacion = None
         self.fecha_modificacion = None
     
-    def __del__(self):
-        """Cierra la conexión cuando se destruye el objeto."""
-        if hasattr(self, 'db') and self.db:
-            self.db.disconnect()
+    @property
+    def db(self):
+        """
+        Sesión de base de datos del hilo que llama (database.sesiones).
+        El modelo no guarda conexión propia, así un mismo modelo (y su
+        controlador) puede usarse desde varios hilos a la vez.
+        """
+        return obtener_sesion()
     
     def validar_datos(self, datos):
         """
@@ -77,6 +98,9 @@ class BaseModel:
         """
         Lee un registro específico por ID.
         
+        Dentro de una unidad de trabajo el registro se guarda en su mapa de
+        identidad y las lecturas siguientes no consultan la BD.
+        
         Args:
             id_registro (int): ID del registro a leer
             
@@ -84,13 +108,20 @@ class BaseModel:
             tuple: (exito, mensaje, datos)
         """
         try:
+            unidad = unidad_activa()
+            if unidad:
+                registro = unidad.mapa_identidad.obtener(self.tabla.nombre, id_registro)
+                if registro is not None:
+                    return True, "Registro encontrado", registro
+            
             query = self._generar_query_lectura()
             params = (id_registro,)
-            resultado = self.db.fetch_all(query, params)
+            resultado = self.db.fetch_all(query, params, self.conversiones_lectura)
             
             if resultado:
-                datos = self._formatear_datos_lectura(resultado[0])
-                return True, "Registro encontrado", datos
+                if unidad:
+                    unidad.mapa_identidad.registrar(self.tabla.nombre, id_registro, resultado[0])
+                return True, "Registro encontrado", resultado[0]
             else:
                 return False, "Registro no encontrado", None
                 
@@ -102,6 +133,13 @@ class BaseModel:
         """
         Actualiza un registro existente.
         
+        Solo se escriben las columnas cuyo valor difiere del registro leído;
+        si no cambió ninguna no se ejecuta el UPDATE.
+        
+        Si la tabla tiene columna de versión y los datos traen la versión que
+        se leyó (datos['version']), la actualización solo se aplica si nadie
+        modificó el registro desde entonces; si no, retorna MENSAJE_CONFLICTO.
+        
         Args:
             id_registro (int): ID del registro a actualizar
             datos (dict): Diccionario con los nuevos datos
@@ -116,21 +154,35 @@ class BaseModel:
                 return False, mensaje_error
             
             # Verificar que el registro existe
-            existe, _, _ = self.leer(id_registro)
+            existe, _, actual = self.leer(id_registro)
             if not existe:
                 return False, "El registro no existe"
             
-            # Preparar datos para actualización
-            datos_update = self._preparar_datos_actualizacion(datos)
-            datos_update['id'] = id_registro
+            version = self._version_leida(datos)
+            if version is not None and actual[self.tabla.version] != version:
+                logger.warning(f"Conflicto de versión en el registro {id_registro}")
+                return False, MENSAJE_CONFLICTO
             
-            # Ejecutar actualización
-            query = self._generar_query_actualizacion()
-            filas_afectadas = self.db.execute_query(query, datos_update)
+            # Preparar datos para actualización y quedarse con los campos modificados
+            datos_update = self._columnas_modificadas(actual, self._preparar_datos_actualizacion(datos))
+            if not datos_update:
+                logger.info(f"Registro {id_registro} sin cambios")
+                return True, "Registro actualizado exitosamente"
+            
+            query = self._generar_query_actualizacion(list(datos_update), version is not None)
+            datos_update['id'] = id_registro
+            if version is not None:
+                datos_update['version_leida'] = version
+            filas_afectadas = self.db.execute_update(query, datos_update)
+            self._descartar_de_mapa(id_registro)
             
             if filas_afectadas:
                 logger.info(f"Registro {id_registro} actualizado exitosamente")
                 return True, "Registro actualizado exitosamente"
+            elif filas_afectadas == 0 and version is not None:
+                # Otro usuario lo modificó entre la lectura y el UPDATE
+                logger.warning(f"Conflicto de versión en el registro {id_registro}")
+                return False, MENSAJE_CONFLICTO
             else:
                 return False, "No se pudo actualizar el registro"
                 
@@ -157,7 +209,8 @@ class BaseModel:
             # Ejecutar eliminación
             query = self._generar_query_eliminacion()
             params = (id_registro,)
-            filas_afectadas = self.db.execute_query(query, params)
+            filas_afectadas = self.db.execute_update(query, params)
+            self._descartar_de_mapa(id_registro)
             
             if filas_afectadas:
                 logger.info(f"Registro {id_registro} eliminado exitosamente")
@@ -169,7 +222,7 @@ class BaseModel:
             logger.error(f"Error al eliminar registro: {str(e)}")
             return False, f"Error al eliminar el registro: {str(e)}"
     
-    def listar(self, filtros=None, limite=None, offset=None):
+    def listar(self, filtros=None, limite=None, offset=None, columnas=None, despues_de=None, timeout=None):
         """
         Lista todos los registros con filtros opcionales.
         
@@ -177,42 +230,215 @@ class BaseModel:
             filtros (dict): Diccionario con filtros a aplicar
             limite (int): Número máximo de registros a retornar
             offset (int): Número de registros a omitir
+            columnas (list): Columnas a retornar (por defecto todas las del listado)
+            despues_de (int): Paginación por clave: solo registros con clave mayor,
+                ordenados por clave
+            timeout (float): Segundos máximos de ejecución de la consulta
             
         Returns:
             tuple: (exito, mensaje, lista_datos)
         """
         try:
-            query, params = self._generar_query_listado(filtros, limite, offset)
-            resultado = self.db.fetch_all(query, params)
-            
-            datos_formateados = [self._formatear_datos_lectura(fila) for fila in resultado]
-            return True, "Lista obtenida exitosamente", datos_formateados
+            query, params = self._generar_query_listado(filtros, limite, offset, columnas, despues_de)
+            db = self.db
+            resultado = db.fetch_all(query, params, self.conversiones_lectura, timeout)
+            interrupcion = self._interrupcion(db, resultado, timeout)
+            if interrupcion:
+                return False, interrupcion, []
+            return True, "Lista obtenida exitosamente", resultado
             
         except Exception as e:
             logger.error(f"Error al listar registros: {str(e)}")
             return False, f"Error al listar registros: {str(e)}", []
     
-    # Métodos abstractos que deben ser implementados por cada modelo
+    def iterar_lotes(self, filtros=None, tamano_lote=1000, columnas=None, timeout=None):
+        """
+        Recorre los registros en lotes paginados por clave primaria.
+        A diferencia de OFFSET, cada lote cuesta lo mismo sin importar su posición.
+        
+        Args:
+            filtros (dict): Diccionario con filtros a aplicar
+            tamano_lote (int): Número de registros por lote
+            columnas (list): Columnas a retornar (la clave se incluye siempre)
+            timeout (float): Segundos máximos de ejecución de la consulta de cada lote
+            
+        Yields:
+            list: Lote de registros
+        
+        Raises:
+            RuntimeError: Si la consulta de un lote se interrumpe (tiempo máximo o
+                cancelación), para no confundirlo con el final del recorrido
+        """
+        clave = self.tabla.clave
+        if columnas and clave not in columnas:
+            columnas = [clave] + list(columnas)
+        
+        ultima_clave = 0
+        while True:
+            query, params = self._generar_query_listado(filtros, tamano_lote, None, columnas, ultima_clave)
+            db = self.db
+            lote = db.fetch_all(query, params, self.conversiones_lectura, timeout)
+            interrupcion = self._interrupcion(db, lote, timeout)
+            if interrupcion:
+                raise RuntimeError(interrupcion)
+            if not lote:
+                return
+            yield lote
+            if len(lote) < tamano_lote:
+                return
+            ultima_clave = lote[-1][clave]
+    
+    def contar(self, filtros=None, timeout=None):
+        """
+        Cuenta los registros que coinciden con los filtros.
+        
+        Args:
+            filtros (dict): Diccionario con filtros a aplicar
+            timeout (float): Segundos máximos de ejecución de la consulta
+            
+        Returns:
+            tuple: (exito, mensaje, conteo)
+        """
+        try:
+            compilador = self.tabla.compilador
+            forma = compilador.forma_filtros(filtros)
+            db = self.db
+            resultado = db.fetch_all(compilador.contar(forma),
+                                     compilador.parametros_filtros(forma, filtros), None, timeout)
+            interrupcion = self._interrupcion(db, resultado, timeout)
+            if interrupcion:
+                return False, interrupcion, 0
+            conteo = resultado[0]['total'] if resultado else 0
+            return True, "Conteo obtenido exitosamente", conteo
+        except Exception as e:
+            logger.error(f"Error al contar registros: {str(e)}")
+            return False, f"Error al contar registros: {str(e)}", 0
+    
+    @staticmethod
+    def _interrupcion(db, resultado, timeout):
+        """
+        Motivo por el que una lectura sin filas fue interrumpida (tiempo
+        máximo o KILL QUERY), o None si terminó normalmente.
+        """
+        if resultado or codigo_error(db.ultimo_error) not in ERRORES_CANCELACION:
+            return None
+        if codigo_error(db.ultimo_error) == ERROR_TIEMPO_AGOTADO:
+            return MENSAJE_TIEMPO_AGOTADO.format(timeout)
+        return "Consulta cancelada"
+    
+    def existe(self, filtros):
+        """
+        Verifica si existe al menos un registro que coincida con los filtros.
+        
+        Args:
+            filtros (dict): Diccionario con filtros a aplicar
+            
+        Returns:
+            tuple: (exito, mensaje, existe)
+        """
+        try:
+            compilador = self.tabla.compilador
+            forma = compilador.forma_filtros(filtros)
+            resultado = self.db.fetch_all(compilador.existe(forma),
+                                          compilador.parametros_filtros(forma, filtros))
+            return True, "Verificación realizada", bool(resultado)
+        except Exception as e:
+            logger.error(f"Error al verificar existencia: {str(e)}")
+            return False, f"Error al verificar existencia: {str(e)}", False
+    
+    def _buscar_uno(self, columna, valor, columnas=None):
+        """
+        Busca un registro por igualdad en una columna única.
+        
+        Args:
+            columna (str): Columna de búsqueda (clave o columna única)
+            valor: Valor a buscar
+            columnas (list): Columnas a retornar (por defecto todas)
+            
+        Returns:
+            Fila: Registro encontrado o None
+        """
+        query = self.tabla.compilador.leer_por(columna, columnas)
+        resultado = self.db.fetch_all(query, (valor,), self.conversiones_lectura)
+        return resultado[0] if resultado else None
+    
+    @staticmethod
+    def _columnas_modificadas(actual, nuevos):
+        """
+        Filtra los datos nuevos dejando solo los que difieren del registro actual.
+        
+        Los valores leídos (fechas, decimales) se comparan también por su texto
+        para no reescribir una fecha '2024-01-31' que ya está guardada.
+        
+        Args:
+            actual: Registro leído de la BD
+            nuevos (dict): Datos preparados para actualizar
+            
+        Returns:
+            dict: Columnas modificadas con su nuevo valor
+        """
+        cambios = {}
+        for columna, valor in nuevos.items():
+            anterior = actual.get(columna)
+            if anterior == valor:
+                continue
+            if anterior is not None and valor is not None and str(anterior) == str(valor):
+                continue
+            cambios[columna] = valor
+        return cambios
+    
+    def _version_leida(self, datos):
+        """
+        Versión del registro que trae el formulario o la petición.
+        
+        Returns:
+            int: Versión leída o None si la tabla no tiene versión o no se indicó
+        """
+        if not self.tabla.version or datos.get('version') in (None, ''):
+            return None
+        return int(datos['version'])
+    
+    def _descartar_de_mapa(self, id_registro):
+        """Olvida un registro modificado del mapa de identidad de la unidad activa."""
+        unidad = unidad_activa()
+        if unidad:
+            unidad.mapa_identidad.descartar(self.tabla.nombre, id_registro)
+    
+    # Generación de SQL a partir de los metadatos de la tabla.
+    # Los modelos pueden sobrescribir estos métodos para consultas especiales.
     def _generar_query_creacion(self):
         """Genera la query SQL para crear un registro."""
-        raise NotImplementedError("Cada modelo debe implementar _generar_query_creacion")
+        return self.tabla.compilador.insertar()
     
     def _generar_query_lectura(self):
         """Genera la query SQL para leer un registro."""
-        raise NotImplementedError("Cada modelo debe implementar _generar_query_lectura")
+        return self.tabla.compilador.leer_por(self.tabla.clave)
     
-    def _generar_query_actualizacion(self):
+    def _generar_query_actualizacion(self, columnas=None, con_version=False):
         """Genera la query SQL para actualizar un registro."""
-        raise NotImplementedError("Cada modelo debe implementar _generar_query_actualizacion")
+        return self.tabla.compilador.actualizar(columnas, con_version)
     
     def _generar_query_eliminacion(self):
         """Genera la query SQL para eliminar un registro."""
-        raise NotImplementedError("Cada modelo debe implementar _generar_query_eliminacion")
+        return self.tabla.compilador.eliminar()
     
-    def _generar_query_listado(self, filtros=None, limite=None, offset=None):
+    def _generar_query_listado(self, filtros=None, limite=None, offset=None, columnas=None, despues_de=None):
         """Genera la query SQL para listar registros."""
-        raise NotImplementedError("Cada modelo debe implementar _generar_query_listado")
+        compilador = self.tabla.compilador
+        forma = compilador.forma_filtros(filtros)
+        query = compilador.seleccionar(columnas, forma, bool(limite), bool(offset), despues_de is not None)
+        
+        params = compilador.parametros_filtros(forma, filtros)
+        if despues_de is not None:
+            params.append(despues_de)
+        if limite:
+            params.append(limite)
+        if offset:
+            params.append(offset)
+        
+        return query, params
     
+    # Métodos abstractos que deben ser implementados por cada modelo
     def _preparar_datos_creacion(self, datos):
         """Prepara los datos para la operación de creación."""
         raise NotImplementedError("Cada modelo debe implementar _preparar_datos_creacion")
@@ -220,7 +446,6 @@ class BaseModel:
     def _preparar_datos_actualizacion(self, datos):
         """Prepara los datos para la operación de actualización."""
         raise NotImplementedError("Cada modelo debe implementar _preparar_datos_actualizacion")
-    
-    def _formatear_datos_lectura(self, fila):
-        """Formatea los datos leídos de la base de datos."""
-        raise NotImplementedError("Cada modelo debe implementar _formatear_datos_lectura")
+
+
+trazar_clase(BaseModel)
@@ -4,12 +4,111 @@ Incluye tipos de documento, ubicaciones, categorías, etc.
 """
 
 from models.base_model import BaseModel
+from database.compilador import Tabla, Filtro
+from database.unidad_trabajo import unidad_de_trabajo
+import logging
 import re
 
+logger = logging.getLogger(__name__)
 
-class TipoDocumento(BaseModel):
+
+class CatalogoBase(BaseModel):
+    """Base de los catálogos: agrega la sincronización masiva desde una fuente externa."""
+    
+    def sincronizar(self, filas, clave=None, eliminar_faltantes=False, tamano_lote=500):
+        """
+        Sincroniza la tabla con una fuente autoritativa usando lotes de
+        INSERT ... ON DUPLICATE KEY UPDATE, todo en una unidad de trabajo.
+        
+        Args:
+            filas (list): Diccionarios con los datos de cada registro
+            clave (str): Columna que identifica el registro en la fuente; debe ser
+                la clave primaria o una columna UNIQUE (por defecto la clave primaria)
+            eliminar_faltantes (bool): Eliminar los registros que no están en la fuente
+            tamano_lote (int): Filas por sentencia
+            
+        Returns:
+            tuple: (exito, mensaje, conteos) con insertados, actualizados y eliminados
+        """
+        conteos = {'insertados': 0, 'actualizados': 0, 'eliminados': 0}
+        try:
+            clave = clave or self.tabla.clave
+            if clave != self.tabla.clave and clave not in self.tabla.columnas:
+                return False, f"Columna clave no válida: {clave}", conteos
+            
+            # Con la clave primaria como clave también se insertan los IDs de la fuente
+            columnas = self.tabla.columnas
+            if clave == self.tabla.clave:
+                columnas = (clave,) + columnas
+            actualizables = tuple(columna for columna in self.tabla.columnas if columna != clave)
+            
+            # Validar y preparar todo antes de escribir; una clave repetida conserva la última fila
+            preparadas = {}
+            for numero, datos in enumerate(filas, start=1):
+                if datos.get(clave) in (None, ''):
+                    return False, f"Fila {numero}: falta la columna clave {clave}", conteos
+                es_valido, mensaje_error = self.validar_datos(datos)
+                if not es_valido:
+                    return False, f"Fila {numero}: {mensaje_error}", conteos
+                # La clave se compara y se escribe tal como la normaliza el modelo;
+                # la clave primaria no la prepara el modelo y se toma de la fuente
+                fila = self._preparar_datos_creacion(datos)
+                if clave not in fila:
+                    valor = datos[clave]
+                    fila[clave] = valor.strip() if isinstance(valor, str) else valor
+                preparadas[str(fila[clave])] = tuple(fila[columna] for columna in columnas)
+            
+            with unidad_de_trabajo(self.db) as bloque:
+                existentes = {str(registro[clave]): registro[clave]
+                              for registro in self.db.fetch_all(self.tabla.compilador.valores_de(clave))}
+                
+                lote_filas = list(preparadas.values())
+                for inicio in range(0, len(lote_filas), tamano_lote):
+                    lote = lote_filas[inicio:inicio + tamano_lote]
+                    query = self.tabla.compilador.insertar_o_actualizar(columnas, actualizables, len(lote))
+                    params = [valor for fila in lote for valor in fila]
+                    afectadas = self.db.execute_update(query, params)
+                    if afectadas is None:
+                        break
+                    # Con FOUND_ROWS: 1 por insertada o sin cambios, 2 por actualizada
+                    nuevas = sum(1 for fila in lote if str(fila[columnas.index(clave)]) not in existentes)
+                    conteos['insertados'] += nuevas
+                    conteos['actualizados'] += afectadas - len(lote)
+                
+                if eliminar_faltantes and not bloque.fallida:
+                    faltantes = [valor for texto, valor in existentes.items() if texto not in preparadas]
+                    for inicio in range(0, len(faltantes), tamano_lote):
+                        lote = faltantes[inicio:inicio + tamano_lote]
+                        query = self.tabla.compilador.eliminar_por(clave, len(lote))
+                        eliminadas = self.db.execute_update(query, lote)
+                        if eliminadas is None:
+                            break
+                        conteos['eliminados'] += eliminadas
+                
+                bloque.unidad.mapa_identidad.limpiar()
+            
+            if bloque.fallida:
+                return False, "No se pudo sincronizar el catálogo", dict.fromkeys(conteos, 0)
+            
+            logger.info(f"Catálogo {self.tabla.nombre} sincronizado: {conteos}")
+            return True, "Catálogo sincronizado exitosamente", conteos
+            
+        except Exception as e:
+            logger.error(f"Error al sincronizar catálogo: {str(e)}")
+            return False, f"Error al sincronizar el catálogo: {str(e)}", dict.fromkeys(conteos, 0)
+
+
+class TipoDocumento(CatalogoBase):
     """Modelo para tipos de documento legal (DNI, Pasaporte, etc.)"""
     
+    tabla = Tabla(
+        nombre='tipo_documento_legal',
+        clave='id_tipo_documento',
+        columnas=('nombre_tipo',),
+        filtros={'nombre_tipo': Filtro('nombre_tipo', 'LIKE')},
+        orden='nombre_tipo'
+    )
+    
     def __init__(self):
         super().__init__()
         self.nombre_tipo = None
@@ -24,38 +123,6 @@ class TipoDocumento(BaseModel):
         
         return True, ""
     
-    def _generar_query_creacion(self):
-        return "INSERT INTO tipo_documento_legal (nombre_tipo) VALUES (%(nombre_tipo)s)"
-    
-    def _generar_query_lectura(self):
-        return "SELECT * FROM tipo_documento_legal WHERE id_tipo_documento = %s"
-    
-    def _generar_query_actualizacion(self):
-        return "UPDATE tipo_documento_legal SET nombre_tipo = %(nombre_tipo)s WHERE id_tipo_documento = %(id)s"
-    
-    def _generar_query_eliminacion(self):
-        return "DELETE FROM tipo_documento_legal WHERE id_tipo_documento = %s"
-    
-    def _generar_query_listado(self, filtros=None, limite=None, offset=None):
-        query = "SELECT * FROM tipo_documento_legal"
-        params = []
-        
-        if filtros and filtros.get('nombre_tipo'):
-            query += " WHERE nombre_tipo LIKE %s"
-            params.append(f"%{filtros['nombre_tipo']}%")
-        
-        query += " ORDER BY nombre_tipo"
-        
-        if limite:
-            query += " LIMIT %s"
-            params.append(limite)
-        
-        if offset:
-            query += " OFFSET %s"
-            params.append(offset)
-        
-        return query, params
-    
     def _preparar_datos_creacion(self, datos):
         return {
             'nombre_tipo': datos['nombre_tipo'].strip()
@@ -65,17 +132,19 @@ class TipoDocumento(BaseModel):
         return {
             'nombre_tipo': datos['nombre_tipo'].strip()
         }
-    
-    def _formatear_datos_lectura(self, fila):
-        return {
-            'id_tipo_documento': fila[0],
-            'nombre_tipo': fila[1]
-        }
 
 
-class Departamento(BaseModel):
+class Departamento(CatalogoBase):
     """Modelo para departamentos del Perú"""
     
+    tabla = Tabla(
+        nombre='departamentos',
+        clave='id_departamento',
+        columnas=('nombre',),
+        filtros={'nombre': Filtro('nombre', 'LIKE')},
+        orden='nombre'
+    )
+    
     def __init__(self):
         super().__init__()
         self.nombre = None
@@ -90,38 +159,6 @@ class Departamento(BaseModel):
         
         return True, ""
     
-    def _generar_query_creacion(self):
-        return "INSERT INTO departamentos (nombre) VALUES (%(nombre)s)"
-    
-    def _generar_query_lectura(self):
-        return "SELECT * FROM departamentos WHERE id_departamento = %s"
-    
-    def _generar_query_actualizacion(self):
-        return "UPDATE departamentos SET nombre = %(nombre)s WHERE id_departamento = %(id)s"
-    
-    def _generar_query_eliminacion(self):
-        return "DELETE FROM departamentos WHERE id_departamento = %s"
-    
-    def _generar_query_listado(self, filtros=None, limite=None, offset=None):
-        query = "SELECT * FROM departamentos"
-        params = []
-        
-        if filtros and filtros.get('nombre'):
-            query += " WHERE nombre LIKE %s"
-            params.append(f"%{filtros['nombre']}%")
-        
-        query += " ORDER BY nombre"
-        
-        if limite:
-            query += " LIMIT %s"
-            params.append(limite)
-        
-        if offset:
-            query += " OFFSET %s"
-            params.append(offset)
-        
-        return query, params
-    
     def _preparar_datos_creacion(self, datos):
         return {
             'nombre': datos['nombre'].strip()
@@ -131,17 +168,25 @@ class Departamento(BaseModel):
         return {
             'nombre': datos['nombre'].strip()
         }
-    
-    def _formatear_datos_lectura(self, fila):
-        return {
-            'id_departamento': fila[0],
-            'nombre': fila[1]
-        }
 
 
-class Provincia(BaseModel):
+class Provincia(CatalogoBase):
     """Modelo para provincias del Perú"""
     
+    tabla = Tabla(
+        nombre='provincias',
+        alias='p',
+        clave='id_provincia',
+        columnas=('nombre', 'id_departamento'),
+        extras={'departamento': ('d.nombre', ('d',))},
+        uniones={'d': "LEFT JOIN departamentos d ON p.id_departamento = d.id_departamento"},
+        filtros={
+            'nombre': Filtro('p.nombre', 'LIKE'),
+            'id_departamento': Filtro('p.id_departamento')
+        },
+        orden='p.nombre'
+    )
+    
     def __init__(self):
         super().__init__()
         self.nombre = None
@@ -160,48 +205,6 @@ class Provincia(BaseModel):
         
         return True, ""
     
-    def _generar_query_creacion(self):
-        return "INSERT INTO provincias (nombre, id_departamento) VALUES (%(nombre)s, %(id_departamento)s)"
-    
-    def _generar_query_lectura(self):
-        return "SELECT p.*, d.nombre as departamento FROM provincias p LEFT JOIN departamentos d ON p.id_departamento = d.id_departamento WHERE p.id_provincia = %s"
-    
-    def _generar_query_actualizacion(self):
-        return "UPDATE provincias SET nombre = %(nombre)s, id_departamento = %(id_departamento)s WHERE id_provincia = %(id)s"
-    
-    def _generar_query_eliminacion(self):
-        return "DELETE FROM provincias WHERE id_provincia = %s"
-    
-    def _generar_query_listado(self, filtros=None, limite=None, offset=None):
-        query = """SELECT p.*, d.nombre as departamento 
-                   FROM provincias p 
-                   LEFT JOIN departamentos d ON p.id_departamento = d.id_departamento"""
-        params = []
-        
-        condiciones = []
-        if filtros:
-            if filtros.get('nombre'):
-                condiciones.append("p.nombre LIKE %s")
-                params.append(f"%{filtros['nombre']}%")
-            if filtros.get('id_departamento'):
-                condiciones.append("p.id_departamento = %s")
-                params.append(filtros['id_departamento'])
-        
-        if condiciones:
-            query += " WHERE " + " AND ".join(condiciones)
-        
-        query += " ORDER BY p.nombre"
-        
-        if limite:
-            query += " LIMIT %s"
-            params.append(limite)
-        
-        if offset:
-            query += " OFFSET %s"
-            params.append(offset)
-        
-        return query, params
-    
     def _preparar_datos_creacion(self, datos):
         return {
             'nombre': datos['nombre'].strip(),
@@ -213,19 +216,31 @@ class Provincia(BaseModel):
             'nombre': datos['nombre'].strip(),
             'id_departamento': datos['id_departamento']
         }
-    
-    def _formatear_datos_lectura(self, fila):
-        return {
-            'id_provincia': fila[0],
-            'nombre': fila[1],
-            'id_departamento': fila[2],
-            'departamento': fila[3] if len(fila) > 3 else None
-        }
 
 
-class Distrito(BaseModel):
+class Distrito(CatalogoBase):
     """Modelo para distritos del Perú"""
     
+    tabla = Tabla(
+        nombre='distritos',
+        alias='d',
+        clave='id_distrito',
+        columnas=('nombre', 'id_provincia'),
+        extras={
+            'provincia': ('p.nombre', ('p',)),
+            'departamento': ('dep.nombre', ('p', 'dep'))
+        },
+        uniones={
+            'p': "LEFT JOIN provincias p ON d.id_provincia = p.id_provincia",
+            'dep': "LEFT JOIN departamentos dep ON p.id_departamento = dep.id_departamento"
+        },
+        filtros={
+            'nombre': Filtro('d.nombre', 'LIKE'),
+            'id_provincia': Filtro('d.id_provincia')
+        },
+        orden='d.nombre'
+    )
+    
     def __init__(self):
         super().__init__()
         self.nombre = None
@@ -244,53 +259,6 @@ class Distrito(BaseModel):
         
         return True, ""
     
-    def _generar_query_creacion(self):
-        return "INSERT INTO distritos (nombre, id_provincia) VALUES (%(nombre)s, %(id_provincia)s)"
-    
-    def _generar_query_lectura(self):
-        return """SELECT d.*, p.nombre as provincia, dep.nombre as departamento 
-                  FROM distritos d 
-                  LEFT JOIN provincias p ON d.id_provincia = p.id_provincia
-                  LEFT JOIN departamentos dep ON p.id_departamento = dep.id_departamento
-                  WHERE d.id_distrito = %s"""
-    
-    def _generar_query_actualizacion(self):
-        return "UPDATE distritos SET nombre = %(nombre)s, id_provincia = %(id_provincia)s WHERE id_distrito = %(id)s"
-    
-    def _generar_query_eliminacion(self):
-        return "DELETE FROM distritos WHERE id_distrito = %s"
-    
-    def _generar_query_listado(self, filtros=None, limite=None, offset=None):
-        query = """SELECT d.*, p.nombre as provincia, dep.nombre as departamento 
-                   FROM distritos d 
-                   LEFT JOIN provincias p ON d.id_provincia = p.id_provincia
-                   LEFT JOIN departamentos dep ON p.id_departamento = dep.id_departamento"""
-        params = []
-        
-        condiciones = []
-        if filtros:
-            if filtros.get('nombre'):
-                condiciones.append("d.nombre LIKE %s")
-                params.append(f"%{filtros['nombre']}%")
-            if filtros.get('id_provincia'):
-                condiciones.append("d.id_provincia = %s")
-                params.append(filtros['id_provincia'])
-        
-        if condiciones:
-            query += " WHERE " + " AND ".join(condiciones)
-        
-        query += " ORDER BY d.nombre"
-        
-        if limite:
-            query += " LIMIT %s"
-            params.append(limite)
-        
-        if offset:
-            query += " OFFSET %s"
-            params.append(offset)
-        
-        return query, params
-    
     def _preparar_datos_creacion(self, datos):
         return {
             'nombre': datos['nombre'].strip(),
@@ -302,20 +270,19 @@ class Distrito(BaseModel):
             'nombre': datos['nombre'].strip(),
             'id_provincia': datos['id_provincia']
         }
-    
-    def _formatear_datos_lectura(self, fila):
-        return {
-            'id_distrito': fila[0],
-            'nombre': fila[1],
-            'id_provincia': fila[2],
-            'provincia': fila[3] if len(fila) > 3 else None,
-            'departamento': fila[4] if len(fila) > 4 else None
-        }
 
 
-class CategoriaCliente(BaseModel):
+class CategoriaCliente(CatalogoBase):
     """Modelo para categorías de cliente (Estándar, Premium, Empresarial)"""
     
+    tabla = Tabla(
+        nombre='categoria_cliente',
+        clave='id_categoria',
+        columnas=('nombre_categoria',),
+        filtros={'nombre_categoria': Filtro('nombre_categoria', 'LIKE')},
+        orden='nombre_categoria'
+    )
+    
     def __init__(self):
         super().__init__()
         self.nombre_categoria = None
@@ -330,38 +297,6 @@ class CategoriaCliente(BaseModel):
         
         return True, ""
     
-    def _generar_query_creacion(self):
-        return "INSERT INTO categoria_cliente (nombre_categoria) VALUES (%(nombre_categoria)s)"
-    
-    def _generar_query_lectura(self):
-        return "SELECT * FROM categoria_cliente WHERE id_categoria = %s"
-    
-    def _generar_query_actualizacion(self):
-        return "UPDATE categoria_cliente SET nombre_categoria = %(nombre_categoria)s WHERE id_categoria = %(id)s"
-    
-    def _generar_query_eliminacion(self):
-        return "DELETE FROM categoria_cliente WHERE id_categoria = %s"
-    
-    def _generar_query_listado(self, filtros=None, limite=None, offset=None):
-        query = "SELECT * FROM categoria_cliente"
-        params = []
-        
-        if filtros and filtros.get('nombre_categoria'):
-            query += " WHERE nombre_categoria LIKE %s"
-            params.append(f"%{filtros['nombre_categoria']}%")
-        
-        query += " ORDER BY nombre_categoria"
-        
-        if limite:
-            query += " LIMIT %s"
-            params.append(limite)
-        
-        if offset:
-            query += " OFFSET %s"
-            params.append(offset)
-        
-        return query, params
-    
     def _preparar_datos_creacion(self, datos):
         return {
             'nombre_categoria': datos['nombre_categoria'].strip()
@@ -371,17 +306,22 @@ class CategoriaCliente(BaseModel):
         return {
             'nombre_categoria': datos['nombre_categoria'].strip()
         }
-    
-    def _formatear_datos_lectura(self, fila):
-        return {
-            'id_categoria': fila[0],
-            'nombre_categoria': fila[1]
-        }
 
 
-class Banco(BaseModel):
+class Banco(CatalogoBase):
     """Modelo para bancos del sistema"""
     
+    tabla = Tabla(
+        nombre='bancos',
+        clave='id_banco',
+        columnas=('nombre_banco', 'codigo_banco'),
+        filtros={
+            'nombre_banco': Filtro('nombre_banco', 'LIKE'),
+            'codigo_banco': Filtro('codigo_banco', 'LIKE')
+        },
+        orden='nombre_banco'
+    )
+    
     def __init__(self):
         super().__init__()
         self.nombre_banco = None
@@ -403,61 +343,62 @@ class Banco(BaseModel):
         
         return True, ""
     
-    def _generar_query_creacion(self):
-        return "INSERT INTO bancos (nombre_banco, codigo_banco) VALUES (%(nombre_banco)s, %(codigo_banco)s)"
-    
-    def _generar_query_lectura(self):
-        return "SELECT * FROM bancos WHERE id_banco = %s"
+    def _preparar_datos_creacion(self, datos):
+        return {
+            'nombre_banco': datos['nombre_banco'].strip(),
+            'codigo_banco': datos['codigo_banco'].strip()
+        }
     
-    def _generar_query_actualizacion(self):
-        return "UPDATE bancos SET nombre_banco = %(nombre_banco)s, codigo_banco = %(codigo_banco)s WHERE id_banco = %(id)s"
+    def _preparar_datos_actualizacion(self, datos):
+        return {
+            'nombre_banco': datos['nombre_banco'].strip(),
+            'codigo_banco': datos['codigo_banco'].strip()
+        }
+
+
+class ProductoCuenta(CatalogoBase):
+    """Modelo para productos de cuenta (Ahorros, Sueldo, Corriente, etc.)"""
+    
+    tabla = Tabla(
+        nombre='productos_cuenta',
+        clave='id_producto',
+        columnas=('nombre_producto', 'tipo_producto'),
+        filtros={
+            'nombre_producto': Filtro('nombre_producto', 'LIKE'),
+            'tipo_producto': Filtro('tipo_producto')
+        },
+        orden='nombre_producto'
+    )
     
-    def _generar_query_eliminacion(self):
-        return "DELETE FROM bancos WHERE id_banco = %s"
+    def __init__(self):
+        super().__init__()
+        self.nombre_producto = None
+        self.tipo_producto = None
     
-    def _generar_query_listado(self, filtros=None, limite=None, offset=None):
-        query = "SELECT * FROM bancos"
-        params = []
-        
-        condiciones = []
-        if filtros:
-            if filtros.get('nombre_banco'):
-                condiciones.append("nombre_banco LIKE %s")
-                params.append(f"%{filtros['nombre_banco']}%")
-            if filtros.get('codigo_banco'):
-                condiciones.append("codigo_banco LIKE %s")
-                params.append(f"%{filtros['codigo_banco']}%")
-        
-        if condiciones:
-            query += " WHERE " + " AND ".join(condiciones)
+    def validar_datos(self, datos):
+        """Valida los datos del producto de cuenta."""
+        if not datos.get('nombre_producto'):
+            return False, "El nombre del producto es requerido"
         
-        query += " ORDER BY nombre_banco"
+        if not datos.get('tipo_producto'):
+            return False, "El tipo de producto es requerido"
         
-        if limite:
-            query += " LIMIT %s"
-            params.append(limite)
+        if len(datos['nombre_producto']) > 100:
+            return False, "El nombre del producto no puede exceder 100 caracteres"
         
-        if offset:
-            query += " OFFSET %s"
-            params.append(offset)
+        if len(datos['tipo_producto']) > 50:
+            return False, "El tipo de producto no puede exceder 50 caracteres"
         
-        return query, params
+        return True, ""
     
     def _preparar_datos_creacion(self, datos):
         return {
-            'nombre_banco': datos['nombre_banco'].strip(),
-            'codigo_banco': datos['codigo_banco'].strip()
+            'nombre_producto': datos['nombre_producto'].strip(),
+            'tipo_producto': datos['tipo_producto'].strip()
         }
     
     def _preparar_datos_actualizacion(self, datos):
         return {
-            'nombre_banco': datos['nombre_banco'].strip(),
-            'codigo_banco': datos['codigo_banco'].strip()
-        }
-    
-    def _formatear_datos_lectura(self, fila):
-        return {
-            'id_banco': fila[0],
-            'nombre_banco': fila[1],
-            'codigo_banco': fila[2]
+            'nombre_producto': datos['nombre_producto'].strip(),
+            'tipo_producto': datos['tipo_producto'].strip()
         }
@@ -4,6 +4,7 @@ Maneja la información personal y de contacto de los clientes.
 """
 
 from models.base_model import BaseModel
+from database.compilador import Tabla, Filtro
 import re
 from datetime import datetime
 
@@ -11,6 +12,34 @@ from datetime import datetime
 class Cliente(BaseModel):
     """Modelo para clientes del banco"""
     
+    tabla = Tabla(
+        nombre='clientes',
+        alias='c',
+        clave='id_cliente',
+        columnas=('nombre', 'apellido_paterno', 'apellido_materno', 'id_tipo_documento',
+                  'numero_documento', 'email', 'telefono', 'fecha_nacimiento',
+                  'id_categoria', 'id_agencia_apertura'),
+        extras={
+            'tipo_documento': ('td.nombre_tipo', ('td',)),
+            'categoria': ('cat.nombre_categoria', ('cat',)),
+            'agencia': ('a.nombre_agencia', ('a',))
+        },
+        uniones={
+            'td': "LEFT JOIN tipo_documento_legal td ON c.id_tipo_documento = td.id_tipo_documento",
+            'cat': "LEFT JOIN categoria_cliente cat ON c.id_categoria = cat.id_categoria",
+            'a': "LEFT JOIN agencias a ON c.id_agencia_apertura = a.id_agencia"
+        },
+        filtros={
+            'nombre': Filtro(('c.nombre', 'c.apellido_paterno', 'c.apellido_materno'), 'LIKE'),
+            'numero_documento': Filtro('c.numero_documento', 'LIKE'),
+            'email': Filtro('c.email', 'LIKE'),
+            'id_categoria': Filtro('c.id_categoria'),
+            'id_agencia_apertura': Filtro('c.id_agencia_apertura')
+        },
+        orden='c.apellido_paterno, c.apellido_materno, c.nombre',
+        version='version'
+    )
+    
     def __init__(self):
         super().__init__()
         self.nombre = None
@@ -98,77 +127,6 @@ class Cliente(BaseModel):
         except ValueError:
             return False
     
-    def _generar_query_creacion(self):
-        return """INSERT INTO clientes 
-                  (nombre, apellido_paterno, apellido_materno, id_tipo_documento, 
-                   numero_documento, email, telefono, fecha_nacimiento, 
-                   id_categoria, id_agencia_apertura) 
-                  VALUES (%(nombre)s, %(apellido_paterno)s, %(apellido_materno)s, 
-                          %(id_tipo_documento)s, %(numero_documento)s, %(email)s, 
-                          %(telefono)s, %(fecha_nacimiento)s, %(id_categoria)s, 
-                          %(id_agencia_apertura)s)"""
-    
-    def _generar_query_lectura(self):
-        return """SELECT c.*, td.nombre_tipo, cat.nombre_categoria, a.nombre_agencia
-                  FROM clientes c
-                  LEFT JOIN tipo_documento_legal td ON c.id_tipo_documento = td.id_tipo_documento
-                  LEFT JOIN categoria_cliente cat ON c.id_categoria = cat.id_categoria
-                  LEFT JOIN agencias a ON c.id_agencia_apertura = a.id_agencia
-                  WHERE c.id_cliente = %s"""
-    
-    def _generar_query_actualizacion(self):
-        return """UPDATE clientes SET 
-                  nombre = %(nombre)s, apellido_paterno = %(apellido_paterno)s, 
-                  apellido_materno = %(apellido_materno)s, id_tipo_documento = %(id_tipo_documento)s,
-                  numero_documento = %(numero_documento)s, email = %(email)s, 
-                  telefono = %(telefono)s, fecha_nacimiento = %(fecha_nacimiento)s,
-                  id_categoria = %(id_categoria)s, id_agencia_apertura = %(id_agencia_apertura)s
-                  WHERE id_cliente = %(id)s"""
-    
-    def _generar_query_eliminacion(self):
-        return "DELETE FROM clientes WHERE id_cliente = %s"
-    
-    def _generar_query_listado(self, filtros=None, limite=None, offset=None):
-        query = """SELECT c.*, td.nombre_tipo, cat.nombre_categoria, a.nombre_agencia
-                   FROM clientes c
-                   LEFT JOIN tipo_documento_legal td ON c.id_tipo_documento = td.id_tipo_documento
-                   LEFT JOIN categoria_cliente cat ON c.id_categoria = cat.id_categoria
-                   LEFT JOIN agencias a ON c.id_agencia_apertura = a.id_agencia"""
-        params = []
-        
-        condiciones = []
-        if filtros:
-            if filtros.get('nombre'):
-                condiciones.append("(c.nombre LIKE %s OR c.apellido_paterno LIKE %s OR c.apellido_materno LIKE %s)")
-                params.extend([f"%{filtros['nombre']}%", f"%{filtros['nombre']}%", f"%{filtros['nombre']}%"])
-            if filtros.get('numero_documento'):
-                condiciones.append("c.numero_documento LIKE %s")
-                params.append(f"%{filtros['numero_documento']}%")
-            if filtros.get('email'):
-                condiciones.append("c.email LIKE %s")
-                params.append(f"%{filtros['email']}%")
-            if filtros.get('id_categoria'):
-                condiciones.append("c.id_categoria = %s")
-                params.append(filtros['id_categoria'])
-            if filtros.get('id_agencia_apertura'):
-                condiciones.append("c.id_agencia_apertura = %s")
-                params.append(filtros['id_agencia_apertura'])
-        
-        if condiciones:
-            query += " WHERE " + " AND ".join(condiciones)
-        
-        query += " ORDER BY c.apellido_paterno, c.apellido_materno, c.nombre"
-        
-        if limite:
-            query += " LIMIT %s"
-            params.append(limite)
-        
-        if offset:
-            query += " OFFSET %s"
-            params.append(offset)
-        
-        return query, params
-    
     def _preparar_datos_creacion(self, datos):
         return {
             'nombre': datos['nombre'].strip(),
@@ -197,47 +155,22 @@ class Cliente(BaseModel):
             'id_agencia_apertura': datos['id_agencia_apertura']
         }
     
-    def _formatear_datos_lectura(self, fila):
-        return {
-            'id_cliente': fila[0],
-            'nombre': fila[1],
-            'apellido_paterno': fila[2],
-            'apellido_materno': fila[3],
-            'id_tipo_documento': fila[4],
-            'numero_documento': fila[5],
-            'email': fila[6],
-            'telefono': fila[7],
-            'fecha_nacimiento': fila[8],
-            'id_categoria': fila[9],
-            'id_agencia_apertura': fila[10],
-            'tipo_documento': fila[11] if len(fila) > 11 else None,
-            'categoria': fila[12] if len(fila) > 12 else None,
-            'agencia': fila[13] if len(fila) > 13 else None
-        }
-    
-    def buscar_por_documento(self, numero_documento):
+    def buscar_por_documento(self, numero_documento, columnas=None):
         """
         Busca un cliente por número de documento.
         
         Args:
             numero_documento (str): Número de documento a buscar
+            columnas (list): Columnas a retornar (por defecto todas)
             
         Returns:
             tuple: (exito, mensaje, datos)
         """
         try:
-            query = """SELECT c.*, td.nombre_tipo, cat.nombre_categoria, a.nombre_agencia
-                       FROM clientes c
-                       LEFT JOIN tipo_documento_legal td ON c.id_tipo_documento = td.id_tipo_documento
-                       LEFT JOIN categoria_cliente cat ON c.id_categoria = cat.id_categoria
-                       LEFT JOIN agencias a ON c.id_agencia_apertura = a.id_agencia
-                       WHERE c.numero_documento = %s"""
-            
-            resultado = self.db.fetch_all(query, (numero_documento,))
+            cliente = self._buscar_uno('numero_documento', numero_documento, columnas)
             
-            if resultado:
-                datos = self._formatear_datos_lectura(resultado[0])
-                return True, "Cliente encontrado", datos
+            if cliente:
+                return True, "Cliente encontrado", cliente
             else:
                 return False, "Cliente no encontrado", None
                 
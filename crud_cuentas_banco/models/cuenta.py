@@ -4,13 +4,63 @@ Maneja las cuentas bancarias de los clientes.
 """
 
 from models.base_model import BaseModel
+from database.compilador import Tabla, Filtro
+from database.unidad_trabajo import unidad_de_trabajo
 import re
 from datetime import datetime
 
 
+# Columnas que admiten cambios masivos y tabla donde se registran
+COLUMNAS_MASIVAS = ('estado', 'id_producto', 'id_cliente')
+HISTORIAL_CUENTAS = 'historial_cuentas'
+
+# Cuentas por UPDATE en los cambios masivos (cada lote se confirma por separado)
+TAMANO_LOTE_MASIVO = 1000
+
+
+def _saldo_a_float(saldo):
+    """Convierte el saldo DECIMAL leído de la BD a float."""
+    return float(saldo) if saldo else 0.0
+
+
 class Cuenta(BaseModel):
     """Modelo para cuentas bancarias"""
     
+    conversiones_lectura = {'saldo': _saldo_a_float}
+    
+    tabla = Tabla(
+        nombre='cuentas',
+        alias='c',
+        clave='id_cuenta',
+        columnas=('numero_cuenta', 'cci', 'id_cliente', 'id_producto', 'saldo',
+                  'fecha_apertura', 'estado'),
+        extras={
+            'nombre_cliente': ('cl.nombre', ('cl',)),
+            'apellido_paterno': ('cl.apellido_paterno', ('cl',)),
+            'apellido_materno': ('cl.apellido_materno', ('cl',)),
+            'producto': ('p.nombre_producto', ('p',)),
+            'tipo_producto': ('p.tipo_producto', ('p',))
+        },
+        uniones={
+            'cl': "LEFT JOIN clientes cl ON c.id_cliente = cl.id_cliente",
+            'p': "LEFT JOIN productos_cuenta p ON c.id_producto = p.id_producto"
+        },
+        filtros={
+            'numero_cuenta': Filtro('c.numero_cuenta', 'LIKE'),
+            'cci': Filtro('c.cci'),
+            'id_cliente': Filtro('c.id_cliente'),
+            'estado': Filtro('c.estado'),
+            'id_producto': Filtro('c.id_producto'),
+            'saldo_minimo': Filtro('c.saldo', '>='),
+            'saldo_maximo': Filtro('c.saldo', '<='),
+            # Último movimiento (o apertura) hasta la fecha indicada
+            'sin_actividad_desde': Filtro("COALESCE((SELECT a.ultima_transaccion FROM actividad_cuentas a "
+                                          "WHERE a.id_cuenta = c.id_cuenta), c.fecha_apertura)", '<=')
+        },
+        orden='c.fecha_apertura DESC',
+        version='version'
+    )
+    
     def __init__(self):
         super().__init__()
         self.numero_cuenta = None
@@ -98,75 +148,6 @@ class Cuenta(BaseModel):
         except ValueError:
             return False
     
-    def _generar_query_creacion(self):
-        return """INSERT INTO cuentas 
-                  (numero_cuenta, cci, id_cliente, id_producto, saldo, fecha_apertura, estado) 
-                  VALUES (%(numero_cuenta)s, %(cci)s, %(id_cliente)s, %(id_producto)s, 
-                          %(saldo)s, %(fecha_apertura)s, %(estado)s)"""
-    
-    def _generar_query_lectura(self):
-        return """SELECT c.*, cl.nombre, cl.apellido_paterno, cl.apellido_materno, 
-                         p.nombre_producto, p.tipo_producto
-                  FROM cuentas c
-                  LEFT JOIN clientes cl ON c.id_cliente = cl.id_cliente
-                  LEFT JOIN productos_cuenta p ON c.id_producto = p.id_producto
-                  WHERE c.id_cuenta = %s"""
-    
-    def _generar_query_actualizacion(self):
-        return """UPDATE cuentas SET 
-                  numero_cuenta = %(numero_cuenta)s, cci = %(cci)s, 
-                  id_cliente = %(id_cliente)s, id_producto = %(id_producto)s,
-                  saldo = %(saldo)s, fecha_apertura = %(fecha_apertura)s, 
-                  estado = %(estado)s
-                  WHERE id_cuenta = %(id)s"""
-    
-    def _generar_query_eliminacion(self):
-        return "DELETE FROM cuentas WHERE id_cuenta = %s"
-    
-    def _generar_query_listado(self, filtros=None, limite=None, offset=None):
-        query = """SELECT c.*, cl.nombre, cl.apellido_paterno, cl.apellido_materno, 
-                          p.nombre_producto, p.tipo_producto
-                   FROM cuentas c
-                   LEFT JOIN clientes cl ON c.id_cliente = cl.id_cliente
-                   LEFT JOIN productos_cuenta p ON c.id_producto = p.id_producto"""
-        params = []
-        
-        condiciones = []
-        if filtros:
-            if filtros.get('numero_cuenta'):
-                condiciones.append("c.numero_cuenta LIKE %s")
-                params.append(f"%{filtros['numero_cuenta']}%")
-            if filtros.get('id_cliente'):
-                condiciones.append("c.id_cliente = %s")
-                params.append(filtros['id_cliente'])
-            if filtros.get('estado'):
-                condiciones.append("c.estado = %s")
-                params.append(filtros['estado'])
-            if filtros.get('id_producto'):
-                condiciones.append("c.id_producto = %s")
-                params.append(filtros['id_producto'])
-            if filtros.get('saldo_minimo'):
-                condiciones.append("c.saldo >= %s")
-                params.append(filtros['saldo_minimo'])
-            if filtros.get('saldo_maximo'):
-                condiciones.append("c.saldo <= %s")
-                params.append(filtros['saldo_maximo'])
-        
-        if condiciones:
-            query += " WHERE " + " AND ".join(condiciones)
-        
-        query += " ORDER BY c.fecha_apertura DESC"
-        
-        if limite:
-            query += " LIMIT %s"
-            params.append(limite)
-        
-        if offset:
-            query += " OFFSET %s"
-            params.append(offset)
-        
-        return query, params
-    
     def _preparar_datos_creacion(self, datos):
         return {
             'numero_cuenta': datos['numero_cuenta'].strip(),
@@ -189,46 +170,22 @@ class Cuenta(BaseModel):
             'estado': datos['estado']
         }
     
-    def _formatear_datos_lectura(self, fila):
-        return {
-            'id_cuenta': fila[0],
-            'numero_cuenta': fila[1],
-            'cci': fila[2],
-            'id_cliente': fila[3],
-            'id_producto': fila[4],
-            'saldo': float(fila[5]) if fila[5] else 0.0,
-            'fecha_apertura': fila[6],
-            'estado': fila[7],
-            'nombre_cliente': fila[8] if len(fila) > 8 else None,
-            'apellido_paterno': fila[9] if len(fila) > 9 else None,
-            'apellido_materno': fila[10] if len(fila) > 10 else None,
-            'producto': fila[11] if len(fila) > 11 else None,
-            'tipo_producto': fila[12] if len(fila) > 12 else None
-        }
-    
-    def buscar_por_numero(self, numero_cuenta):
+    def buscar_por_numero(self, numero_cuenta, columnas=None):
         """
         Busca una cuenta por número de cuenta.
         
         Args:
             numero_cuenta (str): Número de cuenta a buscar
+            columnas (list): Columnas a retornar (por defecto todas)
             
         Returns:
             tuple: (exito, mensaje, datos)
         """
         try:
-            query = """SELECT c.*, cl.nombre, cl.apellido_paterno, cl.apellido_materno, 
-                              p.nombre_producto, p.tipo_producto
-                       FROM cuentas c
-                       LEFT JOIN clientes cl ON c.id_cliente = cl.id_cliente
-                       LEFT JOIN productos_cuenta p ON c.id_producto = p.id_producto
-                       WHERE c.numero_cuenta = %s"""
-            
-            resultado = self.db.fetch_all(query, (numero_cuenta,))
+            cuenta = self._buscar_uno('numero_cuenta', numero_cuenta, columnas)
             
-            if resultado:
-                datos = self._formatear_datos_lectura(resultado[0])
-                return True, "Cuenta encontrada", datos
+            if cuenta:
+                return True, "Cuenta encontrada", cuenta
             else:
                 return False, "Cuenta no encontrada", None
                 
@@ -253,7 +210,8 @@ class Cuenta(BaseModel):
     
     def actualizar_saldo(self, id_cuenta, nuevo_saldo):
         """
-        Actualiza el saldo de una cuenta.
+        Actualiza el saldo de una cuenta y registra el cambio en el historial
+        dentro de una misma unidad de trabajo.
         
         Args:
             id_cuenta (int): ID de la cuenta
@@ -266,35 +224,168 @@ class Cuenta(BaseModel):
             if nuevo_saldo < 0:
                 return False, "El saldo no puede ser negativo"
             
-            query = "UPDATE cuentas SET saldo = %s WHERE id_cuenta = %s"
-            filas_afectadas = self.db.execute_query(query, (nuevo_saldo, id_cuenta))
+            with unidad_de_trabajo(self.db) as bloque:
+                # Leer el saldo anterior antes de modificarlo
+                exito, _, datos = self.leer(id_cuenta)
+                if not exito:
+                    return False, "La cuenta no existe"
+                
+                query = "UPDATE cuentas SET saldo = %s, version = version + 1 WHERE id_cuenta = %s"
+                filas_afectadas = self.db.execute_update(query, (nuevo_saldo, id_cuenta))
+                self._descartar_de_mapa(id_cuenta)
+                if not filas_afectadas:
+                    bloque.cancelar()
+                    return False, "No se pudo actualizar el saldo"
+                
+                self._registrar_cambio_saldo(id_cuenta, datos['saldo'], nuevo_saldo)
             
-            if filas_afectadas:
-                # Registrar en historial de saldos
-                self._registrar_cambio_saldo(id_cuenta, nuevo_saldo)
-                return True, "Saldo actualizado exitosamente"
-            else:
-                return False, "No se pudo actualizar el saldo"
+            if bloque.fallida:
+                return False, "No se pudo registrar el cambio de saldo"
+            return True, "Saldo actualizado exitosamente"
                 
         except Exception as e:
             return False, f"Error al actualizar saldo: {str(e)}"
     
-    def _registrar_cambio_saldo(self, id_cuenta, nuevo_saldo):
-        """Registra el cambio de saldo en el historial."""
+    def cambiar_estado(self, ids_cuenta, estado):
+        """
+        Cambia el estado de varias cuentas con una sola sentencia.
+        
+        Args:
+            ids_cuenta (list): IDs de las cuentas
+            estado (str): Nuevo estado
+            
+        Returns:
+            tuple: (exito, mensaje, filas_afectadas)
+        """
         try:
-            # Obtener saldo anterior
-            exito, _, datos = self.leer(id_cuenta)
-            if exito:
-                saldo_anterior = datos['saldo']
+            if estado not in ['Activa', 'Inactiva', 'Suspendida', 'Cerrada']:
+                return False, "El estado debe ser: Activa, Inactiva, Suspendida o Cerrada", 0
+            if not ids_cuenta:
+                return True, "No hay cuentas para actualizar", 0
+            
+            marcadores = ", ".join(["%s"] * len(ids_cuenta))
+            with unidad_de_trabajo(self.db) as bloque:
+                historial = f"""INSERT INTO {HISTORIAL_CUENTAS} (id_cuenta, campo, valor_anterior, valor_nuevo)
+                               SELECT id_cuenta, 'estado', estado, %s FROM cuentas
+                               WHERE id_cuenta IN ({marcadores}) AND estado <> %s"""
+                self.db.execute_update(historial, [estado, *ids_cuenta, estado])
+                query = f"UPDATE cuentas SET estado = %s, version = version + 1 WHERE id_cuenta IN ({marcadores})"
+                filas_afectadas = self.db.execute_update(query, [estado, *ids_cuenta])
+            for id_cuenta in ids_cuenta:
+                self._descartar_de_mapa(id_cuenta)
+            
+            if filas_afectadas is None or bloque.fallida:
+                return False, "No se pudo cambiar el estado", 0
+            return True, f"Estado cambiado en {filas_afectadas} cuentas", filas_afectadas
                 
-                # Insertar en historial
-                query = """INSERT INTO historial_saldos 
-                          (id_cuenta, saldo_anterior, saldo_nuevo) 
-                          VALUES (%s, %s, %s)"""
-                self.db.execute_query(query, (id_cuenta, saldo_anterior, nuevo_saldo))
         except Exception as e:
-            # No fallar si no se puede registrar el historial
-            pass
+            return False, f"Error al cambiar estado: {str(e)}", 0
+    
+    def actualizar_masivo(self, filtros, cambios, simulacion=False, tamano_lote=TAMANO_LOTE_MASIVO):
+        """
+        Cambia el estado, el producto o el cliente de todas las cuentas que
+        cumplen los filtros, con un UPDATE filtrado por lote de claves.
+        
+        Cada lote se confirma por separado junto con su historial, que se
+        copia con INSERT ... SELECT antes del UPDATE. Solo se tocan las
+        cuentas con algún valor distinto del nuevo, así que repetir la
+        operación después de un error continúa donde quedó.
+        
+        Args:
+            filtros (dict): Filtros del listado de cuentas (al menos uno)
+            cambios (dict): Nuevos valores de estado, id_producto y/o id_cliente
+            simulacion (bool): Solo contar las cuentas que cambiarían
+            tamano_lote (int): Cuentas por UPDATE
+            
+        Returns:
+            tuple: (exito, mensaje, cuentas cambiadas o que cambiarían)
+        """
+        try:
+            es_valido, mensaje_error = self._validar_cambios_masivos(filtros, cambios)
+            if not es_valido:
+                return False, mensaje_error, 0
+            
+            compilador = self.tabla.compilador
+            forma = compilador.forma_filtros(filtros)
+            parametros_filtros = compilador.parametros_filtros(forma, filtros)
+            columnas = tuple(columna for columna in COLUMNAS_MASIVAS if columna in cambios)
+            valores = [cambios['estado'] if columna == 'estado' else int(cambios[columna])
+                       for columna in columnas]
+            
+            if simulacion:
+                resultado = self.db.fetch_all(compilador.contar_cambios(columnas, forma),
+                                              [*parametros_filtros, *valores])
+                total = resultado[0]['total'] if resultado else 0
+                return True, f"Se cambiarían {total} cuentas", total
+            
+            # Las claves de cada lote se leen de la primaria: una réplica atrasada
+            # omitiría cuentas (cada commit de lote renueva la marca)
+            self.db.marcar_escritura()
+            cambiadas = 0
+            ultima = 0
+            while True:
+                ids = [fila[self.tabla.clave] for fila in self.db.fetch_all(
+                    compilador.pendientes_de_cambio(columnas, forma),
+                    [*parametros_filtros, ultima, *valores, tamano_lote])]
+                if not ids:
+                    break
+                
+                rango = [ids[0], ids[-1]]
+                with unidad_de_trabajo(self.db) as bloque:
+                    for columna, valor in zip(columnas, valores):
+                        self.db.execute_update(compilador.registrar_cambios(HISTORIAL_CUENTAS, columna, forma),
+                                               [valor, *parametros_filtros, *rango, valor])
+                    filas_afectadas = self.db.execute_update(compilador.actualizar_rango(columnas, forma),
+                                                             [*valores, *parametros_filtros, *rango, *valores])
+                for id_cuenta in ids:
+                    self._descartar_de_mapa(id_cuenta)
+                
+                if filas_afectadas is None or bloque.fallida:
+                    return False, (f"Error al cambiar el lote {rango[0]}-{rango[1]}; "
+                                   f"{cambiadas} cuentas cambiadas antes del error"), cambiadas
+                cambiadas += filas_afectadas
+                ultima = ids[-1]
+            
+            return True, f"{cambiadas} cuentas actualizadas", cambiadas
+                
+        except Exception as e:
+            return False, f"Error en el cambio masivo: {str(e)}", 0
+    
+    def _validar_cambios_masivos(self, filtros, cambios):
+        """Valida los filtros y los nuevos valores de un cambio masivo."""
+        desconocidos = [nombre for nombre in (filtros or {}) if nombre not in self.tabla.filtros]
+        if desconocidos:
+            return False, f"Filtros no permitidos: {', '.join(desconocidos)}"
+        if not self.tabla.compilador.forma_filtros(filtros):
+            return False, "Indique al menos un filtro (un cambio masivo no puede abarcar todas las cuentas)"
+        
+        if not cambios:
+            return False, "Indique el nuevo estado, producto o cliente"
+        no_permitidos = [columna for columna in cambios if columna not in COLUMNAS_MASIVAS]
+        if no_permitidos:
+            return False, f"Campos no permitidos en un cambio masivo: {', '.join(no_permitidos)}"
+        
+        if 'estado' in cambios and cambios['estado'] not in ['Activa', 'Inactiva', 'Suspendida', 'Cerrada']:
+            return False, "El estado debe ser: Activa, Inactiva, Suspendida o Cerrada"
+        for columna, tabla, nombre in (('id_producto', 'productos_cuenta', 'El producto'),
+                                       ('id_cliente', 'clientes', 'El cliente')):
+            if columna not in cambios:
+                continue
+            try:
+                valor = int(cambios[columna])
+            except (ValueError, TypeError):
+                return False, f"{nombre} debe ser un ID numérico"
+            if not self.db.fetch_all(f"SELECT 1 AS existe FROM {tabla} WHERE {columna} = %s LIMIT 1", (valor,)):
+                return False, f"{nombre} {valor} no existe"
+        
+        return True, ""
+    
+    def _registrar_cambio_saldo(self, id_cuenta, saldo_anterior, nuevo_saldo):
+        """Registra el cambio de saldo en el historial."""
+        query = """INSERT INTO historial_saldos 
+                  (id_cuenta, saldo_anterior, saldo_nuevo) 
+                  VALUES (%s, %s, %s)"""
+        self.db.execute_query(query, (id_cuenta, saldo_anterior, nuevo_saldo))
     
     def obtener_nombre_cliente_completo(self, datos_cuenta):
         """Obtiene el nombre completo del cliente de la cuenta."""
@@ -0,0 +1,343 @@
+"""
+Modelo para el historial de saldos de las cuentas.
+Responde saldos a una fecha a partir de historial_saldos y de los cierres
+guardados en saldos_cierre (saldo de cada cuenta al final de una fecha).
+
+    - saldo_al(): saldo de una cuenta a una fecha con búsquedas por índice
+      (id_cuenta, fecha_cambio), sin recorrer el historial de la cuenta.
+    - saldos_al() / saldos_fin_de_mes(): saldos de todas las cuentas, por
+      rangos de id_cuenta: el cierre anterior más los cambios posteriores a
+      él. Los cierres de fechas ya terminadas se guardan y sirven de punto de
+      partida para el siguiente cálculo.
+"""
+
+from models.base_model import BaseModel
+from database.compilador import Tabla, Filtro
+from database.unidad_trabajo import unidad_de_trabajo
+from datetime import date, datetime, time, timedelta
+import calendar
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Filas por INSERT al guardar un cierre
+TAMANO_LOTE_CIERRE = 1000
+
+# Cuentas por lote al calcular los saldos de todas las cuentas
+TAMANO_LOTE_SALDOS = 5000
+
+CUENTAS_ABIERTAS = """
+    SELECT id_cuenta, saldo FROM cuentas
+    WHERE id_cuenta > %s AND fecha_apertura <= %s
+    ORDER BY id_cuenta LIMIT %s
+"""
+
+CIERRE_DE_CUENTAS = """
+    SELECT id_cuenta, saldo FROM saldos_cierre
+    WHERE fecha = %s AND id_cuenta BETWEEN %s AND %s
+"""
+
+# Cambios de un rango de cuentas en un período, en orden: el último de cada cuenta queda al final
+CAMBIOS_DE_CUENTAS = """
+    SELECT id_cuenta, saldo_nuevo FROM historial_saldos
+    WHERE id_cuenta BETWEEN %s AND %s AND fecha_cambio < %s{desde}
+    ORDER BY id_cuenta, fecha_cambio, id_historial
+"""
+
+# Saldo anterior al primer cambio posterior a una fecha de cada cuenta (una búsqueda por índice por cuenta)
+PRIMER_CAMBIO_POSTERIOR = """
+    SELECT h.id_cuenta, h.saldo_anterior FROM historial_saldos h
+    WHERE h.id_cuenta IN ({marcadores}) AND h.id_historial = (
+        SELECT p.id_historial FROM historial_saldos p
+        WHERE p.id_cuenta = h.id_cuenta AND p.fecha_cambio >= %s
+        ORDER BY p.fecha_cambio, p.id_historial LIMIT 1)
+"""
+
+
+def _a_fecha(valor):
+    """
+    Convierte una fecha en texto (AAAA-MM-DD), date o datetime a date.
+
+    Raises:
+        ValueError: Si el texto no es una fecha válida
+    """
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return datetime.strptime(str(valor).strip(), '%Y-%m-%d').date()
+
+
+def _fin_del_dia(fecha):
+    """Inicio del día siguiente: los cambios anteriores a este instante cuentan para la fecha."""
+    return datetime.combine(fecha + timedelta(days=1), time.min)
+
+
+def _a_float(valor):
+    """Convierte un DECIMAL leído de la BD a float."""
+    return float(valor) if valor is not None else 0.0
+
+
+class HistorialSaldo(BaseModel):
+    """Modelo del historial de saldos y de los cierres por fecha"""
+    
+    conversiones_lectura = {'saldo_anterior': _a_float, 'saldo_nuevo': _a_float}
+    
+    tabla = Tabla(
+        nombre='historial_saldos',
+        alias='h',
+        clave='id_historial',
+        columnas=('id_cuenta', 'saldo_anterior', 'saldo_nuevo', 'fecha_cambio'),
+        filtros={
+            'id_cuenta': Filtro('h.id_cuenta'),
+            'desde': Filtro('h.fecha_cambio', '>='),
+            'hasta': Filtro('h.fecha_cambio', '<=')
+        },
+        orden='h.fecha_cambio DESC, h.id_historial DESC'
+    )
+    
+    def validar_datos(self, datos):
+        """Valida los datos de un cambio de saldo."""
+        errores = []
+        
+        if not datos.get('id_cuenta'):
+            errores.append("La cuenta es requerida")
+        
+        for campo in ('saldo_anterior', 'saldo_nuevo'):
+            try:
+                if float(datos.get(campo)) < 0:
+                    errores.append(f"El campo {campo} no puede ser negativo")
+            except (ValueError, TypeError):
+                errores.append(f"El campo {campo} debe ser un número")
+        
+        if errores:
+            return False, "; ".join(errores)
+        
+        return True, ""
+    
+    def _preparar_datos_creacion(self, datos):
+        return {
+            'id_cuenta': datos['id_cuenta'],
+            'saldo_anterior': float(datos['saldo_anterior']),
+            'saldo_nuevo': float(datos['saldo_nuevo']),
+            'fecha_cambio': datos.get('fecha_cambio') or datetime.now()
+        }
+    
+    def _preparar_datos_actualizacion(self, datos):
+        return self._preparar_datos_creacion(datos)
+    
+    def saldo_al(self, id_cuenta, fecha):
+        """
+        Obtiene el saldo de una cuenta al final de una fecha.
+        
+        Cada paso es una búsqueda por índice con LIMIT 1: el último cambio
+        hasta la fecha; si no hay, el último cierre guardado; si tampoco, el
+        saldo anterior al primer cambio posterior; y si la cuenta nunca
+        cambió, su saldo actual.
+        
+        Args:
+            id_cuenta (int): ID de la cuenta
+            fecha (str | date): Fecha consultada (AAAA-MM-DD)
+        
+        Returns:
+            tuple: (exito, mensaje, saldo)
+        """
+        try:
+            fecha = _a_fecha(fecha)
+            cuenta = self.db.fetch_all("SELECT saldo, fecha_apertura FROM cuentas WHERE id_cuenta = %s",
+                                       (id_cuenta,))
+            if not cuenta:
+                return False, "La cuenta no existe", None
+            if cuenta[0]['fecha_apertura'] and _a_fecha(cuenta[0]['fecha_apertura']) > fecha:
+                return False, f"La cuenta no existía el {fecha.isoformat()}", None
+            
+            limite = _fin_del_dia(fecha)
+            consultas = (
+                ("""SELECT saldo_nuevo AS saldo FROM historial_saldos
+                    WHERE id_cuenta = %s AND fecha_cambio < %s
+                    ORDER BY fecha_cambio DESC, id_historial DESC LIMIT 1""", (id_cuenta, limite)),
+                ("""SELECT saldo FROM saldos_cierre
+                    WHERE id_cuenta = %s AND fecha <= %s
+                    ORDER BY fecha DESC LIMIT 1""", (id_cuenta, fecha)),
+                ("""SELECT saldo_anterior AS saldo FROM historial_saldos
+                    WHERE id_cuenta = %s AND fecha_cambio >= %s
+                    ORDER BY fecha_cambio, id_historial LIMIT 1""", (id_cuenta, limite))
+            )
+            for query, params in consultas:
+                filas = self.db.fetch_all(query, params)
+                if filas:
+                    return True, "Saldo obtenido", _a_float(filas[0]['saldo'])
+            
+            return True, "Saldo obtenido (sin cambios registrados)", _a_float(cuenta[0]['saldo'])
+        
+        except ValueError:
+            return False, "La fecha debe tener el formato AAAA-MM-DD", None
+        except Exception as e:
+            logger.error(f"Error al obtener el saldo al {fecha}: {str(e)}")
+            return False, f"Error al obtener el saldo: {str(e)}", None
+    
+    def saldos_al(self, fecha, guardar=False, tamano_lote=TAMANO_LOTE_SALDOS):
+        """
+        Calcula el saldo de todas las cuentas abiertas al final de una fecha.
+        
+        Recorre las cuentas por rangos de id_cuenta; para cada rango parte del
+        último cierre guardado hasta esa fecha y aplica, en orden, los cambios
+        posteriores a él. Las cuentas que no están en el cierre ni cambiaron
+        toman el saldo anterior a su primer cambio posterior o, si nunca
+        cambiaron, el saldo actual.
+        
+        Args:
+            fecha (str | date): Fecha del cierre (AAAA-MM-DD)
+            guardar (bool): Guardar el resultado en saldos_cierre (solo fechas ya terminadas)
+            tamano_lote (int): Cuentas por rango
+        
+        Returns:
+            tuple: (exito, mensaje, diccionario id_cuenta -> saldo)
+        """
+        try:
+            fecha = _a_fecha(fecha)
+            guardar = guardar and fecha < date.today()
+            if guardar:
+                # Un cierre que se guardará se calcula con la primaria (una réplica
+                # atrasada podría omitir los últimos cambios del día)
+                self.db.marcar_escritura()
+            
+            base = self.db.fetch_all("SELECT MAX(fecha) AS fecha FROM saldos_cierre WHERE fecha <= %s", (fecha,))
+            base = _a_fecha(base[0]['fecha']) if base and base[0]['fecha'] else None
+            
+            saldos = {}
+            ultimo = 0
+            while True:
+                cuentas = self.db.fetch_all(CUENTAS_ABIERTAS, (ultimo, fecha, tamano_lote))
+                if not cuentas:
+                    break
+                saldos.update(self._saldos_de_cuentas(cuentas, fecha, base))
+                if len(cuentas) < tamano_lote:
+                    break
+                ultimo = cuentas[-1]['id_cuenta']
+            
+            if base == fecha:
+                return True, f"Cierre del {fecha.isoformat()} ya calculado", saldos
+            
+            if guardar:
+                exito, mensaje = self._guardar_cierre(fecha, saldos)
+                if not exito:
+                    return False, mensaje, saldos
+            
+            return True, f"Saldos de {len(saldos)} cuentas al {fecha.isoformat()}", saldos
+        
+        except ValueError:
+            return False, "La fecha debe tener el formato AAAA-MM-DD", {}
+        except Exception as e:
+            logger.error(f"Error al calcular los saldos al {fecha}: {str(e)}")
+            return False, f"Error al calcular los saldos: {str(e)}", {}
+    
+    def _saldos_de_cuentas(self, cuentas, fecha, base):
+        """
+        Saldos al final de la fecha de un lote de cuentas ordenado por id_cuenta.
+        
+        Args:
+            cuentas (list): Filas (id_cuenta, saldo actual) del lote
+            fecha (date): Fecha del cierre
+            base (date): Fecha del último cierre guardado hasta la fecha (o None)
+        
+        Returns:
+            dict: id_cuenta -> saldo
+        """
+        primero, ultimo = cuentas[0]['id_cuenta'], cuentas[-1]['id_cuenta']
+        saldos = {}
+        if base is not None:
+            for fila in self.db.fetch_all(CIERRE_DE_CUENTAS, (base, primero, ultimo)):
+                saldos[fila['id_cuenta']] = _a_float(fila['saldo'])
+        
+        limite = _fin_del_dia(fecha)
+        if base is None:
+            cambios = self.db.fetch_all(CAMBIOS_DE_CUENTAS.format(desde=""), (primero, ultimo, limite))
+        elif base != fecha:
+            cambios = self.db.fetch_all(CAMBIOS_DE_CUENTAS.format(desde=" AND fecha_cambio >= %s"),
+                                        (primero, ultimo, limite, _fin_del_dia(base)))
+        else:
+            cambios = []
+        for fila in cambios:
+            saldos[fila['id_cuenta']] = _a_float(fila['saldo_nuevo'])
+        
+        faltantes = [fila for fila in cuentas if fila['id_cuenta'] not in saldos]
+        if faltantes:
+            query = PRIMER_CAMBIO_POSTERIOR.format(marcadores=", ".join(["%s"] * len(faltantes)))
+            params = [fila['id_cuenta'] for fila in faltantes] + [limite]
+            for fila in self.db.fetch_all(query, params):
+                saldos[fila['id_cuenta']] = _a_float(fila['saldo_anterior'])
+            for fila in faltantes:
+                saldos.setdefault(fila['id_cuenta'], _a_float(fila['saldo']))
+        
+        return saldos
+    
+    def saldos_fin_de_mes(self, anio, mes, guardar=True):
+        """
+        Calcula (y guarda como cierre, si el mes ya terminó) el saldo de todas
+        las cuentas al último día del mes.
+        
+        Args:
+            anio (int): Año
+            mes (int): Mes (1-12)
+            guardar (bool): Guardar el cierre para los cálculos siguientes
+        
+        Returns:
+            tuple: (exito, mensaje, diccionario id_cuenta -> saldo)
+        """
+        if not 1 <= int(mes) <= 12:
+            return False, "El mes debe estar entre 1 y 12", {}
+        ultimo_dia = calendar.monthrange(int(anio), int(mes))[1]
+        return self.saldos_al(date(int(anio), int(mes), ultimo_dia), guardar)
+    
+    def movimientos_del_dia(self, fecha):
+        """
+        Totales de los cambios de saldo de un día (depósitos y retiros).
+        
+        Args:
+            fecha (str | date): Fecha (AAAA-MM-DD)
+        
+        Returns:
+            tuple: (exito, mensaje, diccionario con cambios, depositos y retiros)
+        """
+        try:
+            fecha = _a_fecha(fecha)
+            filas = self.db.fetch_all(
+                """SELECT COUNT(*) AS cambios,
+                          COALESCE(SUM(CASE WHEN saldo_nuevo > saldo_anterior
+                                            THEN saldo_nuevo - saldo_anterior ELSE 0 END), 0) AS depositos,
+                          COALESCE(SUM(CASE WHEN saldo_nuevo < saldo_anterior
+                                            THEN saldo_anterior - saldo_nuevo ELSE 0 END), 0) AS retiros
+                   FROM historial_saldos WHERE fecha_cambio >= %s AND fecha_cambio < %s""",
+                (datetime.combine(fecha, time.min), _fin_del_dia(fecha)))
+            fila = filas[0] if filas else {}
+            return True, "Movimientos obtenidos", {
+                'cambios': fila.get('cambios', 0),
+                'depositos': _a_float(fila.get('depositos')),
+                'retiros': _a_float(fila.get('retiros'))
+            }
+        
+        except ValueError:
+            return False, "La fecha debe tener el formato AAAA-MM-DD", {}
+        except Exception as e:
+            logger.error(f"Error al obtener los movimientos del {fecha}: {str(e)}")
+            return False, f"Error al obtener los movimientos: {str(e)}", {}
+    
+    def _guardar_cierre(self, fecha, saldos):
+        """Guarda (o reemplaza) el cierre de una fecha en lotes, en una unidad de trabajo."""
+        filas = sorted(saldos.items())
+        with unidad_de_trabajo(self.db) as bloque:
+            for inicio in range(0, len(filas), TAMANO_LOTE_CIERRE):
+                lote = filas[inicio:inicio + TAMANO_LOTE_CIERRE]
+                marcadores = ", ".join(["(%s, %s, %s)"] * len(lote))
+                query = (f"INSERT INTO saldos_cierre (id_cuenta, fecha, saldo) VALUES {marcadores} "
+                         f"ON DUPLICATE KEY UPDATE saldo = VALUES(saldo)")
+                params = [valor for id_cuenta, saldo in lote for valor in (id_cuenta, fecha, saldo)]
+                if self.db.execute_update(query, params) is None:
+                    bloque.cancelar()
+                    break
+        
+        if bloque.fallida:
+            return False, f"No se pudo guardar el cierre del {fecha.isoformat()}"
+        logger.info(f"Cierre del {fecha.isoformat()} guardado ({len(filas)} cuentas)")
+        return True, "Cierre guardado"
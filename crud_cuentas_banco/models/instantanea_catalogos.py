@@ -0,0 +1,229 @@
+"""
+Copia local (instantánea) de las tablas de catálogo.
+Se guarda en un archivo JSON con la versión de los datos en la BD y un hash
+del esquema esperado; al iniciar se carga en milisegundos y en segundo plano
+se compara la versión de la BD para refrescarla solo si cambió.
+"""
+
+from database.connection import Database
+from database.filas import clase_fila
+from models.catalogo import (TipoDocumento, Departamento, Provincia, Distrito,
+                             CategoriaCliente, Banco, ProductoCuenta)
+from datetime import date, datetime
+from decimal import Decimal
+import hashlib
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Versión del formato del archivo; cambiarla invalida las copias existentes
+FORMATO = 2
+
+RUTA_POR_DEFECTO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'cache', 'catalogos.json')
+
+# Catálogos incluidos: nombre -> modelo
+CATALOGOS = {
+    'tipos_documento': TipoDocumento,
+    'categorias': CategoriaCliente,
+    'departamentos': Departamento,
+    'provincias': Provincia,
+    'distritos': Distrito,
+    'bancos': Banco,
+    'productos': ProductoCuenta
+}
+
+
+# Tipos que JSON no representa: se guardan como {"$tipo": texto} y se restauran al cargar
+_TIPOS = {
+    '$decimal': Decimal,
+    '$datetime': datetime.fromisoformat,
+    '$date': date.fromisoformat
+}
+
+
+def _codificar(valor):
+    """Convierte a JSON los valores que json no soporta, conservando su tipo."""
+    if isinstance(valor, Decimal):
+        return {'$decimal': str(valor)}
+    if isinstance(valor, datetime):
+        return {'$datetime': valor.isoformat()}
+    if isinstance(valor, date):
+        return {'$date': valor.isoformat()}
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+def _decodificar(objeto):
+    """Restaura los valores guardados por _codificar (object_hook de json.load)."""
+    if len(objeto) == 1:
+        clave, texto = next(iter(objeto.items()))
+        if clave in _TIPOS:
+            return _TIPOS[clave](texto)
+    return objeto
+
+
+def hash_esquema():
+    """
+    Calcula el hash de las tablas y columnas que espera la aplicación.
+    Una copia con otro hash se descarta.
+    """
+    partes = [str(FORMATO)]
+    for nombre, modelo in CATALOGOS.items():
+        partes.append(f"{nombre}:{modelo.tabla.nombre}:{','.join(modelo.tabla.proyeccion)}")
+    return hashlib.sha256(";".join(partes).encode()).hexdigest()
+
+
+class InstantaneaCatalogos:
+    """Catálogos en memoria respaldados por un archivo local."""
+
+    def __init__(self, ruta=None):
+        """
+        Args:
+            ruta (str): Archivo de la copia local (por defecto cache/catalogos.json)
+        """
+        self.ruta = ruta or RUTA_POR_DEFECTO
+        self.version = None
+        self._catalogos = {}
+        self._lock = threading.Lock()
+        self._hilo = None
+
+    def cargar(self):
+        """
+        Carga la copia local si existe y corresponde al esquema actual.
+
+        Returns:
+            bool: True si se cargó la copia
+        """
+        try:
+            with open(self.ruta, encoding='utf-8') as archivo:
+                contenido = json.load(archivo, object_hook=_decodificar)
+        except FileNotFoundError:
+            logger.info("No hay copia local de catálogos")
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"Copia local de catálogos ilegible: {str(e)}")
+            return False
+
+        if contenido.get('esquema') != hash_esquema():
+            logger.info("Copia local de catálogos descartada: el esquema cambió")
+            return False
+
+        catalogos = {}
+        for nombre, datos in contenido.get('catalogos', {}).items():
+            clase = clase_fila(tuple(datos['columnas']))
+            catalogos[nombre] = [clase(fila) for fila in datos['filas']]
+
+        with self._lock:
+            self._catalogos = catalogos
+            self.version = contenido.get('version')
+        logger.info(f"Copia local de catálogos cargada ({len(catalogos)} catálogos)")
+        return True
+
+    def obtener(self, nombre):
+        """
+        Obtiene las filas de un catálogo.
+
+        Args:
+            nombre (str): Nombre del catálogo (clave de CATALOGOS)
+
+        Returns:
+            list: Filas del catálogo o None si no está en la copia
+        """
+        with self._lock:
+            return self._catalogos.get(nombre)
+
+    def refrescar(self):
+        """
+        Compara la versión de la BD con la de la copia y, si cambió, vuelve
+        a leer todos los catálogos y reescribe el archivo.
+
+        Returns:
+            tuple: (exito, mensaje, cambio)
+        """
+        db = Database()
+        db.connect()
+        try:
+            if not db.connection or not db.connection.open:
+                return False, "No hay conexión a la base de datos", False
+
+            version = self._version_bd(db)
+            if version is not None and version == self.version:
+                return True, "Catálogos al día", False
+
+            catalogos = {}
+            for nombre, modelo in CATALOGOS.items():
+                query = modelo.tabla.compilador.seleccionar()
+                catalogos[nombre] = db.fetch_all(query, None, modelo.conversiones_lectura)
+
+            with self._lock:
+                self._catalogos = catalogos
+                self.version = version
+            self._guardar(catalogos, version)
+            logger.info("Copia local de catálogos actualizada")
+            return True, "Catálogos actualizados", True
+
+        except Exception as e:
+            logger.error(f"Error al refrescar catálogos: {str(e)}")
+            return False, f"Error al refrescar catálogos: {str(e)}", False
+        finally:
+            db.disconnect()
+
+    def refrescar_en_segundo_plano(self):
+        """Lanza refrescar() en un hilo para no bloquear el inicio de la interfaz."""
+        if self._hilo and self._hilo.is_alive():
+            return
+        self._hilo = threading.Thread(target=self.refrescar, name='refresco-catalogos', daemon=True)
+        self._hilo.start()
+
+    def _version_bd(self, db):
+        """
+        Obtiene la versión de los catálogos en la BD a partir de CHECKSUM TABLE.
+
+        Returns:
+            str: Versión o None si no se pudo calcular
+        """
+        tablas = ", ".join(modelo.tabla.nombre for modelo in CATALOGOS.values())
+        resultado = db.fetch_all(f"CHECKSUM TABLE {tablas}")
+        if not resultado:
+            return None
+        firma = ";".join(f"{fila['Table']}:{fila['Checksum']}" for fila in resultado)
+        return hashlib.sha256(firma.encode()).hexdigest()
+
+    def _guardar(self, catalogos, version):
+        """Escribe la copia local de forma atómica (archivo temporal + reemplazo)."""
+        contenido = {
+            'formato': FORMATO,
+            'esquema': hash_esquema(),
+            'version': version,
+            'catalogos': {
+                nombre: {
+                    'columnas': list(filas[0].keys()) if filas else list(CATALOGOS[nombre].tabla.proyeccion),
+                    'filas': [list(fila) for fila in filas]
+                }
+                for nombre, filas in catalogos.items()
+            }
+        }
+        os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+        temporal = f"{self.ruta}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(contenido, archivo, ensure_ascii=False, separators=(',', ':'), default=_codificar)
+        os.replace(temporal, self.ruta)
+
+
+_instantanea = None
+
+
+def obtener_instantanea():
+    """
+    Obtiene la instantánea de catálogos compartida por la aplicación.
+
+    Returns:
+        InstantaneaCatalogos: Instancia única
+    """
+    global _instantanea
+    if _instantanea is None:
+        _instantanea = InstantaneaCatalogos()
+    return _instantanea
@@ -0,0 +1,237 @@
+"""
+Modelo para los resúmenes diarios de saldos.
+Guarda en resumen_saldos_diarios, por fecha, el número de cuentas y el saldo
+total agrupados por agencia, producto y estado, para que los reportes y las
+estadísticas lean filas ya calculadas en lugar de recorrer la tabla cuentas.
+
+El saldo de cada cuenta al final del día se toma del cierre de saldos_cierre
+(HistorialSaldo.saldos_al, que también lo guarda). La agencia (la de apertura
+del cliente), el producto y el estado son los vigentes al materializar: el
+trabajo nocturno los toma poco después del cierre del día.
+"""
+
+from models.base_model import BaseModel
+from models.historial_saldo import HistorialSaldo, _a_fecha, _a_float
+from database.compilador import Tabla, Filtro
+from database.unidad_trabajo import unidad_de_trabajo
+from collections import defaultdict
+from datetime import date
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Dimensiones del resumen y columna de la consulta de atributos que las agrupa
+DIMENSIONES = {'agencia': 'id_agencia', 'producto': 'id_producto', 'estado': 'estado'}
+
+# Valor del resumen para las cuentas sin agencia o sin producto
+SIN_ASIGNAR = 'Sin asignar'
+
+# Cuentas leídas por lote al agrupar
+TAMANO_LOTE_RESUMEN = 5000
+
+ATRIBUTOS_CUENTAS = """
+    SELECT c.id_cuenta, c.id_producto, c.estado, cl.id_agencia_apertura AS id_agencia
+    FROM cuentas c LEFT JOIN clientes cl ON cl.id_cliente = c.id_cliente
+    WHERE c.id_cuenta > %s AND c.fecha_apertura <= %s
+    ORDER BY c.id_cuenta LIMIT %s
+"""
+
+
+class ResumenSaldo(BaseModel):
+    """Modelo de los resúmenes diarios de saldos por agencia, producto y estado"""
+    
+    conversiones_lectura = {'saldo_total': _a_float}
+    
+    tabla = Tabla(
+        nombre='resumen_saldos_diarios',
+        alias='r',
+        clave='id_resumen',
+        columnas=('fecha', 'dimension', 'valor', 'cuentas', 'saldo_total'),
+        filtros={
+            'fecha': Filtro('r.fecha'),
+            'dimension': Filtro('r.dimension'),
+            'valor': Filtro('r.valor'),
+            'desde': Filtro('r.fecha', '>='),
+            'hasta': Filtro('r.fecha', '<=')
+        },
+        orden='r.fecha, r.dimension, r.valor'
+    )
+    
+    def __init__(self):
+        super().__init__()
+        self.historial = HistorialSaldo()
+    
+    def validar_datos(self, datos):
+        """Valida los datos de una fila del resumen."""
+        errores = []
+        
+        if not datos.get('fecha'):
+            errores.append("La fecha es requerida")
+        
+        if datos.get('dimension') not in DIMENSIONES:
+            errores.append(f"La dimensión debe ser una de: {', '.join(DIMENSIONES)}")
+        
+        if errores:
+            return False, "; ".join(errores)
+        
+        return True, ""
+    
+    def _preparar_datos_creacion(self, datos):
+        return {
+            'fecha': datos['fecha'],
+            'dimension': datos['dimension'],
+            'valor': str(datos.get('valor') or SIN_ASIGNAR),
+            'cuentas': int(datos.get('cuentas') or 0),
+            'saldo_total': float(datos.get('saldo_total') or 0)
+        }
+    
+    def _preparar_datos_actualizacion(self, datos):
+        return self._preparar_datos_creacion(datos)
+    
+    def materializar(self, fecha, tamano_lote=TAMANO_LOTE_RESUMEN):
+        """
+        Calcula y guarda el cierre por cuenta y el resumen de una fecha ya terminada.
+        
+        Los atributos de las cuentas se leen por lotes (lecturas sin bloqueo,
+        por clave) y se agrupan en memoria; el resumen de la fecha se
+        reemplaza completo en una unidad de trabajo, así que repetir la
+        ejecución deja el mismo resultado.
+        
+        Args:
+            fecha (str | date): Fecha (AAAA-MM-DD), anterior a hoy
+            tamano_lote (int): Cuentas leídas por lote
+        
+        Returns:
+            tuple: (exito, mensaje, filas del resumen guardadas)
+        """
+        try:
+            fecha = _a_fecha(fecha)
+            if fecha >= date.today():
+                return False, "Solo se resumen días ya terminados", 0
+            
+            exito, mensaje, saldos = self.historial.saldos_al(fecha, guardar=True)
+            if not exito:
+                return False, mensaje, 0
+            
+            totales = defaultdict(lambda: [0, 0.0])
+            ultimo = 0
+            while True:
+                filas = self.db.fetch_all(ATRIBUTOS_CUENTAS, (ultimo, fecha, tamano_lote))
+                for fila in filas:
+                    saldo = saldos.get(fila['id_cuenta'])
+                    if saldo is None:
+                        continue
+                    for dimension, columna in DIMENSIONES.items():
+                        valor = fila[columna]
+                        total = totales[(dimension, str(valor) if valor is not None else SIN_ASIGNAR)]
+                        total[0] += 1
+                        total[1] += saldo
+                if len(filas) < tamano_lote:
+                    break
+                ultimo = filas[-1]['id_cuenta']
+            
+            exito, mensaje = self._guardar_resumen(fecha, totales)
+            return exito, mensaje, len(totales) if exito else 0
+        
+        except ValueError:
+            return False, "La fecha debe tener el formato AAAA-MM-DD", 0
+        except Exception as e:
+            logger.error(f"Error al resumir los saldos del {fecha}: {str(e)}")
+            return False, f"Error al resumir los saldos: {str(e)}", 0
+    
+    def ultima_fecha(self):
+        """
+        Última fecha con resumen guardado.
+        
+        Returns:
+            date: Fecha o None si no hay resúmenes
+        """
+        filas = self.db.fetch_all("SELECT MAX(fecha) AS fecha FROM resumen_saldos_diarios")
+        return _a_fecha(filas[0]['fecha']) if filas and filas[0]['fecha'] else None
+    
+    def resumen_del_dia(self, fecha=None):
+        """
+        Resumen de una fecha agrupado por dimensión.
+        
+        Args:
+            fecha (str | date): Fecha (AAAA-MM-DD); por defecto la última resumida
+        
+        Returns:
+            tuple: (exito, mensaje, diccionario con fecha y, por dimensión,
+                    valor -> {'cuentas', 'saldo_total'}; vacío si no hay resumen)
+        """
+        try:
+            fecha = _a_fecha(fecha) if fecha else self.ultima_fecha()
+            if fecha is None:
+                return True, "No hay resúmenes de saldos", {}
+            
+            filas = self.db.fetch_all(
+                """SELECT dimension, valor, cuentas, saldo_total FROM resumen_saldos_diarios
+                   WHERE fecha = %s ORDER BY dimension, valor""", (fecha,))
+            if not filas:
+                return True, f"No hay resumen de saldos del {fecha.isoformat()}", {}
+            
+            resumen = {'fecha': fecha.isoformat()}
+            for dimension in DIMENSIONES:
+                resumen[dimension] = {}
+            for fila in filas:
+                resumen[fila['dimension']][fila['valor']] = {
+                    'cuentas': fila['cuentas'],
+                    'saldo_total': _a_float(fila['saldo_total'])
+                }
+            return True, f"Resumen de saldos del {fecha.isoformat()}", resumen
+        
+        except ValueError:
+            return False, "La fecha debe tener el formato AAAA-MM-DD", {}
+        except Exception as e:
+            logger.error(f"Error al obtener el resumen de saldos: {str(e)}")
+            return False, f"Error al obtener el resumen de saldos: {str(e)}", {}
+    
+    def tendencia(self, dimension, valor=None, desde=None, hasta=None):
+        """
+        Serie diaria del resumen de una dimensión.
+        
+        Args:
+            dimension (str): 'agencia', 'producto' o 'estado'
+            valor (str): Agencia, producto o estado (todos si es None)
+            desde (str | date): Primera fecha (AAAA-MM-DD)
+            hasta (str | date): Última fecha (AAAA-MM-DD)
+        
+        Returns:
+            tuple: (exito, mensaje, lista de filas ordenadas por fecha)
+        """
+        if dimension not in DIMENSIONES:
+            return False, f"La dimensión debe ser una de: {', '.join(DIMENSIONES)}", []
+        
+        try:
+            filtros = {'dimension': dimension}
+            if valor is not None:
+                filtros['valor'] = str(valor)
+            if desde:
+                filtros['desde'] = _a_fecha(desde)
+            if hasta:
+                filtros['hasta'] = _a_fecha(hasta)
+        except ValueError:
+            return False, "La fecha debe tener el formato AAAA-MM-DD", []
+        
+        return self.listar(filtros, columnas=['fecha', 'valor', 'cuentas', 'saldo_total'])
+    
+    def _guardar_resumen(self, fecha, totales):
+        """Reemplaza el resumen de una fecha en una unidad de trabajo."""
+        filas = sorted(totales.items())
+        with unidad_de_trabajo(self.db) as bloque:
+            if self.db.execute_update("DELETE FROM resumen_saldos_diarios WHERE fecha = %s", (fecha,)) is None:
+                bloque.cancelar()
+            elif filas:
+                marcadores = ", ".join(["(%s, %s, %s, %s, %s)"] * len(filas))
+                query = (f"INSERT INTO resumen_saldos_diarios (fecha, dimension, valor, cuentas, saldo_total) "
+                         f"VALUES {marcadores}")
+                params = [dato for (dimension, valor), (cuentas, saldo) in filas
+                          for dato in (fecha, dimension, valor, cuentas, round(saldo, 2))]
+                if self.db.execute_update(query, params) is None:
+                    bloque.cancelar()
+        
+        if bloque.fallida:
+            return False, f"No se pudo guardar el resumen de saldos del {fecha.isoformat()}"
+        logger.info(f"Resumen de saldos del {fecha.isoformat()} guardado ({len(filas)} filas)")
+        return True, f"Resumen de saldos del {fecha.isoformat()}: {len(filas)} filas"
@@ -4,6 +4,7 @@ Maneja la autenticación y roles de los usuarios.
 """
 
 from models.base_model import BaseModel
+from database.compilador import Tabla, Filtro
 import hashlib
 import secrets
 
@@ -11,6 +12,27 @@ import secrets
 class Usuario(BaseModel):
     """Modelo para usuarios del sistema"""
     
+    tabla = Tabla(
+        nombre='usuarios',
+        alias='u',
+        clave='id_usuario',
+        columnas=('username', 'password_hash', 'id_cliente'),
+        extras={
+            'nombre_cliente': ('c.nombre', ('c',)),
+            'apellido_paterno': ('c.apellido_paterno', ('c',)),
+            'apellido_materno': ('c.apellido_materno', ('c',)),
+            'email_cliente': ('c.email', ('c',))
+        },
+        uniones={
+            'c': "LEFT JOIN clientes c ON u.id_cliente = c.id_cliente"
+        },
+        filtros={
+            'username': Filtro('u.username', 'LIKE'),
+            'id_cliente': Filtro('u.id_cliente')
+        },
+        orden='u.username'
+    )
+    
     def __init__(self):
         super().__init__()
         self.username = None
@@ -54,51 +76,6 @@ class Usuario(BaseModel):
         password_hash = hashlib.sha256((password + salt).encode()).hexdigest()
         return f"{salt}:{password_hash}"
     
-    def _generar_query_creacion(self):
-        return "INSERT INTO usuarios (username, password_hash, id_cliente) VALUES (%(username)s, %(password_hash)s, %(id_cliente)s)"
-    
-    def _generar_query_lectura(self):
-        return """SELECT u.*, c.nombre, c.apellido_paterno, c.apellido_materno, c.email
-                  FROM usuarios u
-                  LEFT JOIN clientes c ON u.id_cliente = c.id_cliente
-                  WHERE u.id_usuario = %s"""
-    
-    def _generar_query_actualizacion(self):
-        return "UPDATE usuarios SET username = %(username)s, password_hash = %(password_hash)s, id_cliente = %(id_cliente)s WHERE id_usuario = %(id)s"
-    
-    def _generar_query_eliminacion(self):
-        return "DELETE FROM usuarios WHERE id_usuario = %s"
-    
-    def _generar_query_listado(self, filtros=None, limite=None, offset=None):
-        query = """SELECT u.*, c.nombre, c.apellido_paterno, c.apellido_materno, c.email
-                   FROM usuarios u
-                   LEFT JOIN clientes c ON u.id_cliente = c.id_cliente"""
-        params = []
-        
-        condiciones = []
-        if filtros:
-            if filtros.get('username'):
-                condiciones.append("u.username LIKE %s")
-                params.append(f"%{filtros['username']}%")
-            if filtros.get('id_cliente'):
-                condiciones.append("u.id_cliente = %s")
-                params.append(filtros['id_cliente'])
-        
-        if condiciones:
-            query += " WHERE " + " AND ".join(condiciones)
-        
-        query += " ORDER BY u.username"
-        
-        if limite:
-            query += " LIMIT %s"
-            params.append(limite)
-        
-        if offset:
-            query += " OFFSET %s"
-            params.append(offset)
-        
-        return query, params
-    
     def _preparar_datos_creacion(self, datos):
         password_hash = self._hash_password(datos['password'])
         return {
@@ -119,18 +96,6 @@ class Usuario(BaseModel):
         
         return result
     
-    def _formatear_datos_lectura(self, fila):
-        return {
-            'id_usuario': fila[0],
-            'username': fila[1],
-            'password_hash': fila[2],
-            'id_cliente': fila[3],
-            'nombre_cliente': fila[4] if len(fila) > 4 else None,
-            'apellido_paterno': fila[5] if len(fila) > 5 else None,
-            'apellido_materno': fila[6] if len(fila) > 6 else None,
-            'email_cliente': fila[7] if len(fila) > 7 else None
-        }
-    
     def autenticar(self, username, password):
         """
         Autentica un usuario con username y password.
@@ -143,18 +108,11 @@ class Usuario(BaseModel):
             tuple: (exito, mensaje, datos_usuario)
         """
         try:
-            query = """SELECT u.*, c.nombre, c.apellido_paterno, c.apellido_materno, c.email
-                       FROM usuarios u
-                       LEFT JOIN clientes c ON u.id_cliente = c.id_cliente
-                       WHERE u.username = %s"""
-            
-            resultado = self.db.fetch_all(query, (username.lower(),))
+            usuario_data = self._buscar_uno('username', username.lower())
             
-            if not resultado:
+            if not usuario_data:
                 return False, "Usuario no encontrado", None
             
-            usuario_data = self._formatear_datos_lectura(resultado[0])
-            
             # Verificar contraseña
             if self._verificar_password(password, usuario_data['password_hash']):
                 return True, "Autenticación exitosa", usuario_data
@@ -173,27 +131,22 @@ class Usuario(BaseModel):
         except:
             return False
     
-    def buscar_por_username(self, username):
+    def buscar_por_username(self, username, columnas=None):
         """
         Busca un usuario por nombre de usuario.
         
         Args:
             username (str): Nombre de usuario a buscar
+            columnas (list): Columnas a retornar (por defecto todas)
             
         Returns:
             tuple: (exito, mensaje, datos)
         """
         try:
-            query = """SELECT u.*, c.nombre, c.apellido_paterno, c.apellido_materno, c.email
-                       FROM usuarios u
-                       LEFT JOIN clientes c ON u.id_cliente = c.id_cliente
-                       WHERE u.username = %s"""
-            
-            resultado = self.db.fetch_all(query, (username.lower(),))
+            usuario = self._buscar_uno('username', username.lower(), columnas)
             
-            if resultado:
-                datos = self._formatear_datos_lectura(resultado[0])
-                return True, "Usuario encontrado", datos
+            if usuario:
+                return True, "Usuario encontrado", usuario
             else:
                 return False, "Usuario no encontrado", None
                 
@@ -77,6 +77,7 @@ CREATE TABLE IF NOT EXISTS clientes (
     fecha_nacimiento DATE,
     id_categoria INT,
     id_agencia_apertura INT,
+    version INT NOT NULL DEFAULT 1,
     FOREIGN KEY (id_tipo_documento) REFERENCES tipo_documento_legal(id_tipo_documento),
     FOREIGN KEY (id_categoria) REFERENCES categoria_cliente(id_categoria),
     FOREIGN KEY (id_agencia_apertura) REFERENCES agencias(id_agencia)
@@ -129,6 +130,7 @@ CREATE TABLE IF NOT EXISTS cuentas (
     saldo DECIMAL(18, 2) NOT NULL,
     fecha_apertura DATE NOT NULL,
     estado VARCHAR(20) NOT NULL,
+    version INT NOT NULL DEFAULT 1,
     FOREIGN KEY (id_cliente) REFERENCES clientes(id_cliente),
     FOREIGN KEY (id_producto) REFERENCES productos_cuenta(id_producto)
 );
@@ -176,6 +178,57 @@ CREATE TABLE IF NOT EXISTS historial_saldos (
     fecha_cambio TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (id_cuenta) REFERENCES cuentas(id_cuenta)
 );
+
+-- Saldo de una cuenta a una fecha y cambios de un período (models/historial_saldo.py)
+CREATE INDEX idx_historial_saldos_cuenta_fecha ON historial_saldos (id_cuenta, fecha_cambio);
+CREATE INDEX idx_historial_saldos_fecha ON historial_saldos (fecha_cambio);
+
+-- Saldo de cada cuenta al final de una fecha (puntos de partida del historial de saldos)
+CREATE TABLE IF NOT EXISTS saldos_cierre (
+    id_cuenta INT NOT NULL,
+    fecha DATE NOT NULL,
+    saldo DECIMAL(18, 2) NOT NULL,
+    PRIMARY KEY (id_cuenta, fecha),
+    FOREIGN KEY (id_cuenta) REFERENCES cuentas(id_cuenta)
+);
+CREATE INDEX idx_saldos_cierre_fecha ON saldos_cierre (fecha);
+
+-- Cambios de estado, producto o cliente de las cuentas (operaciones masivas)
+CREATE TABLE IF NOT EXISTS historial_cuentas (
+    id_historial INT AUTO_INCREMENT PRIMARY KEY,
+    id_cuenta INT NOT NULL,
+    campo VARCHAR(20) NOT NULL,
+    valor_anterior VARCHAR(50),
+    valor_nuevo VARCHAR(50),
+    fecha_cambio TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (id_cuenta) REFERENCES cuentas(id_cuenta)
+);
+
+-- Fecha del último movimiento de cada cuenta (trabajos/cuentas_inactivas.py)
+CREATE TABLE IF NOT EXISTS actividad_cuentas (
+    id_cuenta INT PRIMARY KEY,
+    ultima_transaccion TIMESTAMP NOT NULL,
+    FOREIGN KEY (id_cuenta) REFERENCES cuentas(id_cuenta)
+);
+
+-- Último registro procesado por cada trabajo incremental
+CREATE TABLE IF NOT EXISTS marcas_trabajos (
+    trabajo VARCHAR(50) PRIMARY KEY,
+    ultimo_id INT NOT NULL DEFAULT 0,
+    fecha_ejecucion TIMESTAMP NULL
+);
+
+-- Cuentas y saldo total por día y por agencia, producto o estado (trabajos/saldos_diarios.py)
+CREATE TABLE IF NOT EXISTS resumen_saldos_diarios (
+    id_resumen INT AUTO_INCREMENT PRIMARY KEY,
+    fecha DATE NOT NULL,
+    dimension VARCHAR(20) NOT NULL,
+    valor VARCHAR(50) NOT NULL,
+    cuentas INT NOT NULL,
+    saldo_total DECIMAL(20, 2) NOT NULL,
+    UNIQUE (fecha, dimension, valor)
+);
+CREATE INDEX idx_resumen_saldos_dimension ON resumen_saldos_diarios (dimension, valor, fecha);
 -- Datos de Ubicación (Perú)
 INSERT INTO departamentos (nombre) VALUES 
 ('Lima'), 
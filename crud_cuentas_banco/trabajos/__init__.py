@@ -0,0 +1,6 @@
+"""
+Trabajos programados de mantenimiento de datos (por ejemplo cada noche desde cron).
+
+Uso (desde crud_cuentas_banco/):
+    python -m trabajos.cuentas_inactivas --dias 365 [--simular]
+"""
@@ -0,0 +1,167 @@
+"""
+Detección de cuentas inactivas.
+
+    1. Actualiza la última actividad de cada cuenta (actividad_cuentas) solo
+       con las transacciones nuevas desde la marca de la ejecución anterior
+       (marcas_trabajos): el costo depende de las transacciones nuevas y no
+       del historial completo.
+    2. Marca como Inactiva, con un UPDATE por lote (Cuenta.actualizar_masivo),
+       las cuentas activas sin movimientos en los últimos N días. Las que
+       nunca tuvieron movimientos cuentan desde su fecha de apertura.
+
+La marca es el último id_transaccion procesado. Cada ejecución vuelve a leer
+las SOLAPAMIENTO transacciones anteriores a la marca, por si alguna se
+confirmó después de otra con un ID mayor; la actualización es idempotente
+(se queda con la fecha más reciente). Con --simular la actividad también se
+actualiza, pero la marca no avanza: la próxima ejecución real vuelve a
+procesar las mismas transacciones.
+
+Uso (desde crud_cuentas_banco/, por ejemplo cada noche desde cron):
+    python -m trabajos.cuentas_inactivas --dias 365 [--simular] [--memoria]
+"""
+
+from datetime import datetime, timedelta
+import argparse
+import logging
+import sys
+
+from database.sesiones import obtener_sesion
+from database.unidad_trabajo import unidad_de_trabajo
+from models.cuenta import Cuenta
+from utils.helpers import Constantes
+
+logger = logging.getLogger(__name__)
+
+NOMBRE_TRABAJO = 'actividad_cuentas'
+
+# Transacciones por lote (cada lote se confirma junto con la marca)
+TAMANO_LOTE = 10_000
+
+# IDs anteriores a la marca que se vuelven a leer en cada ejecución
+SOLAPAMIENTO = 1_000
+
+ACTUALIZAR_ACTIVIDAD = """
+    INSERT INTO actividad_cuentas (id_cuenta, ultima_transaccion)
+    SELECT id_cuenta, MAX(fecha_transaccion) FROM (
+        SELECT id_cuenta_origen AS id_cuenta, fecha_transaccion FROM transacciones_cuenta
+        WHERE id_transaccion > %s AND id_transaccion <= %s AND id_cuenta_origen IS NOT NULL
+        UNION ALL
+        SELECT id_cuenta_destino, fecha_transaccion FROM transacciones_cuenta
+        WHERE id_transaccion > %s AND id_transaccion <= %s AND id_cuenta_destino IS NOT NULL
+    ) movimientos
+    GROUP BY id_cuenta
+    ON DUPLICATE KEY UPDATE ultima_transaccion = GREATEST(ultima_transaccion, VALUES(ultima_transaccion))
+"""
+
+GUARDAR_MARCA = """
+    INSERT INTO marcas_trabajos (trabajo, ultimo_id, fecha_ejecucion) VALUES (%s, %s, NOW())
+    ON DUPLICATE KEY UPDATE ultimo_id = VALUES(ultimo_id), fecha_ejecucion = VALUES(fecha_ejecucion)
+"""
+
+
+def leer_marca(db):
+    """
+    Último id_transaccion procesado por el trabajo.
+
+    Returns:
+        int: ID de la marca (0 si el trabajo nunca se ejecutó)
+    """
+    filas = db.fetch_all("SELECT ultimo_id FROM marcas_trabajos WHERE trabajo = %s", (NOMBRE_TRABAJO,))
+    return filas[0]['ultimo_id'] if filas else 0
+
+
+def actualizar_actividad(db, tamano_lote=TAMANO_LOTE, guardar_marca=True):
+    """
+    Incorpora a actividad_cuentas las transacciones nuevas desde la marca.
+
+    Args:
+        db: Sesión de base de datos
+        tamano_lote (int): Transacciones (rango de IDs) por lote
+        guardar_marca (bool): Avanzar la marca con cada lote (False al simular)
+
+    Returns:
+        tuple: (exito, mensaje, transacciones nuevas procesadas)
+    """
+    # La marca y el último ID se leen de la primaria: una réplica atrasada
+    # solo haría releer transacciones, pero así cada lote parte de lo confirmado
+    db.marcar_escritura()
+    marca = leer_marca(db)
+    filas = db.fetch_all("SELECT MAX(id_transaccion) AS maximo FROM transacciones_cuenta")
+    maximo = filas[0]['maximo'] if filas and filas[0]['maximo'] is not None else 0
+
+    desde = max(marca - SOLAPAMIENTO, 0)
+    while desde < maximo:
+        hasta = min(desde + tamano_lote, maximo)
+        with unidad_de_trabajo(db) as bloque:
+            resultado = db.execute_update(ACTUALIZAR_ACTIVIDAD, (desde, hasta, desde, hasta))
+            if guardar_marca:
+                db.execute_update(GUARDAR_MARCA, (NOMBRE_TRABAJO, max(hasta, marca)))
+        if resultado is None or bloque.fallida:
+            return False, f"Error al procesar las transacciones {desde + 1}-{hasta}", max(desde - marca, 0)
+        desde = hasta
+
+    nuevas = max(maximo - marca, 0)
+    return True, f"{nuevas} transacciones nuevas procesadas", nuevas
+
+
+def marcar_inactivas(dias, simulacion=False):
+    """
+    Marca como Inactiva las cuentas activas sin movimientos en los últimos días.
+
+    Args:
+        dias (int): Días sin movimientos a partir de los cuales la cuenta queda inactiva
+        simulacion (bool): Solo contar las cuentas que se marcarían
+
+    Returns:
+        tuple: (exito, mensaje, cuentas marcadas o que se marcarían)
+    """
+    limite = datetime.now() - timedelta(days=dias)
+    filtros = {'estado': 'Activa', 'sin_actividad_desde': limite}
+    return Cuenta().actualizar_masivo(filtros, {'estado': 'Inactiva'}, simulacion)
+
+
+def ejecutar(dias=Constantes.DIAS_INACTIVIDAD_CUENTA, simulacion=False):
+    """
+    Ejecuta el trabajo completo. Al simular se actualiza la actividad para que
+    el conteo refleje los últimos movimientos, pero no cambia ninguna cuenta
+    ni avanza la marca.
+
+    Returns:
+        tuple: (exito, mensaje)
+    """
+    try:
+        exito, mensaje, _ = actualizar_actividad(obtener_sesion(), guardar_marca=not simulacion)
+        if not exito:
+            # Con la actividad desactualizada se marcarían cuentas que sí tienen movimientos
+            return False, mensaje
+        logger.info(mensaje)
+
+        exito, mensaje_cuentas, _ = marcar_inactivas(dias, simulacion)
+        return exito, f"{mensaje}; {mensaje_cuentas}"
+    except Exception as e:
+        logger.error(f"Error en el trabajo de cuentas inactivas: {str(e)}")
+        return False, f"Error en el trabajo de cuentas inactivas: {str(e)}"
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Marca como inactivas las cuentas sin movimientos")
+    parser.add_argument('--dias', type=int, default=Constantes.DIAS_INACTIVIDAD_CUENTA,
+                        help=f"Días sin movimientos (por defecto {Constantes.DIAS_INACTIVIDAD_CUENTA})")
+    parser.add_argument('--simular', action='store_true', help="Solo contar las cuentas que se marcarían")
+    parser.add_argument('--memoria', action='store_true', help="Usar la BD en memoria (database.memoria)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.memoria:
+        from database import memoria
+        memoria.activar()
+
+    exito, mensaje = ejecutar(args.dias, args.simular)
+    print(mensaje)
+    return 0 if exito else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Materialización diaria de saldos para reportes.
+
+Para cada día ya terminado:
+    1. Guarda el saldo de cada cuenta al final del día en saldos_cierre
+       (HistorialSaldo.saldos_al): parte del cierre del día anterior y solo
+       aplica los cambios del día.
+    2. Guarda en resumen_saldos_diarios el número de cuentas y el saldo total
+       por agencia, producto y estado (ResumenSaldo.materializar).
+
+Sin fechas, procesa los días desde el último resumen guardado hasta ayer
+(si una ejecución nocturna falló, la siguiente la recupera). Con --fecha o
+--desde/--hasta vuelve a calcular esos días: el resumen de cada fecha se
+reemplaza completo, así que repetir una ejecución no duplica filas.
+
+Uso (desde crud_cuentas_banco/, por ejemplo cada noche desde cron):
+    python -m trabajos.saldos_diarios [--fecha AAAA-MM-DD | --desde AAAA-MM-DD --hasta AAAA-MM-DD] [--memoria]
+"""
+
+from datetime import date, timedelta
+import argparse
+import logging
+import sys
+
+from models.historial_saldo import _a_fecha
+from models.resumen_saldo import ResumenSaldo
+
+logger = logging.getLogger(__name__)
+
+# Días que recupera como máximo una ejecución sin fechas
+MAXIMO_DIAS_PENDIENTES = 31
+
+
+def dias_pendientes(resumen, desde=None, hasta=None):
+    """
+    Fechas que debe procesar el trabajo.
+
+    Args:
+        resumen (ResumenSaldo): Modelo de resúmenes
+        desde (str | date): Primera fecha (por defecto, el día siguiente al último resumen)
+        hasta (str | date): Última fecha (por defecto, ayer)
+
+    Returns:
+        list: Fechas (date) en orden
+
+    Raises:
+        ValueError: Si una fecha no tiene el formato AAAA-MM-DD
+    """
+    ayer = date.today() - timedelta(days=1)
+    hasta = min(_a_fecha(hasta), ayer) if hasta else ayer
+    if desde:
+        desde = _a_fecha(desde)
+    else:
+        ultima = resumen.ultima_fecha()
+        desde = ultima + timedelta(days=1) if ultima else hasta
+        desde = max(desde, hasta - timedelta(days=MAXIMO_DIAS_PENDIENTES - 1))
+    return [desde + timedelta(days=dias) for dias in range((hasta - desde).days + 1)]
+
+
+def ejecutar(desde=None, hasta=None):
+    """
+    Materializa los saldos de los días pendientes (o de los indicados).
+
+    Returns:
+        tuple: (exito, mensaje)
+    """
+    try:
+        resumen = ResumenSaldo()
+        try:
+            fechas = dias_pendientes(resumen, desde, hasta)
+        except ValueError:
+            return False, "La fecha debe tener el formato AAAA-MM-DD"
+        if not fechas:
+            return True, "No hay días pendientes de resumir"
+
+        for fecha in fechas:
+            exito, mensaje, _ = resumen.materializar(fecha)
+            if not exito:
+                # Los días siguientes parten del cierre de este: no se sigue
+                return False, mensaje
+            logger.info(mensaje)
+
+        if len(fechas) == 1:
+            return True, mensaje
+        return True, f"Saldos resumidos del {fechas[0].isoformat()} al {fechas[-1].isoformat()} ({len(fechas)} días)"
+    except Exception as e:
+        logger.error(f"Error en el trabajo de saldos diarios: {str(e)}")
+        return False, f"Error en el trabajo de saldos diarios: {str(e)}"
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Materializa los saldos diarios por cuenta, agencia, "
+                                                 "producto y estado")
+    parser.add_argument('--fecha', help="Resumir solo esta fecha (AAAA-MM-DD)")
+    parser.add_argument('--desde', help="Primera fecha a resumir (AAAA-MM-DD)")
+    parser.add_argument('--hasta', help="Última fecha a resumir (AAAA-MM-DD, por defecto ayer)")
+    parser.add_argument('--memoria', action='store_true', help="Usar la BD en memoria (database.memoria)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.memoria:
+        from database import memoria
+        memoria.activar()
+
+    exito, mensaje = ejecutar(args.fecha or args.desde, args.fecha or args.hasta)
+    print(mensaje)
+    return 0 if exito else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,396 @@
+"""
+Generador de datos sintéticos a gran escala para pruebas de rendimiento.
+Produce clientes, direcciones, usuarios, cuentas, tarjetas, transacciones e
+historial de saldos con integridad referencial, distribuciones sesgadas
+(pocos clientes concentran muchas cuentas y movimientos) y los formatos que
+exigen utils/validators.py y los modelos.
+
+Los datos se generan por bloques de clientes en paralelo (multiprocessing) y
+se escriben como INSERT de varias filas (.sql) o archivos para LOAD DATA
+(.csv), junto a un script cargar.sql que los carga en orden.
+
+Uso (desde crud_cuentas_banco/, sobre una BD con los catálogos de script.sql):
+    python -m utils.generador_datos --clientes 1000000 --salida datos --procesos 8
+    mysql --local-infile=1 banco_peru_db < datos/cargar.sql
+"""
+
+from datetime import date, datetime, timedelta
+from multiprocessing import Pool
+import argparse
+import csv
+import hashlib
+import os
+import random
+import time
+import unicodedata
+
+from utils.validators import (validar_email, validar_telefono, validar_fecha_nacimiento,
+                              validar_documento, validar_username, validar_numero_cuenta,
+                              validar_cci)
+
+# IDs de catálogo cargados por script.sql
+TIPOS_DOCUMENTO = {'DNI': 1, 'Pasaporte': 3}
+CATEGORIAS = ((1, 80), (2, 17), (3, 3))            # (id_categoria, peso)
+AGENCIAS = (1, 2, 3)
+DISTRITOS = (3, 1, 2, 6, 4, 5)                     # de mayor a menor población
+PRODUCTOS = ((1, 50), (2, 35), (4, 10), (3, 5))    # (id_producto, peso)
+ESTADOS_CUENTA = (('Activa', 85), ('Inactiva', 10), ('Suspendida', 4), ('Cerrada', 1))
+TIPO_TARJETA_DEBITO = 1
+TIPO_TARJETA_CREDITO = 2
+ROL_CLIENTE = 1
+
+NOMBRES = ('José', 'María', 'Juan', 'Rosa', 'Luis', 'Carmen', 'Carlos', 'Ana', 'Jorge', 'Julia',
+           'Pedro', 'Elena', 'Miguel', 'Lucía', 'Víctor', 'Patricia', 'César', 'Sofía', 'Raúl', 'Gabriela',
+           'Manuel', 'Diana', 'Alberto', 'Valeria', 'Jesús', 'Milagros', 'Fernando', 'Katherine')
+APELLIDOS = ('Quispe', 'Flores', 'Sánchez', 'Rodríguez', 'García', 'Rojas', 'Mamani', 'Huamán',
+             'Vásquez', 'Chávez', 'Ramos', 'Torres', 'Díaz', 'Mendoza', 'Castillo', 'Gutiérrez',
+             'Espinoza', 'Ruiz', 'Pérez', 'Vargas', 'Álvarez', 'Cruz', 'Romero', 'Suárez', 'Gómez')
+CALLES = ('Av. Arequipa', 'Av. Larco', 'Jr. de la Unión', 'Av. Brasil', 'Calle Las Begonias',
+          'Av. Javier Prado', 'Av. La Marina', 'Calle Schell', 'Av. Angamos', 'Jr. Puno')
+DOMINIOS = ('gmail.com', 'hotmail.com', 'outlook.com', 'yahoo.com', 'email.com')
+MOVIMIENTOS_ABONO = ('Abono', 'Depósito')
+MOVIMIENTOS_CARGO = ('Cargo', 'Retiro', 'Transferencia')
+
+# Máximo de cuentas por cliente: los IDs de cuenta se derivan del ID del cliente
+MAXIMO_CUENTAS = 4
+
+# Todos los usuarios generados comparten contraseña (formato salt:sha256 de models/usuario.py)
+PASSWORD_GENERADO = 'Clave123'
+_SALT = 'a' * 32
+PASSWORD_HASH = f"{_SALT}:{hashlib.sha256((PASSWORD_GENERADO + _SALT).encode()).hexdigest()}"
+
+# Tablas en orden de carga (dependencias primero) con sus columnas
+TABLAS = {
+    'clientes': ('id_cliente', 'nombre', 'apellido_paterno', 'apellido_materno', 'id_tipo_documento',
+                 'numero_documento', 'email', 'telefono', 'fecha_nacimiento', 'id_categoria',
+                 'id_agencia_apertura'),
+    'direcciones': ('calle', 'numero', 'id_distrito', 'id_cliente'),
+    'usuarios': ('id_usuario', 'username', 'password_hash', 'id_cliente'),
+    'usuario_rol': ('id_usuario', 'id_rol'),
+    'lineas_credito': ('id_linea', 'id_cliente', 'limite_credito', 'saldo_pendiente', 'tasa_interes',
+                       'fecha_apertura'),
+    'cuentas': ('id_cuenta', 'numero_cuenta', 'cci', 'id_cliente', 'id_producto', 'saldo',
+                'fecha_apertura', 'estado'),
+    'tarjetas': ('id_tarjeta', 'numero_tarjeta', 'fecha_vencimiento', 'id_cuenta', 'id_linea',
+                 'id_tipo_tarjeta', 'estado'),
+    'transacciones_cuenta': ('id_cuenta_origen', 'id_cuenta_destino', 'monto', 'fecha_transaccion',
+                             'descripcion', 'tipo_movimiento'),
+    'transacciones_tarjeta': ('id_tarjeta', 'monto', 'fecha_transaccion', 'descripcion', 'tipo_movimiento'),
+    'historial_saldos': ('id_cuenta', 'saldo_anterior', 'saldo_nuevo', 'fecha_cambio')
+}
+
+
+def pesos_zipf(cantidad, exponente=1.0):
+    """Pesos acumulados de una distribución tipo Zipf (el primero es el más frecuente)."""
+    acumulado = 0.0
+    pesos = []
+    for rango in range(1, cantidad + 1):
+        acumulado += 1.0 / rango ** exponente
+        pesos.append(acumulado)
+    return pesos
+
+
+def cantidad_sesgada(rng, promedio, maximo):
+    """
+    Cantidad con cola pesada (Pareto): la mayoría cerca de cero y unos pocos
+    con muchos elementos, con media aproximada al promedio indicado.
+    """
+    return min(int(promedio * 0.2 * rng.paretovariate(1.25)), maximo)
+
+
+def sin_acentos(texto):
+    """Quita acentos y la ñ para usar el texto en emails y usernames."""
+    normalizado = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in normalizado if not unicodedata.combining(c)).lower()
+
+
+def numero_cuenta(id_cuenta, base):
+    """Número de cuenta único con formato XXX-XXX-XXXXXX-XX derivado del ID."""
+    return f"003-{base + id_cuenta // 1_000_000:03d}-{id_cuenta % 1_000_000:06d}-{id_cuenta * 37 % 100:02d}"
+
+
+class EscritorSQL:
+    """Escribe una tabla como INSERT de varias filas dentro de una transacción."""
+
+    extension = 'sql'
+
+    def __init__(self, ruta, tabla, filas_por_insert):
+        self.archivo = open(ruta, 'w', encoding='utf-8')
+        self.cabecera = f"INSERT INTO {tabla} ({', '.join(TABLAS[tabla])}) VALUES\n"
+        self.filas_por_insert = filas_por_insert
+        self.pendientes = []
+        self.archivo.write("SET FOREIGN_KEY_CHECKS = 0;\nSET UNIQUE_CHECKS = 0;\nSTART TRANSACTION;\n")
+
+    def agregar(self, fila):
+        self.pendientes.append("(" + ", ".join(self._literal(valor) for valor in fila) + ")")
+        if len(self.pendientes) >= self.filas_por_insert:
+            self._volcar()
+
+    def cerrar(self):
+        self._volcar()
+        self.archivo.write("COMMIT;\nSET UNIQUE_CHECKS = 1;\nSET FOREIGN_KEY_CHECKS = 1;\n")
+        self.archivo.close()
+
+    def _volcar(self):
+        if self.pendientes:
+            self.archivo.write(self.cabecera + ",\n".join(self.pendientes) + ";\n")
+            self.pendientes = []
+
+    @staticmethod
+    def _literal(valor):
+        if valor is None:
+            return "NULL"
+        if isinstance(valor, (int, float)):
+            return str(valor)
+        texto = str(valor).replace("\\", "\\\\").replace("'", "\\'")
+        return f"'{texto}'"
+
+
+class EscritorCSV:
+    """Escribe una tabla como CSV para LOAD DATA (NULL como \\N)."""
+
+    extension = 'csv'
+
+    def __init__(self, ruta, tabla, filas_por_insert=None):
+        self.archivo = open(ruta, 'w', newline='', encoding='utf-8')
+        self.escritor = csv.writer(self.archivo, lineterminator='\n')
+        self.escritor.writerow(TABLAS[tabla])
+
+    def agregar(self, fila):
+        self.escritor.writerow(['\\N' if valor is None else valor for valor in fila])
+
+    def cerrar(self):
+        self.archivo.close()
+
+
+ESCRITORES = {'sql': EscritorSQL, 'csv': EscritorCSV}
+
+
+def generar_bloque(tarea):
+    """
+    Genera todas las tablas para un rango de clientes y las escribe en archivos.
+    Se ejecuta en un proceso del pool; el resultado solo depende de la semilla.
+
+    Args:
+        tarea (dict): numero, id_desde, id_hasta, semilla, salida, formato,
+            filas_por_insert, movimientos_promedio, fecha_referencia
+
+    Returns:
+        dict: Filas generadas por tabla
+    """
+    rng = random.Random(f"{tarea['semilla']}:{tarea['numero']}")
+    hoy = tarea['fecha_referencia']
+    ahora = datetime.combine(hoy, datetime.min.time()) + timedelta(hours=12)
+    clase = ESCRITORES[tarea['formato']]
+    escritores = {
+        tabla: clase(os.path.join(tarea['salida'], f"{tabla}.{tarea['numero']:05d}.{clase.extension}"),
+                     tabla, tarea['filas_por_insert'])
+        for tabla in TABLAS
+    }
+    conteos = dict.fromkeys(TABLAS, 0)
+
+    def escribir(tabla, fila):
+        escritores[tabla].agregar(fila)
+        conteos[tabla] += 1
+
+    zipf_nombres = pesos_zipf(len(NOMBRES))
+    zipf_apellidos = pesos_zipf(len(APELLIDOS))
+    zipf_distritos = pesos_zipf(len(DISTRITOS), 1.3)
+    promedio = tarea['movimientos_promedio']
+    verificados = 0
+
+    for id_cliente in range(tarea['id_desde'], tarea['id_hasta']):
+        nombre = rng.choices(NOMBRES, cum_weights=zipf_nombres)[0]
+        paterno, materno = rng.choices(APELLIDOS, cum_weights=zipf_apellidos, k=2)
+        if id_cliente < 10_000_000:
+            id_tipo, documento, tipo_texto = TIPOS_DOCUMENTO['DNI'], f"{90_000_000 + id_cliente:08d}", 'DNI'
+        else:
+            id_tipo, documento, tipo_texto = TIPOS_DOCUMENTO['Pasaporte'], f"P{id_cliente:09d}", 'Pasaporte'
+        email = f"{sin_acentos(nombre)}.{sin_acentos(paterno)}{id_cliente}@{rng.choice(DOMINIOS)}"
+        telefono = f"9{rng.randrange(10**8):08d}"
+        nacimiento = hoy - timedelta(days=rng.randrange(18 * 365, 85 * 365))
+        id_categoria = rng.choices([c for c, _ in CATEGORIAS], weights=[p for _, p in CATEGORIAS])[0]
+        agencia = rng.choice(AGENCIAS)
+        username = f"{sin_acentos(nombre)[0]}{sin_acentos(paterno)}_{id_cliente}".replace(' ', '')
+
+        # Verificación de formatos con los validadores de la aplicación en los primeros registros
+        if verificados < 3:
+            for es_valido, mensaje in (validar_email(email), validar_telefono(telefono),
+                                       validar_fecha_nacimiento(nacimiento.isoformat()),
+                                       validar_documento(documento, tipo_texto), validar_username(username)):
+                if not es_valido:
+                    raise ValueError(f"Dato generado inválido para el cliente {id_cliente}: {mensaje}")
+
+        escribir('clientes', (id_cliente, nombre, paterno, materno, id_tipo, documento, email, telefono,
+                              nacimiento.isoformat(), id_categoria, agencia))
+        escribir('direcciones', (rng.choice(CALLES), str(rng.randint(1, 3000)),
+                                 rng.choices(DISTRITOS, cum_weights=zipf_distritos)[0], id_cliente))
+
+        if rng.random() < 0.6:
+            escribir('usuarios', (id_cliente, username, PASSWORD_HASH, id_cliente))
+            escribir('usuario_rol', (id_cliente, ROL_CLIENTE))
+
+        id_linea = None
+        if id_categoria != 1 or rng.random() < 0.15:
+            id_linea = id_cliente
+            limite = rng.choice((2000, 5000, 10000, 20000, 50000))
+            escribir('lineas_credito', (id_linea, id_cliente, f"{limite:.2f}",
+                                        f"{rng.uniform(0, limite * 0.6):.2f}", f"{rng.uniform(1.5, 45):.2f}",
+                                        (hoy - timedelta(days=rng.randrange(30, 2000))).isoformat()))
+            id_tarjeta = id_cliente * 2 * MAXIMO_CUENTAS + 1
+            escribir('tarjetas', (id_tarjeta, f"5{id_tarjeta:015d}",
+                                  (hoy + timedelta(days=rng.randrange(180, 1800))).isoformat(),
+                                  None, id_linea, TIPO_TARJETA_CREDITO, 'Activa'))
+            _movimientos_tarjeta(rng, escribir, id_tarjeta, cantidad_sesgada(rng, promedio // 2, promedio * 20), ahora)
+
+        for indice in range(1 + cantidad_sesgada(rng, 0.8, MAXIMO_CUENTAS - 1)):
+            id_cuenta = id_cliente * MAXIMO_CUENTAS + indice
+            numero, cci = numero_cuenta(id_cuenta, 100), numero_cuenta(id_cuenta, 200)
+            if verificados < 3:
+                for es_valido, mensaje in (validar_numero_cuenta(numero), validar_cci(cci)):
+                    if not es_valido:
+                        raise ValueError(f"Dato generado inválido para la cuenta {id_cuenta}: {mensaje}")
+
+            apertura = hoy - timedelta(days=rng.randrange(1, 8 * 365))
+            estado = rng.choices([e for e, _ in ESTADOS_CUENTA], weights=[p for _, p in ESTADOS_CUENTA])[0]
+            id_producto = rng.choices([p for p, _ in PRODUCTOS], weights=[w for _, w in PRODUCTOS])[0]
+            saldo = _movimientos_cuenta(rng, escribir, id_cuenta, apertura,
+                                        cantidad_sesgada(rng, promedio, promedio * 50), ahora)
+            escribir('cuentas', (id_cuenta, numero, cci, id_cliente, id_producto, f"{saldo:.2f}",
+                                 apertura.isoformat(), estado))
+
+            if estado == 'Activa' and rng.random() < 0.7:
+                id_tarjeta = id_cuenta * 2
+                escribir('tarjetas', (id_tarjeta, f"4{id_tarjeta:015d}",
+                                      (hoy + timedelta(days=rng.randrange(180, 1800))).isoformat(),
+                                      id_cuenta, None, TIPO_TARJETA_DEBITO, 'Activa'))
+                _movimientos_tarjeta(rng, escribir, id_tarjeta, cantidad_sesgada(rng, promedio // 2, promedio * 20), ahora)
+        verificados += 1
+
+    for escritor in escritores.values():
+        escritor.cerrar()
+    return conteos
+
+
+def _movimientos_cuenta(rng, escribir, id_cuenta, apertura, cantidad, ahora):
+    """
+    Genera los movimientos de una cuenta con su historial de saldos.
+    Los movimientos son consistentes: el saldo final coincide con el de la cuenta.
+
+    Returns:
+        float: Saldo final
+    """
+    saldo = round(rng.lognormvariate(6.5, 1.4), 2)
+    inicio = datetime.combine(apertura, datetime.min.time())
+    segundos = max(int((ahora - inicio).total_seconds()), 1)
+    instantes = sorted(rng.randrange(segundos) for _ in range(cantidad))
+    for desplazamiento in instantes:
+        fecha = (inicio + timedelta(seconds=desplazamiento)).strftime('%Y-%m-%d %H:%M:%S')
+        if saldo > 1 and rng.random() < 0.45:
+            monto = round(rng.uniform(1, saldo * 0.5), 2)
+            tipo = rng.choice(MOVIMIENTOS_CARGO)
+            nuevo = round(saldo - monto, 2)
+        else:
+            monto = round(rng.lognormvariate(5, 1.2), 2)
+            tipo = rng.choice(MOVIMIENTOS_ABONO)
+            nuevo = round(saldo + monto, 2)
+        escribir('transacciones_cuenta', (id_cuenta, None, f"{monto:.2f}", fecha, tipo, tipo))
+        escribir('historial_saldos', (id_cuenta, f"{saldo:.2f}", f"{nuevo:.2f}", fecha))
+        saldo = nuevo
+    return saldo
+
+
+def _movimientos_tarjeta(rng, escribir, id_tarjeta, cantidad, ahora):
+    """Genera compras y retiros de una tarjeta en el último año."""
+    for _ in range(cantidad):
+        fecha = (ahora - timedelta(seconds=rng.randrange(365 * 86400))).strftime('%Y-%m-%d %H:%M:%S')
+        tipo = 'Compra' if rng.random() < 0.85 else 'Retiro'
+        escribir('transacciones_tarjeta', (id_tarjeta, f"{rng.lognormvariate(4, 1):.2f}", fecha, tipo, tipo))
+
+
+def escribir_script_carga(salida, formato, bloques):
+    """Escribe cargar.sql con la carga de todos los archivos en orden de dependencias."""
+    lineas = ["-- Generado por utils/generador_datos.py"]
+    for tabla, columnas in TABLAS.items():
+        for numero in range(bloques):
+            archivo = f"{tabla}.{numero:05d}.{formato}"
+            if formato == 'sql':
+                lineas.append(f"SOURCE {os.path.join(salida, archivo)};")
+            else:
+                lineas.append(
+                    f"LOAD DATA LOCAL INFILE '{os.path.abspath(os.path.join(salida, archivo))}' "
+                    f"INTO TABLE {tabla} FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+                    f"LINES TERMINATED BY '\\n' IGNORE 1 LINES ({', '.join(columnas)});")
+    with open(os.path.join(salida, 'cargar.sql'), 'w', encoding='utf-8') as archivo:
+        archivo.write("\n".join(lineas) + "\n")
+
+
+def generar(clientes, salida, formato='sql', procesos=None, tamano_bloque=50_000, id_inicial=1000,
+            semilla=2024, filas_por_insert=1000, movimientos_promedio=8):
+    """
+    Genera el conjunto de datos completo.
+
+    Args:
+        clientes (int): Cantidad de clientes
+        salida (str): Directorio de salida
+        formato (str): 'sql' (INSERT de varias filas) o 'csv' (LOAD DATA)
+        procesos (int): Procesos en paralelo (por defecto, uno por CPU)
+        tamano_bloque (int): Clientes por bloque/archivo
+        id_inicial (int): Primer id_cliente (evita chocar con los datos de script.sql)
+        semilla (int): Semilla para resultados reproducibles
+        filas_por_insert (int): Filas por sentencia INSERT (formato sql)
+        movimientos_promedio (int): Movimientos promedio por cuenta
+
+    Returns:
+        dict: Filas generadas por tabla
+    """
+    os.makedirs(salida, exist_ok=True)
+    fecha_referencia = date.today()
+    tareas = []
+    for numero, desde in enumerate(range(id_inicial, id_inicial + clientes, tamano_bloque)):
+        tareas.append({
+            'numero': numero,
+            'id_desde': desde,
+            'id_hasta': min(desde + tamano_bloque, id_inicial + clientes),
+            'semilla': semilla,
+            'salida': salida,
+            'formato': formato,
+            'filas_por_insert': filas_por_insert,
+            'movimientos_promedio': movimientos_promedio,
+            'fecha_referencia': fecha_referencia
+        })
+
+    totales = dict.fromkeys(TABLAS, 0)
+    with Pool(procesos) as pool:
+        for conteos in pool.imap_unordered(generar_bloque, tareas):
+            for tabla, cantidad in conteos.items():
+                totales[tabla] += cantidad
+
+    escribir_script_carga(salida, formato, len(tareas))
+    return totales
+
+
+def main():
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Generador de datos sintéticos del sistema bancario")
+    parser.add_argument('--clientes', type=int, default=100_000, help="Cantidad de clientes")
+    parser.add_argument('--salida', default='datos_generados', help="Directorio de salida")
+    parser.add_argument('--formato', choices=ESCRITORES, default='sql', help="sql (INSERT) o csv (LOAD DATA)")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos en paralelo")
+    parser.add_argument('--tamano-bloque', type=int, default=50_000, help="Clientes por archivo")
+    parser.add_argument('--id-inicial', type=int, default=1000, help="Primer id_cliente")
+    parser.add_argument('--semilla', type=int, default=2024, help="Semilla aleatoria")
+    parser.add_argument('--filas-por-insert', type=int, default=1000, help="Filas por INSERT")
+    parser.add_argument('--movimientos', type=int, default=8, help="Movimientos promedio por cuenta")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    totales = generar(args.clientes, args.salida, args.formato, args.procesos, args.tamano_bloque,
+                      args.id_inicial, args.semilla, args.filas_por_insert, args.movimientos)
+    print(f"Datos generados en {args.salida} ({time.perf_counter() - inicio:.1f} s):")
+    for tabla, cantidad in totales.items():
+        print(f"  {tabla}: {cantidad:,}")
+
+
+if __name__ == "__main__":
+    main()
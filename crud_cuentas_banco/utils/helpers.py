@@ -28,6 +28,9 @@ class Constantes:
     SALDO_MAXIMO = 999999999999.99
     SALDO_MINIMO = 0.0
     
+    # Días sin movimientos tras los cuales una cuenta activa pasa a Inactiva
+    DIAS_INACTIVIDAD_CUENTA = 365
+    
     # Longitudes máximas
     LONGITUD_MAXIMA_NOMBRE = 100
     LONGITUD_MAXIMA_EMAIL = 255
@@ -0,0 +1,178 @@
+"""
+Perfilador por muestreo para la aplicación de escritorio.
+
+Un hilo toma cada pocos milisegundos la pila de los demás hilos
+(sys._current_frames) y cuenta cuántas veces aparece cada pila. Al
+detenerse escribe dos archivos:
+    <prefijo>.folded  pilas colapsadas (flamegraph.pl, speedscope)
+    <prefijo>.txt     lista de funciones por muestras propias y totales
+
+Uso:
+    python main.py --perfil            (o BANCO_PERFIL=1: toda la sesión)
+    Menú Sistema > Perfilar 30 segundos (bajo demanda)
+"""
+
+from collections import Counter
+from datetime import datetime
+import atexit
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DIRECTORIO_POR_DEFECTO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'perfiles')
+
+# Identificadores de los hilos de muestreo (no se muestrean entre sí)
+_hilos_muestreo = set()
+
+
+def prefijo_por_defecto(nombre='perfil'):
+    """Ruta sin extensión para un perfil nuevo: perfiles/<nombre>_<fecha>."""
+    return os.path.join(DIRECTORIO_POR_DEFECTO, f"{nombre}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+
+class PerfiladorMuestreo:
+    """Toma muestras periódicas de las pilas de todos los hilos."""
+
+    def __init__(self, intervalo=0.005):
+        """
+        Args:
+            intervalo (float): Segundos entre muestras
+        """
+        self.intervalo = intervalo
+        self.muestras = Counter()
+        self.total = 0
+        self.inicio = None
+        self.duracion = 0.0
+        self._etiquetas = {}
+        self._detener = threading.Event()
+        self._hilo = None
+
+    @property
+    def activo(self):
+        """Indica si el perfilador está tomando muestras."""
+        return self._hilo is not None and self._hilo.is_alive()
+
+    def iniciar(self):
+        """Comienza a tomar muestras en un hilo aparte."""
+        if self.activo:
+            return
+        self._detener.clear()
+        self.inicio = time.perf_counter()
+        self._hilo = threading.Thread(target=self._bucle, name='perfilador', daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """Deja de tomar muestras y espera al hilo de muestreo."""
+        if not self.activo:
+            return
+        self._detener.set()
+        self._hilo.join()
+        self.duracion += time.perf_counter() - self.inicio
+
+    def _bucle(self):
+        propio = threading.get_ident()
+        _hilos_muestreo.add(propio)
+        try:
+            while not self._detener.wait(self.intervalo):
+                self._muestrear()
+        finally:
+            _hilos_muestreo.discard(propio)
+
+    def _muestrear(self):
+        """Cuenta la pila actual de cada hilo (excepto los de muestreo)."""
+        nombres = {hilo.ident: hilo.name for hilo in threading.enumerate()}
+        for ident, marco in sys._current_frames().items():
+            if ident in _hilos_muestreo:
+                continue
+            pila = []
+            while marco is not None:
+                pila.append(self._etiqueta(marco.f_code))
+                marco = marco.f_back
+            pila.append(nombres.get(ident, f"hilo-{ident}"))
+            self.muestras[tuple(reversed(pila))] += 1
+        self.total += 1
+
+    def _etiqueta(self, codigo):
+        """Nombre de un marco: archivo:función (en caché por objeto de código)."""
+        etiqueta = self._etiquetas.get(codigo)
+        if etiqueta is None:
+            nombre = getattr(codigo, 'co_qualname', codigo.co_name)
+            etiqueta = f"{os.path.basename(codigo.co_filename)}:{nombre}"
+            self._etiquetas[codigo] = etiqueta
+        return etiqueta
+
+    def lista_caliente(self, limite=40):
+        """
+        Funciones ordenadas por muestras propias (en la cima de la pila).
+
+        Args:
+            limite (int): Cantidad de funciones a retornar
+
+        Returns:
+            list: Tuplas (función, muestras propias, muestras totales)
+        """
+        propias = Counter()
+        totales = Counter()
+        for pila, cantidad in self.muestras.items():
+            propias[pila[-1]] += cantidad
+            for funcion in set(pila[1:]):
+                totales[funcion] += cantidad
+        return [(funcion, cantidad, totales[funcion]) for funcion, cantidad in propias.most_common(limite)]
+
+    def guardar(self, prefijo=None):
+        """
+        Escribe las pilas colapsadas y la lista de funciones.
+
+        Args:
+            prefijo (str): Ruta sin extensión (por defecto perfiles/perfil_<fecha>)
+
+        Returns:
+            tuple: (ruta_folded, ruta_txt)
+        """
+        prefijo = prefijo or prefijo_por_defecto()
+        os.makedirs(os.path.dirname(prefijo) or '.', exist_ok=True)
+        ruta_folded, ruta_txt = f"{prefijo}.folded", f"{prefijo}.txt"
+
+        with open(ruta_folded, 'w', encoding='utf-8') as archivo:
+            for pila, cantidad in sorted(self.muestras.items()):
+                archivo.write(f"{';'.join(pila)} {cantidad}\n")
+
+        muestras = sum(self.muestras.values()) or 1
+        with open(ruta_txt, 'w', encoding='utf-8') as archivo:
+            archivo.write(f"Duración: {self.duracion:.1f} s, {self.total} muestreos cada "
+                          f"{self.intervalo * 1000:.0f} ms, {sum(self.muestras.values())} pilas\n\n")
+            archivo.write(f"{'Propias':>8} {'%':>6} {'Totales':>8} {'%':>6}  Función\n")
+            for funcion, propias, totales in self.lista_caliente():
+                archivo.write(f"{propias:>8} {propias / muestras * 100:>6.1f} "
+                              f"{totales:>8} {totales / muestras * 100:>6.1f}  {funcion}\n")
+
+        logger.info(f"Perfil guardado en {ruta_folded} y {ruta_txt}")
+        return ruta_folded, ruta_txt
+
+
+def perfilar_sesion(prefijo=None, intervalo=0.005):
+    """
+    Perfila todo el proceso y guarda los resultados al terminar.
+
+    Args:
+        prefijo (str): Ruta sin extensión de los archivos (por defecto perfiles/sesion_<fecha>)
+        intervalo (float): Segundos entre muestras
+
+    Returns:
+        PerfiladorMuestreo: Perfilador iniciado
+    """
+    perfilador = PerfiladorMuestreo(intervalo)
+    prefijo = prefijo or prefijo_por_defecto('sesion')
+
+    def finalizar():
+        perfilador.detener()
+        perfilador.guardar(prefijo)
+
+    atexit.register(finalizar)
+    perfilador.iniciar()
+    logger.info(f"Perfilador de sesión activo (resultados en {prefijo}.*)")
+    return perfilador
@@ -0,0 +1,223 @@
+"""
+Trazas ligeras de extremo a extremo: vista -> controlador -> modelo -> SQL.
+
+Cada llamada instrumentada abre un tramo anidado dentro del tramo actual
+(propagado con contextvars junto con el ID de la traza). El tiempo propio
+de cada pila de tramos se acumula y se exporta en formato de pilas
+colapsadas ("vista;controlador;modelo;SQL microsegundos"), el que leen
+flamegraph.pl, speedscope o inferno.
+
+Desactivadas (por defecto) cada llamada instrumentada solo consulta una
+variable global. Se activan con la variable de entorno BANCO_TRAZAS (ruta
+del archivo a escribir al salir) o con activar().
+
+Uso:
+    BANCO_TRAZAS=trazas.folded python main.py
+    flamegraph.pl trazas.folded > trazas.svg
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+import atexit
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+_activo = False
+_ruta = None
+
+# Traza y pila de tramos abiertos en el contexto actual
+_traza_actual = contextvars.ContextVar('traza_actual', default=None)
+_tramos_abiertos = contextvars.ContextVar('tramos_abiertos', default=())
+
+# Tiempo propio acumulado por pila colapsada (microsegundos)
+_pilas = Counter()
+_lock = threading.Lock()
+
+_TABLA_SQL = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+(\w+)", re.I)
+
+
+class _Tramo:
+    """Tramo abierto: nombre, inicio y tiempo consumido por sus hijos."""
+
+    __slots__ = ('nombre', 'inicio', 'hijos')
+
+    def __init__(self, nombre, inicio):
+        self.nombre = nombre
+        self.inicio = inicio
+        self.hijos = 0.0
+
+
+def activar(ruta=None):
+    """
+    Activa las trazas.
+
+    Args:
+        ruta (str): Archivo donde exportar las pilas al terminar el proceso (opcional)
+    """
+    global _activo, _ruta
+    if ruta and _ruta is None:
+        atexit.register(lambda: exportar())
+    _ruta = ruta or _ruta
+    _activo = True
+
+
+def desactivar():
+    """Desactiva las trazas (los tramos ya abiertos se registran al cerrarse)."""
+    global _activo
+    _activo = False
+
+
+def activas():
+    """Indica si las trazas están activas."""
+    return _activo
+
+
+def traza_actual():
+    """
+    Obtiene el ID de la traza en curso en el contexto actual.
+
+    Returns:
+        str: ID de la traza o None fuera de un tramo
+    """
+    return _traza_actual.get()
+
+
+def _cerrar(tramos, tramo, duracion):
+    """Acumula el tiempo propio de un tramo en su pila y lo descuenta del padre."""
+    if tramos:
+        tramos[-1].hijos += duracion
+    pila = ";".join(t.nombre for t in tramos) + (";" if tramos else "") + tramo.nombre
+    with _lock:
+        _pilas[pila] += max(int((duracion - tramo.hijos) * 1_000_000), 0)
+
+
+@contextmanager
+def tramo(nombre):
+    """
+    Abre un tramo anidado en el contexto actual.
+
+    Args:
+        nombre (str): Nombre del tramo (un marco de la gráfica de llamas)
+    """
+    if not _activo:
+        yield
+        return
+
+    tramos = _tramos_abiertos.get()
+    token_traza = _traza_actual.set(uuid.uuid4().hex[:16]) if not tramos else None
+    actual = _Tramo(nombre, time.perf_counter())
+    token = _tramos_abiertos.set(tramos + (actual,))
+    try:
+        yield
+    finally:
+        _tramos_abiertos.reset(token)
+        if token_traza is not None:
+            _traza_actual.reset(token_traza)
+        _cerrar(tramos, actual, time.perf_counter() - actual.inicio)
+
+
+def registrar_sql(sql, inicio):
+    """
+    Registra una sentencia ya ejecutada como tramo hoja (lo llama la instrumentación de Database).
+
+    Args:
+        sql (str): Sentencia ejecutada
+        inicio (float): time.perf_counter() tomado antes de ejecutarla
+    """
+    tabla = _TABLA_SQL.search(sql)
+    partes = sql.split(None, 1)
+    nombre = f"SQL {partes[0].upper() if partes else ''}{' ' + tabla.group(1) if tabla else ''}"
+    _cerrar(_tramos_abiertos.get(), _Tramo(nombre, inicio), time.perf_counter() - inicio)
+
+
+def trazar(nombre):
+    """
+    Decorador que abre un tramo en cada llamada a la función.
+
+    Args:
+        nombre (str): Nombre del tramo
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _activo:
+                return funcion(*args, **kwargs)
+            with tramo(nombre):
+                return funcion(*args, **kwargs)
+        envoltura._trazado = True
+        return envoltura
+    return decorador
+
+
+def trazar_clase(cls):
+    """
+    Instrumenta los métodos definidos en una clase (no los heredados, que
+    ya instrumentó su clase). Los tramos se llaman Clase.metodo.
+
+    Returns:
+        type: La misma clase (se puede usar como decorador)
+    """
+    for nombre, atributo in list(vars(cls).items()):
+        if nombre.startswith('__') or not inspect.isfunction(atributo) or getattr(atributo, '_trazado', False):
+            continue
+        setattr(cls, nombre, trazar(f"{cls.__name__}.{nombre}")(atributo))
+    return cls
+
+
+def pilas():
+    """
+    Obtiene una copia de las pilas acumuladas.
+
+    Returns:
+        dict: Pila colapsada -> microsegundos de tiempo propio
+    """
+    with _lock:
+        return dict(_pilas)
+
+
+def limpiar():
+    """Descarta las pilas acumuladas."""
+    with _lock:
+        _pilas.clear()
+
+
+def exportar(ruta=None):
+    """
+    Escribe las pilas acumuladas en formato de pilas colapsadas.
+
+    Args:
+        ruta (str): Archivo de salida (por defecto el indicado al activar)
+
+    Returns:
+        str: Ruta escrita o None si no había ruta o datos
+    """
+    ruta = ruta or _ruta
+    datos = pilas()
+    if not ruta or not datos:
+        return None
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        for pila, microsegundos in sorted(datos.items()):
+            archivo.write(f"{pila} {microsegundos}\n")
+    logger.info(f"Trazas exportadas a {ruta}")
+    return ruta
+
+
+class FiltroTraza(logging.Filter):
+    """Agrega el ID de la traza en curso a los registros de log (atributo traza)."""
+
+    def filter(self, record):
+        record.traza = _traza_actual.get() or '-'
+        return True
+
+
+if os.environ.get('BANCO_TRAZAS'):
+    activar(os.environ['BANCO_TRAZAS'])
@@ -5,15 +5,31 @@ Proporciona funcionalidad común y componentes reutilizables.
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 from typing import Dict, List, Any, Optional, Callable
+from database.cancelacion import Cancelacion
+from database.sesiones import obtener_sesion
+from utils.trazas import trazar_clase
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Hilos para las consultas de las vistas (cada uno con su sesión de BD)
+_EJECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='vista')
+
+# Cada cuánto revisa la interfaz si terminó una tarea en segundo plano (ms)
+INTERVALO_SONDEO_MS = 50
+
 
 class BaseView:
     """Clase base para todas las vistas del sistema."""
     
+    def __init_subclass__(cls, **kwargs):
+        """Instrumenta con trazas los métodos (manejadores) de cada vista."""
+        super().__init_subclass__(**kwargs)
+        trazar_clase(cls)
+    
     def __init__(self, parent, titulo: str = ""):
         """
         Inicializa la vista base.
@@ -28,6 +44,9 @@ class BaseView:
         self.variables_formulario = {}
         self.widgets = {}
         
+        # Tareas en segundo plano en curso por acción
+        self.tareas = {}
+        
         # Configurar estilo
         self._configurar_estilo()
         
@@ -271,6 +290,57 @@ class BaseView:
         """
         return messagebox.askyesno(titulo, mensaje)
     
+    def ejecutar_en_segundo_plano(self, clave: str, funcion: Callable, al_terminar: Callable):
+        """
+        Ejecuta una operación de BD fuera del hilo de la interfaz.
+        
+        Una tarea nueva con la misma clave reemplaza a la anterior: su consulta
+        en curso se cancela (KILL QUERY) y su resultado se descarta.
+        
+        Args:
+            clave: Acción a la que pertenece la tarea (por ejemplo 'listar')
+            funcion: Operación a ejecutar, sin argumentos
+            al_terminar: Recibe el resultado en el hilo de la interfaz
+        """
+        anterior = self.tareas.get(clave)
+        if anterior:
+            anterior.cancelar()
+        
+        cancelacion = Cancelacion()
+        self.tareas[clave] = cancelacion
+        # La tarea corre en una copia del contexto: conserva la traza en curso (utils.trazas)
+        futuro = _EJECUTOR.submit(contextvars.copy_context().run, self._ejecutar_tarea, cancelacion, funcion)
+        self._esperar_tarea(clave, cancelacion, futuro, al_terminar)
+    
+    @staticmethod
+    def _ejecutar_tarea(cancelacion: Cancelacion, funcion: Callable):
+        """Ejecuta la tarea en un hilo del ejecutor vinculando su conexión a la cancelación."""
+        if cancelacion.cancelada:
+            return None
+        with cancelacion.vincular(obtener_sesion()):
+            return funcion()
+    
+    def _esperar_tarea(self, clave: str, cancelacion: Cancelacion, futuro, al_terminar: Callable):
+        """Revisa desde el hilo de la interfaz si la tarea terminó y entrega su resultado."""
+        if not self.frame_principal.winfo_exists():
+            cancelacion.cancelar()
+            return
+        if not futuro.done():
+            self.parent.after(INTERVALO_SONDEO_MS, self._esperar_tarea, clave, cancelacion, futuro, al_terminar)
+            return
+        
+        if self.tareas.get(clave) is cancelacion:
+            del self.tareas[clave]
+        if cancelacion.cancelada:
+            return
+        try:
+            resultado = futuro.result()
+        except Exception as e:
+            logger.error(f"Error en tarea '{clave}': {str(e)}")
+            self.mostrar_mensaje("Error", f"Error en la operación: {str(e)}", "error")
+            return
+        al_terminar(resultado)
+    
     def limpiar_formulario(self):
         """Limpia todos los campos del formulario."""
         for variable in self.variables_formulario.values():
@@ -393,3 +463,6 @@ class BaseView:
                         sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
         
         return frame_grupo
+
+
+trazar_clase(BaseView)
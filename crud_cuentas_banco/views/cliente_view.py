@@ -4,7 +4,7 @@ Permite realizar operaciones CRUD sobre clientes.
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog
 from views.base_view import BaseView
 from controllers.cliente_controller import ClienteController
 from typing import Dict, List, Optional
@@ -12,6 +12,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Segundos máximos de las consultas de listado y búsqueda
+TIEMPO_MAXIMO_CONSULTA = 30
+
 
 class ClienteView(BaseView):
     """Vista para la gestión de clientes."""
@@ -20,6 +23,8 @@ class ClienteView(BaseView):
         super().__init__(parent, "Gestión de Clientes")
         self.controller = controller
         self.cliente_actual = None
+        # Versión del registro cargado en el formulario (concurrencia optimista)
+        self.version_actual = None
         self.tipos_documento = []
         self.categorias = []
         
@@ -166,9 +171,17 @@ class ClienteView(BaseView):
         frame_tabla.columnconfigure(0, weight=1)
     
     def _cargar_clientes(self):
-        """Carga la lista de clientes en la tabla."""
+        """
+        Carga la lista de clientes en la tabla en segundo plano.
+        Una búsqueda o recarga posterior cancela la que siga en curso.
+        """
+        self.ejecutar_en_segundo_plano(
+            'listar', lambda: self.controller.listar(timeout=TIEMPO_MAXIMO_CONSULTA), self._mostrar_clientes)
+    
+    def _mostrar_clientes(self, resultado):
+        """Muestra en la tabla el resultado de un listado o búsqueda."""
         try:
-            exito, mensaje, clientes = self.controller.listar()
+            exito, mensaje, clientes = resultado
             if exito:
                 # Preparar datos para la tabla
                 datos_tabla = []
@@ -213,6 +226,8 @@ class ClienteView(BaseView):
             
             if self.cliente_actual:
                 # Actualizar cliente existente
+                if self.version_actual is not None:
+                    datos['version'] = self.version_actual
                 exito, mensaje = self.controller.actualizar_cliente(self.cliente_actual, datos)
             else:
                 # Crear nuevo cliente
@@ -225,6 +240,11 @@ class ClienteView(BaseView):
                 self._cargar_clientes()
                 self._limpiar_formulario()
                 self.cliente_actual = None
+            elif self.controller.es_conflicto(mensaje):
+                # Otro usuario guardó cambios después de cargar el formulario
+                if self.mostrar_confirmacion("Conflicto", f"{mensaje}\n\n¿Desea cargar los datos actuales? "
+                                                         "Se perderán los cambios del formulario."):
+                    self._editar_cliente()
             else:
                 messagebox.showerror("Error", mensaje)
                 
@@ -273,9 +293,22 @@ class ClienteView(BaseView):
             messagebox.showerror("Error", f"Error al eliminar cliente: {str(e)}")
     
     def _buscar_cliente(self):
-        """Busca clientes por criterios."""
-        # TODO: Implementar diálogo de búsqueda avanzada
-        messagebox.showinfo("Búsqueda", "Funcionalidad de búsqueda en desarrollo")
+        """
+        Busca clientes por nombre en segundo plano (vacío muestra todos).
+        Una búsqueda nueva cancela la consulta de la anterior.
+        """
+        nombre = simpledialog.askstring("Buscar Cliente", "Nombre o apellido:", parent=self.parent)
+        if nombre is None:
+            return
+        
+        nombre = nombre.strip()
+        if not nombre:
+            self._cargar_clientes()
+            return
+        
+        self.ejecutar_en_segundo_plano(
+            'listar', lambda: self.controller.buscar_clientes_por_nombre(nombre, TIEMPO_MAXIMO_CONSULTA),
+            self._mostrar_clientes)
     
     def _on_seleccion_cliente(self, event):
         """Maneja la selección de un cliente en la tabla."""
@@ -328,6 +361,7 @@ class ClienteView(BaseView):
     def _llenar_formulario(self, datos_cliente: Dict):
         """Llena el formulario con los datos del cliente."""
         try:
+            self.version_actual = datos_cliente.get('version')
             self.variables_formulario['nombre'].set(datos_cliente.get('nombre', ''))
             self.variables_formulario['apellido_paterno'].set(datos_cliente.get('apellido_paterno', ''))
             self.variables_formulario['apellido_materno'].set(datos_cliente.get('apellido_materno', ''))
@@ -354,3 +388,4 @@ class ClienteView(BaseView):
         for variable in self.variables_formulario.values():
             variable.set("")
         self.cliente_actual = None
+        self.version_actual = None
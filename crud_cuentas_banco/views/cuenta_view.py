@@ -13,6 +13,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Segundos máximos de la consulta de listado
+TIEMPO_MAXIMO_CONSULTA = 30
+
 
 class CuentaView(BaseView):
     """Vista para la gestión de cuentas bancarias."""
@@ -22,6 +25,8 @@ class CuentaView(BaseView):
         self.controller = controller
         self.cliente_controller = ClienteController()
         self.cuenta_actual = None
+        # Versión del registro cargado en el formulario (concurrencia optimista)
+        self.version_actual = None
         self.clientes = []
         self.productos = []
         
@@ -34,18 +39,16 @@ class CuentaView(BaseView):
     def _cargar_datos_iniciales(self):
         """Carga los datos iniciales necesarios."""
         try:
-            # Cargar clientes
-            exito, _, self.clientes = self.cliente_controller.listar()
+            # Cargar clientes (solo las columnas que usa el combobox)
+            columnas = ['id_cliente', 'nombre', 'apellido_paterno', 'apellido_materno']
+            exito, _, self.clientes = self.cliente_controller.listar(columnas=columnas)
             if not exito:
                 messagebox.showwarning("Advertencia", "No se pudieron cargar los clientes")
             
-            # Cargar productos de cuenta (hardcoded por ahora)
-            self.productos = [
-                {'id_producto': 1, 'nombre_producto': 'Cuenta de Ahorros Clásica'},
-                {'id_producto': 2, 'nombre_producto': 'Cuenta Sueldo'},
-                {'id_producto': 3, 'nombre_producto': 'Cuenta Corriente Empresarial'},
-                {'id_producto': 4, 'nombre_producto': 'Ahorro Programado'}
-            ]
+            # Cargar productos de cuenta
+            exito, _, self.productos = self.controller.obtener_productos()
+            if not exito:
+                messagebox.showwarning("Advertencia", "No se pudieron cargar los productos")
                 
         except Exception as e:
             logger.error(f"Error al cargar datos iniciales: {str(e)}")
@@ -165,9 +168,17 @@ class CuentaView(BaseView):
         frame_tabla.columnconfigure(0, weight=1)
     
     def _cargar_cuentas(self):
-        """Carga la lista de cuentas en la tabla."""
+        """
+        Carga la lista de cuentas en la tabla en segundo plano.
+        Una recarga posterior cancela la que siga en curso.
+        """
+        self.ejecutar_en_segundo_plano(
+            'listar', lambda: self.controller.listar(timeout=TIEMPO_MAXIMO_CONSULTA), self._mostrar_cuentas)
+    
+    def _mostrar_cuentas(self, resultado):
+        """Muestra en la tabla el resultado del listado."""
         try:
-            exito, mensaje, cuentas = self.controller.listar()
+            exito, mensaje, cuentas = resultado
             if exito:
                 # Preparar datos para la tabla
                 datos_tabla = []
@@ -223,6 +234,8 @@ class CuentaView(BaseView):
             
             if self.cuenta_actual:
                 # Actualizar cuenta existente
+                if self.version_actual is not None:
+                    datos['version'] = self.version_actual
                 exito, mensaje = self.controller.actualizar_cuenta(self.cuenta_actual, datos)
             else:
                 # Crear nueva cuenta
@@ -235,6 +248,11 @@ class CuentaView(BaseView):
                 self._cargar_cuentas()
                 self._limpiar_formulario()
                 self.cuenta_actual = None
+            elif self.controller.es_conflicto(mensaje):
+                # Otro usuario guardó cambios después de cargar el formulario
+                if self.mostrar_confirmacion("Conflicto", f"{mensaje}\n\n¿Desea cargar los datos actuales? "
+                                                         "Se perderán los cambios del formulario."):
+                    self._editar_cuenta()
             else:
                 messagebox.showerror("Error", mensaje)
                 
@@ -345,6 +363,7 @@ class CuentaView(BaseView):
     def _llenar_formulario(self, datos_cuenta: Dict):
         """Llena el formulario con los datos de la cuenta."""
         try:
+            self.version_actual = datos_cuenta.get('version')
             self.variables_formulario['numero_cuenta'].set(datos_cuenta.get('numero_cuenta', ''))
             self.variables_formulario['cci'].set(datos_cuenta.get('cci', ''))
             self.variables_formulario['saldo'].set(str(datos_cuenta.get('saldo', 0)))
@@ -377,3 +396,4 @@ class CuentaView(BaseView):
         for variable in self.variables_formulario.values():
             variable.set("")
         self.cuenta_actual = None
+        self.version_actual = None
@@ -4,6 +4,7 @@ Contiene el menú principal y la navegación entre módulos.
 """
 
 import py_compile
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 from views.base_view import BaseView
@@ -12,11 +13,19 @@ from views.cuenta_view import CuentaView
 from controllers.cliente_controller import ClienteController
 from controllers.cuenta_controller import CuentaController
 from controllers.usuario_controller import UsuarioController
+from utils.trazas import trazar_clase
+from utils.perfilador import PerfiladorMuestreo, prefijo_por_defecto
 import logging
 
 logger = logging.getLogger(__name__)
 
+SEGUNDOS_PERFIL = 30
 
+# Cada cuánto revisa la interfaz si terminó la verificación de la conexión (ms)
+INTERVALO_SONDEO_MS = 100
+
+
+@trazar_clase
 class MainWindow:
     """Ventana principal del sistema bancario."""
     
@@ -42,6 +51,9 @@ class MainWindow:
         # Frame actual
         self.frame_actual = None
         
+        # Perfilador bajo demanda (menú Sistema)
+        self.perfilador = None
+        
         # Crear interfaz
         self._crear_interfaz()
         
@@ -50,6 +62,11 @@ class MainWindow:
     
     def _crear_interfaz(self):
         """Crea la interfaz principal."""
+        # Barra de estado (antes del frame principal para que quede abajo)
+        self.label_estado_bd = ttk.Label(self.root, text="Base de datos: verificando conexión...",
+                                         anchor=tk.W, relief=tk.SUNKEN, padding=(5, 2))
+        self.label_estado_bd.pack(side=tk.BOTTOM, fill=tk.X)
+        
         # Frame principal
         self.frame_principal = ttk.Frame(self.root)
         self.frame_principal.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -72,6 +89,7 @@ class MainWindow:
         menu_sistema = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Sistema", menu=menu_sistema)
         menu_sistema.add_command(label="Inicio", command=self._mostrar_pantalla_inicio)
+        menu_sistema.add_command(label=f"Perfilar {SEGUNDOS_PERFIL} segundos", command=self._perfilar)
         menu_sistema.add_separator()
         menu_sistema.add_command(label="Salir", command=self._cerrar_aplicacion)
         
@@ -175,6 +193,56 @@ Funcionalidades:
         """
         messagebox.showinfo("Acerca de", mensaje)
     
+    def _perfilar(self):
+        """Perfila la aplicación durante SEGUNDOS_PERFIL segundos y guarda el resultado."""
+        if self.perfilador and self.perfilador.activo:
+            messagebox.showinfo("Perfilador", "Ya hay un perfil en curso")
+            return
+        
+        self.perfilador = PerfiladorMuestreo()
+        self.perfilador.iniciar()
+        self.root.after(SEGUNDOS_PERFIL * 1000, self._terminar_perfil)
+        logger.info(f"Perfilando durante {SEGUNDOS_PERFIL} segundos")
+    
+    def _terminar_perfil(self):
+        """Detiene el perfil bajo demanda y muestra dónde quedaron los archivos."""
+        try:
+            self.perfilador.detener()
+            ruta_folded, ruta_txt = self.perfilador.guardar(prefijo_por_defecto())
+            messagebox.showinfo("Perfilador", f"Perfil guardado en:\n{ruta_txt}\n{ruta_folded}")
+        except Exception as e:
+            logger.error(f"Error al guardar el perfil: {str(e)}")
+            messagebox.showerror("Error", f"Error al guardar el perfil: {str(e)}")
+    
+    def verificar_conexion_en_segundo_plano(self, verificar, al_fallar=None):
+        """
+        Verifica la conexión con la BD en un hilo, sin bloquear la interfaz,
+        y muestra el resultado en la barra de estado.
+        
+        Args:
+            verificar: Función sin argumentos que retorna True si hay conexión
+            al_fallar: Función que se llama (en el hilo de la interfaz) si no hay conexión
+        """
+        resultado = {}
+        hilo = threading.Thread(target=lambda: resultado.update(conectada=verificar()),
+                                name='verificar-conexion', daemon=True)
+        hilo.start()
+        self.root.after(INTERVALO_SONDEO_MS, self._esperar_verificacion, hilo, resultado, al_fallar)
+    
+    def _esperar_verificacion(self, hilo, resultado, al_fallar):
+        """Revisa si terminó la verificación de la conexión y actualiza la barra de estado."""
+        if hilo.is_alive():
+            self.root.after(INTERVALO_SONDEO_MS, self._esperar_verificacion, hilo, resultado, al_fallar)
+            return
+        
+        if resultado.get('conectada'):
+            self.label_estado_bd.config(text="Base de datos: conectada")
+            return
+        
+        self.label_estado_bd.config(text="Base de datos: sin conexión (solo catálogos de la copia local)")
+        if al_fallar:
+            al_fallar()
+    
     def _limpiar_contenido(self):
         """Limpia el área de contenido."""
         if self.frame_actual:
@@ -338,12 +406,16 @@ class EstadisticasView(BaseView):
             else:
                 self.label_total_clientes.config(text=f"Error: {mensaje}")
             
-            # Estadísticas de cuentas
-            exito, mensaje, stats_cuentas = self.main_window.cuenta_controller.obtener_estadisticas_cuentas()
+            # Estadísticas de cuentas (del cierre de ayer si el trabajo nocturno ya lo resumió)
+            exito, mensaje, stats_cuentas = self.main_window.cuenta_controller.obtener_estadisticas_cuentas(
+                usar_resumen=True)
             if exito:
                 self.label_total_cuentas.config(text=f"Total de Cuentas: {stats_cuentas['total_cuentas']}")
                 self.label_cuentas_activas.config(text=f"Cuentas Activas: {stats_cuentas['cuentas_activas']}")
-                self.label_saldo_total.config(text=f"Saldo Total: S/ {stats_cuentas['saldo_total']:,.2f}")
+                texto_saldo = f"Saldo Total: S/ {stats_cuentas['saldo_total']:,.2f}"
+                if 'fecha_resumen' in stats_cuentas:
+                    texto_saldo += f" (cierre del {stats_cuentas['fecha_resumen']})"
+                self.label_saldo_total.config(text=texto_saldo)
             else:
                 self.label_total_cuentas.config(text=f"Error: {mensaje}")
                 
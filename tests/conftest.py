@@ -5,8 +5,12 @@ Contiene fixtures y configuraciones compartidas entre tests.
 import pytest
 import tempfile
 import os
+import sys
 from unittest.mock import Mock
 
+# Agregar el directorio de la aplicación al path para importar los módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'crud_cuentas_banco'))
+
 
 @pytest.fixture
 def temp_config_file():
@@ -48,3 +52,21 @@ def sample_cliente_data():
         'email': 'juan@example.com',
         'telefono': '123456789'
     }
+
+
+@pytest.fixture
+def bd_memoria():
+    """
+    Fixture que conecta los modelos a una BD en memoria nueva (SQLite con el
+    esquema y los datos de script.sql) y retorna la sesión del test.
+    """
+    from database import memoria
+    from database.sesiones import sesion
+    
+    motor = memoria.activar()
+    try:
+        with sesion() as db:
+            yield db
+    finally:
+        memoria.desactivar()
+        motor.cerrar()
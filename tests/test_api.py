@@ -0,0 +1,281 @@
+"""
+Tests de las rutas del servidor HTTP/JSON (api.servidor) contra la BD en memoria.
+"""
+import gzip
+import http.client
+import json
+import threading
+
+import pytest
+
+from api import servidor as api
+from api.servidor import ServidorAPI
+
+
+@pytest.fixture
+def iniciar_servidor(bd_memoria):
+    """Fixture que inicia servidores en un puerto libre de 127.0.0.1 y los detiene al terminar."""
+    servidores = []
+
+    def iniciar(**opciones):
+        servidor = ServidorAPI(('127.0.0.1', 0), hilos=2, cola=2, timeout_conexion=5, **opciones)
+        threading.Thread(target=servidor.serve_forever, args=(0.05,), daemon=True).start()
+        servidores.append(servidor)
+        return servidor
+
+    yield iniciar
+
+    for servidor in servidores:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+@pytest.fixture
+def servidor(iniciar_servidor):
+    """Fixture que inicia un servidor sin token."""
+    return iniciar_servidor()
+
+
+def pedir(servidor, metodo, ruta, cuerpo=None, cabeceras=None):
+    """Hace una petición y retorna (respuesta, cuerpo en bytes sin descomprimir)."""
+    conexion = http.client.HTTPConnection(*servidor.server_address, timeout=5)
+    try:
+        datos = json.dumps(cuerpo).encode('utf-8') if cuerpo is not None else None
+        conexion.request(metodo, ruta, body=datos, headers=cabeceras or {})
+        respuesta = conexion.getresponse()
+        return respuesta, respuesta.read()
+    finally:
+        conexion.close()
+
+
+def pedir_json(servidor, metodo, ruta, cuerpo=None, cabeceras=None):
+    """Hace una petición y retorna (estado, JSON decodificado)."""
+    respuesta, datos = pedir(servidor, metodo, ruta, cuerpo, cabeceras)
+    return respuesta.status, json.loads(datos)
+
+
+class TestRutas:
+    """Clase de tests de las rutas de lectura y escritura."""
+    
+    def test_salud(self, servidor):
+        """Test que verifica que /salud responde sin consultar la BD."""
+        estado, cuerpo = pedir_json(servidor, 'GET', '/salud')
+        
+        assert estado == 200
+        assert cuerpo['exito']
+    
+    def test_ruta_desconocida(self, servidor):
+        """Test que verifica que un recurso o una ruta desconocidos responden 404."""
+        assert pedir_json(servidor, 'GET', '/bancos')[0] == 404
+        assert pedir(servidor, 'PATCH', '/cuentas/1')[0].status == 501
+        assert pedir_json(servidor, 'GET', '/cuentas/1/movimientos')[0] == 404
+    
+    def test_leer_y_conteo(self, servidor, bd_memoria):
+        """Test que verifica la lectura por id y el conteo de un recurso."""
+        total = bd_memoria.fetch_all("SELECT COUNT(*) AS total FROM cuentas")[0]['total']
+        
+        estado, cuerpo = pedir_json(servidor, 'GET', '/cuentas/1')
+        assert estado == 200
+        assert cuerpo['datos']['id_cuenta'] == 1
+        
+        estado, cuerpo = pedir_json(servidor, 'GET', '/cuentas/conteo')
+        assert estado == 200
+        assert cuerpo['datos'] == total
+        
+        assert pedir_json(servidor, 'GET', '/cuentas/999999')[0] == 404
+    
+    def test_usuarios_sin_password_hash(self, servidor):
+        """Test que verifica que las columnas ocultas no salen en listados ni lecturas."""
+        _, listado = pedir_json(servidor, 'GET', '/usuarios')
+        _, usuario = pedir_json(servidor, 'GET', '/usuarios/1')
+        
+        assert listado['datos']
+        assert all('password_hash' not in fila for fila in listado['datos'])
+        assert 'password_hash' not in usuario['datos']
+    
+    def test_crear_actualizar_y_eliminar_cliente(self, servidor):
+        """Test que verifica PUT, POST y DELETE de clientes."""
+        _, cliente = pedir_json(servidor, 'GET', '/clientes/1')
+        datos = dict(cliente['datos'], telefono='999000111')
+        
+        estado, cuerpo = pedir_json(servidor, 'PUT', '/clientes/1', datos)
+        assert estado == 200, cuerpo
+        _, cliente = pedir_json(servidor, 'GET', '/clientes/1')
+        assert cliente['datos']['telefono'] == '999000111'
+        
+        estado, cuerpo = pedir_json(servidor, 'POST', '/clientes', {
+            'nombre': 'Rosa', 'apellido_paterno': 'Quispe', 'apellido_materno': 'Huamán',
+            'id_tipo_documento': 1, 'numero_documento': '41234567', 'email': 'rosa.quispe@email.com',
+            'telefono': '987111222', 'fecha_nacimiento': '1992-06-30', 'id_categoria': 1,
+            'id_agencia_apertura': 1})
+        assert estado == 201, cuerpo
+        id_cliente = cuerpo['datos']['id']
+        
+        assert pedir_json(servidor, 'DELETE', f'/clientes/{id_cliente}')[0] == 200
+        assert pedir_json(servidor, 'DELETE', f'/clientes/{id_cliente}')[0] == 404
+    
+    def test_actualizar_saldo_invalido(self, servidor):
+        """Test que verifica que un saldo no numérico responde 400."""
+        estado, cuerpo = pedir_json(servidor, 'POST', '/cuentas/1/saldo', {'saldo': 'mucho'})
+        
+        assert estado == 400
+        assert not cuerpo['exito']
+
+
+class TestPaginacion:
+    """Clase de tests de los límites de los listados."""
+    
+    def test_limite_se_acota_al_maximo(self, servidor, monkeypatch):
+        """Test que verifica que un limite mayor que LIMITE_MAXIMO se reduce al máximo."""
+        monkeypatch.setattr(api, 'LIMITE_MAXIMO', 2)
+        
+        estado, cuerpo = pedir_json(servidor, 'GET', '/cuentas?limite=500')
+        
+        assert estado == 200
+        assert len(cuerpo['datos']) == 2
+        assert cuerpo['paginacion']['limite'] == 2
+        assert cuerpo['paginacion']['siguiente'] == cuerpo['datos'][-1]['id_cuenta']
+    
+    @pytest.mark.parametrize('limite', ['0', '-1', 'abc'])
+    def test_limite_invalido(self, servidor, limite):
+        """Test que verifica que un limite cero, negativo o no numérico responde 400."""
+        estado, cuerpo = pedir_json(servidor, 'GET', f'/cuentas?limite={limite}')
+        
+        assert estado == 400
+        assert 'limite' in cuerpo['mensaje']
+    
+    def test_paginacion_por_clave(self, servidor):
+        """Test que verifica que despues_de continúa donde terminó la página anterior."""
+        _, primera = pedir_json(servidor, 'GET', '/cuentas?limite=2')
+        siguiente = primera['paginacion']['siguiente']
+        
+        _, segunda = pedir_json(servidor, 'GET', f'/cuentas?limite=2&despues_de={siguiente}')
+        
+        assert segunda['datos']
+        assert all(fila['id_cuenta'] > siguiente for fila in segunda['datos'])
+
+
+class TestCodificacion:
+    """Clase de tests de gzip, streaming y Content-Length."""
+    
+    def test_gzip_solo_si_el_cliente_lo_acepta(self, servidor):
+        """Test que verifica que una respuesta grande se comprime solo con Accept-Encoding: gzip."""
+        respuesta, datos = pedir(servidor, 'GET', '/clientes', cabeceras={'Accept-Encoding': 'gzip'})
+        assert respuesta.getheader('Content-Encoding') == 'gzip'
+        assert int(respuesta.getheader('Content-Length')) == len(datos)
+        comprimido = json.loads(gzip.decompress(datos))
+        
+        respuesta, datos = pedir(servidor, 'GET', '/clientes')
+        assert respuesta.getheader('Content-Encoding') is None
+        assert len(datos) >= api.MINIMO_GZIP
+        assert json.loads(datos) == comprimido
+    
+    def test_respuesta_pequena_sin_gzip(self, servidor):
+        """Test que verifica que las respuestas pequeñas no se comprimen."""
+        respuesta, _ = pedir(servidor, 'GET', '/salud', cabeceras={'Accept-Encoding': 'gzip'})
+        
+        assert respuesta.getheader('Content-Encoding') is None
+    
+    @pytest.mark.parametrize('comprimir', [False, True])
+    def test_stream_chunked(self, servidor, bd_memoria, monkeypatch, comprimir):
+        """Test que verifica que el streaming envía todas las filas por lotes con chunked."""
+        monkeypatch.setattr(api, 'TAMANO_LOTE_STREAM', 3)
+        total = bd_memoria.fetch_all("SELECT COUNT(*) AS total FROM cuentas")[0]['total']
+        cabeceras = {'Accept-Encoding': 'gzip'} if comprimir else {}
+        
+        respuesta, datos = pedir(servidor, 'GET', '/cuentas?stream=1', cabeceras=cabeceras)
+        
+        assert respuesta.status == 200
+        assert respuesta.getheader('Transfer-Encoding') == 'chunked'
+        assert respuesta.getheader('Content-Length') is None
+        if comprimir:
+            assert respuesta.getheader('Content-Encoding') == 'gzip'
+            datos = gzip.decompress(datos)
+        filas = json.loads(datos)['datos']
+        assert len(filas) == total
+        assert len({fila['id_cuenta'] for fila in filas}) == total
+    
+    def test_keep_alive(self, servidor):
+        """Test que verifica que varias peticiones comparten la misma conexión."""
+        conexion = http.client.HTTPConnection(*servidor.server_address, timeout=5)
+        try:
+            for _ in range(3):
+                conexion.request('GET', '/cuentas/conteo')
+                respuesta = conexion.getresponse()
+                respuesta.read()
+                assert respuesta.status == 200
+                assert not respuesta.will_close
+        finally:
+            conexion.close()
+    
+    @pytest.mark.parametrize('longitud', ['-1', 'abc'])
+    def test_content_length_invalido(self, servidor, longitud):
+        """Test que verifica que un Content-Length inválido responde 400 y cierra la conexión."""
+        conexion = http.client.HTTPConnection(*servidor.server_address, timeout=5)
+        try:
+            conexion.putrequest('POST', '/clientes')
+            conexion.putheader('Content-Length', longitud)
+            conexion.endheaders()
+            respuesta = conexion.getresponse()
+            cuerpo = json.loads(respuesta.read())
+        finally:
+            conexion.close()
+        
+        assert respuesta.status == 400
+        assert 'Content-Length' in cuerpo['mensaje']
+        assert respuesta.getheader('Connection') == 'close'
+    
+    def test_cuerpo_demasiado_grande(self, servidor, monkeypatch):
+        """Test que verifica que un cuerpo mayor que MAXIMO_CUERPO se rechaza sin leerlo."""
+        monkeypatch.setattr(api, 'MAXIMO_CUERPO', 10)
+        
+        estado, cuerpo = pedir_json(servidor, 'POST', '/clientes', {'nombre': 'x' * 50})
+        
+        assert estado == 400
+        assert 'demasiado grande' in cuerpo['mensaje']
+    
+    def test_cuerpo_no_json(self, servidor):
+        """Test que verifica que un cuerpo que no es un objeto JSON responde 400."""
+        respuesta, datos = pedir(servidor, 'POST', '/clientes', cuerpo=[1, 2])
+        
+        assert respuesta.status == 400
+        assert 'objeto JSON' in json.loads(datos)['mensaje']
+
+
+class TestAutenticacion:
+    """Clase de tests del token de acceso."""
+    
+    def test_sin_token_exige_interfaz_local(self):
+        """Test que verifica que sin token no se puede escuchar en todas las interfaces."""
+        with pytest.raises(ValueError):
+            ServidorAPI(('0.0.0.0', 0))
+        with pytest.raises(ValueError):
+            ServidorAPI(('', 0))
+    
+    def test_interfaces_locales(self):
+        """Test que verifica qué hosts se consideran locales."""
+        assert api.es_interfaz_local('127.0.0.1')
+        assert api.es_interfaz_local('::1')
+        assert api.es_interfaz_local('localhost')
+        assert not api.es_interfaz_local('0.0.0.0')
+        assert not api.es_interfaz_local('')
+        assert not api.es_interfaz_local('servidor.banco')
+    
+    def test_token_requerido(self, iniciar_servidor):
+        """Test que verifica que con token solo /salud responde sin Authorization."""
+        servidor = iniciar_servidor(token='secreto')
+        
+        assert pedir_json(servidor, 'GET', '/salud')[0] == 200
+        
+        respuesta, _ = pedir(servidor, 'GET', '/cuentas')
+        assert respuesta.status == 401
+        assert respuesta.getheader('WWW-Authenticate') == 'Bearer'
+        
+        estado, _ = pedir_json(servidor, 'DELETE', '/cuentas/1', cabeceras={'Authorization': 'Bearer otro'})
+        assert estado == 401
+        estado, _ = pedir_json(servidor, 'GET', '/cuentas', cabeceras={'Authorization': 'Basic secreto'})
+        assert estado == 401
+        
+        estado, cuerpo = pedir_json(servidor, 'GET', '/cuentas/1', cabeceras={'Authorization': 'Bearer secreto'})
+        assert estado == 200
+        assert cuerpo['datos']['id_cuenta'] == 1
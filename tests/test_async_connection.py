@@ -0,0 +1,190 @@
+"""
+Tests de la capa de acceso asíncrono (database.async_connection).
+Se omiten si aiomysql no está instalado (dependencia opcional).
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip('aiomysql')
+
+from database.async_connection import DatabaseAsync, ModeloAsync
+from database.compilador import MENSAJE_CONFLICTO
+from models.cliente import Cliente
+from models.cuenta import Cuenta
+
+
+class BDAsyncMemoria:
+    """Misma interfaz que DatabaseAsync sobre la sesión de la BD en memoria."""
+    
+    def __init__(self, db):
+        self.db = db
+    
+    async def execute_query(self, query, params=None):
+        return self.db.execute_query(query, params)
+    
+    async def execute_update(self, query, params=None):
+        return self.db.execute_update(query, params)
+    
+    async def fetch_all(self, query, params=None, conversiones=None):
+        return self.db.fetch_all(query, params, conversiones)
+
+
+class CursorFalso:
+    """Cursor de aiomysql que anota las sentencias en su conexión."""
+    
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.lastrowid = None
+        self.rowcount = 1
+        self.description = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+    
+    async def execute(self, query, params=None):
+        self.conexion.eventos.append(query)
+    
+    async def fetchall(self):
+        return []
+
+
+class ConexionFalsa:
+    """Conexión de aiomysql que registra sentencias, commits y rollbacks."""
+    
+    def __init__(self):
+        self.eventos = []
+    
+    def cursor(self):
+        return CursorFalso(self)
+    
+    async def begin(self):
+        self.eventos.append('BEGIN')
+    
+    async def commit(self):
+        self.eventos.append('COMMIT')
+    
+    async def rollback(self):
+        self.eventos.append('ROLLBACK')
+    
+    def close(self):
+        self.eventos.append('CLOSE')
+
+
+class PoolFalso:
+    """Pool de aiomysql con una sola conexión."""
+    
+    def __init__(self):
+        self.conexion = ConexionFalsa()
+        self.prestadas = 0
+    
+    async def acquire(self):
+        self.prestadas += 1
+        return self.conexion
+    
+    def release(self, conexion):
+        self.prestadas -= 1
+
+
+@pytest.fixture
+def db_async():
+    """Fixture que proporciona una DatabaseAsync con un pool falso."""
+    db = DatabaseAsync()
+    db.pool = PoolFalso()
+    return db
+
+
+class TestDatabaseAsync:
+    """Clase de tests de las transacciones de DatabaseAsync."""
+    
+    def test_sentencia_fuera_de_transaccion_confirma(self, db_async):
+        """Test que verifica que cada sentencia suelta se confirma y devuelve la conexión."""
+        resultado = asyncio.run(db_async.execute_update("UPDATE cuentas SET estado = 'Activa'"))
+        
+        assert resultado == 1
+        assert db_async.pool.conexion.eventos == ["UPDATE cuentas SET estado = 'Activa'", 'COMMIT']
+        assert db_async.pool.prestadas == 0
+    
+    def test_transaccion_confirma_una_vez(self, db_async):
+        """Test que verifica que las sentencias de la transacción usan una conexión y un commit."""
+        async def operacion():
+            async with db_async.transaccion():
+                await db_async.execute_update("UPDATE a")
+                await db_async.execute_update("UPDATE b")
+        
+        asyncio.run(operacion())
+        
+        assert db_async.pool.conexion.eventos == ['BEGIN', 'UPDATE a', 'UPDATE b', 'COMMIT']
+        assert db_async.pool.prestadas == 0
+    
+    def test_transaccion_deshace_con_excepcion(self, db_async):
+        """Test que verifica que una excepción deshace la transacción y se propaga."""
+        async def operacion():
+            async with db_async.transaccion():
+                await db_async.execute_update("UPDATE a")
+                raise ValueError("error de la operación")
+        
+        with pytest.raises(ValueError):
+            asyncio.run(operacion())
+        
+        assert db_async.pool.conexion.eventos == ['BEGIN', 'UPDATE a', 'ROLLBACK']
+    
+    def test_sin_pool_falla(self):
+        """Test que verifica el error al usar la base sin iniciar el pool."""
+        with pytest.raises(ConnectionError):
+            asyncio.run(DatabaseAsync().fetch_all("SELECT 1"))
+
+
+class TestModeloAsync:
+    """Clase de tests de ModeloAsync contra la BD en memoria."""
+    
+    def test_crear_y_leer(self, bd_memoria):
+        """Test que verifica que un registro creado se lee con los mismos datos."""
+        cuentas = ModeloAsync(Cuenta, BDAsyncMemoria(bd_memoria))
+        datos = {'numero_cuenta': '003-100-009999-11', 'cci': '003-100-009999-11', 'id_cliente': 1,
+                 'id_producto': 1, 'saldo': 10.0, 'fecha_apertura': '2024-02-01', 'estado': 'Activa'}
+        
+        exito, mensaje, id_cuenta = asyncio.run(cuentas.crear(datos))
+        
+        assert exito, mensaje
+        exito, _, cuenta = asyncio.run(cuentas.leer(id_cuenta))
+        assert exito
+        assert cuenta['numero_cuenta'] == '003-100-009999-11'
+    
+    def test_listar_y_contar(self, bd_memoria):
+        """Test que verifica el listado filtrado y el conteo."""
+        cuentas = ModeloAsync(Cuenta, BDAsyncMemoria(bd_memoria))
+        
+        _, _, filas = asyncio.run(cuentas.listar({'id_cliente': 2}, columnas=['numero_cuenta']))
+        _, _, total = asyncio.run(cuentas.contar())
+        
+        assert [fila['numero_cuenta'] for fila in filas] == ['003-100-001002-55']
+        assert total == 4
+    
+    def test_actualizar_con_version_desactualizada(self, bd_memoria):
+        """Test que verifica el conflicto de versión igual que el modelo síncrono."""
+        clientes = ModeloAsync(Cliente, BDAsyncMemoria(bd_memoria))
+        _, _, cliente = asyncio.run(clientes.leer(1))
+        datos = {columna: valor.isoformat() if hasattr(valor, 'isoformat') else valor
+                 for columna, valor in cliente.items()}
+        
+        assert asyncio.run(clientes.actualizar(1, dict(datos, telefono='911111111')))[0]
+        exito, mensaje = asyncio.run(clientes.actualizar(1, dict(datos, telefono='922222222')))
+        
+        assert not exito
+        assert mensaje == MENSAJE_CONFLICTO
+    
+    def test_eliminar_igual_que_el_modelo_sincrono(self, bd_memoria):
+        """Test que verifica que eliminar responde como BaseModel.eliminar."""
+        db = BDAsyncMemoria(bd_memoria)
+        cuentas = ModeloAsync(Cuenta, db)
+        id_cuenta = asyncio.run(db.execute_query(
+            """INSERT INTO cuentas (numero_cuenta, cci, id_cliente, id_producto, saldo, fecha_apertura, estado)
+               VALUES ('x-1', 'x-1', 1, 1, 0, '2024-02-01', 'Activa')"""))
+        
+        assert asyncio.run(cuentas.eliminar(id_cuenta)) == (True, "Registro eliminado exitosamente")
+        assert asyncio.run(cuentas.eliminar(id_cuenta)) == Cuenta().eliminar(id_cuenta)
+        assert asyncio.run(cuentas.eliminar(id_cuenta)) == (False, "El registro no existe")
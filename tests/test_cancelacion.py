@@ -0,0 +1,198 @@
+"""
+Tests del tiempo máximo y la cancelación de consultas (database.cancelacion)
+a través de fetch_all(timeout=), listar(timeout=) y Cancelacion.cancelar, y
+de las sesiones de las tareas en segundo plano, contra la BD en memoria.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import threading
+import time
+
+import pytest
+
+from controllers.cuenta_controller import CuentaController
+from database import cancelacion as modulo_cancelacion
+from database import memoria
+from database.cancelacion import Cancelacion, ERROR_INTERRUMPIDA, ERROR_TIEMPO_AGOTADO, limitar_tiempo
+from database.instrumentacion import contar_sentencias
+from database.sesiones import cerrar_sesion, obtener_sesion, sesiones_abiertas
+
+# Cuenta hasta 50 millones: tarda varios segundos si nada la interrumpe
+CONSULTA_LENTA = """SELECT COUNT(*) AS total FROM (
+    WITH RECURSIVE serie(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM serie WHERE x < 50000000)
+    SELECT x FROM serie) numeros"""
+
+
+class RelojAdelantado:
+    """Reloj que avanza 10 s en cada lectura: toda consulta con tiempo máximo vence."""
+    
+    def __init__(self):
+        self.lecturas = 0
+    
+    def monotonic(self):
+        self.lecturas += 1
+        return time.monotonic() + 10 * self.lecturas
+
+
+@pytest.fixture
+def reloj_adelantado(monkeypatch):
+    """Fixture que hace vencer el tiempo máximo de las consultas de la BD en memoria en su primer paso."""
+    monkeypatch.setattr(memoria, 'time', RelojAdelantado())
+    monkeypatch.setattr(memoria, '_PASOS_VERIFICACION', 1)
+
+
+def en_tarea(funcion, cancelacion):
+    """
+    Ejecuta funcion(db) en un hilo con su propia sesión vinculada a la cancelación.
+
+    Returns:
+        tuple: (hilo, sesión del hilo, lista donde queda el resultado)
+    """
+    lista = threading.Event()
+    sesiones, resultado = [], []
+
+    def tarea():
+        db = obtener_sesion()
+        sesiones.append(db)
+        try:
+            with cancelacion.vincular(db):
+                lista.set()
+                resultado.append(funcion(db))
+        finally:
+            cerrar_sesion()
+
+    hilo = threading.Thread(target=tarea)
+    hilo.start()
+    lista.wait(5)
+    return hilo, sesiones[0], resultado
+
+
+def esperar_consulta(db):
+    """Espera a que la sesión tenga una sentencia en curso y el motor ya la esté ejecutando."""
+    fin = time.monotonic() + 5
+    while db.consulta_en_curso is None and time.monotonic() < fin:
+        time.sleep(0.001)
+    assert db.consulta_en_curso is not None
+    # SQLite ignora la interrupción si llega antes de que la sentencia empiece
+    time.sleep(0.1)
+
+
+class TestTiempoMaximo:
+    """Clase de tests del parámetro timeout de las lecturas."""
+    
+    def test_fetch_all_interrumpe_la_consulta_al_vencer(self, bd_memoria):
+        """Test que verifica que la consulta se interrumpe al vencer el plazo y la sesión sigue disponible."""
+        inicio = time.monotonic()
+        
+        filas = bd_memoria.fetch_all(CONSULTA_LENTA, timeout=0.05)
+        
+        assert filas == []
+        assert bd_memoria.ultimo_error.args[0] == ERROR_TIEMPO_AGOTADO
+        assert time.monotonic() - inicio < 2
+        assert len(bd_memoria.fetch_all("SELECT * FROM cuentas", timeout=5)) == 4
+        assert bd_memoria.ultimo_error is None
+    
+    def test_solo_se_limitan_los_select(self):
+        """Test que verifica que la pista MAX_EXECUTION_TIME solo se agrega a las lecturas."""
+        assert limitar_tiempo("SELECT * FROM cuentas", 1.5) == \
+            "SELECT /*+ MAX_EXECUTION_TIME(1500) */ * FROM cuentas"
+        assert limitar_tiempo("UPDATE cuentas SET estado = 'Activa'", 1) == "UPDATE cuentas SET estado = 'Activa'"
+    
+    def test_listar_informa_el_tiempo_agotado(self, bd_memoria, reloj_adelantado):
+        """Test que verifica que listar con timeout retorna el mensaje de tiempo agotado."""
+        controlador = CuentaController()
+        
+        exito, mensaje, cuentas = controlador.listar({'estado': 'Activa'}, timeout=2)
+        
+        assert not exito
+        assert cuentas == []
+        assert controlador.es_tiempo_agotado(mensaje)
+        assert '2 s' in mensaje
+    
+    def test_listar_sin_timeout_no_se_interrumpe(self, bd_memoria, reloj_adelantado):
+        """Test que verifica que sin timeout la consulta no lleva tiempo máximo."""
+        exito, mensaje, cuentas = CuentaController().listar({'estado': 'Activa'})
+        
+        assert exito, mensaje
+        assert len(cuentas) == 4
+
+
+class TestCancelacion:
+    """Clase de tests de Cancelacion."""
+    
+    def test_cancelar_interrumpe_la_consulta_en_curso(self, bd_memoria):
+        """Test que verifica que cancelar desde otro hilo interrumpe la consulta con KILL QUERY."""
+        cancelacion = Cancelacion()
+        
+        def leer(db):
+            filas = db.fetch_all(CONSULTA_LENTA, timeout=30)
+            return filas, db.ultimo_error, len(db.fetch_all("SELECT * FROM cuentas"))
+        
+        hilo, db, resultado = en_tarea(leer, cancelacion)
+        esperar_consulta(db)
+        cancelacion.cancelar()
+        hilo.join(5)
+        
+        filas, error, siguiente = resultado[0]
+        assert filas == []
+        assert error.args[0] == ERROR_INTERRUMPIDA
+        # La sentencia siguiente no se envía: la tarea quedó cancelada
+        assert siguiente == 0
+    
+    def test_listar_cancelado(self, bd_memoria):
+        """Test que verifica el mensaje de listar cuando la tarea se cancela."""
+        cancelacion = Cancelacion()
+        cancelacion.cancelar()
+        
+        hilo, _, resultado = en_tarea(lambda db: CuentaController().listar(timeout=5), cancelacion)
+        hilo.join(5)
+        
+        assert resultado[0] == (False, "Consulta cancelada", [])
+    
+    def test_sesion_cancelada_no_envia_sentencias(self, bd_memoria):
+        """Test que verifica que tras cancelar las sentencias fallan sin enviarse."""
+        cancelacion = Cancelacion()
+        
+        with cancelacion.vincular(bd_memoria):
+            cancelacion.cancelar()
+            with contar_sentencias() as registro:
+                filas = bd_memoria.fetch_all("SELECT * FROM cuentas")
+                filas_afectadas = bd_memoria.execute_update("UPDATE cuentas SET estado = 'Bloqueada'")
+        
+        assert filas == []
+        assert filas_afectadas is None
+        assert bd_memoria.ultimo_error.args[0] == ERROR_INTERRUMPIDA
+        assert registro.total == 0
+        # Al desvincularla la sesión vuelve a ejecutar sentencias
+        assert len(bd_memoria.fetch_all("SELECT * FROM cuentas")) == 4
+    
+    def test_sin_sentencia_en_curso_no_envia_kill(self, bd_memoria, monkeypatch):
+        """Test que verifica que cancelar entre sentencias no envía KILL QUERY a la conexión."""
+        enviados = []
+        monkeypatch.setattr(modulo_cancelacion, 'cancelar_consulta', lambda *args: enviados.append(args))
+        cancelacion = Cancelacion()
+        
+        with cancelacion.vincular(bd_memoria):
+            assert len(bd_memoria.fetch_all("SELECT * FROM cuentas", timeout=5)) == 4
+            cancelacion.cancelar()
+            cancelacion.cancelar()
+        
+        assert enviados == []
+        assert cancelacion.cancelada
+
+
+class TestSesionesContextoCopiado:
+    """Clase de tests de las sesiones en contextos copiados a otro hilo."""
+    
+    def test_contexto_copiado_reutiliza_la_sesion_del_hilo(self, bd_memoria):
+        """Test que verifica que cada tarea de un hilo no abre una sesión nueva."""
+        with ThreadPoolExecutor(max_workers=1) as ejecutor:
+            sesiones = [ejecutor.submit(contextvars.copy_context().run, obtener_sesion).result()
+                        for _ in range(3)]
+            abiertas = sesiones_abiertas()
+            sesiones[0].disconnect()
+        
+        assert sesiones[0] is sesiones[1] is sesiones[2]
+        assert sesiones[0] is not bd_memoria
+        # La del test y la del hilo del ejecutor
+        assert abiertas == 2
@@ -0,0 +1,143 @@
+"""
+Tests de la línea de comandos por lotes (cli.py) contra la BD en memoria.
+"""
+import csv
+import json
+
+import cli
+
+
+def correr(*lineas, atomico=False):
+    """Lee y ejecuta un lote de comandos; retorna el informe."""
+    return cli.ejecutar_comandos(cli.leer_comandos(cli.crear_parser(), lineas), atomico)
+
+
+def cuenta(db, id_cuenta):
+    return db.fetch_all("SELECT saldo, estado FROM cuentas WHERE id_cuenta = %s", (id_cuenta,))[0]
+
+
+class TestLeerComandos:
+    """Clase de tests de la lectura de comandos de un lote."""
+    
+    def test_ignora_vacias_y_comentarios(self):
+        """Test que verifica que las líneas vacías y los comentarios no son comandos."""
+        comandos = cli.leer_comandos(cli.crear_parser(), ["", "# comentario", "  estado Activa 1  "])
+        
+        assert len(comandos) == 1
+        texto, args = comandos[0]
+        assert texto == "estado Activa 1"
+        assert args.ids == [1]
+    
+    def test_errores_de_sintaxis_y_lotes_anidados(self):
+        """Test que verifica que los comandos inválidos quedan como mensaje de error."""
+        comandos = cli.leer_comandos(cli.crear_parser(), ["estado Borrada 1", "lote otro.txt", "ajustar-saldo uno 5"])
+        
+        assert all(isinstance(args, str) for _, args in comandos)
+        assert "anidados" in comandos[1][1]
+
+
+class TestLote:
+    """Clase de tests de la ejecución de lotes en una unidad de trabajo."""
+    
+    def test_fallo_deshace_solo_su_comando(self, bd_memoria):
+        """Test que verifica que cada comando corre en su SAVEPOINT."""
+        informe = correr("ajustar-saldo 1 100",
+                         "ajustar-saldo 2 -999999",
+                         "estado Suspendida 4")
+        
+        assert [resultado['exito'] for resultado in informe] == [True, False, True]
+        assert float(cuenta(bd_memoria, 1)['saldo']) == 600.50
+        assert float(cuenta(bd_memoria, 2)['saldo']) == 12000.75
+        assert cuenta(bd_memoria, 4)['estado'] == 'Suspendida'
+    
+    def test_comando_invalido_no_corta_el_lote(self, bd_memoria):
+        """Test que verifica que un comando mal escrito se informa y los demás se ejecutan."""
+        informe = correr("estado Borrada 1", "estado Suspendida 4")
+        
+        assert not informe[0]['exito']
+        assert informe[0]['mensaje'].startswith("Comando inválido")
+        assert informe[1]['exito']
+        assert cuenta(bd_memoria, 4)['estado'] == 'Suspendida'
+    
+    def test_atomico_deshace_todo(self, bd_memoria):
+        """Test que verifica que en un lote atómico un fallo deshace los comandos anteriores."""
+        informe = correr("ajustar-saldo 1 100",
+                         "ajustar-saldo 2 -999999",
+                         "estado Suspendida 4",
+                         atomico=True)
+        
+        assert not any(resultado['exito'] for resultado in informe)
+        assert "deshecho" in informe[0]['mensaje']
+        assert informe[2]['mensaje'].startswith("No ejecutado")
+        assert float(cuenta(bd_memoria, 1)['saldo']) == 500.50
+        assert cuenta(bd_memoria, 4)['estado'] == 'Activa'
+    
+    def test_atomico_exitoso(self, bd_memoria):
+        """Test que verifica que un lote atómico sin fallos se confirma completo."""
+        informe = correr("ajustar-saldo 1 100", "estado Suspendida 4", atomico=True)
+        
+        assert all(resultado['exito'] for resultado in informe)
+        assert float(cuenta(bd_memoria, 1)['saldo']) == 600.50
+        assert cuenta(bd_memoria, 4)['estado'] == 'Suspendida'
+    
+    def test_atomico_rechaza_no_transaccionales(self, bd_memoria):
+        """Test que verifica que un lote atómico con comandos no transaccionales no ejecuta nada."""
+        informe = correr("estado Suspendida 4",
+                         "masivo --filtro id_cliente=4 --estado Inactiva",
+                         atomico=True)
+        
+        assert not any(resultado['exito'] for resultado in informe)
+        assert all(resultado['mensaje'].startswith("No ejecutado") for resultado in informe)
+        assert cuenta(bd_memoria, 4)['estado'] == 'Activa'
+    
+    def test_orden_con_comandos_no_transaccionales(self, bd_memoria):
+        """Test que verifica que un comando no transaccional ve los cambios de los anteriores."""
+        informe = correr("estado Suspendida 1 2",
+                         "masivo --filtro estado=Suspendida --estado Inactiva --simular",
+                         "estado Activa 1",
+                         "masivo --filtro estado=Suspendida --estado Inactiva --simular")
+        
+        assert [resultado['comando'].split()[0] for resultado in informe] == ['estado', 'masivo', 'estado', 'masivo']
+        assert all(resultado['exito'] for resultado in informe)
+        assert informe[1]['mensaje'] == "Se cambiarían 2 cuentas"
+        assert informe[3]['mensaje'] == "Se cambiarían 1 cuentas"
+
+
+class TestMain:
+    """Clase de tests del punto de entrada."""
+    
+    def test_exportar_csv(self, bd_memoria, tmp_path, capsys):
+        """Test que verifica la exportación por lotes y el informe en JSON."""
+        archivo = tmp_path / "cuentas.csv"
+        
+        codigo = cli.main(['--json', 'exportar', 'cuentas', str(archivo), '--filtro', 'estado=Activa'])
+        
+        assert codigo == 0
+        with open(archivo, newline='', encoding='utf-8') as f:
+            filas = list(csv.DictReader(f))
+        assert len(filas) == 4
+        assert json.loads(capsys.readouterr().out)['exitosos'] == 1
+    
+    def test_exportar_usuarios_sin_password_hash(self, bd_memoria, tmp_path):
+        """Test que verifica que las columnas ocultas no se exportan."""
+        archivo = tmp_path / "usuarios.csv"
+        
+        assert cli.main(['exportar', 'usuarios', str(archivo)]) == 0
+        with open(archivo, newline='', encoding='utf-8') as f:
+            assert 'password_hash' not in next(csv.reader(f))
+    
+    def test_lote_desde_archivo_con_fallo(self, bd_memoria, tmp_path, capsys):
+        """Test que verifica que el código de salida es 1 si algún comando falló."""
+        archivo = tmp_path / "comandos.txt"
+        archivo.write_text("ajustar-saldo 1 100\najustar-saldo 99999 5\n", encoding='utf-8')
+        
+        codigo = cli.main(['lote', str(archivo)])
+        
+        assert codigo == 1
+        assert "1 exitosos, 1 fallidos" in capsys.readouterr().out
+        assert float(cuenta(bd_memoria, 1)['saldo']) == 600.50
+    
+    def test_argumentos_invalidos(self, capsys):
+        """Test que verifica que un comando inválido termina con código 2 sin ejecutar nada."""
+        assert cli.main(['estado', 'Borrada', '1']) == 2
+        assert "error" in capsys.readouterr().err
@@ -0,0 +1,111 @@
+"""
+Tests del trabajo de cuentas inactivas (trabajos.cuentas_inactivas) contra la BD en memoria.
+
+En los datos de script.sql las cuentas 1, 2 y 4 tienen transacciones de hoy
+(IDs 1 a 3) y la cuenta 3, abierta en 2023, ninguna.
+"""
+from trabajos import cuentas_inactivas
+from trabajos.cuentas_inactivas import actualizar_actividad, ejecutar, leer_marca
+
+
+def registrar_transaccion(db, id_cuenta, fecha, id_transaccion=None):
+    """Registra un abono a la cuenta, con el ID indicado o el siguiente."""
+    db.execute_update("""INSERT INTO transacciones_cuenta
+                         (id_transaccion, id_cuenta_destino, monto, fecha_transaccion, tipo_movimiento)
+                         VALUES (%s, %s, 10.00, %s, 'Abono')""", (id_transaccion, id_cuenta, fecha))
+
+
+def actividad(db):
+    filas = db.fetch_all("SELECT id_cuenta, ultima_transaccion FROM actividad_cuentas")
+    return {fila['id_cuenta']: str(fila['ultima_transaccion'])[:10] for fila in filas}
+
+
+def estado(db, id_cuenta):
+    return db.fetch_all("SELECT estado FROM cuentas WHERE id_cuenta = %s", (id_cuenta,))[0]['estado']
+
+
+class TestActividad:
+    """Clase de tests de la actualización incremental de actividad_cuentas."""
+    
+    def test_procesa_por_lotes_y_avanza_la_marca(self, bd_memoria):
+        """Test que verifica que todas las transacciones se procesan y la marca queda en la última."""
+        exito, mensaje, nuevas = actualizar_actividad(bd_memoria, tamano_lote=2)
+        
+        assert exito, mensaje
+        assert nuevas == 3
+        assert leer_marca(bd_memoria) == 3
+        assert set(actividad(bd_memoria)) == {1, 2, 4}
+        
+        assert actualizar_actividad(bd_memoria)[2] == 0
+    
+    def test_se_queda_con_la_fecha_mas_reciente(self, bd_memoria):
+        """Test que verifica que volver a leer una transacción antigua no retrocede la actividad."""
+        registrar_transaccion(bd_memoria, 3, '2024-06-01 10:00:00')
+        registrar_transaccion(bd_memoria, 3, '2024-03-01 10:00:00')
+        
+        actualizar_actividad(bd_memoria, tamano_lote=1)
+        actualizar_actividad(bd_memoria, tamano_lote=1)
+        
+        assert actividad(bd_memoria)[3] == '2024-06-01'
+    
+    def test_solapamiento_recoge_transacciones_confirmadas_tarde(self, bd_memoria):
+        """Test que verifica que una transacción con ID menor que la marca, confirmada después, se procesa."""
+        actualizar_actividad(bd_memoria)
+        registrar_transaccion(bd_memoria, 1, '2025-01-01 10:00:00', id_transaccion=5)
+        actualizar_actividad(bd_memoria)
+        assert leer_marca(bd_memoria) == 5
+        
+        # La transacción 4 se confirma después de procesar la 5
+        registrar_transaccion(bd_memoria, 3, '2025-01-02 10:00:00', id_transaccion=4)
+        exito, _, nuevas = actualizar_actividad(bd_memoria)
+        
+        assert exito
+        assert nuevas == 0
+        assert leer_marca(bd_memoria) == 5
+        assert actividad(bd_memoria)[3] == '2025-01-02'
+    
+    def test_sin_solapamiento_se_perderia(self, bd_memoria, monkeypatch):
+        """Test que verifica que sin releer antes de la marca la transacción confirmada tarde se omite."""
+        monkeypatch.setattr(cuentas_inactivas, 'SOLAPAMIENTO', 0)
+        actualizar_actividad(bd_memoria)
+        registrar_transaccion(bd_memoria, 1, '2025-01-01 10:00:00', id_transaccion=5)
+        actualizar_actividad(bd_memoria)
+        
+        registrar_transaccion(bd_memoria, 3, '2025-01-02 10:00:00', id_transaccion=4)
+        actualizar_actividad(bd_memoria)
+        
+        assert 3 not in actividad(bd_memoria)
+
+
+class TestEjecutar:
+    """Clase de tests del trabajo completo."""
+    
+    def test_simular_no_avanza_la_marca(self, bd_memoria):
+        """Test que verifica que al simular no cambia ninguna cuenta ni la marca, y el conteo coincide."""
+        exito, mensaje = ejecutar(365, simulacion=True)
+        
+        assert exito, mensaje
+        assert mensaje == "3 transacciones nuevas procesadas; Se cambiarían 1 cuentas"
+        assert leer_marca(bd_memoria) == 0
+        assert bd_memoria.fetch_all("SELECT * FROM marcas_trabajos") == []
+        assert estado(bd_memoria, 3) == 'Activa'
+        
+        exito, mensaje = ejecutar(365)
+        
+        assert exito, mensaje
+        assert mensaje == "3 transacciones nuevas procesadas; 1 cuentas actualizadas"
+        assert leer_marca(bd_memoria) == 3
+        assert [estado(bd_memoria, id_cuenta) for id_cuenta in (1, 2, 3, 4)] == \
+            ['Activa', 'Activa', 'Inactiva', 'Activa']
+    
+    def test_simular_cuenta_movimientos_nuevos(self, bd_memoria):
+        """Test que verifica que la simulación tiene en cuenta las transacciones posteriores a la marca."""
+        ejecutar(365)
+        bd_memoria.execute_update("UPDATE cuentas SET estado = 'Activa' WHERE id_cuenta = 3")
+        registrar_transaccion(bd_memoria, 3, '2099-01-01 10:00:00')
+        
+        exito, mensaje = ejecutar(365, simulacion=True)
+        
+        assert exito, mensaje
+        assert mensaje == "1 transacciones nuevas procesadas; Se cambiarían 0 cuentas"
+        assert leer_marca(bd_memoria) == 3
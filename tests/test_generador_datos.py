@@ -0,0 +1,148 @@
+"""
+Tests del generador de datos sintéticos (utils.generador_datos).
+"""
+import csv
+import os
+from collections import Counter, defaultdict
+from datetime import date
+
+import pytest
+
+from database.memoria import dividir_script
+from utils import generador_datos as generador
+from utils.validators import validar_email, validar_numero_cuenta, validar_cci
+
+
+def tarea(salida, formato='sql', semilla=2024, id_desde=1000, id_hasta=1200):
+    return {
+        'numero': 0,
+        'id_desde': id_desde,
+        'id_hasta': id_hasta,
+        'semilla': semilla,
+        'salida': str(salida),
+        'formato': formato,
+        'filas_por_insert': 50,
+        'movimientos_promedio': 8,
+        'fecha_referencia': date(2024, 6, 30)
+    }
+
+
+def leer(ruta):
+    with open(ruta, encoding='utf-8') as archivo:
+        return archivo.read()
+
+
+class TestBloque:
+    """Clase de tests de la generación de un bloque de clientes."""
+    
+    def test_misma_semilla_mismo_resultado(self, tmp_path):
+        """Test que verifica que el resultado solo depende de la semilla."""
+        for nombre, semilla in (('a', 7), ('b', 7), ('c', 8)):
+            os.makedirs(tmp_path / nombre)
+            generador.generar_bloque(tarea(tmp_path / nombre, semilla=semilla))
+        
+        for tabla in ('clientes', 'cuentas', 'historial_saldos'):
+            archivo = f"{tabla}.00000.sql"
+            assert leer(tmp_path / 'a' / archivo) == leer(tmp_path / 'b' / archivo)
+        assert leer(tmp_path / 'a' / 'cuentas.00000.sql') != leer(tmp_path / 'c' / 'cuentas.00000.sql')
+    
+    def test_carga_con_integridad_referencial(self, bd_memoria, tmp_path):
+        """Test que verifica que los INSERT generados se cargan y sus referencias existen."""
+        conteos = generador.generar_bloque(tarea(tmp_path))
+        
+        cursor = bd_memoria.connection.cursor()
+        for tabla in generador.TABLAS:
+            for sentencia in dividir_script(leer(tmp_path / f"{tabla}.00000.sql")):
+                cursor.execute(sentencia)
+        bd_memoria.connection.commit()
+        
+        def total(consulta):
+            return bd_memoria.fetch_all(consulta)[0]['total']
+        
+        assert total("SELECT COUNT(*) AS total FROM clientes WHERE id_cliente >= 1000") == 200
+        assert total("SELECT COUNT(*) AS total FROM cuentas WHERE id_cliente >= 1000") == conteos['cuentas']
+        
+        # Filas generadas (IDs desde 1000) cuya referencia no existe
+        huerfanas = {
+            'cuentas': "SELECT COUNT(*) AS total FROM cuentas c LEFT JOIN clientes cl ON cl.id_cliente = c.id_cliente "
+                       "WHERE c.id_cuenta >= 4000 AND cl.id_cliente IS NULL",
+            'tarjetas': "SELECT COUNT(*) AS total FROM tarjetas t LEFT JOIN cuentas c ON c.id_cuenta = t.id_cuenta "
+                        "LEFT JOIN lineas_credito l ON l.id_linea = t.id_linea "
+                        "WHERE t.id_tarjeta >= 8000 AND c.id_cuenta IS NULL AND l.id_linea IS NULL",
+            'usuarios': "SELECT COUNT(*) AS total FROM usuarios u LEFT JOIN clientes cl ON cl.id_cliente = u.id_cliente "
+                        "WHERE u.id_usuario >= 1000 AND cl.id_cliente IS NULL",
+            'historial_saldos': "SELECT COUNT(*) AS total FROM historial_saldos h "
+                                "LEFT JOIN cuentas c ON c.id_cuenta = h.id_cuenta "
+                                "WHERE h.id_cuenta >= 4000 AND c.id_cuenta IS NULL"
+        }
+        for tabla, consulta in huerfanas.items():
+            assert total(consulta) == 0, tabla
+    
+    def test_historial_termina_en_el_saldo_de_la_cuenta(self, bd_memoria, tmp_path):
+        """Test que verifica que el historial de cada cuenta encadena saldos hasta el saldo actual."""
+        generador.generar_bloque(tarea(tmp_path))
+        cursor = bd_memoria.connection.cursor()
+        for tabla in ('clientes', 'cuentas', 'historial_saldos'):
+            for sentencia in dividir_script(leer(tmp_path / f"{tabla}.00000.sql")):
+                cursor.execute(sentencia)
+        bd_memoria.connection.commit()
+        
+        cadenas = defaultdict(list)
+        for fila in bd_memoria.fetch_all("SELECT id_cuenta, saldo_anterior, saldo_nuevo FROM historial_saldos "
+                                         "WHERE id_cuenta >= 4000 ORDER BY id_historial"):
+            cadenas[fila['id_cuenta']].append(fila)
+        saldos = {fila['id_cuenta']: fila['saldo']
+                  for fila in bd_memoria.fetch_all("SELECT id_cuenta, saldo FROM cuentas WHERE id_cuenta >= 4000")}
+        
+        assert cadenas
+        for id_cuenta, cambios in cadenas.items():
+            for anterior, siguiente in zip(cambios, cambios[1:]):
+                assert siguiente['saldo_anterior'] == anterior['saldo_nuevo']
+            assert cambios[-1]['saldo_nuevo'] == saldos[id_cuenta]
+    
+    def test_formatos_validos_y_distribucion_sesgada(self, tmp_path):
+        """Test que verifica los formatos de la aplicación y que pocos clientes concentran movimientos."""
+        generador.generar_bloque(tarea(tmp_path, formato='csv', id_hasta=1500))
+        
+        with open(tmp_path / 'clientes.00000.csv', newline='', encoding='utf-8') as archivo:
+            assert all(validar_email(fila['email'])[0] for fila in csv.DictReader(archivo))
+        with open(tmp_path / 'cuentas.00000.csv', newline='', encoding='utf-8') as archivo:
+            cuentas = list(csv.DictReader(archivo))
+        assert all(validar_numero_cuenta(c['numero_cuenta'])[0] and validar_cci(c['cci'])[0] for c in cuentas)
+        assert len({c['numero_cuenta'] for c in cuentas}) == len(cuentas)
+        
+        with open(tmp_path / 'transacciones_cuenta.00000.csv', newline='', encoding='utf-8') as archivo:
+            por_cuenta = Counter(fila['id_cuenta_origen'] for fila in csv.DictReader(archivo))
+        movimientos = sorted(por_cuenta.values(), reverse=True)
+        decimo = max(len(cuentas) // 10, 1)
+        assert sum(movimientos[:decimo]) > 0.3 * sum(movimientos)
+
+
+class TestGenerar:
+    """Clase de tests de la generación completa en paralelo."""
+    
+    def test_bloques_y_script_de_carga(self, tmp_path):
+        """Test que verifica los archivos por bloque, los totales y el orden de cargar.sql."""
+        totales = generador.generar(25, str(tmp_path), formato='csv', procesos=2, tamano_bloque=10,
+                                    id_inicial=5000, movimientos_promedio=2)
+        
+        script = leer(tmp_path / 'cargar.sql').splitlines()[1:]
+        assert len(script) == len(generador.TABLAS) * 3
+        assert [linea.split(' INTO TABLE ')[1].split()[0] for linea in script[::3]] == list(generador.TABLAS)
+        
+        for tabla, columnas in generador.TABLAS.items():
+            filas = 0
+            for numero in range(3):
+                with open(tmp_path / f"{tabla}.{numero:05d}.csv", newline='', encoding='utf-8') as archivo:
+                    lector = csv.reader(archivo)
+                    assert tuple(next(lector)) == columnas
+                    filas += sum(1 for _ in lector)
+            assert filas == totales[tabla], tabla
+        assert totales['clientes'] == 25
+    
+    def test_rechaza_datos_invalidos(self, tmp_path, monkeypatch):
+        """Test que verifica que un formato inválido detiene la generación."""
+        monkeypatch.setattr(generador, 'DOMINIOS', ('sin-punto',))
+        
+        with pytest.raises(ValueError):
+            generador.generar_bloque(tarea(tmp_path))
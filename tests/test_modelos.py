@@ -0,0 +1,346 @@
+"""
+Tests de los modelos y controladores contra la BD en memoria (database.memoria).
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from controllers.cliente_controller import ClienteController
+from controllers.cuenta_controller import CuentaController
+from models.base_model import MENSAJE_CONFLICTO
+from models.catalogo import Banco, Departamento
+from models.historial_saldo import HistorialSaldo
+from models.resumen_saldo import ResumenSaldo
+
+
+class TestClientes:
+    """Clase de tests de creación, lectura y actualización de clientes."""
+    
+    def datos_cliente(self, **cambios):
+        datos = {
+            'nombre': 'Rosa',
+            'apellido_paterno': 'Quispe',
+            'apellido_materno': 'Huamán',
+            'id_tipo_documento': 1,
+            'numero_documento': '41234567',
+            'email': 'rosa.quispe@email.com',
+            'telefono': '987111222',
+            'fecha_nacimiento': '1992-06-30',
+            'id_categoria': 1,
+            'id_agencia_apertura': 1
+        }
+        datos.update(cambios)
+        return datos
+    
+    def test_crear_y_leer_cliente(self, bd_memoria):
+        """Test que verifica que un cliente creado se lee con los mismos datos."""
+        controlador = ClienteController()
+        
+        exito, mensaje, id_cliente = controlador.crear_cliente(self.datos_cliente())
+        
+        assert exito, mensaje
+        exito, _, cliente = controlador.leer(id_cliente)
+        assert exito
+        assert cliente['numero_documento'] == '41234567'
+        assert cliente['email'] == 'rosa.quispe@email.com'
+    
+    def test_crear_cliente_documento_repetido(self, bd_memoria):
+        """Test que verifica que no se crean dos clientes con el mismo documento."""
+        controlador = ClienteController()
+        
+        exito, mensaje, id_cliente = controlador.crear_cliente(self.datos_cliente(numero_documento='47896541'))
+        
+        assert not exito
+        assert id_cliente is None
+        assert 'documento' in mensaje
+    
+    def test_actualizar_cliente(self, bd_memoria):
+        """Test que verifica que la actualización se guarda."""
+        controlador = ClienteController()
+        _, _, id_cliente = controlador.crear_cliente(self.datos_cliente())
+        
+        exito, mensaje = controlador.actualizar_cliente(id_cliente, self.datos_cliente(telefono='900000001'))
+        
+        assert exito, mensaje
+        assert controlador.leer(id_cliente)[2]['telefono'] == '900000001'
+    
+    def test_actualizar_cliente_con_version_desactualizada(self, bd_memoria):
+        """Test que verifica que una versión ya modificada por otro retorna conflicto."""
+        controlador = ClienteController()
+        _, _, id_cliente = controlador.crear_cliente(self.datos_cliente())
+        version = controlador.leer(id_cliente)[2]['version']
+        controlador.actualizar_cliente(id_cliente, self.datos_cliente(telefono='900000001', version=version))
+        
+        exito, mensaje = controlador.actualizar_cliente(
+            id_cliente, self.datos_cliente(telefono='900000002', version=version))
+        
+        assert not exito
+        assert mensaje == MENSAJE_CONFLICTO
+        assert controlador.es_conflicto(mensaje)
+
+
+class TestCuentas:
+    """Clase de tests de cuentas."""
+    
+    def test_crear_cuenta(self, bd_memoria):
+        """Test que verifica la creación de una cuenta de un cliente existente."""
+        controlador = CuentaController()
+        numero = controlador.generar_numero_cuenta()
+        
+        exito, mensaje, id_cuenta = controlador.crear_cuenta({
+            'numero_cuenta': numero,
+            'cci': numero,
+            'id_cliente': 1,
+            'id_producto': 1,
+            'saldo': 250.00,
+            'fecha_apertura': '2024-02-01',
+            'estado': 'Activa'
+        })
+        
+        assert exito, mensaje
+        exito, _, cuenta = controlador.buscar_cuenta_por_numero(numero)
+        assert exito
+        assert cuenta['id_cuenta'] == id_cuenta
+        assert cuenta['saldo'] == 250.00
+    
+    def test_listar_cuentas_con_filtro(self, bd_memoria):
+        """Test que verifica el listado filtrado y el conteo."""
+        controlador = CuentaController()
+        
+        exito, _, cuentas = controlador.listar({'id_cliente': 2})
+        
+        assert exito
+        assert [cuenta['numero_cuenta'] for cuenta in cuentas] == ['003-100-001002-55']
+        assert controlador.obtener_conteo()[2] == 4
+    
+    def test_actualizar_saldo(self, bd_memoria):
+        """Test que verifica que el saldo actualizado se guarda con dos decimales."""
+        controlador = CuentaController()
+        
+        exito, mensaje = controlador.actualizar_saldo(1, 1234.56)
+        
+        assert exito, mensaje
+        saldo = bd_memoria.fetch_all("SELECT saldo FROM cuentas WHERE id_cuenta = 1")[0]['saldo']
+        assert saldo == Decimal('1234.56')
+
+
+class TestSincronizarCatalogo:
+    """Clase de tests de la sincronización masiva de catálogos."""
+    
+    def fuente(self):
+        _, _, filas = Departamento().listar()
+        return [{'id_departamento': fila['id_departamento'], 'nombre': fila['nombre']} for fila in filas]
+    
+    def test_sincronizar_sin_cambios(self, bd_memoria):
+        """Test que verifica que una fuente idéntica no cuenta actualizaciones."""
+        exito, _, conteos = Departamento().sincronizar(self.fuente())
+        
+        assert exito
+        assert conteos == {'insertados': 0, 'actualizados': 0, 'eliminados': 0}
+    
+    def test_sincronizar_cuenta_insertados_y_actualizados(self, bd_memoria):
+        """Test que verifica los conteos con una fila nueva y una modificada."""
+        fuente = self.fuente()
+        fuente[0]['nombre'] = 'Departamento modificado'
+        fuente.append({'id_departamento': 99, 'nombre': 'Departamento nuevo'})
+        
+        exito, _, conteos = Departamento().sincronizar(fuente)
+        
+        assert exito
+        assert conteos == {'insertados': 1, 'actualizados': 1, 'eliminados': 0}
+        assert Departamento().leer(99)[2]['nombre'] == 'Departamento nuevo'
+        
+        # Repetir la misma fuente no cambia nada
+        assert Departamento().sincronizar(fuente)[2]['actualizados'] == 0
+    
+    def test_sincronizar_eliminar_faltantes(self, bd_memoria):
+        """Test que verifica que se eliminan los registros que no están en la fuente."""
+        fuente = self.fuente()
+        Departamento().sincronizar(fuente + [{'id_departamento': 99, 'nombre': 'Departamento nuevo'}])
+        
+        exito, _, conteos = Departamento().sincronizar(fuente, eliminar_faltantes=True)
+        
+        assert exito
+        assert conteos == {'insertados': 0, 'actualizados': 0, 'eliminados': 1}
+        assert not Departamento().leer(99)[0]
+    
+    def test_sincronizar_por_columna_unica_normaliza_la_clave(self, bd_memoria):
+        """Test que verifica que una clave con espacios coincide con la guardada."""
+        fuente = [
+            {'codigo_banco': ' 002 ', 'nombre_banco': 'Banco de Crédito del Perú'},
+            {'codigo_banco': '003', 'nombre_banco': 'Interbank'},
+            {'codigo_banco': ' 011', 'nombre_banco': 'BBVA'}
+        ]
+        
+        exito, mensaje, conteos = Banco().sincronizar(fuente, clave='codigo_banco')
+        
+        assert exito, mensaje
+        assert conteos == {'insertados': 0, 'actualizados': 1, 'eliminados': 0}
+        _, _, bancos = Banco().listar()
+        assert sorted(banco['codigo_banco'] for banco in bancos) == ['002', '003', '011']
+
+
+class TestSaldos:
+    """Clase de tests de los saldos a una fecha y de las estadísticas de cuentas."""
+    
+    def registrar_cambios(self, db):
+        """Cambios de saldo de las cuentas 1 a 3 entre el 10 y el 20 de enero de 2024."""
+        cambios = [
+            (1, 500.50, 600.00, datetime(2024, 1, 10, 9)),
+            (1, 600.00, 650.00, datetime(2024, 1, 12, 15)),
+            (2, 12000.75, 11000.00, datetime(2024, 1, 11, 10)),
+            (3, 50000.00, 48000.00, datetime(2024, 1, 20, 8))
+        ]
+        for cambio in cambios:
+            db.execute_update("""INSERT INTO historial_saldos (id_cuenta, saldo_anterior, saldo_nuevo, fecha_cambio)
+                                 VALUES (%s, %s, %s, %s)""", cambio)
+    
+    def test_saldos_al_por_lotes(self, bd_memoria):
+        """Test que verifica los saldos de todas las cuentas leyendo de a dos cuentas."""
+        self.registrar_cambios(bd_memoria)
+        historial = HistorialSaldo()
+        
+        exito, _, saldos = historial.saldos_al('2024-01-11', tamano_lote=2)
+        
+        assert exito
+        assert saldos == {1: 600.00, 2: 11000.00, 3: 50000.00, 4: 850.20}
+        for id_cuenta, saldo in saldos.items():
+            assert historial.saldo_al(id_cuenta, '2024-01-11')[2] == saldo
+    
+    def test_saldos_al_desde_cierre_guardado(self, bd_memoria):
+        """Test que verifica que el cálculo parte del cierre guardado."""
+        self.registrar_cambios(bd_memoria)
+        historial = HistorialSaldo()
+        historial.saldos_al('2024-01-11', guardar=True)
+        
+        _, mensaje, _ = historial.saldos_al('2024-01-11')
+        assert mensaje == "Cierre del 2024-01-11 ya calculado"
+        
+        exito, _, saldos = historial.saldos_al('2024-01-31', tamano_lote=3)
+        assert exito
+        assert saldos == {1: 650.00, 2: 11000.00, 3: 48000.00, 4: 850.20}
+    
+    def test_estadisticas_sobre_la_tabla_por_defecto(self, bd_memoria):
+        """Test que verifica que las estadísticas usan el resumen solo si se pide."""
+        ayer = date.today() - timedelta(days=1)
+        assert ResumenSaldo().materializar(ayer)[0]
+        bd_memoria.execute_update("UPDATE cuentas SET estado = 'Cerrada' WHERE id_cuenta = 4")
+        controlador = CuentaController()
+        
+        _, _, actuales = controlador.obtener_estadisticas_cuentas()
+        _, _, del_resumen = controlador.obtener_estadisticas_cuentas(usar_resumen=True)
+        
+        assert 'fecha_resumen' not in actuales
+        assert actuales['cuentas_por_estado']['Cerrada'] == 1
+        assert del_resumen['fecha_resumen'] == ayer.isoformat()
+        assert del_resumen['cuentas_por_estado']['Cerrada'] == 0
+    
+    def test_estadisticas_ignoran_resumen_antiguo(self, bd_memoria):
+        """Test que verifica que un resumen anterior a ayer no se usa."""
+        assert ResumenSaldo().materializar(date.today() - timedelta(days=3))[0]
+        
+        _, _, estadisticas = CuentaController().obtener_estadisticas_cuentas(usar_resumen=True)
+        
+        assert 'fecha_resumen' not in estadisticas
+
+
+class TestCambioMasivo:
+    """Clase de tests del cambio masivo de cuentas."""
+    
+    def crear_cuentas(self, estados, id_cliente=1):
+        """Crea cuentas del cliente con los estados indicados."""
+        controlador = CuentaController()
+        for estado in estados:
+            numero = controlador.generar_numero_cuenta()
+            exito, mensaje, _ = controlador.crear_cuenta({
+                'numero_cuenta': numero,
+                'cci': numero,
+                'id_cliente': id_cliente,
+                'id_producto': 1,
+                'saldo': 100.00,
+                'fecha_apertura': '2024-02-01',
+                'estado': estado
+            })
+            assert exito, mensaje
+    
+    def contar(self, db, query, params=()):
+        return db.fetch_all(f"SELECT COUNT(*) AS total FROM {query}", params)[0]['total']
+    
+    def test_simulacion_cuenta_lo_que_se_aplica(self, bd_memoria):
+        """Test que verifica que la simulación no cambia nada y cuenta las mismas cuentas que luego se cambian."""
+        self.crear_cuentas(['Activa'] * 5 + ['Inactiva'] * 2)
+        controlador = CuentaController()
+        filtros, cambios = {'id_cliente': 1}, {'estado': 'Inactiva'}
+        
+        exito, mensaje, simuladas = controlador.actualizar_masivo(filtros, cambios, simulacion=True)
+        
+        assert exito
+        assert simuladas == 6
+        assert mensaje == "Se cambiarían 6 cuentas"
+        assert self.contar(bd_memoria, "cuentas WHERE id_cliente = 1 AND estado = 'Activa'") == 6
+        assert self.contar(bd_memoria, "historial_cuentas") == 0
+        
+        exito, mensaje, cambiadas = controlador.actualizar_masivo(filtros, cambios)
+        
+        assert exito, mensaje
+        assert cambiadas == simuladas
+        assert mensaje == f"{simuladas} cuentas actualizadas"
+        assert self.contar(bd_memoria, "cuentas WHERE id_cliente = 1 AND estado = 'Inactiva'") == 8
+        assert self.contar(bd_memoria, "cuentas WHERE id_cliente <> 1 AND estado = 'Activa'") == 3
+        assert self.contar(bd_memoria, "historial_cuentas WHERE campo = 'estado' AND valor_anterior = 'Activa' "
+                                       "AND valor_nuevo = 'Inactiva'") == simuladas
+    
+    def test_repetir_no_cambia_nada(self, bd_memoria):
+        """Test que verifica que repetir el cambio solo toca las cuentas que aún no tienen el valor nuevo."""
+        controlador = CuentaController()
+        filtros, cambios = {'id_producto': 1}, {'estado': 'Suspendida'}
+        controlador.actualizar_masivo(filtros, cambios)
+        
+        assert controlador.actualizar_masivo(filtros, cambios, simulacion=True)[2] == 0
+        assert controlador.actualizar_masivo(filtros, cambios)[2] == 0
+        assert self.contar(bd_memoria, "historial_cuentas") == 2
+    
+    def test_por_lotes(self, bd_memoria, monkeypatch):
+        """Test que verifica que cada lote es un UPDATE aparte y el total coincide con la simulación."""
+        self.crear_cuentas(['Activa'] * 6)
+        modelo = CuentaController().modelo
+        actualizaciones = []
+        execute_update = bd_memoria.execute_update
+        
+        def contar_actualizaciones(query, params=None):
+            filas = execute_update(query, params)
+            if query.lstrip().startswith('UPDATE cuentas'):
+                actualizaciones.append(filas)
+            return filas
+        
+        monkeypatch.setattr(bd_memoria, 'execute_update', contar_actualizaciones)
+        filtros, cambios = {'id_cliente': 1}, {'id_producto': 2, 'estado': 'Cerrada'}
+        simuladas = modelo.actualizar_masivo(filtros, cambios, simulacion=True)[2]
+        
+        exito, mensaje, cambiadas = modelo.actualizar_masivo(filtros, cambios, tamano_lote=3)
+        
+        assert exito, mensaje
+        assert simuladas == cambiadas == 7
+        assert actualizaciones == [3, 3, 1]
+        assert self.contar(bd_memoria, "cuentas WHERE id_cliente = 1 AND id_producto = 2 AND estado = 'Cerrada'") == 7
+        assert self.contar(bd_memoria, "historial_cuentas") == 14
+    
+    def test_validaciones(self, bd_memoria):
+        """Test que verifica que los cambios masivos inválidos no tocan ninguna cuenta."""
+        controlador = CuentaController()
+        
+        casos = [
+            ({}, {'estado': 'Inactiva'}, "al menos un filtro"),
+            ({'saldo': 0}, {'estado': 'Inactiva'}, "Filtros no permitidos: saldo"),
+            ({'id_cliente': 1}, {}, "Indique el nuevo estado"),
+            ({'id_cliente': 1}, {'saldo': 0}, "Campos no permitidos en un cambio masivo: saldo"),
+            ({'id_cliente': 1}, {'estado': 'Congelada'}, "El estado debe ser"),
+            ({'id_cliente': 1}, {'id_producto': 'uno'}, "El producto debe ser un ID numérico"),
+            ({'id_cliente': 1}, {'id_cliente': 999}, "El cliente 999 no existe")
+        ]
+        for filtros, cambios, mensaje_esperado in casos:
+            exito, mensaje, cambiadas = controlador.actualizar_masivo(filtros, cambios)
+            assert not exito
+            assert mensaje_esperado in mensaje
+            assert cambiadas == 0
+        
+        assert self.contar(bd_memoria, "cuentas WHERE estado = 'Activa'") == 4
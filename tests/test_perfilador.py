@@ -0,0 +1,111 @@
+"""
+Tests del perfilador por muestreo (utils.perfilador).
+"""
+import threading
+import time
+from collections import Counter
+
+from utils import perfilador as modulo_perfilador
+from utils.perfilador import PerfiladorMuestreo, perfilar_sesion
+
+
+def trabajo_ocupado(segundos):
+    """Consume CPU durante los segundos indicados."""
+    fin = time.perf_counter() + segundos
+    while time.perf_counter() < fin:
+        sum(range(100))
+
+
+def perfilar_trabajo(perfilador, segundos=0.2):
+    """Perfila un hilo que ejecuta trabajo_ocupado."""
+    hilo = threading.Thread(target=trabajo_ocupado, args=(segundos,), name='ocupado')
+    perfilador.iniciar()
+    hilo.start()
+    hilo.join()
+    perfilador.detener()
+
+
+class TestMuestreo:
+    """Clase de tests de la toma de muestras."""
+    
+    def test_muestrea_los_hilos_en_ejecucion(self):
+        """Test que verifica que las pilas del hilo ocupado aparecen con su nombre y función."""
+        perfilador = PerfiladorMuestreo(intervalo=0.002)
+        
+        perfilar_trabajo(perfilador)
+        
+        assert perfilador.total > 0
+        assert perfilador.duracion > 0
+        pilas = [pila for pila in perfilador.muestras if pila[0] == 'ocupado']
+        assert pilas
+        assert any('test_perfilador.py:trabajo_ocupado' in pila for pila in pilas)
+    
+    def test_no_se_muestrea_a_si_mismo(self):
+        """Test que verifica que el hilo de muestreo no aparece en las pilas."""
+        perfilador = PerfiladorMuestreo(intervalo=0.002)
+        
+        perfilar_trabajo(perfilador, 0.05)
+        
+        assert all(pila[0] != 'perfilador' for pila in perfilador.muestras)
+        assert not modulo_perfilador._hilos_muestreo
+    
+    def test_iniciar_y_detener_son_idempotentes(self):
+        """Test que verifica que iniciar dos veces no crea otro hilo y detener sin iniciar no falla."""
+        perfilador = PerfiladorMuestreo(intervalo=0.002)
+        perfilador.detener()
+        
+        perfilador.iniciar()
+        hilo = perfilador._hilo
+        perfilador.iniciar()
+        assert perfilador._hilo is hilo
+        perfilador.detener()
+        perfilador.detener()
+        
+        assert not perfilador.activo
+
+
+class TestResultados:
+    """Clase de tests de la lista de funciones y los archivos."""
+    
+    def test_lista_caliente(self):
+        """Test que verifica las muestras propias y totales (una recursión cuenta una vez)."""
+        perfilador = PerfiladorMuestreo()
+        perfilador.muestras = Counter({
+            ('hilo', 'a', 'b'): 3,
+            ('hilo', 'a', 'b', 'b'): 2,
+            ('hilo', 'a'): 1
+        })
+        
+        lista = perfilador.lista_caliente()
+        
+        assert lista == [('b', 5, 5), ('a', 1, 6)]
+    
+    def test_guardar(self, tmp_path):
+        """Test que verifica el formato de las pilas colapsadas y la lista de funciones."""
+        perfilador = PerfiladorMuestreo()
+        perfilador.muestras = Counter({('hilo', 'a', 'b'): 3, ('hilo', 'a'): 1})
+        perfilador.total = 4
+        
+        ruta_folded, ruta_txt = perfilador.guardar(str(tmp_path / 'sub' / 'perfil'))
+        
+        with open(ruta_folded, encoding='utf-8') as archivo:
+            assert archivo.read().splitlines() == ['hilo;a 1', 'hilo;a;b 3']
+        with open(ruta_txt, encoding='utf-8') as archivo:
+            lineas = archivo.read().splitlines()
+        assert '4 muestreos' in lineas[0]
+        assert lineas[3].split() == ['3', '75.0', '3', '75.0', 'b']
+    
+    def test_perfilar_sesion_guarda_al_salir(self, tmp_path, monkeypatch):
+        """Test que verifica que el perfil de sesión se guarda en la función registrada para la salida."""
+        registradas = []
+        monkeypatch.setattr(modulo_perfilador.atexit, 'register', registradas.append)
+        prefijo = str(tmp_path / 'sesion')
+        
+        perfilador = perfilar_sesion(prefijo, intervalo=0.002)
+        assert perfilador.activo
+        trabajo_ocupado(0.05)
+        registradas[0]()
+        
+        assert not perfilador.activo
+        assert (tmp_path / 'sesion.folded').read_text(encoding='utf-8')
+        assert (tmp_path / 'sesion.txt').exists()
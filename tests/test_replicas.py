@@ -0,0 +1,228 @@
+"""
+Tests de las réplicas de lectura (database.replicas y Database) contra la BD en memoria.
+
+Las "réplicas" son otras conexiones a la misma BD en memoria: cada sentencia
+se anota con la conexión que la ejecutó para saber a qué servidor fue.
+"""
+import time
+
+import pymysql
+import pytest
+
+from database import memoria
+from database.connection import Database
+from database.replicas import REPLICAS, ConjuntoReplicas, Replica, es_lectura_replicable
+from database.unidad_trabajo import unidad_de_trabajo
+
+CONSULTA = "SELECT id_cuenta FROM cuentas WHERE id_cuenta = 1"
+
+
+class Servidores:
+    """Sentencias ejecutadas por conexión y error a inyectar en las consultas de prueba de las réplicas."""
+    
+    def __init__(self):
+        self.sentencias = []
+        self.error_replica = None
+    
+    def conexiones_de(self, texto):
+        return [conexion for conexion, sql in self.sentencias if texto in sql]
+
+
+@pytest.fixture
+def servidores(bd_memoria, monkeypatch):
+    """Fixture que configura dos réplicas sobre la BD en memoria y anota dónde se ejecuta cada sentencia."""
+    servidores = Servidores()
+    execute = memoria.CursorMemoria.execute
+
+    def execute_anotado(cursor, query, args=None):
+        servidores.sentencias.append((cursor.conexion, query))
+        if servidores.error_replica is not None and getattr(cursor.conexion, 'es_replica', False) \
+                and CONSULTA in query:
+            raise servidores.error_replica
+        return execute(cursor, query, args)
+
+    conectar = Replica.conectar
+
+    def conectar_replica(replica):
+        conexion = conectar(replica)
+        conexion.es_replica = True
+        return conexion
+
+    monkeypatch.setattr(memoria.CursorMemoria, 'execute', execute_anotado)
+    monkeypatch.setattr(Replica, 'conectar', conectar_replica)
+    monkeypatch.setattr(REPLICAS, 'replicas', [Replica('mysql_replica_1', {}), Replica('mysql_replica_2', {})])
+    monkeypatch.setattr(REPLICAS, 'retraso_maximo', 5)
+    monkeypatch.setattr(REPLICAS, '_proxima_verificacion', 0.0)
+    return servidores
+
+
+@pytest.fixture
+def db(servidores):
+    """Fixture que retorna una sesión conectada a la primaria."""
+    db = Database()
+    db.connect()
+    yield db
+    db.disconnect()
+
+
+def servidor_de(db, servidores, texto=CONSULTA):
+    """'replica' o 'primaria' según la conexión que ejecutó la última sentencia con el texto."""
+    conexion = servidores.conexiones_de(texto)[-1]
+    if conexion is db.connection:
+        return 'primaria'
+    assert conexion is db.conexion_lectura
+    return 'replica'
+
+
+class TestClasificacion:
+    """Clase de tests de las sentencias que pueden ir a una réplica."""
+    
+    def test_lecturas_replicables(self):
+        """Test que verifica que solo las lecturas sin bloqueo van a una réplica."""
+        assert es_lectura_replicable("SELECT * FROM cuentas")
+        assert es_lectura_replicable("  with t AS (SELECT 1) SELECT * FROM t")
+        assert not es_lectura_replicable("SELECT * FROM cuentas WHERE id_cuenta = 1 FOR UPDATE")
+        assert not es_lectura_replicable("SELECT * FROM cuentas LOCK IN SHARE MODE")
+        assert not es_lectura_replicable("SELECT * FROM cuentas FOR SHARE")
+        assert not es_lectura_replicable("UPDATE cuentas SET estado = 'Activa'")
+        assert not es_lectura_replicable("INSERT INTO cuentas SELECT * FROM cuentas")
+
+
+class TestEnrutamiento:
+    """Clase de tests del envío de lecturas a las réplicas."""
+    
+    def test_lectura_va_a_una_replica(self, db, servidores):
+        """Test que verifica que un SELECT fuera de una unidad de trabajo va a una réplica."""
+        filas = db.fetch_all(CONSULTA)
+        
+        assert [fila['id_cuenta'] for fila in filas] == [1]
+        assert servidor_de(db, servidores) == 'replica'
+        assert db._replica in REPLICAS.replicas
+    
+    def test_sesion_mantiene_su_replica(self, db, servidores):
+        """Test que verifica que una sesión sigue usando la misma réplica mientras esté sana."""
+        db.fetch_all(CONSULTA)
+        replica, conexion = db._replica, db.conexion_lectura
+        
+        db.fetch_all(CONSULTA)
+        db.fetch_all(CONSULTA)
+        
+        assert db._replica is replica
+        assert db.conexion_lectura is conexion
+    
+    def test_sesiones_se_reparten_las_replicas(self, servidores):
+        """Test que verifica que las sesiones nuevas se reparten entre las réplicas sanas."""
+        sesiones = [Database() for _ in range(2)]
+        try:
+            for sesion in sesiones:
+                sesion.connect()
+                sesion.fetch_all(CONSULTA)
+            
+            assert {sesion._replica.nombre for sesion in sesiones} == {'mysql_replica_1', 'mysql_replica_2'}
+        finally:
+            for sesion in sesiones:
+                sesion.disconnect()
+    
+    def test_unidad_de_trabajo_lee_de_la_primaria(self, db, servidores):
+        """Test que verifica que dentro de una unidad de trabajo todo va a la primaria."""
+        with unidad_de_trabajo(db):
+            db.fetch_all(CONSULTA)
+        
+        assert servidor_de(db, servidores) == 'primaria'
+    
+    def test_lee_sus_escrituras(self, db, servidores, monkeypatch):
+        """Test que verifica que tras escribir la sesión lee de la primaria durante retraso_maximo."""
+        monkeypatch.setattr(REPLICAS, 'retraso_maximo', 0.05)
+        
+        db.execute_update("UPDATE cuentas SET estado = 'Activa' WHERE id_cuenta = 1")
+        db.fetch_all(CONSULTA)
+        assert servidor_de(db, servidores) == 'primaria'
+        
+        time.sleep(0.06)
+        db.fetch_all(CONSULTA)
+        assert servidor_de(db, servidores) == 'replica'
+
+
+class TestFallos:
+    """Clase de tests de las réplicas caídas o atrasadas."""
+    
+    def test_replica_caida_se_lee_de_la_primaria(self, db, servidores):
+        """Test que verifica que si la réplica falla la lectura se repite en la primaria y la réplica sale."""
+        servidores.error_replica = pymysql.err.OperationalError(2013, "Lost connection")
+        
+        filas = db.fetch_all(CONSULTA)
+        
+        assert [fila['id_cuenta'] for fila in filas] == [1]
+        assert len(servidores.conexiones_de(CONSULTA)) == 2
+        assert servidor_de(db, servidores) == 'primaria'
+        assert [replica.sana for replica in REPLICAS.replicas].count(False) == 1
+        assert db.conexion_lectura is None
+    
+    def test_lectura_cancelada_no_se_repite(self, db, servidores):
+        """Test que verifica que una lectura que venció en la réplica no se repite en la primaria."""
+        servidores.error_replica = pymysql.err.OperationalError(3024, "maximum statement execution time exceeded")
+        
+        assert db.fetch_all(CONSULTA) == []
+        assert len(servidores.conexiones_de(CONSULTA)) == 1
+        assert db.ultimo_error.args[0] == 3024
+        assert all(replica.sana for replica in REPLICAS.replicas)
+    
+    def test_verificar_retraso(self, servidores, monkeypatch):
+        """Test que verifica que las réplicas atrasadas, detenidas o caídas dejan de recibir lecturas."""
+        retrasos = {'mysql_replica_1': 10, 'mysql_replica_2': None}
+        monkeypatch.setattr(Replica, 'medir_retraso', lambda replica: retrasos[replica.nombre])
+        
+        REPLICAS.verificar()
+        assert [replica.sana for replica in REPLICAS.replicas] == [False, False]
+        assert REPLICAS.elegir() is None
+        
+        def caida(replica):
+            raise pymysql.err.OperationalError(2003, "Can't connect")
+        monkeypatch.setattr(Replica, 'medir_retraso', caida)
+        REPLICAS.verificar()
+        assert REPLICAS.estado() == [{'nombre': 'mysql_replica_1', 'sana': False, 'retraso': None},
+                                     {'nombre': 'mysql_replica_2', 'sana': False, 'retraso': None}]
+        
+        monkeypatch.setattr(Replica, 'medir_retraso', lambda replica: 2)
+        REPLICAS.verificar()
+        assert all(replica.sana for replica in REPLICAS.replicas)
+    
+    def test_sin_replicas_sanas_lee_de_la_primaria(self, db, servidores, monkeypatch):
+        """Test que verifica que sin réplicas sanas las lecturas van a la primaria."""
+        monkeypatch.setattr(REPLICAS, '_proxima_verificacion', time.monotonic() + 60)
+        for replica in REPLICAS.replicas:
+            replica.sana = False
+        
+        db.fetch_all(CONSULTA)
+        
+        assert servidor_de(db, servidores) == 'primaria'
+    
+    def test_medir_retraso(self, servidores):
+        """Test que verifica la lectura de SHOW REPLICA STATUS."""
+        assert REPLICAS.replicas[0].medir_retraso() == 0
+
+
+class TestConfiguracion:
+    """Clase de tests de la lectura de config.ini."""
+    
+    def test_desde_config(self, tmp_path):
+        """Test que verifica que las réplicas heredan los datos de mysql_config."""
+        ruta = tmp_path / 'config.ini'
+        ruta.write_text("[mysql_config]\nhost = primaria\nport = 3306\nuser = banco\npassword = clave\ndb = banco_db\n\n"
+                        "[mysql_replica_1]\nhost = replica1\nport = 3307\n\n"
+                        "[replicas]\nretraso_maximo = 2\nintervalo_verificacion = 30\n", encoding='utf-8')
+        
+        conjunto = ConjuntoReplicas.desde_config(str(ruta))
+        
+        assert len(conjunto.replicas) == 1
+        assert conjunto.replicas[0].config == {'user': 'banco', 'password': 'clave', 'host': 'replica1',
+                                               'database': 'banco_db', 'port': 3307}
+        assert conjunto.retraso_maximo == 2
+        assert conjunto.intervalo_verificacion == 30
+    
+    def test_sin_secciones_no_hay_replicas(self, tmp_path):
+        """Test que verifica que sin secciones mysql_replica no se usa ninguna réplica."""
+        conjunto = ConjuntoReplicas.desde_config(str(tmp_path / 'no_existe.ini'))
+        
+        assert conjunto.replicas == []
+        assert conjunto.elegir() is None
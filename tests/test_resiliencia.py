@@ -0,0 +1,247 @@
+"""
+Tests de la tolerancia a fallos de la conexión (database.resiliencia y Database)
+contra la BD en memoria, inyectando errores de MySQL en las sentencias.
+"""
+import time
+
+import pymysql
+import pytest
+
+from database import connection, memoria, resiliencia
+from database.connection import Database
+from database.resiliencia import CORTOCIRCUITO, Cortocircuito
+from database.unidad_trabajo import unidad_de_trabajo
+
+
+class Fallas:
+    """Errores a inyectar en las próximas sentencias que contengan un texto."""
+    
+    def __init__(self):
+        self.pendientes = []
+        self.ejecutadas = []
+        self.conexiones = 0
+        self.conectar = None
+        self.ping = None
+    
+    def agregar(self, texto, codigo, veces=1):
+        self.pendientes.extend([(texto, pymysql.err.OperationalError(codigo, f"Error {codigo}"))] * veces)
+    
+    def intentos(self, texto):
+        return sum(1 for sql in self.ejecutadas if texto in sql)
+
+
+@pytest.fixture
+def fallas(bd_memoria, monkeypatch):
+    """Fixture que inyecta errores en las sentencias y en el ping de la BD en memoria."""
+    fallas = Fallas()
+    execute = memoria.CursorMemoria.execute
+    ping = memoria.ConexionMemoria.ping
+    fabrica = Database.fabrica_conexion
+
+    def execute_con_fallas(cursor, query, args=None):
+        fallas.ejecutadas.append(query)
+        for posicion, (texto, error) in enumerate(fallas.pendientes):
+            if texto in query:
+                del fallas.pendientes[posicion]
+                raise error
+        return execute(cursor, query, args)
+
+    def ping_con_fallas(conexion, reconnect=True):
+        if fallas.ping is not None:
+            raise fallas.ping
+        return ping(conexion, reconnect)
+
+    def fabrica_con_fallas():
+        fallas.conexiones += 1
+        if fallas.conectar is not None:
+            raise fallas.conectar
+        return fabrica()
+
+    monkeypatch.setattr(memoria.CursorMemoria, 'execute', execute_con_fallas)
+    monkeypatch.setattr(memoria.ConexionMemoria, 'ping', ping_con_fallas)
+    monkeypatch.setattr(Database, 'fabrica_conexion', fabrica_con_fallas)
+    # Sin esperas entre reintentos y con el cortocircuito del proceso restaurado al terminar
+    monkeypatch.setattr(resiliencia, 'ESPERA_MAXIMA', 0)
+    monkeypatch.setattr(CORTOCIRCUITO, 'estado', Cortocircuito.CERRADO)
+    monkeypatch.setattr(CORTOCIRCUITO, 'fallos', 0)
+    return fallas
+
+
+@pytest.fixture
+def db(fallas):
+    """Fixture que retorna una Database conectada a través de las fallas inyectadas."""
+    db = Database()
+    db.connect()
+    yield db
+    db.disconnect()
+
+
+def saldo(db, id_cuenta):
+    return float(db.fetch_all("SELECT saldo FROM cuentas WHERE id_cuenta = %s", (id_cuenta,))[0]['saldo'])
+
+
+SUMAR = "UPDATE cuentas SET saldo = saldo + 1 WHERE id_cuenta = 1"
+
+
+class TestClasificacion:
+    """Clase de tests de la clasificación de errores y la espera entre reintentos."""
+    
+    def test_errores_reintentables_y_de_conexion(self):
+        """Test que verifica qué errores se reintentan y cuáles indican conexión perdida."""
+        error = pymysql.err.OperationalError
+        
+        assert resiliencia.es_reintentable(error(1213, "Deadlock"))
+        assert resiliencia.es_reintentable(error(1205, "Lock wait timeout"))
+        assert not resiliencia.es_reintentable(pymysql.err.IntegrityError(1062, "Duplicate"))
+        assert resiliencia.es_conexion_perdida(error(2013, "Lost connection"))
+        assert resiliencia.es_conexion_perdida(pymysql.err.InterfaceError(0, ""))
+        assert not resiliencia.es_conexion_perdida(error(1213, "Deadlock"))
+        assert resiliencia.codigo_error(Exception("sin código")) is None
+    
+    def test_espera_con_jitter_acotada(self):
+        """Test que verifica que la espera es aleatoria entre 0 y la exponencial, sin pasar el máximo."""
+        for intento in range(1, 10):
+            tope = min(resiliencia.ESPERA_MAXIMA, resiliencia.ESPERA_BASE * 2 ** (intento - 1))
+            esperas = [resiliencia.espera_reintento(intento) for _ in range(50)]
+            assert all(0 <= espera <= tope for espera in esperas)
+            assert len(set(esperas)) > 1
+
+
+class TestCortocircuito:
+    """Clase de tests de los estados del cortocircuito."""
+    
+    def test_abre_tras_el_umbral_y_deja_pasar_una_prueba(self):
+        """Test que verifica cerrado -> abierto -> semiabierto -> abierto -> cerrado."""
+        circuito = Cortocircuito(umbral_fallos=2, tiempo_abierto=0.05)
+        
+        circuito.registrar_fallo()
+        assert circuito.permitir()
+        circuito.registrar_fallo()
+        assert circuito.estado == Cortocircuito.ABIERTO
+        assert not circuito.permitir()
+        
+        time.sleep(0.06)
+        assert circuito.permitir()
+        assert circuito.estado == Cortocircuito.SEMIABIERTO
+        assert not circuito.permitir()
+        
+        circuito.registrar_fallo()
+        assert circuito.estado == Cortocircuito.ABIERTO
+        time.sleep(0.06)
+        assert circuito.permitir()
+        circuito.registrar_exito()
+        assert circuito.estado == Cortocircuito.CERRADO
+        assert circuito.fallos == 0
+    
+    def test_un_exito_reinicia_los_fallos(self):
+        """Test que verifica que solo los fallos seguidos abren el circuito."""
+        circuito = Cortocircuito(umbral_fallos=2)
+        
+        circuito.registrar_fallo()
+        circuito.registrar_exito()
+        circuito.registrar_fallo()
+        
+        assert circuito.estado == Cortocircuito.CERRADO
+    
+    def test_sin_conexion_falla_de_inmediato(self, fallas, monkeypatch):
+        """Test que verifica que con el circuito abierto Database no intenta conectar."""
+        monkeypatch.setattr(CORTOCIRCUITO, 'umbral_fallos', 2)
+        fallas.conectar = pymysql.err.OperationalError(2003, "Can't connect")
+        db = Database()
+        
+        db.connect()
+        db.connect()
+        assert fallas.conexiones == 2
+        assert CORTOCIRCUITO.estado == Cortocircuito.ABIERTO
+        
+        db.connect()
+        assert fallas.conexiones == 2
+        assert db.fetch_all("SELECT 1") == []
+        assert resiliencia.codigo_error(db.ultimo_error) == 2006
+        assert fallas.conexiones == 2
+
+
+class TestReintentos:
+    """Clase de tests de los reintentos de Database."""
+    
+    def test_deadlock_se_reintenta(self, db, fallas):
+        """Test que verifica que una sentencia que chocó se repite y se aplica una sola vez."""
+        antes = saldo(db, 1)
+        fallas.agregar(SUMAR, 1213, veces=2)
+        
+        assert db.execute_update(SUMAR) == 1
+        assert fallas.intentos(SUMAR) == 3
+        assert db.ultimo_error is None
+        assert saldo(db, 1) == antes + 1
+    
+    def test_reintentos_acotados(self, db, fallas):
+        """Test que verifica que tras MAXIMO_REINTENTOS se devuelve el error."""
+        antes = saldo(db, 1)
+        fallas.agregar(SUMAR, 1205, veces=10)
+        
+        assert db.execute_update(SUMAR) is None
+        assert fallas.intentos(SUMAR) == resiliencia.MAXIMO_REINTENTOS + 1
+        assert resiliencia.codigo_error(db.ultimo_error) == 1205
+        assert saldo(db, 1) == antes
+    
+    def test_sin_reintentos_dentro_de_una_unidad(self, db, fallas):
+        """Test que verifica que en una unidad de trabajo el deadlock marca el bloque como fallido."""
+        antes = saldo(db, 1)
+        fallas.agregar(SUMAR, 1213)
+        
+        with unidad_de_trabajo(db) as bloque:
+            assert db.execute_update(SUMAR) is None
+        
+        assert bloque.fallida
+        assert fallas.intentos(SUMAR) == 1
+        assert saldo(db, 1) == antes
+    
+    def test_error_no_reintentable(self, db, fallas):
+        """Test que verifica que otros errores no se repiten."""
+        fallas.agregar(SUMAR, 1064)
+        
+        assert db.execute_update(SUMAR) is None
+        assert fallas.intentos(SUMAR) == 1
+
+
+class TestReconexion:
+    """Clase de tests de la reconexión tras perder la conexión."""
+    
+    def test_lectura_se_repite_con_otra_conexion(self, db, fallas):
+        """Test que verifica que una lectura con la conexión perdida se repite una vez tras reconectar."""
+        consulta = "SELECT id_cuenta FROM cuentas WHERE id_cuenta = 1"
+        fallas.agregar(consulta, 2013)
+        
+        filas = db.fetch_all(consulta)
+        
+        assert [fila['id_cuenta'] for fila in filas] == [1]
+        assert fallas.intentos(consulta) == 2
+        assert fallas.conexiones == 2
+    
+    def test_escritura_no_se_repite(self, db, fallas):
+        """Test que verifica que una escritura con la conexión perdida no se repite y la siguiente reconecta."""
+        antes = saldo(db, 1)
+        fallas.agregar(SUMAR, 2006)
+        
+        assert db.execute_update(SUMAR) is None
+        assert fallas.intentos(SUMAR) == 1
+        assert db.connection is None
+        
+        assert db.execute_update(SUMAR) == 1
+        assert fallas.conexiones == 2
+        assert saldo(db, 1) == antes + 1
+    
+    def test_ping_tras_inactividad(self, db, fallas, monkeypatch):
+        """Test que verifica que una conexión sin usar se comprueba con ping y se reemplaza si no responde."""
+        monkeypatch.setattr(connection, 'INTERVALO_PING', 0)
+        primera = db.connection
+        fallas.ping = pymysql.err.OperationalError(2006, "MySQL server has gone away")
+        
+        assert db.fetch_all("SELECT 1 AS uno")[0]['uno'] == 1
+        assert db.connection is not primera
+        assert fallas.conexiones == 2
+        
+        fallas.ping = None
+        segunda = db.connection
+        db.fetch_all("SELECT 1 AS uno")
+        assert db.connection is segunda
@@ -0,0 +1,148 @@
+"""
+Tests del número de sentencias SQL por operación de los controladores
+(database.instrumentacion) contra la BD en memoria. Cada máximo es el número
+actual de sentencias: si una operación emite más, el test muestra cuáles.
+"""
+import pytest
+
+from controllers.cliente_controller import ClienteController
+from controllers.cuenta_controller import CuentaController
+from database.instrumentacion import EstadisticasOperaciones, contar_sentencias, instrumentar_controlador, \
+    limite_sentencias
+
+
+@pytest.fixture
+def datos_cliente(bd_memoria):
+    """Fixture que proporciona los datos del cliente 1 como los envía el formulario."""
+    _, _, cliente = ClienteController().leer(1)
+    return {columna: valor.isoformat() if hasattr(valor, 'isoformat') else valor
+            for columna, valor in cliente.items() if columna != 'version'}
+
+
+class TestInstrumentacion:
+    """Clase de tests del registro y el límite de sentencias."""
+    
+    def test_limite_superado_muestra_las_sentencias(self, bd_memoria):
+        """Test que verifica que superar el máximo falla con el detalle de cada sentencia."""
+        with pytest.raises(AssertionError) as error:
+            with limite_sentencias(1, "dos lecturas"):
+                bd_memoria.fetch_all("SELECT * FROM clientes WHERE id_cliente = 1")
+                bd_memoria.fetch_all("SELECT * FROM cuentas WHERE id_cuenta = %s", (2,))
+        
+        mensaje = str(error.value)
+        assert mensaje.startswith("dos lecturas emitió 2 sentencias (máximo 1)")
+        assert "FROM clientes" in mensaje
+        assert "FROM cuentas" in mensaje
+    
+    def test_registros_anidados(self, bd_memoria):
+        """Test que verifica que cada bloque anidado cuenta solo sus sentencias."""
+        with contar_sentencias() as externo:
+            bd_memoria.fetch_all("SELECT 1")
+            with contar_sentencias() as interno:
+                bd_memoria.execute_update("UPDATE cuentas SET estado = 'Activa' WHERE id_cuenta = 1")
+        
+        assert externo.total == 2
+        assert interno.total == 1
+        assert externo.por_tipo() == {'SELECT': 1, 'UPDATE': 1}
+    
+    def test_estadisticas_por_operacion(self, bd_memoria):
+        """Test que verifica las sentencias por llamada acumuladas de un controlador instrumentado."""
+        estadisticas = EstadisticasOperaciones()
+        controlador = instrumentar_controlador(ClienteController(), estadisticas)
+        
+        controlador.leer(1)
+        controlador.leer(2)
+        controlador.listar()
+        
+        resumen = estadisticas.resumen()
+        assert resumen['ClienteController.leer']['llamadas'] == 2
+        assert resumen['ClienteController.leer']['promedio'] == 1
+        assert resumen['ClienteController.listar']['maximo'] == 1
+        # Instrumentar otra vez no cuenta las llamadas dos veces
+        instrumentar_controlador(controlador, estadisticas)
+        controlador.leer(3)
+        assert estadisticas.resumen()['ClienteController.leer']['llamadas'] == 3
+
+
+class TestSentenciasClientes:
+    """Clase de tests de las sentencias de las operaciones de clientes."""
+    
+    def test_actualizar_cliente(self, datos_cliente):
+        """Verificación, validaciones y UPDATE en una unidad de trabajo."""
+        controlador = ClienteController()
+        
+        with limite_sentencias(6, "actualizar_cliente") as registro:
+            exito, mensaje = controlador.actualizar_cliente(1, dict(datos_cliente, telefono='911111111'))
+        
+        assert exito, mensaje
+        assert registro.por_tipo().get('UPDATE') == 1
+    
+    def test_actualizar_cliente_sin_cambios(self, datos_cliente):
+        """Sin columnas modificadas no se ejecuta el UPDATE."""
+        controlador = ClienteController()
+        
+        with limite_sentencias(5, "actualizar_cliente sin cambios") as registro:
+            exito, mensaje = controlador.actualizar_cliente(1, datos_cliente)
+        
+        assert exito, mensaje
+        assert 'UPDATE' not in registro.por_tipo()
+    
+    def test_leer_y_listar_clientes(self, bd_memoria):
+        """Una sentencia por lectura o listado."""
+        controlador = ClienteController()
+        
+        with limite_sentencias(1, "leer"):
+            assert controlador.leer(1)[0]
+        with limite_sentencias(1, "listar"):
+            assert controlador.listar()[0]
+
+
+class TestSentenciasCuentas:
+    """Clase de tests de las sentencias de las operaciones de cuentas."""
+    
+    def test_crear_cuenta(self, bd_memoria):
+        """Cuatro verificaciones y el INSERT."""
+        controlador = CuentaController()
+        numero = controlador.generar_numero_cuenta()
+        
+        with limite_sentencias(5, "crear_cuenta") as registro:
+            exito, mensaje, _ = controlador.crear_cuenta({
+                'numero_cuenta': numero,
+                'cci': numero,
+                'id_cliente': 1,
+                'id_producto': 1,
+                'saldo': 100.00,
+                'fecha_apertura': '2024-02-01',
+                'estado': 'Activa'
+            })
+        
+        assert exito, mensaje
+        assert registro.por_tipo().get('INSERT') == 1
+    
+    def test_listar_y_contar_cuentas(self, bd_memoria):
+        """Una sentencia por listado, filtrado o no, y por conteo."""
+        controlador = CuentaController()
+        
+        with limite_sentencias(1, "listar"):
+            assert controlador.listar()[0]
+        with limite_sentencias(1, "listar con filtro y límite"):
+            assert controlador.listar({'estado': 'Activa'}, limite=2)[0]
+        with limite_sentencias(1, "buscar_cuentas_por_cliente"):
+            assert controlador.buscar_cuentas_por_cliente(1)[0]
+        with limite_sentencias(1, "obtener_conteo"):
+            assert controlador.obtener_conteo()[2] == 4
+    
+    def test_actualizar_saldo(self, bd_memoria):
+        """Lectura del saldo anterior, UPDATE e historial."""
+        with limite_sentencias(3, "actualizar_saldo"):
+            exito, mensaje = CuentaController().actualizar_saldo(1, 99.50)
+        
+        assert exito, mensaje
+    
+    def test_cambiar_estado(self, bd_memoria):
+        """Un UPDATE por lote, sin importar el número de cuentas."""
+        with limite_sentencias(2, "cambiar_estado"):
+            exito, mensaje, cambiadas = CuentaController().cambiar_estado([1, 2, 3], 'Inactiva')
+        
+        assert exito, mensaje
+        assert cambiadas == 3
@@ -0,0 +1,135 @@
+"""
+Tests de las sesiones de base de datos por hilo (database.sesiones) contra la BD en memoria.
+"""
+import threading
+
+import pytest
+
+from controllers.cliente_controller import ClienteController
+from database.sesiones import cerrar_sesion, cerrar_todas, obtener_sesion, sesion, sesiones_abiertas
+
+
+def en_hilo(funcion):
+    """Ejecuta la función en un hilo nuevo y retorna su resultado."""
+    resultado = []
+    hilo = threading.Thread(target=lambda: resultado.append(funcion()))
+    hilo.start()
+    hilo.join()
+    return resultado[0]
+
+
+@pytest.fixture
+def sin_sesion_implicita():
+    """Fixture que cierra la sesión implícita del hilo del test al terminar."""
+    yield
+    cerrar_sesion()
+
+
+class TestSesionPorHilo:
+    """Clase de tests de la sesión de cada hilo."""
+    
+    def test_el_modelo_usa_la_sesion_del_bloque(self, bd_memoria):
+        """Test que verifica que dentro de with sesion() los modelos usan esa conexión."""
+        controlador = ClienteController()
+        
+        assert controlador.modelo.db is bd_memoria
+        with sesion() as interna:
+            assert controlador.modelo.db is interna
+            assert interna is not bd_memoria
+        assert controlador.modelo.db is bd_memoria
+        assert not interna.connection.open
+    
+    def test_misma_sesion_en_el_mismo_hilo(self, bd_memoria, sin_sesion_implicita):
+        """Test que verifica que fuera de un bloque el hilo reutiliza su sesión implícita."""
+        def dos_veces():
+            primera = obtener_sesion()
+            return primera, obtener_sesion()
+        
+        primera, segunda = en_hilo(dos_veces)
+        
+        assert primera is segunda
+        assert primera is not bd_memoria
+    
+    def test_hilos_distintos_sesiones_distintas(self, bd_memoria):
+        """Test que verifica que un controlador compartido usa una conexión por hilo."""
+        controlador = ClienteController()
+        barrera = threading.Barrier(4)
+        resultados = {}
+        
+        def leer(indice):
+            barrera.wait()
+            exito, _, cliente = controlador.leer(indice + 1)
+            resultados[indice] = (exito, cliente['id_cliente'] if exito else None, controlador.modelo.db)
+            cerrar_sesion()
+        
+        hilos = [threading.Thread(target=leer, args=(indice,)) for indice in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        
+        assert [resultados[i][:2] for i in range(4)] == [(True, i + 1) for i in range(4)]
+        assert len({id(resultado[2]) for resultado in resultados.values()}) == 4
+
+
+class TestCierre:
+    """Clase de tests del cierre de sesiones."""
+    
+    def test_cerrar_sesion_la_reabre_en_el_proximo_uso(self, bd_memoria, sin_sesion_implicita):
+        """Test que verifica que cerrar_sesion cierra la implícita y el próximo uso abre otra."""
+        def cerrar_y_reabrir():
+            primera = obtener_sesion()
+            cerrar_sesion()
+            cerrada = not primera.connection or not primera.connection.open
+            segunda = obtener_sesion()
+            cerrar_sesion()
+            return primera, cerrada, segunda
+        
+        primera, cerrada, segunda = en_hilo(cerrar_y_reabrir)
+        
+        assert cerrada
+        assert segunda is not primera
+    
+    def test_reconecta_si_la_sesion_se_cerro(self, bd_memoria, sin_sesion_implicita):
+        """Test que verifica que una sesión desconectada se reemplaza por una nueva."""
+        primera = obtener_sesion()
+        primera.disconnect()
+        
+        segunda = obtener_sesion()
+        
+        assert segunda is not primera
+        assert segunda.connection.open
+    
+    def test_cierra_las_sesiones_de_hilos_terminados(self, bd_memoria):
+        """Test que verifica que al abrir otra sesión se cierran las de hilos que ya terminaron."""
+        antes = sesiones_abiertas()
+        huerfana = en_hilo(obtener_sesion)
+        assert sesiones_abiertas() == antes + 1
+        
+        with sesion():
+            assert sesiones_abiertas() == antes + 1
+        
+        assert not huerfana.connection or not huerfana.connection.open
+    
+    def test_cerrar_todas(self, bd_memoria):
+        """Test que verifica que cerrar_todas cierra las sesiones de todos los hilos."""
+        listo = threading.Event()
+        terminar = threading.Event()
+        sesiones = []
+        
+        def trabajo():
+            sesiones.append(obtener_sesion())
+            listo.set()
+            terminar.wait(5)
+        
+        hilo = threading.Thread(target=trabajo)
+        hilo.start()
+        listo.wait(5)
+        
+        cerrar_todas()
+        terminar.set()
+        hilo.join()
+        
+        assert sesiones_abiertas() == 0
+        assert not sesiones[0].connection or not sesiones[0].connection.open
+        assert not bd_memoria.connection or not bd_memoria.connection.open
@@ -0,0 +1,145 @@
+"""
+Tests de las trazas de vista -> controlador -> modelo -> SQL (utils.trazas).
+"""
+import contextvars
+import logging
+import threading
+import time
+
+import pytest
+
+from controllers.cliente_controller import ClienteController
+from utils import trazas
+
+
+@pytest.fixture
+def trazas_activas():
+    """Fixture que activa las trazas sin archivo de salida y las limpia al terminar."""
+    trazas.limpiar()
+    trazas.activar()
+    yield
+    trazas.desactivar()
+    trazas.limpiar()
+
+
+class TestTramos:
+    """Clase de tests de los tramos anidados y el tiempo propio."""
+    
+    def test_desactivadas_no_registran(self, bd_memoria):
+        """Test que verifica que sin activar no se acumula ninguna pila."""
+        trazas.limpiar()
+        
+        ClienteController().leer(1)
+        with trazas.tramo('manual'):
+            assert trazas.traza_actual() is None
+        
+        assert trazas.pilas() == {}
+    
+    def test_tiempo_propio_descuenta_los_hijos(self, trazas_activas):
+        """Test que verifica que cada pila acumula solo su tiempo propio."""
+        with trazas.tramo('padre'):
+            time.sleep(0.01)
+            with trazas.tramo('hijo'):
+                time.sleep(0.05)
+        
+        pilas = trazas.pilas()
+        assert set(pilas) == {'padre', 'padre;hijo'}
+        assert pilas['padre;hijo'] >= 50_000
+        assert 10_000 <= pilas['padre'] < pilas['padre;hijo']
+    
+    def test_id_de_traza(self, trazas_activas):
+        """Test que verifica que los tramos anidados comparten la traza y los raíz abren una nueva."""
+        assert trazas.traza_actual() is None
+        with trazas.tramo('a'):
+            primera = trazas.traza_actual()
+            with trazas.tramo('b'):
+                assert trazas.traza_actual() == primera
+        with trazas.tramo('a'):
+            segunda = trazas.traza_actual()
+        
+        assert primera and segunda and primera != segunda
+        assert trazas.traza_actual() is None
+    
+    def test_contexto_copiado_a_otro_hilo(self, trazas_activas):
+        """Test que verifica que un hilo que ejecuta un contexto copiado anida sus tramos."""
+        with trazas.tramo('vista'):
+            contexto = contextvars.copy_context()
+            traza = trazas.traza_actual()
+        vistas = []
+        
+        def tarea():
+            with trazas.tramo('tarea'):
+                vistas.append(trazas.traza_actual())
+        
+        hilo = threading.Thread(target=contexto.run, args=(tarea,))
+        hilo.start()
+        hilo.join()
+        
+        assert vistas == [traza]
+        assert 'vista;tarea' in trazas.pilas()
+
+
+class TestInstrumentacion:
+    """Clase de tests de los tramos de controladores, modelos y SQL."""
+    
+    def test_controlador_modelo_y_sql(self, bd_memoria, trazas_activas):
+        """Test que verifica que una operación del controlador produce la pila completa hasta el SQL."""
+        exito, _, _ = ClienteController().leer(1)
+        
+        assert exito
+        pilas = [pila.split(';') for pila in trazas.pilas()]
+        completas = [pila for pila in pilas if pila[-1].startswith('SQL SELECT clientes')]
+        assert completas
+        marcos = completas[0]
+        assert marcos[0] == 'BaseController.leer'
+        assert any(marco.endswith('.leer') and 'Controller' not in marco for marco in marcos[1:-1])
+    
+    def test_nombre_de_sentencias(self, trazas_activas):
+        """Test que verifica el nombre de los tramos de SQL (operación y tabla)."""
+        with trazas.tramo('raiz'):
+            trazas.registrar_sql("UPDATE cuentas SET saldo = %s WHERE id_cuenta = %s", time.perf_counter())
+            trazas.registrar_sql("INSERT INTO historial_saldos VALUES (1)", time.perf_counter())
+            trazas.registrar_sql("SELECT 1", time.perf_counter())
+        
+        assert {'raiz;SQL UPDATE cuentas', 'raiz;SQL INSERT historial_saldos', 'raiz;SQL SELECT'} <= set(trazas.pilas())
+    
+    def test_metodos_envueltos_una_sola_vez(self):
+        """Test que verifica que los métodos de las subclases no se instrumentan dos veces."""
+        metodo = ClienteController.crear_cliente
+        
+        assert getattr(metodo, '_trazado', False)
+        assert not getattr(metodo.__wrapped__, '_trazado', False)
+
+
+class TestExportacion:
+    """Clase de tests de la exportación y el filtro de logging."""
+    
+    def test_exportar_pilas_colapsadas(self, trazas_activas, tmp_path):
+        """Test que verifica el formato 'pila microsegundos' por línea."""
+        with trazas.tramo('a'):
+            with trazas.tramo('b'):
+                pass
+        ruta = tmp_path / 'trazas.folded'
+        
+        assert trazas.exportar(str(ruta)) == str(ruta)
+        lineas = ruta.read_text(encoding='utf-8').splitlines()
+        assert [linea.rsplit(' ', 1)[0] for linea in lineas] == ['a', 'a;b']
+        assert all(linea.rsplit(' ', 1)[1].isdigit() for linea in lineas)
+    
+    def test_exportar_sin_datos(self, tmp_path):
+        """Test que verifica que sin pilas no se escribe nada."""
+        trazas.limpiar()
+        
+        assert trazas.exportar(str(tmp_path / 'vacio.folded')) is None
+        assert not (tmp_path / 'vacio.folded').exists()
+    
+    def test_filtro_de_logging(self, trazas_activas):
+        """Test que verifica que los registros de log llevan el ID de la traza en curso."""
+        filtro = trazas.FiltroTraza()
+        registro = logging.LogRecord('prueba', logging.INFO, __file__, 1, "mensaje", None, None)
+        
+        filtro.filter(registro)
+        assert registro.traza == '-'
+        with trazas.tramo('a'):
+            filtro.filter(registro)
+            assert registro.traza == trazas.traza_actual()
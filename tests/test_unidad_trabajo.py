@@ -0,0 +1,84 @@
+"""
+Tests de la unidad de trabajo (database.unidad_trabajo) contra la BD en memoria.
+"""
+import pytest
+from pymysql import err
+
+from database.unidad_trabajo import unidad_de_trabajo
+
+
+def saldo(db, id_cuenta):
+    return db.fetch_all("SELECT saldo FROM cuentas WHERE id_cuenta = %s", (id_cuenta,))[0]['saldo']
+
+
+class TestUnidadDeTrabajo:
+    """Clase de tests de unidad_de_trabajo."""
+    
+    def test_confirma_al_salir(self, bd_memoria):
+        """Test que verifica que las sentencias del bloque se confirman juntas."""
+        with unidad_de_trabajo(bd_memoria) as bloque:
+            bd_memoria.execute_update("UPDATE cuentas SET saldo = 1 WHERE id_cuenta = 1")
+            bd_memoria.execute_update("UPDATE cuentas SET saldo = 2 WHERE id_cuenta = 2")
+        
+        assert not bloque.fallida
+        assert (saldo(bd_memoria, 1), saldo(bd_memoria, 2)) == (1, 2)
+    
+    def test_cancelar_deshace(self, bd_memoria):
+        """Test que verifica que cancelar() deshace el bloque sin lanzar excepción."""
+        anterior = saldo(bd_memoria, 1)
+        
+        with unidad_de_trabajo(bd_memoria) as bloque:
+            bd_memoria.execute_update("UPDATE cuentas SET saldo = 1 WHERE id_cuenta = 1")
+            bloque.cancelar()
+        
+        assert bloque.fallida
+        assert saldo(bd_memoria, 1) == anterior
+    
+    def test_savepoint_deshace_solo_el_bloque_anidado(self, bd_memoria):
+        """Test que verifica que un bloque anidado cancelado no deshace el exterior."""
+        with unidad_de_trabajo(bd_memoria) as exterior:
+            bd_memoria.execute_update("UPDATE cuentas SET saldo = 1 WHERE id_cuenta = 1")
+            with unidad_de_trabajo(bd_memoria) as anidado:
+                bd_memoria.execute_update("UPDATE cuentas SET saldo = 2 WHERE id_cuenta = 2")
+                anidado.cancelar()
+        
+        assert not exterior.fallida
+        assert saldo(bd_memoria, 1) == 1
+        assert saldo(bd_memoria, 2) != 2
+    
+    def test_excepcion_deshace_y_se_propaga(self, bd_memoria):
+        """Test que verifica que una excepción del bloque deshace y se relanza."""
+        anterior = saldo(bd_memoria, 1)
+        
+        with pytest.raises(ValueError):
+            with unidad_de_trabajo(bd_memoria):
+                bd_memoria.execute_update("UPDATE cuentas SET saldo = 1 WHERE id_cuenta = 1")
+                raise ValueError("error de la operación")
+        
+        assert saldo(bd_memoria, 1) == anterior
+    
+    def test_fallo_del_rollback_no_oculta_el_error(self, bd_memoria, monkeypatch):
+        """Test que verifica que si el rollback falla se relanza el error original."""
+        def rollback_fallido():
+            raise err.OperationalError(2013, "Lost connection to MySQL server during query")
+        monkeypatch.setattr(bd_memoria.connection, 'rollback', rollback_fallido)
+        
+        with pytest.raises(ValueError):
+            with unidad_de_trabajo(bd_memoria):
+                raise ValueError("error de la operación")
+    
+    def test_fallo_del_commit_se_propaga(self, bd_memoria, monkeypatch):
+        """Test que verifica que un commit fallido se relanza aunque el rollback también falle."""
+        def commit_fallido():
+            raise err.OperationalError(1213, "Deadlock found when trying to get lock")
+        
+        def rollback_fallido():
+            raise err.OperationalError(2013, "Lost connection to MySQL server during query")
+        monkeypatch.setattr(bd_memoria.connection, 'commit', commit_fallido)
+        monkeypatch.setattr(bd_memoria.connection, 'rollback', rollback_fallido)
+        
+        with pytest.raises(err.OperationalError) as error:
+            with unidad_de_trabajo(bd_memoria):
+                bd_memoria.execute_update("UPDATE cuentas SET saldo = 1 WHERE id_cuenta = 1")
+        
+        assert error.value.args[0] == 1213